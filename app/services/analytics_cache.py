@@ -0,0 +1,236 @@
+"""
+ANALYTICS CACHE
+===============
+Stale-while-revalidate snapshots for the Analytics tab.
+
+Each source (Shopify, Printify, YouTube, ...) is cached on its own:
+1. Reads return the last snapshot immediately, however old it is
+2. Stale sources are refreshed on background threads, one fetch in flight
+   per source, and a scheduler keeps registered sources fresh between visits
+3. A source's data is swapped in as soon as its own fetch finishes, so a
+   slow platform never holds back the others
+4. A failed refresh keeps the previous data and records the error
+5. Freshness and fetch duration are tracked per source and persisted
+"""
+
+import os
+import json
+import time
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+ANALYTICS_CACHE_FILE = Path.home() / ".pod_wizard" / "analytics_cache.json"
+
+
+class AnalyticsCache:
+    """
+    Per-source analytics snapshots with background revalidation.
+
+    Usage:
+        cache = get_analytics_cache()
+        cache.register("shopify", lambda: api.get_comprehensive_analytics(),
+                       account=shop_url)
+        cache.refresh("shopify")             # no-op while fresh or in flight
+        entry = cache.get("shopify")         # instant, possibly stale
+        data = entry["data"] if entry else None
+    """
+
+    def __init__(
+        self,
+        path: Path = ANALYTICS_CACHE_FILE,
+        default_ttl: int = 300,
+        max_workers: int = 3,
+        schedule_interval: float = 30.0
+    ):
+        self.path = Path(path)
+        self.default_ttl = default_ttl
+        self.schedule_interval = schedule_interval
+        self._lock = threading.Lock()
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="analytics-refresh")
+        self._sources: Dict[str, Dict[str, Any]] = {}
+        self._inflight: Dict[str, Future] = {}
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+        self._scheduler: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    # ----- persistence -----
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        if self.path.exists():
+            try:
+                with open(self.path, "r") as f:
+                    return json.load(f)
+            except Exception as e:
+                logger.warning(f"Failed to load analytics cache: {e}")
+        return {}
+
+    def _save(self):
+        try:
+            with self._lock:
+                payload = json.dumps(self._entries, default=str)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                f.write(payload)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Failed to save analytics cache: {e}")
+
+    # ----- sources -----
+
+    def register(self, name: str, fetcher: Callable[[], Any],
+                 ttl: Optional[int] = None, account: Optional[str] = None):
+        """
+        Register (or update) the fetch function for a source.
+
+        Args:
+            name: Source name, e.g. "shopify"
+            fetcher: Returns the source's data; must not touch st.session_state
+            ttl: Seconds before the snapshot counts as stale
+            account: Identifies the connected account; cached data from a
+                different account is discarded
+        """
+        with self._lock:
+            self._sources[name] = {"fetcher": fetcher, "ttl": ttl or self.default_ttl, "account": account}
+            entry = self._entries.get(name)
+            if entry and entry.get("account") != account:
+                del self._entries[name]
+        self._ensure_scheduler()
+
+    def unregister(self, name: str):
+        with self._lock:
+            self._sources.pop(name, None)
+
+    # ----- reads -----
+
+    def get(self, name: str) -> Optional[Dict[str, Any]]:
+        """
+        Last snapshot for a source (never blocks on a fetch).
+
+        Returns:
+            Dict with data, fetched_at, duration, error, age, stale and
+            refreshing keys, or None if the source was never fetched
+        """
+        with self._lock:
+            entry = self._entries.get(name)
+            if entry is None:
+                return None
+            entry = dict(entry)
+            ttl = self._sources.get(name, {}).get("ttl", self.default_ttl)
+            refreshing = name in self._inflight
+        entry["age"] = time.time() - entry["fetched_at"] if entry.get("fetched_at") else None
+        entry["stale"] = entry["age"] is None or entry["age"] > ttl
+        entry["refreshing"] = refreshing
+        return entry
+
+    def data(self, name: str) -> Any:
+        entry = self.get(name)
+        return entry["data"] if entry else None
+
+    def is_refreshing(self, name: Optional[str] = None) -> bool:
+        with self._lock:
+            return name in self._inflight if name else bool(self._inflight)
+
+    # ----- revalidation -----
+
+    def _is_stale(self, name: str) -> bool:
+        entry = self._entries.get(name) or {}
+        # Failures back off for a ttl too instead of retrying every tick
+        last_attempt = max(entry.get("fetched_at") or 0, entry.get("failed_at") or 0)
+        return time.time() - last_attempt > self._sources[name]["ttl"]
+
+    def refresh(self, name: str, force: bool = False) -> bool:
+        """
+        Start a background fetch if the source is stale (or forced).
+
+        Returns:
+            True if a fetch was started
+        """
+        with self._lock:
+            if name not in self._sources or name in self._inflight:
+                return False
+            if not force and not self._is_stale(name):
+                return False
+            source = self._sources[name]
+            future = self._pool.submit(self._fetch, name, source["fetcher"], source["account"])
+            self._inflight[name] = future
+        future.add_done_callback(lambda _f: self._done(name))
+        return True
+
+    def refresh_all(self, force: bool = False) -> int:
+        with self._lock:
+            names = list(self._sources)
+        return sum(self.refresh(name, force=force) for name in names)
+
+    def _done(self, name: str):
+        with self._lock:
+            self._inflight.pop(name, None)
+
+    def _fetch(self, name: str, fetcher: Callable[[], Any], account: Optional[str]):
+        start = time.time()
+        try:
+            data = fetcher()
+            error = data.get("error") if isinstance(data, dict) else None
+        except Exception as e:
+            data, error = None, str(e)
+        duration = time.time() - start
+
+        with self._lock:
+            entry = self._entries.setdefault(name, {"data": None, "fetched_at": None})
+            entry["account"] = account
+            entry["duration"] = round(duration, 3)
+            if error:
+                # Keep serving the last good snapshot
+                entry["error"] = error
+                entry["failed_at"] = time.time()
+            else:
+                entry.update(data=data, fetched_at=time.time(), error=None, failed_at=None)
+        if error:
+            logger.warning(f"⚠️ Analytics refresh failed for {name} after {duration:.1f}s: {error}")
+        else:
+            logger.info(f"📊 Analytics refreshed: {name} in {duration:.1f}s")
+        self._save()
+
+    def _ensure_scheduler(self):
+        if self._scheduler is None or not self._scheduler.is_alive():
+            self._scheduler = threading.Thread(target=self._schedule_loop, name="analytics-scheduler", daemon=True)
+            self._scheduler.start()
+
+    def _schedule_loop(self):
+        while not self._stop.wait(self.schedule_interval):
+            try:
+                self.refresh_all()
+            except Exception as e:
+                logger.debug(f"Analytics schedule tick failed: {e}")
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Freshness summary per registered or cached source."""
+        with self._lock:
+            names = set(self._sources) | set(self._entries)
+        summary = {}
+        for name in sorted(names):
+            entry = self.get(name) or {"age": None, "stale": True, "refreshing": self.is_refreshing(name)}
+            summary[name] = {k: entry.get(k) for k in ("age", "duration", "stale", "refreshing", "error")}
+        return summary
+
+    def shutdown(self):
+        self._stop.set()
+        self._pool.shutdown(wait=False)
+
+
+_analytics_cache: Optional[AnalyticsCache] = None
+_analytics_cache_lock = threading.Lock()
+
+
+def get_analytics_cache() -> AnalyticsCache:
+    """Get the global analytics cache instance."""
+    global _analytics_cache
+    with _analytics_cache_lock:
+        if _analytics_cache is None:
+            _analytics_cache = AnalyticsCache()
+        return _analytics_cache
@@ -0,0 +1,337 @@
+"""
+ARTIFACT WRITER
+===============
+Background persistence for task queue artifacts.
+
+Steps hand artifacts to the writer and keep going; the writer:
+1. Downloads media on a bounded pool of worker threads, streaming to a
+   temp file so large videos never sit fully in memory
+2. Renames into place atomically (no half-written files on crash)
+3. Dedupes by URL (in-flight and finished) and by content hash (identical
+   bytes from different URLs are hard-linked, not stored twice)
+4. Batches metadata into one append per task directory per flush
+5. Returns a Future per artifact so callers can wait only when they need to
+
+Only in-flight downloads are tracked per URL; finished URLs, content hashes
+and per-task futures are kept in LRUs of ``max_tracked`` entries so a
+long-running process doesn't hold every download it ever made.
+"""
+
+import os
+import json
+import queue
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+class ArtifactWriter:
+    """
+    Bounded background writer for artifacts produced by EnhancedTaskQueue.
+
+    Usage:
+        writer = ArtifactWriter(Path("task_artifacts"))
+        future = writer.submit(artifact, task_id)   # returns immediately
+        ...
+        path = future.result(timeout=120)           # only if you need the file
+    """
+
+    def __init__(
+        self,
+        base_dir: Path,
+        max_workers: int = 3,
+        flush_interval: float = 0.5,
+        metadata_batch_size: int = 32,
+        chunk_size: int = 256 * 1024,
+        timeout: int = 120,
+        max_tracked: int = 1024
+    ):
+        self.base_dir = Path(base_dir)
+        self.base_dir.mkdir(parents=True, exist_ok=True)
+        self.max_workers = max_workers
+        self.flush_interval = flush_interval
+        self.metadata_batch_size = metadata_batch_size
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.max_tracked = max_tracked
+
+        self._jobs: "queue.Queue" = queue.Queue()
+        self._metadata: "queue.Queue" = queue.Queue()
+        self._lock = threading.Lock()
+        self._by_url: Dict[str, Future] = {}                       # in-flight downloads
+        self._done_urls: "OrderedDict[str, str]" = OrderedDict()    # url -> saved path
+        self._by_hash: "OrderedDict[str, str]" = OrderedDict()      # sha256 -> saved path
+        self._by_task: "OrderedDict[str, List[Future]]" = OrderedDict()
+        self._stats = {"submitted": 0, "downloaded": 0, "url_dedup": 0, "hash_dedup": 0, "failed": 0}
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+        self._workers = [
+            threading.Thread(target=self._worker_loop, name=f"artifact-writer-{i}", daemon=True)
+            for i in range(max_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+        self._flusher = threading.Thread(target=self._flush_loop, name="artifact-metadata", daemon=True)
+        self._flusher.start()
+
+    # ----- public API -----
+
+    def submit(self, artifact: Any, task_id: str) -> Future:
+        """
+        Queue an artifact for persistence and return immediately.
+
+        The future resolves to the saved file path (or None when the artifact
+        has nothing to write). ``artifact.file_path`` is set on completion.
+        """
+        future: Future = Future()
+        saved_path = None
+        with self._lock:
+            self._stats["submitted"] += 1
+            self._by_task.setdefault(task_id, []).append(future)
+            self._by_task.move_to_end(task_id)
+            self._trim(self._by_task)
+            url = getattr(artifact, "url", None)
+            if url and self._is_media(artifact):
+                existing = self._by_url.get(url)
+                if existing is not None:
+                    self._stats["url_dedup"] += 1
+                    existing.add_done_callback(
+                        lambda done: self._finish_from(done, future, artifact, task_id)
+                    )
+                    return future
+                saved_path = self._done_urls.get(url)
+                if saved_path and os.path.exists(saved_path):
+                    self._done_urls.move_to_end(url)
+                    self._stats["url_dedup"] += 1
+                else:
+                    saved_path = None
+                    self._by_url[url] = future
+        if saved_path:
+            self._finish_with(saved_path, future, artifact, task_id)
+            return future
+        self._jobs.put((artifact, task_id, future))
+        return future
+
+    def futures_for_task(self, task_id: str) -> List[Future]:
+        """All futures submitted for a task."""
+        with self._lock:
+            return list(self._by_task.get(task_id, []))
+
+    def wait_for_task(self, task_id: str, timeout: Optional[float] = None) -> List[Optional[str]]:
+        """Block until every artifact of a task is written; returns their paths."""
+        from concurrent.futures import wait
+        futures = self.futures_for_task(task_id)
+        wait(futures, timeout=timeout)
+        return [f.result() if f.done() and not f.exception() else None for f in futures]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self._stats, queued=self._jobs.qsize())
+
+    def shutdown(self, wait: bool = True):
+        """Stop workers after the queue drains and flush pending metadata."""
+        for _ in self._workers:
+            self._jobs.put(_STOP)
+        self._metadata.put(_STOP)
+        if wait:
+            for worker in self._workers:
+                worker.join()
+            self._flusher.join()
+
+    # ----- workers -----
+
+    def _trim(self, lru: OrderedDict):
+        """Drop the least recently used entries beyond max_tracked (lock held)."""
+        while len(lru) > self.max_tracked:
+            lru.popitem(last=False)
+
+    @staticmethod
+    def _is_media(artifact: Any) -> bool:
+        kind = getattr(getattr(artifact, "type", None), "value", None)
+        return kind in ("image", "video")
+
+    def _worker_loop(self):
+        while True:
+            job = self._jobs.get()
+            if job is _STOP:
+                return
+            artifact, task_id, future = job
+            try:
+                path = self._persist(artifact, task_id)
+                artifact.file_path = path
+                url = getattr(artifact, "url", None)
+                if url:
+                    with self._lock:
+                        if self._by_url.get(url) is future:
+                            del self._by_url[url]
+                        if path:
+                            self._done_urls[url] = path
+                            self._done_urls.move_to_end(url)
+                            self._trim(self._done_urls)
+                future.set_result(path)
+                self._metadata.put((task_id, artifact.to_dict()))
+            except Exception as e:
+                with self._lock:
+                    self._stats["failed"] += 1
+                    # Let a later submit of the same URL try again
+                    url = getattr(artifact, "url", None)
+                    if url and self._by_url.get(url) is future:
+                        del self._by_url[url]
+                logger.warning(f"Failed to save artifact {artifact.id}: {e}")
+                future.set_exception(e)
+
+    def _finish_from(self, source: Future, target: Future, artifact: Any, task_id: str):
+        """Complete a URL-deduped submission from the original download."""
+        try:
+            path = source.result()
+        except Exception as e:
+            target.set_exception(e)
+            return
+        self._finish_with(path, target, artifact, task_id)
+
+    def _finish_with(self, path: Optional[str], target: Future, artifact: Any, task_id: str):
+        """Complete a submission from an already saved file."""
+        if path:
+            dest = self.base_dir / task_id / f"{artifact.id}{Path(path).suffix}"
+            try:
+                dest.parent.mkdir(parents=True, exist_ok=True)
+                path = self._link_or_reference(path, dest)
+            except OSError:
+                pass
+        artifact.file_path = path
+        target.set_result(path)
+        self._metadata.put((task_id, artifact.to_dict()))
+
+    def _persist(self, artifact: Any, task_id: str) -> Optional[str]:
+        task_dir = self.base_dir / task_id
+        task_dir.mkdir(parents=True, exist_ok=True)
+
+        if getattr(artifact, "url", None) and self._is_media(artifact):
+            ext = "mp4" if artifact.type.value == "video" else "png"
+            return self._download(artifact.url, task_dir / f"{artifact.id}.{ext}")
+
+        content = getattr(artifact, "content", None)
+        if content and getattr(artifact.type, "value", None) == "text":
+            dest = task_dir / f"{artifact.id}.txt"
+            tmp_path = dest.with_suffix(".txt.part")
+            with open(tmp_path, "w") as f:
+                f.write(content)
+            os.replace(tmp_path, dest)
+            return str(dest)
+
+        return None
+
+    def _download(self, url: str, dest: Path) -> str:
+        tmp_path = dest.with_name(dest.name + ".part")
+        digest = hashlib.sha256()
+        try:
+            with self.session.get(url, timeout=self.timeout, stream=True) as response:
+                response.raise_for_status()
+                with open(tmp_path, "wb") as f:
+                    for chunk in response.iter_content(chunk_size=self.chunk_size):
+                        if chunk:
+                            digest.update(chunk)
+                            f.write(chunk)
+        except Exception:
+            if tmp_path.exists():
+                tmp_path.unlink()
+            raise
+
+        content_hash = digest.hexdigest()
+        with self._lock:
+            existing = self._by_hash.get(content_hash)
+            if not existing or not os.path.exists(existing):
+                self._by_hash[content_hash] = str(dest)
+                existing = None
+            else:
+                self._stats["hash_dedup"] += 1
+            self._by_hash.move_to_end(content_hash)
+            self._trim(self._by_hash)
+            self._stats["downloaded"] += 1
+
+        if existing:
+            tmp_path.unlink()
+            return self._link_or_reference(existing, dest)
+
+        os.replace(tmp_path, dest)
+        return str(dest)
+
+    @staticmethod
+    def _link_or_reference(existing: str, dest: Path) -> str:
+        """Hard-link identical content into place, or reuse the existing path."""
+        if Path(existing) == dest:
+            return str(dest)
+        try:
+            if dest.exists():
+                dest.unlink()
+            os.link(existing, dest)
+            return str(dest)
+        except OSError:
+            return existing
+
+    # ----- metadata flusher -----
+
+    def _flush_loop(self):
+        stopping = False
+        while not stopping:
+            batch = []
+            try:
+                item = self._metadata.get(timeout=self.flush_interval)
+                if item is _STOP:
+                    stopping = True
+                else:
+                    batch.append(item)
+            except queue.Empty:
+                continue
+            while len(batch) < self.metadata_batch_size:
+                try:
+                    item = self._metadata.get_nowait()
+                except queue.Empty:
+                    break
+                if item is _STOP:
+                    stopping = True
+                    break
+                batch.append(item)
+            if batch:
+                self._write_metadata(batch)
+
+    def _write_metadata(self, batch: List[tuple]):
+        by_task: Dict[str, List[Dict]] = {}
+        for task_id, record in batch:
+            by_task.setdefault(task_id, []).append(record)
+        for task_id, records in by_task.items():
+            try:
+                task_dir = self.base_dir / task_id
+                task_dir.mkdir(parents=True, exist_ok=True)
+                with open(task_dir / "artifacts.jsonl", "a") as f:
+                    f.write("".join(json.dumps(r, default=str) + "\n" for r in records))
+            except Exception as e:
+                logger.warning(f"Failed to write artifact metadata for {task_id}: {e}")
+
+
+_writers: Dict[str, ArtifactWriter] = {}
+_writers_lock = threading.Lock()
+
+
+def get_artifact_writer(base_dir: Path) -> ArtifactWriter:
+    """Get the process-wide writer for a base directory."""
+    key = str(Path(base_dir).resolve())
+    with _writers_lock:
+        if key not in _writers:
+            _writers[key] = ArtifactWriter(Path(base_dir))
+        return _writers[key]
@@ -27,6 +27,9 @@ from enum import Enum
 from functools import wraps
 import os
 
+from app.services.secure_config import get_api_key
+from app.services.execution_fabric import get_fabric
+
 logger = logging.getLogger(__name__)
 
 # Persistent storage for task state
@@ -50,6 +53,10 @@ class TaskState(Enum):
     PAUSED = "paused"
 
 
+class TaskCancelled(Exception):
+    """Raised inside a task when its stop flag is set."""
+
+
 @dataclass
 class BackgroundTask:
     """Represents a background task."""
@@ -153,7 +160,7 @@ def retry_with_backoff(max_retries: int = 5, base_delay: float = 2.0, max_delay:
 class BackgroundTaskManager:
     """
     Singleton manager for background tasks.
-    Persists state to disk and manages thread execution.
+    Persists state to disk; tasks run on the shared execution fabric.
     Uses Streamlit cache_resource to survive page reloads.
     """
     _instance = None
@@ -173,7 +180,7 @@ class BackgroundTaskManager:
         
         self._initialized = True
         self._tasks: Dict[str, BackgroundTask] = {}
-        self._threads: Dict[str, threading.Thread] = {}
+        self._jobs: Dict[str, Any] = {}  # task_id -> FabricJob
         self._stop_flags: Dict[str, threading.Event] = {}
         self._state_lock = threading.Lock()
         
@@ -189,8 +196,10 @@ class BackgroundTaskManager:
                     data = json.load(f)
                 for task_data in data.get("tasks", []):
                     task = BackgroundTask.from_dict(task_data)
-                    # Mark running tasks as failed (they were interrupted)
-                    if task.state == TaskState.RUNNING:
+                    # Mark running tasks as failed (they were interrupted),
+                    # including started tasks still waiting on the fabric
+                    queued = task.state == TaskState.PENDING and task.metadata.get('background_target')
+                    if task.state == TaskState.RUNNING or queued:
                         task.state = TaskState.FAILED
                         task.error = "Task was interrupted (app restart)"
                     self._tasks[task.id] = task
@@ -223,8 +232,18 @@ class BackgroundTaskManager:
         except Exception as e:
             logger.warning(f"Could not save task state: {e}")
     
-    def create_task(self, name: str, description: str = "", metadata: Dict = None) -> BackgroundTask:
-        """Create a new background task."""
+    def create_task(self, name: str, description: str = "", metadata: Dict = None,
+                    profile: Optional[str] = None) -> BackgroundTask:
+        """
+        Create a new background task.
+        
+        Args:
+            name: Task name
+            description: Task description
+            metadata: Extra data stored with the task
+            profile: Execution fabric resource profile (RESOURCE_PROFILES key);
+                "default" unless given, kept across retries and recovery
+        """
         task_id = str(uuid.uuid4())[:8]
         task = BackgroundTask(
             id=task_id,
@@ -232,6 +251,8 @@ class BackgroundTaskManager:
             description=description,
             metadata=metadata or {}
         )
+        if profile:
+            task.metadata['resource_profile'] = profile
         with self._state_lock:
             self._tasks[task_id] = task
             self._stop_flags[task_id] = threading.Event()
@@ -240,7 +261,14 @@ class BackgroundTaskManager:
         return task
     
     def start_task(self, task_id: str, target: Callable, *args, **kwargs):
-        """Start a task in a background thread."""
+        """
+        Queue a task on the execution fabric.
+        
+        The target is called with task, stop_flag and update_callback. stop_flag
+        is also the fabric job's cancel_event, so stop_task(), fabric cancel()
+        and fabric shutdown all set it; a running target only stops if it
+        checks the flag.
+        """
         task = self._tasks.get(task_id)
         if not task:
             raise ValueError(f"Task {task_id} not found")
@@ -262,6 +290,11 @@ class BackgroundTaskManager:
         except Exception as e:
             logger.warning(f"Could not save task metadata for {task_id}: {e}")
         
+        # Fresh stop flag per run: tasks loaded from disk have none, and a
+        # cancelled task's flag is still set when it is retried/resumed
+        with self._state_lock:
+            self._stop_flags[task_id] = threading.Event()
+        
         def task_wrapper():
             try:
                 # Clear previous error when retrying / starting
@@ -271,9 +304,10 @@ class BackgroundTaskManager:
                 self._save_state()
                 
                 # Pass task and stop flag to the target function
+                stop_flag = self._stop_flags[task_id]
                 result = target(
                     task=task,
-                    stop_flag=self._stop_flags[task_id],
+                    stop_flag=stop_flag,
                     update_callback=lambda: self._save_state(),
                     *args,
                     **kwargs
@@ -281,12 +315,21 @@ class BackgroundTaskManager:
                 
                 task.result = result
                 task.error = None
+                if stop_flag.is_set():
+                    # The target saw the flag and returned early
+                    raise TaskCancelled()
                 task.state = TaskState.COMPLETED
                 task.completed_at = datetime.now().isoformat()
                 task.progress = 1.0
                 self._save_state()
                 logger.info(f"✅ Task {task_id} completed successfully")
                 
+            except TaskCancelled:
+                task.state = TaskState.CANCELLED
+                task.completed_at = datetime.now().isoformat()
+                self._save_state()
+                logger.info(f"🛑 Task {task_id} stopped after cancellation")
+                
             except Exception as e:
                 task.state = TaskState.FAILED
                 task.error = str(e)
@@ -296,11 +339,20 @@ class BackgroundTaskManager:
                 self._save_state()
                 logger.error(f"❌ Task {task_id} failed: {e}")
         
-        # Use non-daemon thread so it persists across Streamlit page changes
-        thread = threading.Thread(target=task_wrapper, daemon=False)
-        self._threads[task_id] = thread
-        thread.start()
-        logger.info(f"🚀 Started task {task_id} in background thread (non-daemon)")
+        # Queue on the execution fabric so campaigns share the CPU, memory
+        # and API budget with every other background job in the process
+        task.state = TaskState.PENDING
+        task.started_at = None
+        job = get_fabric().submit(
+            task_wrapper,
+            name=task.name,
+            source="background_tasks",
+            profile=task.metadata.get('resource_profile', 'default'),
+            metadata={'task_id': task_id},
+            cancel_event=self._stop_flags[task_id]
+        )
+        self._jobs[task_id] = job
+        logger.info(f"🚀 Queued task {task_id} on the execution fabric (job {job.job_id})")
 
 
     def _resolve_target(self, module_name: str, target_name: str) -> Optional[Callable]:
@@ -367,15 +419,14 @@ class BackgroundTaskManager:
         """Get all currently running tasks."""
         running = [t for t in self._tasks.values() if t.state == TaskState.RUNNING]
         
-        # Check if threads are actually alive
+        # Check if the fabric jobs are actually still running
         for task in running:
-            thread = self._threads.get(task.id)
-            if thread:
-                is_alive = thread.is_alive()
-                if not is_alive:
-                    logger.warning(f"⚠️ Task {task.id} marked as running but thread is DEAD")
+            job = self._jobs.get(task.id)
+            if job:
+                if job.done:
+                    logger.warning(f"⚠️ Task {task.id} marked as running but its job has ended")
                     task.state = TaskState.FAILED
-                    task.error = "Thread died unexpectedly"
+                    task.error = "Job ended unexpectedly"
                     self._save_state()
         
         return [t for t in self._tasks.values() if t.state == TaskState.RUNNING]
@@ -406,62 +457,64 @@ class BackgroundTaskManager:
         """Request a task to stop."""
         if task_id in self._stop_flags:
             self._stop_flags[task_id].set()
+            job = self._jobs.get(task_id)
+            if job:
+                get_fabric().cancel(job.job_id)
             task = self._tasks.get(task_id)
             if task:
                 task.state = TaskState.CANCELLED
                 task.logs.append("Task cancelled by user")
                 self._save_state()
             logger.info(f"🛑 Requested stop for task {task_id}")
+    
+    def manual_retry_task(self, task_id: str, override_kwargs: Dict = None, reset_attempts: bool = False,
+                          max_attempts: Optional[int] = None):
+        """Manually retry/resume a failed task using stored metadata.
+
+        Parameters:
+            task_id: ID of the failed task
+            override_kwargs: Optional dict to override saved background kwargs
+            reset_attempts: If True, reset `recovery_attempts` to 0 before retry
+            max_attempts: Optionally set a new `max_recovery_attempts` value
+        """
+        task = self._tasks.get(task_id)
+        if not task:
+            raise ValueError(f"Task {task_id} not found")
 
-        def manual_retry_task(self, task_id: str, override_kwargs: Dict = None, reset_attempts: bool = False,
-                              max_attempts: Optional[int] = None):
-            """Manually retry/resume a failed task using stored metadata.
-
-            Parameters:
-                task_id: ID of the failed task
-                override_kwargs: Optional dict to override saved background kwargs
-                reset_attempts: If True, reset `recovery_attempts` to 0 before retry
-                max_attempts: Optionally set a new `max_recovery_attempts` value
-            """
-            task = self._tasks.get(task_id)
-            if not task:
-                raise ValueError(f"Task {task_id} not found")
-
-            if task.state not in (TaskState.FAILED, TaskState.CANCELLED):
-                raise ValueError("Can only retry tasks that are FAILED or CANCELLED")
-
-            meta = task.metadata or {}
-            bg_target = meta.get('background_target')
-            bg_module = meta.get('background_module', __name__)
+        if task.state not in (TaskState.FAILED, TaskState.CANCELLED):
+            raise ValueError("Can only retry tasks that are FAILED or CANCELLED")
 
-            if not bg_target:
-                raise ValueError("Task has no background_target metadata to retry")
+        meta = task.metadata or {}
+        bg_target = meta.get('background_target')
+        bg_module = meta.get('background_module', __name__)
 
-            if reset_attempts:
-                meta['recovery_attempts'] = 0
+        if not bg_target:
+            raise ValueError("Task has no background_target metadata to retry")
 
-            if max_attempts is not None:
-                meta['max_recovery_attempts'] = int(max_attempts)
+        if reset_attempts:
+            meta['recovery_attempts'] = 0
 
-            # Update kwargs
-            if override_kwargs is not None:
-                try:
-                    # Try to ensure serialization
-                    meta['background_kwargs'] = json.loads(json.dumps(override_kwargs))
-                except Exception:
-                    meta['background_kwargs'] = {k: str(v) for k, v in override_kwargs.items()}
+        if max_attempts is not None:
+            meta['max_recovery_attempts'] = int(max_attempts)
 
-            # Persist metadata changes
-            task.metadata = meta
-            self._save_state()
+        # Update kwargs
+        if override_kwargs is not None:
+            try:
+                # Try to ensure serialization
+                meta['background_kwargs'] = json.loads(json.dumps(override_kwargs))
+            except Exception:
+                meta['background_kwargs'] = {k: str(v) for k, v in override_kwargs.items()}
 
-            func = self._resolve_target(bg_module, bg_target)
-            if not func:
-                raise RuntimeError(f"Could not resolve function {bg_target} in {bg_module}")
+        # Persist metadata changes
+        task.metadata = meta
+        self._save_state()
 
-            # Start the task again
-            self.start_task(task.id, func, **(meta.get('background_kwargs', {}) or {}))
+        func = self._resolve_target(bg_module, bg_target)
+        if not func:
+            raise RuntimeError(f"Could not resolve function {bg_target} in {bg_module}")
 
+        # Start the task again
+        self.start_task(task.id, func, **(meta.get('background_kwargs', {}) or {}))
     
     def update_task_progress(self, task_id: str, progress: float, current_step: str = "", 
                              completed_steps: int = None, total_steps: int = None):
@@ -475,6 +528,9 @@ class BackgroundTaskManager:
                 task.completed_steps = completed_steps
             if total_steps is not None:
                 task.total_steps = total_steps
+            job = self._jobs.get(task_id)
+            if job:
+                get_fabric().update(job.job_id, task.progress, task.current_step)
             self._save_state()
     
     def add_task_log(self, task_id: str, message: str):
@@ -505,7 +561,7 @@ class BackgroundTaskManager:
             for tid in to_remove:
                 del self._tasks[tid]
                 self._stop_flags.pop(tid, None)
-                self._threads.pop(tid, None)
+                self._jobs.pop(tid, None)
             self._save_state()
             logger.info(f"🧹 Cleared {len(to_remove)} completed tasks")
 
@@ -654,6 +710,240 @@ def render_task_monitor_page():
                             st.error(f"Could not retry task: {e}")
 
 
+def _stream_download(session, url: str, dest: Path, timeout: int = 60) -> bool:
+    """Stream url to dest via a temp file so partial downloads never look complete."""
+    tmp_path = dest.with_suffix(dest.suffix + '.part')
+    with session.get(url, timeout=timeout, stream=True) as response:
+        if response.status_code != 200:
+            return False
+        with open(tmp_path, 'wb') as f:
+            for chunk in response.iter_content(chunk_size=64 * 1024):
+                if chunk:
+                    f.write(chunk)
+    os.replace(tmp_path, dest)
+    return dest.stat().st_size > 0
+
+
+def _run_product_pipeline(
+    task: BackgroundTask,
+    manager: 'BackgroundTaskManager',
+    replicate_api,
+    replicate_token: str,
+    campaign_dir: Path,
+    campaign_config: Dict,
+    existing_products: List[Dict],
+    checkpoints,
+    log: Callable,
+    progress: Callable,
+    check_cancelled: Callable
+) -> tuple:
+    """
+    Staged, concurrent product → video pipeline for run_campaign_in_background.
+    
+    Stage 1 (image pool): generate product images concurrently, bounded by
+    ``max_concurrent_products`` (default 3).
+    Stage 2 (download): stream each finished image to disk on the same worker.
+    Stage 3 (video pool): as soon as a product's files exist, submit its
+    commercial to a separate pool bounded by ``max_concurrent_videos``
+    (default 2) so rendering overlaps with the remaining generations.
+    
+    Every finished product and video is recorded as an item in the
+    ``products``/``videos`` checkpoint stages, keyed by a hash of its inputs,
+    so a resumed run only regenerates items that are missing or changed.
+    
+    Cancellation (TaskCancelled from ``check_cancelled``) is never counted as
+    a per-item failure: queued work is cancelled and the exception propagates.
+    
+    Returns:
+        (products, videos) with products in their original index order
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+    import requests
+    from requests.adapters import HTTPAdapter
+    
+    concept_input = campaign_config.get('concept_input', '')
+    product_enabled = campaign_config.get('product_enabled', True)
+    video_enabled = campaign_config.get('video_enabled', False)
+    num_products = campaign_config.get('num_products', 1) if product_enabled else 0
+    image_workers = max(1, int(campaign_config.get('max_concurrent_products', 3)))
+    video_workers = max(1, int(campaign_config.get('max_concurrent_videos', 2)))
+    brand_template = campaign_config.get('brand_template')
+    video_template = campaign_config.get('video_template', '3_scene_basic')
+    
+    products_dir = campaign_dir / "products"
+    products_dir.mkdir(exist_ok=True)
+    video_dir = campaign_dir / "videos"
+    if video_enabled:
+        video_dir.mkdir(exist_ok=True)
+    
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=image_workers, pool_maxsize=image_workers)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    
+    products: Dict[int, Dict] = {i: p for i, p in enumerate(existing_products)}
+    offset = len(existing_products)
+    videos: List[Dict] = []
+    done_count = [0]
+    count_lock = threading.Lock()
+    
+    product_prompt = f"{concept_input}, high quality product design, professional"
+    
+    def product_inputs_hash(i: int) -> str:
+        return checkpoints.inputs_hash({'prompt': product_prompt, 'index': i, 'size': [1024, 1024]})
+    
+    def generate_product(i: int) -> Optional[Dict]:
+        check_cancelled()
+        log(f"🎨 Generating product {i+1}: {product_prompt[:50]}...")
+        
+        image_output = replicate_api.generate_image(
+            prompt=product_prompt,
+            width=1024,
+            height=1024
+        )
+        if not image_output:
+            log(f"   ⚠️ No image generated for product {i+1}")
+            return None
+        
+        check_cancelled()
+        image_url = image_output[0] if isinstance(image_output, list) else image_output
+        image_path = products_dir / f"product_{i+1}.png"
+        if not _stream_download(session, image_url, image_path):
+            log(f"   ⚠️ Failed to download product {i+1} image")
+            return None
+        
+        log(f"   ✅ Product {i+1} saved: {image_path.name}")
+        manager.add_task_artifact(task.id, {
+            'name': f'Product {i+1}',
+            'type': 'image',
+            'path': str(image_path)
+        })
+        product = {
+            'title': f"{concept_input} - Design {i+1}",
+            'image_file': str(image_path),
+            'image_url': image_url
+        }
+        checkpoints.record_item('products', f"product_{i+1}", product_inputs_hash(i),
+                                data=product, artifacts=[image_path])
+        return product
+    
+    def render_video(pidx: int, prod: Dict) -> tuple:
+        from static_commercial_producer import StaticCommercialProducer
+        
+        check_cancelled()
+        mockups = prod.get('lifestyle_mockups') or prod.get('all_mockups') or []
+        # If a dedicated product mockup for video was set earlier, prefer it
+        if prod.get('video_mockup'):
+            mockups = [prod.get('video_mockup')] + mockups
+        if not mockups and prod.get('image_file'):
+            mockups = [prod['image_file']]
+        mockups = mockups[:3]
+        features = prod.get('features') or prod.get('attributes') or []
+        
+        out_path = str(video_dir / f"product_{pidx+1}_commercial.mp4")
+        video_key = f"video_{pidx+1}"
+        try:
+            video_hash = checkpoints.inputs_hash({
+                'concept': concept_input,
+                'title': prod.get('title', concept_input),
+                'mockups': [checkpoints.file_hash(m) if os.path.exists(m) else m for m in mockups],
+                'features': features,
+                'template': video_template,
+                'brand_template': brand_template
+            })
+            if checkpoints.get_item('videos', video_key, video_hash) is not None:
+                log(f"   ⏭️ Video {pidx+1} unchanged, reusing checkpoint")
+                return (True, out_path)
+            
+            producer = StaticCommercialProducer(replicate_token)
+            # Enforce fidelity: do not allow substitute visuals in autonomous mode
+            producer.create_product_commercial(
+                campaign_concept=concept_input,
+                product_name=prod.get('title', concept_input),
+                mockup_image_paths=mockups,
+                output_path=out_path,
+                product_features=features,
+                allow_substitute_visuals=False,
+                template=video_template,
+                brand_template=brand_template,
+                max_retries=2
+            )
+            checkpoints.record_item('videos', video_key, video_hash,
+                                    data={'path': out_path}, artifacts=[out_path])
+            return (True, out_path)
+        except Exception as e:
+            return (False, str(e))
+    
+    with ThreadPoolExecutor(max_workers=image_workers, thread_name_prefix="campaign-img") as image_pool, \
+         ThreadPoolExecutor(max_workers=video_workers, thread_name_prefix="campaign-vid") as video_pool:
+        video_futures = []
+        
+        def submit_video(pidx: int, prod: Dict):
+            if video_enabled:
+                video_futures.append(video_pool.submit(render_video, pidx, prod))
+        
+        image_futures = {}
+        try:
+            # Products loaded from a previous run can start rendering right away
+            for pidx, prod in products.items():
+                submit_video(pidx, prod)
+        
+            for i in range(offset, offset + num_products):
+                cached = checkpoints.get_item('products', f"product_{i+1}", product_inputs_hash(i))
+                if cached is not None:
+                    log(f"   ⏭️ Product {i+1} already generated, reusing checkpoint")
+                    products[i] = cached
+                    submit_video(i, cached)
+                    with count_lock:
+                        done_count[0] += 1
+                else:
+                    image_futures[image_pool.submit(generate_product, i)] = i
+            for future in as_completed(image_futures):
+                idx = image_futures[future]
+                try:
+                    prod = future.result()
+                except TaskCancelled:
+                    raise
+                except Exception as e:
+                    prod = None
+                    log(f"   ❌ Product {idx+1} error: {e}")
+            
+                with count_lock:
+                    done_count[0] += 1
+                    completed = done_count[0]
+                progress(0.25 + (completed * 0.3 / max(num_products, 1)),
+                         f"Generated product {completed}/{num_products}...", 3, 10)
+            
+                if prod:
+                    products[idx] = prod
+                    submit_video(idx, prod)
+                check_cancelled()
+        
+            if video_futures:
+                progress(0.55, "Generating product videos...", 4, 10)
+            for future in as_completed(video_futures):
+                check_cancelled()
+                ok, res = future.result()
+                if ok:
+                    videos.append({'path': res})
+                    manager.add_task_artifact(task.id, {
+                        'name': os.path.basename(res),
+                        'type': 'video',
+                        'path': res
+                    })
+                    log(f"   ✅ Video generated: {res}")
+                else:
+                    log(f"   ❌ Video generation failed: {res}")
+        except TaskCancelled:
+            for future in list(image_futures) + video_futures:
+                future.cancel()
+            raise
+        finally:
+            session.close()
+    
+    return [products[i] for i in sorted(products)], videos
+
+
 # === CAMPAIGN GENERATION WITH BACKGROUND TASKS ===
 
 def run_campaign_in_background(
@@ -686,7 +976,7 @@ def run_campaign_in_background(
     def check_cancelled():
         if stop_flag.is_set():
             log("Task cancelled by user")
-            raise Exception("Task cancelled")
+            raise TaskCancelled("Task cancelled")
     
     log("🚀 Starting background campaign generation...")
     progress(0.02, "Initializing...", 0, 10)
@@ -747,10 +1037,22 @@ def run_campaign_in_background(
         progress(0.05, "Creating campaign directory...", 1, 10)
         check_cancelled()
         
-        # Create campaign directory
+        # Create campaign directory, or reuse the one from an interrupted/cancelled run
         from app.services.platform_helpers import create_campaign_directory, _slugify
-        campaign_dir = create_campaign_directory(concept_input)
-        log(f"📁 Campaign directory: {campaign_dir}")
+        from app.services.performance_utils import CheckpointManager
+        resume_dir = campaign_config.get('campaign_dir')
+        if resume_dir and Path(resume_dir).exists():
+            campaign_dir = Path(resume_dir)
+            log(f"🔁 Resuming in campaign directory: {campaign_dir}")
+        else:
+            campaign_dir = create_campaign_directory(concept_input)
+            log(f"📁 Campaign directory: {campaign_dir}")
+            # Remember the directory so a retry or recovery resumes here
+            bg_config = (task.metadata or {}).get('background_kwargs', {}).get('campaign_config')
+            if isinstance(bg_config, dict):
+                bg_config['campaign_dir'] = str(campaign_dir)
+                update_callback()
+        checkpoints = CheckpointManager(campaign_dir)
         
         results = {
             'campaign_plan': None,
@@ -788,7 +1090,16 @@ def run_campaign_in_background(
             pass
         
         # Step 1: Generate Campaign Plan
-        if campaign_enabled:
+        concept_platforms = ["Instagram", "TikTok", "Pinterest"]
+        concept_hash = CheckpointManager.inputs_hash({
+            'concept_input': concept_input,
+            'target_audience': target_audience,
+            'platforms': concept_platforms
+        })
+        if campaign_enabled and checkpoints.is_stage_current('concept', concept_hash):
+            results['campaign_plan'] = checkpoints.get_stage('concept')
+            log("⏭️ Campaign concept unchanged, reusing checkpoint")
+        elif campaign_enabled:
             progress(0.1, "Generating campaign plan...", 2, 10)
             check_cancelled()
             
@@ -801,7 +1112,7 @@ def run_campaign_in_background(
                     product_description=concept_input,
                     target_audience=target_audience,
                     budget="500",  # Default budget
-                    platforms=["Instagram", "TikTok", "Pinterest"]
+                    platforms=concept_platforms
                 )
                 results['campaign_plan'] = {
                     'concept': concept,
@@ -819,132 +1130,51 @@ def run_campaign_in_background(
                 with open(analyzed_path, 'w') as f:
                     f.write(analyzed_concept)
                 log(f"   📄 Saved: analyzed_concept.txt")
+                
+                checkpoints.complete_stage(
+                    'concept', concept_hash,
+                    data=results['campaign_plan'],
+                    artifacts=[concept_path, analyzed_path]
+                )
                     
             except Exception as e:
                 log(f"⚠️ Campaign plan error: {e}")
         
-        # Step 2: Generate Products
-        if product_enabled:
-            progress(0.25, f"Generating {num_products} products...", 3, 10)
+        # Step 2 + 2.5: Product pipeline
+        # Product images are generated concurrently (bounded so we stay inside the
+        # Replicate rate limit; ReplicateAPI retries any 429s), each image streams
+        # straight to disk as its generation finishes, and that product's video
+        # starts rendering immediately instead of waiting for every product.
+        if product_enabled or video_enabled:
+            progress(0.25, f"Generating {num_products if product_enabled else 0} products...", 3, 10)
             check_cancelled()
             
-            for i in range(num_products):
-                check_cancelled()
-                progress(0.25 + (i * 0.15 / num_products), f"Generating product {i+1}/{num_products}...", 3, 10)
-                
-                try:
-                    # Generate product image
-                    product_prompt = f"{concept_input}, high quality product design, professional"
-                    log(f"🎨 Generating product {i+1}: {product_prompt[:50]}...")
-                    
-                    image_output = replicate_api.generate_image(
-                        prompt=product_prompt,
-                        width=1024,
-                        height=1024
-                    )
-                    
-                    if image_output:
-                        # Download and save image
-                        import requests
-                        image_url = image_output[0] if isinstance(image_output, list) else image_output
-                        
-                        products_dir = campaign_dir / "products"
-                        products_dir.mkdir(exist_ok=True)
-                        
-                        image_path = products_dir / f"product_{i+1}.png"
-                        response = requests.get(image_url, timeout=60)
-                        if response.status_code == 200:
-                            with open(image_path, 'wb') as f:
-                                f.write(response.content)
-                            
-                            results['products'].append({
-                                'title': f"{concept_input} - Design {i+1}",
-                                'image_file': str(image_path),
-                                'image_url': image_url
-                            })
-                            log(f"   ✅ Product {i+1} saved: {image_path.name}")
-                            
-                            # Add as artifact
-                            manager.add_task_artifact(task.id, {
-                                'name': f'Product {i+1}',
-                                'type': 'image',
-                                'path': str(image_path)
-                            })
-                        else:
-                            log(f"   ⚠️ Failed to download product {i+1} image")
-                    else:
-                        log(f"   ⚠️ No image generated for product {i+1}")
-                        
-                except Exception as e:
-                    log(f"   ❌ Product {i+1} error: {e}")
-
-        # Step 2.5: Generate Videos for products (if enabled)
-        if video_enabled:
-            progress(0.55, "Generating product videos...", 4, 10)
+            results['products'], videos = _run_product_pipeline(
+                task=task,
+                manager=manager,
+                replicate_api=replicate_api,
+                replicate_token=replicate_token,
+                campaign_dir=campaign_dir,
+                campaign_config=campaign_config,
+                existing_products=results['products'],
+                checkpoints=checkpoints,
+                log=log,
+                progress=progress,
+                check_cancelled=check_cancelled
+            )
+            results['videos'].extend(videos)
             check_cancelled()
-
-            try:
-                from concurrent.futures import ThreadPoolExecutor, as_completed
-                from static_commercial_producer import StaticCommercialProducer
-
-                video_dir = campaign_dir / "videos"
-                video_dir.mkdir(exist_ok=True)
-
-                # Use a small threadpool to render videos concurrently but not overload local resources
-                with ThreadPoolExecutor(max_workers=2) as ex:
-                    futures = []
-                    for pidx, prod in enumerate(results['products']):
-                        check_cancelled()
-                        mockups = prod.get('lifestyle_mockups') or prod.get('all_mockups') or []
-                        # If a dedicated product mockup for video was set earlier, prefer it
-                        if prod.get('video_mockup'):
-                            mockups = [prod.get('video_mockup')] + mockups
-
-                        out_path = video_dir / f"product_{pidx+1}_commercial.mp4"
-
-                        # Prepare args for submission
-                        producer = StaticCommercialProducer(replicate_token)
-
-                        product_features = prod.get('features') or prod.get('attributes') or []
-                        brand_template = campaign_config.get('brand_template') if isinstance(campaign_config, dict) else None
-
-                        def render_job(prod_idx=pidx, mockups=mockups, out=str(out_path), features=product_features, brand=brand_template):
-                            try:
-                                # Enforce fidelity: do not allow substitute visuals in autonomous mode
-                                result = producer.create_product_commercial(
-                                    campaign_concept=concept_input,
-                                    product_name=prod.get('title', concept_input),
-                                    mockup_image_paths=mockups[:3],
-                                    output_path=out,
-                                    product_features=features,
-                                    allow_substitute_visuals=False,
-                                    template=campaign_config.get('video_template', '3_scene_basic') if isinstance(campaign_config, dict) else '3_scene_basic',
-                                    brand_template=brand,
-                                    max_retries=2
-                                )
-                                return (True, out)
-                            except Exception as e:
-                                return (False, str(e))
-
-                        futures.append(ex.submit(render_job))
-
-                    for f in as_completed(futures):
-                        ok, res = f.result()
-                        if ok:
-                            manager.add_task_artifact(task.id, {
-                                'name': os.path.basename(res),
-                                'type': 'video',
-                                'path': res
-                            })
-                            log(f"   ✅ Video generated: {res}")
-                        else:
-                            log(f"   ❌ Video generation failed: {res}")
-
-            except Exception as e:
-                log(f"⚠️ Video generation stage error: {e}")
         
         # Step 3: Generate Blog Post
-        if blog_enabled:
+        blog_hash = CheckpointManager.inputs_hash({
+            'concept_input': concept_input,
+            'target_audience': target_audience,
+            'tone': 'Professional'
+        })
+        if blog_enabled and checkpoints.is_stage_current('blog', blog_hash):
+            results['blog_posts'].append(checkpoints.get_stage('blog'))
+            log("⏭️ Blog post unchanged, reusing checkpoint")
+        elif blog_enabled:
             progress(0.5, "Generating blog post...", 5, 10)
             check_cancelled()
             
@@ -969,6 +1199,11 @@ def run_campaign_in_background(
                         'pdf_path': pdf_path
                     })
                     log(f"✅ Blog post generated: {html_path}")
+                    checkpoints.complete_stage(
+                        'blog', blog_hash,
+                        data={'html_path': html_path, 'pdf_path': pdf_path},
+                        artifacts=[p for p in (html_path, pdf_path) if p]
+                    )
                     
                     # Add as artifact
                     manager.add_task_artifact(task.id, {
@@ -981,7 +1216,12 @@ def run_campaign_in_background(
                 log(f"⚠️ Blog generation error: {e}")
         
         # Step 4: Generate Social Media Content
-        if social_enabled:
+        social_prompt = f"Write 3 social media posts promoting: {concept_input}. Target audience: {target_audience}. Include hashtags."
+        social_hash = CheckpointManager.inputs_hash({'prompt': social_prompt, 'max_tokens': 500})
+        if social_enabled and checkpoints.is_stage_current('social', social_hash):
+            results['social_posts'].append(checkpoints.get_stage('social'))
+            log("⏭️ Social content unchanged, reusing checkpoint")
+        elif social_enabled:
             progress(0.7, "Generating social media content...", 7, 10)
             check_cancelled()
             
@@ -990,7 +1230,6 @@ def run_campaign_in_background(
                 social_dir.mkdir(exist_ok=True)
                 
                 # Generate social post text
-                social_prompt = f"Write 3 social media posts promoting: {concept_input}. Target audience: {target_audience}. Include hashtags."
                 social_text = replicate_api.generate_text(prompt=social_prompt, max_tokens=500)
                 
                 if social_text:
@@ -1002,6 +1241,11 @@ def run_campaign_in_background(
                         'path': str(social_path)
                     })
                     log(f"✅ Social media content generated")
+                    checkpoints.complete_stage(
+                        'social', social_hash,
+                        data=results['social_posts'][-1],
+                        artifacts=[social_path]
+                    )
                     
             except Exception as e:
                 log(f"⚠️ Social media error: {e}")
@@ -1080,7 +1324,8 @@ def start_background_campaign(campaign_config: Dict) -> str:
     task = manager.create_task(
         name=f"Campaign: {concept}",
         description=f"Generating campaign for: {concept}",
-        metadata=campaign_config
+        metadata=campaign_config,
+        profile="campaign"
     )
     
     manager.start_task(
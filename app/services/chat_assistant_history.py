@@ -85,6 +85,12 @@ class ChatHistoryManager:
             with open(file_path, 'w') as f:
                 json.dump(conversation, f, indent=2, default=str)
             
+            try:
+                from app.services.search_index import get_search_index, conversation_doc
+                get_search_index().upsert("conversations", *conversation_doc(conversation))
+            except Exception as e:
+                logger.debug(f"Search indexing skipped: {e}")
+            
             return {
                 "success": True,
                 "id": conv_id,
@@ -86,6 +86,10 @@ class DatabaseManager:
                 created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
             )
         """)
+        cursor.execute("""
+            CREATE INDEX IF NOT EXISTS idx_scheduled_jobs_status_time
+            ON scheduled_jobs(status, scheduled_time)
+        """)
         
         # Analytics
         cursor.execute("""
@@ -243,29 +247,63 @@ class DatabaseManager:
             job.status
         ))
         self.conn.commit()
-        return cursor.lastrowid
+        job.id = cursor.lastrowid
+        self._register_with_scheduler(job)
+        return job.id
     
-    def get_pending_jobs(self) -> List[ScheduledJob]:
-        """Get pending scheduled jobs"""
+    def _register_with_scheduler(self, job: ScheduledJob):
+        """Hand a job to the scheduler service so it fires at its time without polling"""
+        try:
+            from .scheduler_service import get_scheduler
+            get_scheduler().schedule(
+                "product_job", job.scheduled_time,
+                title=f"{len(job.prompts)} {job.product_type} products",
+                payload={"job_id": job.id},
+                ref=f"scheduled_jobs:{job.id}"
+            )
+        except Exception as e:
+            print(f"Scheduler unavailable for job {job.id}: {e}")
+    
+    def sync_scheduled_jobs(self) -> int:
+        """Make sure every pending job has a scheduler entry (idempotent)"""
+        jobs = self._pending_jobs_before(None)
+        for job in jobs:
+            self._register_with_scheduler(job)
+        return len(jobs)
+    
+    def get_scheduled_job(self, job_id: int) -> Optional[ScheduledJob]:
         cursor = self.conn.cursor()
-        now = datetime.now().isoformat()
-        cursor.execute("""
-            SELECT * FROM scheduled_jobs 
-            WHERE status = 'pending' AND scheduled_time <= ?
-        """, (now,))
-        
-        jobs = []
-        for row in cursor.fetchall():
-            jobs.append(ScheduledJob(
-                id=row[0],
-                scheduled_time=datetime.fromisoformat(row[1]),
-                prompts=json.loads(row[2]),
-                product_type=row[3],
-                price=row[4],
-                shop_id=row[5],
-                status=row[6]
-            ))
-        return jobs
+        cursor.execute("SELECT * FROM scheduled_jobs WHERE id = ?", (job_id,))
+        row = cursor.fetchone()
+        return self._row_to_job(row) if row else None
+    
+    @staticmethod
+    def _row_to_job(row) -> ScheduledJob:
+        return ScheduledJob(
+            id=row[0],
+            scheduled_time=datetime.fromisoformat(row[1]),
+            prompts=json.loads(row[2]),
+            product_type=row[3],
+            price=row[4],
+            shop_id=row[5],
+            status=row[6]
+        )
+    
+    def _pending_jobs_before(self, until: Optional[str]) -> List[ScheduledJob]:
+        cursor = self.conn.cursor()
+        if until is None:
+            cursor.execute("SELECT * FROM scheduled_jobs WHERE status = 'pending' ORDER BY scheduled_time")
+        else:
+            cursor.execute("""
+                SELECT * FROM scheduled_jobs 
+                WHERE status = 'pending' AND scheduled_time <= ?
+                ORDER BY scheduled_time
+            """, (until,))
+        return [self._row_to_job(row) for row in cursor.fetchall()]
+    
+    def get_pending_jobs(self) -> List[ScheduledJob]:
+        """Get pending scheduled jobs that are due (indexed on status, scheduled_time)"""
+        return self._pending_jobs_before(datetime.now().isoformat())
     
     def update_job_status(self, job_id: int, status: str):
         """Update job status"""
@@ -5,8 +5,11 @@ Not just cover art, but the entire product with all content.
 """
 from app.tabs.abp_imports_common import (
     os, json, requests, replicate, Path, Optional, Dict, List, Any,
-    datetime, logging, BytesIO, base64, time, re, setup_logger
+    datetime, logging, BytesIO, base64, re, threading, ThreadPoolExecutor, setup_logger
 )
+from typing import Callable
+from app.services.secure_config import get_api_key
+from app.services.platform_integrations import get_adaptive_rate_limiter
 
 logger = setup_logger(__name__)
 
@@ -17,6 +20,7 @@ try:
     from reportlab.pdfgen import canvas
     from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
     from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Image, PageBreak, Table, TableStyle
+    from reportlab.platypus import Frame
     from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_JUSTIFY
     from reportlab.lib import colors
     REPORTLAB_AVAILABLE = True
@@ -33,23 +37,182 @@ except ImportError:
     logger.warning("gTTS not available - text-to-speech limited")
 
 
+# Forward the Streamlit script context so progress callbacks work from workers
+try:
+    from streamlit.runtime.scriptrunner import add_script_run_ctx, get_script_run_ctx
+except ImportError:
+    add_script_run_ctx = get_script_run_ctx = None
+
+
+def _make_executor(max_workers: int) -> ThreadPoolExecutor:
+    """Thread pool whose workers inherit the caller's Streamlit context."""
+    ctx = get_script_run_ctx(suppress_warning=True) if get_script_run_ctx else None
+    if ctx is None:
+        return ThreadPoolExecutor(max_workers=max_workers)
+    return ThreadPoolExecutor(
+        max_workers=max_workers,
+        initializer=lambda: add_script_run_ctx(threading.current_thread(), ctx)
+    )
+
+
+def _download_file(url: str, path: Path) -> bool:
+    """Stream a generated asset to disk; returns True on success."""
+    path = Path(path)
+    tmp_path = path.with_name(path.name + '.part')
+    try:
+        with requests.get(url, stream=True, timeout=120) as response:
+            if response.status_code != 200:
+                return False
+            with open(tmp_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=256 * 1024):
+                    f.write(chunk)
+        os.replace(tmp_path, path)
+        return True
+    except Exception as e:
+        logger.error(f"Download failed for {path.name}: {e}")
+        if tmp_path.exists():
+            tmp_path.unlink()
+        return False
+
+
+def _generation_failed(text: str) -> bool:
+    """True for the placeholder generate_text returns on errors."""
+    return text.startswith("[Content generation failed")
+
+
+# Longest text sent to XTTS in one request
+NARRATION_CHUNK_CHARS = 450
+
+
+def split_for_narration(text: str, max_chars: int = NARRATION_CHUNK_CHARS) -> List[str]:
+    """Split text into chunks of whole sentences no longer than max_chars."""
+    text = re.sub(r'[#*_`>]+', ' ', text)
+    sentences = re.split(r'(?<=[.!?])\s+', " ".join(text.split()))
+    chunks, current = [], ""
+    for sentence in sentences:
+        # Break overlong sentences at word boundaries
+        while len(sentence) > max_chars:
+            cut = sentence.rfind(' ', 0, max_chars)
+            cut = cut if cut > 0 else max_chars
+            if current:
+                chunks.append(current)
+                current = ""
+            chunks.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if current and len(current) + 1 + len(sentence) > max_chars:
+            chunks.append(current)
+            current = sentence
+        else:
+            current = f"{current} {sentence}".strip()
+    if current:
+        chunks.append(current)
+    return [c for c in chunks if c]
+
+
+def _ffmpeg_binary() -> Optional[str]:
+    try:
+        from modules.ffmpeg_assembly import get_ffmpeg_binary
+        return get_ffmpeg_binary()
+    except ImportError:
+        return None
+
+
+def _audio_format(path: str) -> str:
+    """'wav' for RIFF files (XTTS), otherwise 'mp3' (gTTS)."""
+    with open(path, 'rb') as f:
+        return 'wav' if f.read(4) == b'RIFF' else 'mp3'
+
+
+def _stitch_audio(parts: List[str], output_path: Path) -> Optional[str]:
+    """
+    Concatenate audio chunks in order.
+    
+    ffmpeg decodes and re-encodes any mix of formats. Without it, WAV chunks
+    are joined frame by frame and MP3 chunks byte by byte; the two can't be
+    combined without a decoder, so a mixed set keeps only the majority format
+    (narrate_long_text avoids that case by re-synthesizing).
+    """
+    if not parts:
+        return None
+    output_path = Path(output_path)
+    
+    ffmpeg = _ffmpeg_binary()
+    if ffmpeg:
+        import subprocess
+        cmd = [ffmpeg, "-y", "-loglevel", "error"]
+        for part in parts:
+            cmd += ["-i", part]
+        inputs = "".join(f"[{i}:a]" for i in range(len(parts)))
+        cmd += ["-filter_complex", f"{inputs}concat=n={len(parts)}:v=0:a=1[out]",
+                "-map", "[out]", "-c:a", "libmp3lame", "-q:a", "4", str(output_path)]
+        if subprocess.run(cmd, capture_output=True).returncode == 0:
+            return str(output_path)
+        logger.warning("ffmpeg audio stitch failed, falling back to byte-level concat")
+    
+    formats = [_audio_format(p) for p in parts]
+    if len(set(formats)) > 1:
+        keep = max(set(formats), key=formats.count)
+        dropped = sum(1 for f in formats if f != keep)
+        logger.warning(f"⚠️ Can't merge WAV and MP3 narration without ffmpeg; dropping {dropped} chunk(s)")
+        parts = [p for p, f in zip(parts, formats) if f == keep]
+        formats = [keep] * len(parts)
+    
+    if formats[0] == 'wav':
+        import wave
+        output_path = output_path.with_suffix('.wav')
+        with wave.open(str(output_path), 'wb') as out:
+            for i, part in enumerate(parts):
+                with wave.open(part, 'rb') as src:
+                    if i == 0:
+                        out.setparams(src.getparams())
+                    out.writeframes(src.readframes(src.getnframes()))
+        return str(output_path)
+    
+    # MP3 frames can be concatenated directly
+    output_path = output_path.with_suffix('.mp3')
+    with open(output_path, 'wb') as out:
+        for part in parts:
+            with open(part, 'rb') as src:
+                while True:
+                    block = src.read(1024 * 1024)
+                    if not block:
+                        break
+                    out.write(block)
+    return str(output_path)
+
+
 class AIContentGenerator:
     """Generate text content using AI models."""
     
     def __init__(self):
         self.replicate_token = get_api_key('REPLICATE_API_TOKEN')
         self.anthropic_key = os.getenv('ANTHROPIC_API_KEY')
-        self._last_api_call = 0
-        self._rate_limit_delay = 12  # seconds between API calls (safe for 6/min limit)
-        
-    def _wait_for_rate_limit(self):
-        """Wait if needed to respect rate limits."""
-        elapsed = time.time() - self._last_api_call
-        if elapsed < self._rate_limit_delay:
-            wait_time = self._rate_limit_delay - elapsed
-            logger.info(f"⏳ Rate limit: waiting {wait_time:.1f}s before next API call...")
-            time.sleep(wait_time)
-        self._last_api_call = time.time()
+        # Shared across all generators so concurrent work respects one quota
+        self.limiter = get_adaptive_rate_limiter()
+    
+    def _run_model(self, model: str, model_input: Dict) -> Any:
+        """Run a Replicate model under the shared adaptive rate limiter."""
+        return self.limiter.call(replicate.run, model, input=model_input)
+    
+    def map_concurrent(self, fn: Callable, items: List, max_workers: int = None) -> List:
+        """
+        Run fn over items concurrently (bounded by the limiter), preserving order.
+        
+        Args:
+            fn: Function applied to each item
+            items: Work items
+            max_workers: Worker cap (defaults to the limiter's in-flight limit)
+            
+        Returns:
+            List of results in the same order as items
+        """
+        if not items:
+            return []
+        workers = min(len(items), max_workers or self.limiter.max_in_flight)
+        if workers <= 1:
+            return [fn(item) for item in items]
+        with _make_executor(workers) as executor:
+            return list(executor.map(fn, items))
         
     def generate_text(self, prompt: str, max_tokens: int = 4000, system_prompt: str = None) -> str:
         """
@@ -57,9 +220,6 @@ class AIContentGenerator:
         Uses Llama for longer content generation.
         """
         try:
-            # Wait for rate limit
-            self._wait_for_rate_limit()
-            
             # Use Llama 3 70B for text generation
             full_prompt = prompt
             if system_prompt:
@@ -68,9 +228,9 @@ class AIContentGenerator:
             logger.info(f"Generating text (max_tokens={max_tokens})...")
             logger.info(f"Prompt preview: {prompt[:200]}...")
             
-            output = replicate.run(
+            output = self._run_model(
                 "meta/meta-llama-3-70b-instruct",
-                input={
+                {
                     "prompt": full_prompt,
                     "max_tokens": max_tokens,
                     "temperature": 0.7,
@@ -98,9 +258,6 @@ class AIContentGenerator:
     def generate_image(self, prompt: str, style: str = "", size: str = "1024x1024") -> Optional[str]:
         """Generate an image using Flux."""
         try:
-            # Wait for rate limit
-            self._wait_for_rate_limit()
-            
             full_prompt = f"{prompt}, {style}" if style else prompt
             
             # Parse size
@@ -109,9 +266,9 @@ class AIContentGenerator:
                 parts = size.lower().split('x')
                 width, height = int(parts[0]), int(parts[1])
             
-            output = replicate.run(
+            output = self._run_model(
                 "black-forest-labs/flux-1.1-pro",
-                input={
+                {
                     "prompt": full_prompt + ", high quality, detailed, professional",
                     "width": width,
                     "height": height,
@@ -134,24 +291,28 @@ class AIContentGenerator:
         """
         Generate audio narration from text.
         Uses gTTS for basic TTS, or Replicate for higher quality.
+        
+        Text longer than one XTTS request is split into sentence-sized chunks
+        that are synthesized in parallel and stitched back in order.
         """
+        if len(text) > NARRATION_CHUNK_CHARS:
+            return self.narrate_long_text(text, output_path)
+        return self._synthesize_chunk(text, output_path)
+    
+    def _synthesize_chunk(self, text: str, output_path: str) -> Optional[str]:
+        """Synthesize one short piece of text (XTTS, falling back to gTTS)."""
         try:
             # Try Replicate's TTS first for better quality
             try:
-                output = replicate.run(
+                output = self._run_model(
                     "lucataco/xtts-v2",
-                    input={
-                        "text": text[:500],  # Limit for API
+                    {
+                        "text": text,
                         "language": "en"
                     }
                 )
-                if output:
-                    # Download audio
-                    response = requests.get(str(output))
-                    if response.status_code == 200:
-                        with open(output_path, 'wb') as f:
-                            f.write(response.content)
-                        return output_path
+                if output and _download_file(str(output), Path(output_path)):
+                    return output_path
             except:
                 pass
             
@@ -165,6 +326,52 @@ class AIContentGenerator:
             logger.error(f"Audio generation error: {e}")
         
         return None
+    
+    def narrate_long_text(self, text: str, output_path: str) -> Optional[str]:
+        """
+        Narrate text of any length: chunk at sentence boundaries, synthesize
+        chunks concurrently, then stitch them in order into output_path.
+        
+        Returns:
+            Path of the stitched audio (suffix may change to .wav when no
+            ffmpeg is available and the chunks are WAV), or None
+        """
+        chunks = split_for_narration(text)
+        if not chunks:
+            return None
+        
+        output_path = Path(output_path)
+        parts_dir = output_path.parent / f".{output_path.stem}_parts"
+        parts_dir.mkdir(parents=True, exist_ok=True)
+        
+        def synth(indexed):
+            i, chunk = indexed
+            return self._synthesize_chunk(chunk, str(parts_dir / f"part_{i:04d}.audio"))
+        
+        parts = self.map_concurrent(synth, list(enumerate(chunks)))
+        missing = sum(1 for p in parts if not p)
+        if missing:
+            logger.warning(f"⚠️ {missing}/{len(parts)} narration chunks failed for {output_path.name}")
+        
+        # Some chunks fell back to gTTS (MP3) while others are XTTS (WAV). Without
+        # ffmpeg they can't be merged, so redo the WAV chunks with gTTS as well.
+        formats = {_audio_format(p) for p in parts if p}
+        if len(formats) > 1 and GTTS_AVAILABLE and not _ffmpeg_binary():
+            for i, part in enumerate(parts):
+                if part and _audio_format(part) == 'wav':
+                    try:
+                        gTTS(text=chunks[i], lang='en', slow=False).save(part)
+                    except Exception as e:
+                        logger.warning(f"gTTS re-synthesis failed for chunk {i}: {e}")
+        
+        stitched = _stitch_audio([p for p in parts if p], output_path)
+        for part in parts_dir.glob("part_*"):
+            part.unlink()
+        try:
+            parts_dir.rmdir()
+        except OSError:
+            pass
+        return stitched
 
 
 class EBookGenerator:
@@ -190,6 +397,11 @@ class EBookGenerator:
         """
         Generate a complete e-book.
         
+        Chapters stream through the pipeline: each one is narrated as soon as
+        its text is written and appended to the PDF once the chapters before
+        it are in. Outline, chapters, cover and narration are checkpointed in
+        the book directory, so rerunning the same book resumes it.
+        
         Args:
             topic: Main topic/subject of the book
             title: Book title (auto-generated if not provided)
@@ -236,8 +448,17 @@ class EBookGenerator:
         book_dir = self.output_dir / safe_title
         book_dir.mkdir(parents=True, exist_ok=True)
         
+        # Chapters, narration and images are checkpointed per item so an
+        # interrupted book resumes where it stopped
+        from app.services.performance_utils import CheckpointManager
+        checkpoints = CheckpointManager(book_dir)
+        
         # Generate book outline
-        outline_prompt = f"""Create a detailed chapter outline for a {genre} book titled "{title}" about {topic}.
+        outline_hash = CheckpointManager.inputs_hash([title, topic, genre, target_audience, num_chapters])
+        if checkpoints.is_stage_current("outline", outline_hash):
+            outline = checkpoints.get_stage("outline").get("outline", "")
+        else:
+            outline_prompt = f"""Create a detailed chapter outline for a {genre} book titled "{title}" about {topic}.
         
 Target audience: {target_audience}
 Number of chapters: {num_chapters}
@@ -256,18 +477,33 @@ Description: [Brief description]
 
 Continue for all {num_chapters} chapters."""
 
-        outline = self.ai.generate_text(outline_prompt, max_tokens=2000)
+            outline = self.ai.generate_text(outline_prompt, max_tokens=2000)
+            if not _generation_failed(outline):
+                checkpoints.complete_stage("outline", outline_hash, {"outline": outline})
         
         # Parse outline to extract chapter info
         chapters_info = self._parse_outline(outline, num_chapters)
         
         update_progress(f"📖 Generating {num_chapters} chapters...")
         
-        # Generate each chapter
-        full_text = f"# {title}\n\n"
-        chapters_content = []
+        chapters_dir = book_dir / "chapters"
+        chapters_dir.mkdir(exist_ok=True)
+        audio_dir = book_dir / "audio"
+        if include_audio:
+            audio_dir.mkdir(exist_ok=True)
         
-        for i, chapter_info in enumerate(chapters_info):
+        def write_chapter(indexed):
+            i, chapter_info = indexed
+            key = f"chapter_{i+1}"
+            chapter_hash = CheckpointManager.inputs_hash(
+                [title, chapter_info, genre, target_audience, words_per_chapter, include_images]
+            )
+            cached = checkpoints.get_item("chapters", key, chapter_hash)
+            if cached:
+                update_progress(f"♻️ Chapter {i+1} restored from checkpoint")
+                with open(cached['text_path'], 'r') as f:
+                    return dict(cached, content=f.read())
+            
             update_progress(f"✍️ Writing Chapter {i+1}: {chapter_info['title']}...")
             
             chapter_prompt = f"""Write Chapter {i+1} of the book "{title}".
@@ -288,15 +524,11 @@ Write engaging, well-structured content. Include:
 
 Write the full chapter content now:"""
 
-            chapter_content = self.ai.generate_text(chapter_prompt, max_tokens=3000)
-            
-            chapters_content.append({
+            chapter = {
                 'number': i + 1,
                 'title': chapter_info['title'],
-                'content': chapter_content
-            })
-            
-            full_text += f"\n\n## Chapter {i+1}: {chapter_info['title']}\n\n{chapter_content}"
+                'content': self.ai.generate_text(chapter_prompt, max_tokens=3000)
+            }
             
             # Generate chapter image if enabled
             if include_images:
@@ -307,50 +539,124 @@ Write the full chapter content now:"""
                 Professional book illustration, detailed, evocative"""
                 
                 image_url = self.ai.generate_image(image_prompt)
-                if image_url:
-                    # Download image
-                    img_path = book_dir / f"chapter_{i+1}_illustration.png"
-                    response = requests.get(image_url)
-                    if response.status_code == 200:
-                        with open(img_path, 'wb') as f:
-                            f.write(response.content)
-                        result['images'].append(str(img_path))
-                        chapters_content[-1]['image'] = str(img_path)
-        
-        result['chapters'] = chapters_content
-        
-        # Generate cover
-        update_progress("🎨 Generating book cover...")
-        cover_prompt = f"""Professional book cover design for "{title}", 
-        a {genre} book about {topic}. 
-        Eye-catching, marketable book cover, professional typography space for title,
-        bestseller quality design"""
-        
-        cover_url = self.ai.generate_image(cover_prompt, size="768x1024")
-        if cover_url:
+                img_path = book_dir / f"chapter_{i+1}_illustration.png"
+                if image_url and _download_file(image_url, img_path):
+                    chapter['image'] = str(img_path)
+            
+            # Checkpoint the chapter (text on disk, metadata in the manifest)
+            text_path = chapters_dir / f"chapter_{i+1}.md"
+            with open(text_path, 'w') as f:
+                f.write(chapter['content'])
+            meta = {k: v for k, v in chapter.items() if k != 'content'}
+            meta['text_path'] = str(text_path)
+            artifacts = [text_path] + ([chapter['image']] if chapter.get('image') else [])
+            if not _generation_failed(chapter['content']) and (chapter.get('image') or not include_images):
+                checkpoints.record_item("chapters", key, chapter_hash, meta, artifacts)
+            return dict(meta, content=chapter['content'])
+        
+        def narrate(chapter):
+            key = f"chapter_{chapter['number']}"
+            narration_hash = CheckpointManager.inputs_hash([chapter['title'], chapter['content']])
+            cached = checkpoints.get_item("narration", key, narration_hash)
+            if cached:
+                return cached['audio_path']
+            update_progress(f"🎙️ Recording Chapter {chapter['number']}...")
+            audio_path = self._narrate_chapter(chapter, audio_dir)
+            if audio_path:
+                checkpoints.record_item("narration", key, narration_hash, {'audio_path': audio_path}, [audio_path])
+            return audio_path
+        
+        def make_cover(_):
             cover_path = book_dir / "cover.png"
-            response = requests.get(cover_url)
-            if response.status_code == 200:
-                with open(cover_path, 'wb') as f:
-                    f.write(response.content)
-                result['cover_path'] = str(cover_path)
-        
-        # Generate PDF
-        update_progress("📄 Creating PDF...")
-        pdf_path = self._create_pdf(book_dir, title, chapters_content, result.get('cover_path'))
-        result['pdf_path'] = pdf_path
-        
-        # Save as text/markdown too
-        md_path = book_dir / f"{safe_title}.md"
-        with open(md_path, 'w') as f:
-            f.write(full_text)
-        result['markdown_path'] = str(md_path)
+            cover_hash = CheckpointManager.inputs_hash([title, topic, genre])
+            if checkpoints.get_item("cover", "cover", cover_hash) is not None:
+                return str(cover_path)
+            
+            update_progress("🎨 Generating book cover...")
+            cover_prompt = f"""Professional book cover design for "{title}", 
+            a {genre} book about {topic}. 
+            Eye-catching, marketable book cover, professional typography space for title,
+            bestseller quality design"""
+            
+            cover_url = self.ai.generate_image(cover_prompt, size="768x1024")
+            if cover_url and _download_file(cover_url, cover_path):
+                checkpoints.record_item("cover", "cover", cover_hash, {}, [cover_path])
+                return str(cover_path)
+            return None
         
-        # Generate audiobook if enabled
-        if include_audio:
-            update_progress("🎙️ Generating audiobook...")
-            audio_path = self._create_audiobook(book_dir, title, chapters_content, progress_callback)
-            result['audio_path'] = audio_path
+        # Streaming pipeline: chapters (and the cover) are written concurrently
+        # under the shared rate limiter; each finished chapter is handed to
+        # narration immediately and appended to the PDF as soon as every
+        # earlier chapter is in.
+        from concurrent.futures import as_completed
+        toc = [{'number': i + 1, 'title': info['title']} for i, info in enumerate(chapters_info)]
+        chapters_content: List[Optional[Dict]] = [None] * len(chapters_info)
+        narration_futures = {}
+        pdf = None
+        pdf_path = self._pdf_path(book_dir, title)
+        styles = self._pdf_styles() if REPORTLAB_AVAILABLE else None
+        next_for_pdf = 0
+        
+        with _make_executor(1) as cover_executor, \
+                _make_executor(self.ai.limiter.max_in_flight) as chapter_executor, \
+                _make_executor(2) as narration_executor:
+            cover_future = cover_executor.submit(make_cover, None)
+            chapter_futures = {
+                chapter_executor.submit(write_chapter, (i, info)): i
+                for i, info in enumerate(chapters_info)
+            }
+            
+            for future in as_completed(chapter_futures):
+                i = chapter_futures[future]
+                chapter = future.result()
+                chapters_content[i] = chapter
+                
+                if include_audio:
+                    narration_futures[i] = narration_executor.submit(narrate, chapter)
+                
+                if not styles:
+                    continue
+                try:
+                    if pdf is None:
+                        update_progress("📄 Creating PDF...")
+                        result['cover_path'] = cover_future.result()
+                        pdf = _StreamingBookPDF(pdf_path)
+                        pdf.append(self._front_matter_flowables(title, toc, result['cover_path'], styles))
+                    while next_for_pdf < len(chapters_content) and chapters_content[next_for_pdf]:
+                        pdf.append(self._chapter_flowables(chapters_content[next_for_pdf], styles))
+                        next_for_pdf += 1
+                except Exception as e:
+                    logger.error(f"PDF creation error: {e}")
+                    styles = None
+            
+            result['cover_path'] = cover_future.result()
+            
+            if pdf is not None and styles:
+                try:
+                    pdf.close()
+                    result['pdf_path'] = str(pdf_path)
+                except Exception as e:
+                    logger.error(f"PDF creation error: {e}")
+            elif REPORTLAB_AVAILABLE:
+                # Incremental layout failed part-way; build in one pass instead
+                result['pdf_path'] = self._create_pdf(book_dir, title, chapters_content, result['cover_path'])
+            
+            # Save as text/markdown too
+            md_path = book_dir / f"{safe_title}.md"
+            with open(md_path, 'w') as f:
+                f.write(f"# {title}\n\n")
+                for chapter in chapters_content:
+                    f.write(f"\n\n## Chapter {chapter['number']}: {chapter['title']}\n\n{chapter['content']}")
+                    if chapter.get('image'):
+                        result['images'].append(chapter['image'])
+            result['markdown_path'] = str(md_path)
+            result['chapters'] = chapters_content
+            
+            # Generate audiobook if enabled
+            if include_audio:
+                update_progress("🎙️ Finishing audiobook...")
+                audio_files = [narration_futures[i].result() for i in sorted(narration_futures)]
+                result['audio_path'] = str(audio_dir) if any(audio_files) else None
         
         update_progress("✅ E-book generation complete!")
         
@@ -404,15 +710,11 @@ Write the full chapter content now:"""
         
         return chapters[:num_chapters]
     
-    def _create_pdf(self, book_dir: Path, title: str, chapters: List[Dict], cover_path: str = None) -> str:
-        """Create a PDF from the book content."""
-        if not REPORTLAB_AVAILABLE:
-            logger.warning("ReportLab not available, skipping PDF generation")
-            return None
-        
-        pdf_path = book_dir / f"{title.replace(' ', '_')[:30]}.pdf"
-        
-        doc = SimpleDocTemplate(
+    def _pdf_path(self, book_dir: Path, title: str) -> Path:
+        return book_dir / f"{title.replace(' ', '_')[:30]}.pdf"
+    
+    def _pdf_doc(self, pdf_path: Path):
+        return SimpleDocTemplate(
             str(pdf_path),
             pagesize=letter,
             rightMargin=72,
@@ -420,35 +722,37 @@ Write the full chapter content now:"""
             topMargin=72,
             bottomMargin=72
         )
-        
+    
+    def _pdf_styles(self) -> Dict[str, Any]:
         styles = getSampleStyleSheet()
-        
-        # Custom styles
-        title_style = ParagraphStyle(
-            'BookTitle',
-            parent=styles['Title'],
-            fontSize=28,
-            spaceAfter=30,
-            alignment=TA_CENTER
-        )
-        
-        chapter_style = ParagraphStyle(
-            'ChapterTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            spaceBefore=20,
-            spaceAfter=12
-        )
-        
-        body_style = ParagraphStyle(
-            'BookBody',
-            parent=styles['Normal'],
-            fontSize=11,
-            leading=14,
-            alignment=TA_JUSTIFY,
-            spaceAfter=12
-        )
-        
+        return {
+            'base': styles,
+            'title': ParagraphStyle(
+                'BookTitle',
+                parent=styles['Title'],
+                fontSize=28,
+                spaceAfter=30,
+                alignment=TA_CENTER
+            ),
+            'chapter': ParagraphStyle(
+                'ChapterTitle',
+                parent=styles['Heading1'],
+                fontSize=18,
+                spaceBefore=20,
+                spaceAfter=12
+            ),
+            'body': ParagraphStyle(
+                'BookBody',
+                parent=styles['Normal'],
+                fontSize=11,
+                leading=14,
+                alignment=TA_JUSTIFY,
+                spaceAfter=12
+            )
+        }
+    
+    def _front_matter_flowables(self, title: str, chapters: List[Dict], cover_path: str, styles: Dict) -> List:
+        """Cover, title page and table of contents."""
         story = []
         
         # Cover page
@@ -462,52 +766,66 @@ Write the full chapter content now:"""
         
         # Title page
         story.append(Spacer(1, 2*inch))
-        story.append(Paragraph(title, title_style))
+        story.append(Paragraph(title, styles['title']))
         story.append(Spacer(1, 0.5*inch))
-        story.append(Paragraph("Generated by AI", styles['Normal']))
+        story.append(Paragraph("Generated by AI", styles['base']['Normal']))
         story.append(PageBreak())
         
         # Table of contents
-        story.append(Paragraph("Table of Contents", chapter_style))
+        story.append(Paragraph("Table of Contents", styles['chapter']))
         story.append(Spacer(1, 0.3*inch))
         
         for chapter in chapters:
             toc_entry = f"Chapter {chapter['number']}: {chapter['title']}"
-            story.append(Paragraph(toc_entry, styles['Normal']))
+            story.append(Paragraph(toc_entry, styles['base']['Normal']))
         
         story.append(PageBreak())
+        return story
+    
+    def _chapter_flowables(self, chapter: Dict, styles: Dict) -> List:
+        """Flowables for one chapter, ending with a page break."""
+        story = []
+        story.append(Paragraph(f"Chapter {chapter['number']}", styles['base']['Heading2']))
+        story.append(Paragraph(chapter['title'], styles['chapter']))
+        story.append(Spacer(1, 0.2*inch))
         
-        # Chapters
-        for chapter in chapters:
-            story.append(Paragraph(f"Chapter {chapter['number']}", styles['Heading2']))
-            story.append(Paragraph(chapter['title'], chapter_style))
-            story.append(Spacer(1, 0.2*inch))
-            
-            # Chapter image if available
-            if chapter.get('image') and Path(chapter['image']).exists():
+        # Chapter image if available
+        if chapter.get('image') and Path(chapter['image']).exists():
+            try:
+                img = Image(chapter['image'], width=4*inch, height=3*inch)
+                story.append(img)
+                story.append(Spacer(1, 0.2*inch))
+            except:
+                pass
+        
+        # Chapter content - split into paragraphs
+        for para in chapter['content'].split('\n\n'):
+            para = para.strip()
+            if para:
+                # Clean up the text for PDF
+                para = para.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
                 try:
-                    img = Image(chapter['image'], width=4*inch, height=3*inch)
-                    story.append(img)
-                    story.append(Spacer(1, 0.2*inch))
+                    story.append(Paragraph(para, styles['body']))
                 except:
-                    pass
-            
-            # Chapter content - split into paragraphs
-            content = chapter['content']
-            paragraphs = content.split('\n\n')
-            
-            for para in paragraphs:
-                para = para.strip()
-                if para:
-                    # Clean up the text for PDF
-                    para = para.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
-                    try:
-                        story.append(Paragraph(para, body_style))
-                    except:
-                        # If paragraph fails, try simpler text
-                        story.append(Paragraph(para[:500], body_style))
-            
-            story.append(PageBreak())
+                    # If paragraph fails, try simpler text
+                    story.append(Paragraph(para[:500], styles['body']))
+        
+        story.append(PageBreak())
+        return story
+    
+    def _create_pdf(self, book_dir: Path, title: str, chapters: List[Dict], cover_path: str = None) -> str:
+        """Create a PDF from the book content."""
+        if not REPORTLAB_AVAILABLE:
+            logger.warning("ReportLab not available, skipping PDF generation")
+            return None
+        
+        pdf_path = self._pdf_path(book_dir, title)
+        doc = self._pdf_doc(pdf_path)
+        styles = self._pdf_styles()
+        
+        story = self._front_matter_flowables(title, chapters, cover_path, styles)
+        for chapter in chapters:
+            story.extend(self._chapter_flowables(chapter, styles))
         
         # Build PDF
         try:
@@ -517,6 +835,12 @@ Write the full chapter content now:"""
             logger.error(f"PDF creation error: {e}")
             return None
     
+    def _narrate_chapter(self, chapter: Dict, audio_dir: Path) -> Optional[str]:
+        """Narrate a full chapter (chunked and stitched)."""
+        audio_path = audio_dir / f"chapter_{chapter['number']}.mp3"
+        narration_text = f"Chapter {chapter['number']}. {chapter['title']}. {chapter['content']}"
+        return self.ai.generate_audio_narration(narration_text, str(audio_path))
+    
     def _create_audiobook(self, book_dir: Path, title: str, chapters: List[Dict], progress_callback=None) -> str:
         """Create an audiobook from the chapters."""
         audio_dir = book_dir / "audio"
@@ -528,24 +852,76 @@ Write the full chapter content now:"""
             if progress_callback:
                 progress_callback(f"🎙️ Recording Chapter {chapter['number']}...")
             
-            audio_path = audio_dir / f"chapter_{chapter['number']}.mp3"
-            
-            # Prepare text for narration
-            narration_text = f"Chapter {chapter['number']}. {chapter['title']}. {chapter['content']}"
-            
-            # Generate audio (in chunks if needed)
-            result = self.ai.generate_audio_narration(
-                narration_text[:5000],  # Limit text length
-                str(audio_path)
-            )
-            
+            result = self._narrate_chapter(chapter, audio_dir)
             if result:
-                audio_files.append(str(audio_path))
+                audio_files.append(result)
         
         # Return path to audio directory
         return str(audio_dir) if audio_files else None
 
 
+class _StreamingBookPDF:
+    """
+    Lays chapters out onto a ReportLab canvas as they become available.
+    
+    Uses the public Canvas/Frame API: flowables are drawn into a page frame
+    and each full page is finished with showPage(), so a chapter's flowables
+    can be freed as soon as it is laid out and only encoded pages are kept
+    until save().
+    """
+    
+    def __init__(self, pdf_path: Path, pagesize=letter, margin: float = 72):
+        self.canvas = canvas.Canvas(str(pdf_path), pagesize=pagesize)
+        self.pagesize = pagesize
+        self.margin = margin
+        self._frame = None
+        self._page_used = False
+    
+    def _current_frame(self):
+        if self._frame is None:
+            width, height = self.pagesize
+            self._frame = Frame(self.margin, self.margin, width - 2 * self.margin, height - 2 * self.margin, id='normal')
+            self._page_used = False
+        return self._frame
+    
+    def _end_page(self):
+        self.canvas.showPage()
+        self._frame = None
+    
+    def append(self, flowables: List):
+        pending = list(flowables)
+        while pending:
+            head = pending[0]
+            if isinstance(head, PageBreak):
+                pending.pop(0)
+                if self._page_used:
+                    self._end_page()
+                continue
+            frame = self._current_frame()
+            if frame.add(head, self.canvas):
+                pending.pop(0)
+                self._page_used = True
+                continue
+            # Split what doesn't fit (long paragraphs) across pages
+            parts = frame.split(head, self.canvas)
+            if parts and parts[0] is not head:
+                pending[0:1] = parts
+                if frame.add(parts[0], self.canvas):
+                    pending.pop(0)
+                    self._page_used = True
+                    continue
+            if self._page_used:
+                self._end_page()
+            else:
+                logger.warning(f"Skipping {type(head).__name__} too large for a page")
+                pending.pop(0)
+    
+    def close(self):
+        if self._frame is not None and self._page_used:
+            self.canvas.showPage()
+        self.canvas.save()
+
+
 class ColoringBookGenerator:
     """Generate complete printable coloring books."""
     
@@ -644,7 +1020,7 @@ class ColoringBookGenerator:
             ideas.append(f"{theme} {style} design variation {len(ideas)+1}")
         
         # Generate each coloring page
-        for i in range(num_pages):
+        def make_page(i):
             update_progress(f"✏️ Creating page {i+1}/{num_pages}...")
             
             page_desc = ideas[i] if i < len(ideas) else f"{theme} design {i+1}"
@@ -656,20 +1032,12 @@ class ColoringBookGenerator:
             professional coloring book illustration"""
             
             image_url = self.ai.generate_image(image_prompt, size="1024x1024")
-            
-            if image_url:
-                page_path = book_dir / f"page_{i+1:02d}.png"
-                response = requests.get(image_url)
-                if response.status_code == 200:
-                    with open(page_path, 'wb') as f:
-                        f.write(response.content)
-                    result['pages'].append(str(page_path))
-            
-            # Small delay to avoid rate limiting
-            time.sleep(0.5)
+            page_path = book_dir / f"page_{i+1:02d}.png"
+            if image_url and _download_file(image_url, page_path):
+                return str(page_path)
+            return None
         
-        # Generate cover
-        if include_cover:
+        def make_cover(_):
             update_progress("🎨 Creating cover...")
             
             cover_prompt = f"""Coloring book cover design for "{title}",
@@ -678,13 +1046,18 @@ class ColoringBookGenerator:
             professional book cover, title space at top"""
             
             cover_url = self.ai.generate_image(cover_prompt, size="768x1024")
-            if cover_url:
-                cover_path = book_dir / "cover.png"
-                response = requests.get(cover_url)
-                if response.status_code == 200:
-                    with open(cover_path, 'wb') as f:
-                        f.write(response.content)
-                    result['cover_path'] = str(cover_path)
+            cover_path = book_dir / "cover.png"
+            if cover_url and _download_file(cover_url, cover_path):
+                return str(cover_path)
+            return None
+        
+        # Pages are independent - fan out under the shared rate limiter
+        with _make_executor(1) as cover_executor:
+            cover_future = cover_executor.submit(make_cover, None) if include_cover else None
+            pages = self.ai.map_concurrent(make_page, list(range(num_pages)))
+            if cover_future:
+                result['cover_path'] = cover_future.result()
+        result['pages'] = [p for p in pages if p]
         
         # Create PDF
         update_progress("📄 Compiling PDF...")
@@ -848,24 +1221,18 @@ Continue for all {num_modules} modules."""
         
         # Generate each module
         total_lessons = num_modules * lessons_per_module
-        current_lesson = 0
-        
-        for m_idx, module_info in enumerate(modules_info):
-            update_progress(f"📚 Creating Module {m_idx+1}: {module_info['title']}...")
+        lesson_jobs = [
+            (m_idx, l_idx, module_info, lesson_title)
+            for m_idx, module_info in enumerate(modules_info)
+            for l_idx, lesson_title in enumerate(module_info.get('lessons', []))
+        ]
+        
+        def build_lesson(numbered):
+            lesson_no, (m_idx, l_idx, module_info, lesson_title) = numbered
+            update_progress(f"✍️ Writing Lesson {lesson_no}/{total_lessons}: {lesson_title}...")
             
-            module_data = {
-                'number': m_idx + 1,
-                'title': module_info['title'],
-                'description': module_info.get('description', ''),
-                'lessons': []
-            }
-            
-            for l_idx, lesson_title in enumerate(module_info.get('lessons', [])):
-                current_lesson += 1
-                update_progress(f"✍️ Writing Lesson {current_lesson}/{total_lessons}: {lesson_title}...")
-                
-                # Generate lesson content
-                lesson_prompt = f"""Write a detailed lesson for an online course.
+            # Generate lesson content
+            lesson_prompt = f"""Write a detailed lesson for an online course.
 
 Course: {title}
 Module {m_idx+1}: {module_info['title']}
@@ -881,55 +1248,70 @@ Include:
 
 Write comprehensive, educational content that's engaging and easy to follow."""
 
-                lesson_content = self.ai.generate_text(lesson_prompt, max_tokens=2500)
-                
-                lesson_data = {
-                    'number': l_idx + 1,
-                    'title': lesson_title,
-                    'content': lesson_content
-                }
-                
-                # Generate slide deck for lesson
-                if include_slides:
-                    update_progress(f"📊 Creating slides for Lesson {current_lesson}...")
-                    slides_content = self._generate_slides(
-                        module_info['title'],
-                        lesson_title,
-                        lesson_content,
-                        slides_dir,
-                        m_idx + 1,
-                        l_idx + 1
-                    )
-                    lesson_data['slides'] = slides_content
-                
-                # Generate audio narration
-                if include_audio:
-                    update_progress(f"🎙️ Recording audio for Lesson {current_lesson}...")
-                    audio_path = audio_dir / f"module{m_idx+1}_lesson{l_idx+1}.mp3"
-                    narration = f"Module {m_idx+1}, Lesson {l_idx+1}: {lesson_title}. {lesson_content[:3000]}"
-                    self.ai.generate_audio_narration(narration, str(audio_path))
-                    lesson_data['audio'] = str(audio_path)
-                
-                module_data['lessons'].append(lesson_data)
+            lesson_content = self.ai.generate_text(lesson_prompt, max_tokens=2500)
+            
+            lesson_data = {
+                'number': l_idx + 1,
+                'title': lesson_title,
+                'content': lesson_content
+            }
+            
+            # Generate slide deck for lesson
+            if include_slides:
+                update_progress(f"📊 Creating slides for Lesson {lesson_no}...")
+                slides_content = self._generate_slides(
+                    module_info['title'],
+                    lesson_title,
+                    lesson_content,
+                    slides_dir,
+                    m_idx + 1,
+                    l_idx + 1
+                )
+                lesson_data['slides'] = slides_content
+            
+            # Generate audio narration
+            if include_audio:
+                update_progress(f"🎙️ Recording audio for Lesson {lesson_no}...")
+                audio_path = audio_dir / f"module{m_idx+1}_lesson{l_idx+1}.mp3"
+                narration = f"Module {m_idx+1}, Lesson {l_idx+1}: {lesson_title}. {lesson_content[:3000]}"
+                self.ai.generate_audio_narration(narration, str(audio_path))
+                lesson_data['audio'] = str(audio_path)
+            
+            return lesson_data
+        
+        # Lessons only depend on the curriculum - fan out under the shared rate limiter
+        lessons = self.ai.map_concurrent(build_lesson, list(enumerate(lesson_jobs, 1)))
+        
+        modules = []
+        for m_idx, module_info in enumerate(modules_info):
+            modules.append({
+                'number': m_idx + 1,
+                'title': module_info['title'],
+                'description': module_info.get('description', ''),
+                'lessons': [lesson for job, lesson in zip(lesson_jobs, lessons) if job[0] == m_idx]
+            })
+        
+        def finish_module(indexed):
+            m_idx, module_data = indexed
+            module_info = modules_info[m_idx]
             
             # Generate module quiz
             if include_quizzes:
                 update_progress(f"❓ Creating quiz for Module {m_idx+1}...")
-                quiz = self._generate_quiz(module_info, module_data['lessons'])
-                module_data['quiz'] = quiz
+                module_data['quiz'] = self._generate_quiz(module_info, module_data['lessons'])
             
             # Generate module worksheet
             if include_worksheets:
                 update_progress(f"📝 Creating worksheet for Module {m_idx+1}...")
-                worksheet = self._generate_worksheet(
+                module_data['worksheet'] = self._generate_worksheet(
                     module_info,
                     module_data['lessons'],
                     worksheets_dir,
                     m_idx + 1
                 )
-                module_data['worksheet'] = worksheet
-            
-            result['modules'].append(module_data)
+            return module_data
+        
+        result['modules'] = self.ai.map_concurrent(finish_module, list(enumerate(modules)))
         
         # Generate course PDF
         update_progress("📄 Compiling course PDF...")
@@ -1290,7 +1672,8 @@ Continue for all {num_pages} pages. Make it engaging with good pacing."""
         pages_info = self._parse_comic_script(script, num_pages)
         
         # Generate comic pages
-        for i, page_info in enumerate(pages_info):
+        def draw_page(indexed):
+            i, page_info = indexed
             update_progress(f"🎨 Drawing page {i+1}/{num_pages}...")
             
             page_prompt = f"""Comic book page, {style} style, {genre} genre,
@@ -1299,19 +1682,12 @@ Continue for all {num_pages} pages. Make it engaging with good pacing."""
             bold inks, dramatic lighting, sequential art"""
             
             image_url = self.ai.generate_image(page_prompt, size="768x1024")
-            
-            if image_url:
-                page_path = comic_dir / f"page_{i+1:02d}.png"
-                response = requests.get(image_url)
-                if response.status_code == 200:
-                    with open(page_path, 'wb') as f:
-                        f.write(response.content)
-                    result['pages'].append(str(page_path))
-            
-            time.sleep(0.5)
+            page_path = comic_dir / f"page_{i+1:02d}.png"
+            if image_url and _download_file(image_url, page_path):
+                return str(page_path)
+            return None
         
-        # Generate cover
-        if include_cover:
+        def make_cover(_):
             update_progress("🎨 Creating cover...")
             
             cover_prompt = f"""Comic book cover for "{title}",
@@ -1321,13 +1697,18 @@ Continue for all {num_pages} pages. Make it engaging with good pacing."""
             professional comic book cover art, eye-catching"""
             
             cover_url = self.ai.generate_image(cover_prompt, size="768x1024")
-            if cover_url:
-                cover_path = comic_dir / "cover.png"
-                response = requests.get(cover_url)
-                if response.status_code == 200:
-                    with open(cover_path, 'wb') as f:
-                        f.write(response.content)
-                    result['cover_path'] = str(cover_path)
+            cover_path = comic_dir / "cover.png"
+            if cover_url and _download_file(cover_url, cover_path):
+                return str(cover_path)
+            return None
+        
+        # Pages are independent - fan out under the shared rate limiter
+        with _make_executor(1) as cover_executor:
+            cover_future = cover_executor.submit(make_cover, None) if include_cover else None
+            pages = self.ai.map_concurrent(draw_page, list(enumerate(pages_info)))
+            if cover_future:
+                result['cover_path'] = cover_future.result()
+        result['pages'] = [p for p in pages if p]
         
         # Create PDF
         update_progress("📄 Compiling PDF...")
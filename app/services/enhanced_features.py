@@ -13,6 +13,7 @@ New functionality to improve workflow, productivity, and intelligence:
 
 import streamlit as st
 import json
+import hashlib
 from pathlib import Path
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
@@ -35,52 +36,110 @@ class GlobalSearchManager:
     }
     
     @staticmethod
-    def search(query: str, content_types: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+    def search(query: str, content_types: Optional[List[str]] = None, limit: int = 50) -> List[Dict[str, Any]]:
         """
         Global search across all content types
         
+        Backed by the persistent FTS5 index (BM25 ranking, prefix matching),
+        so it also finds content from past sessions.
+        
         Args:
             query: Search query string
             content_types: Optional filter by content type
+            limit: Max results
             
         Returns:
             List of matching items with metadata
         """
-        query_lower = query.lower()
-        results = []
-        
-        # Determine which types to search
-        types_to_search = content_types or list(GlobalSearchManager.SEARCHABLE_TYPES.keys())
+        index = GlobalSearchManager._index()
+        if index is None:
+            return []
+        GlobalSearchManager.sync_session(index)
         
-        for content_type in types_to_search:
-            if content_type not in GlobalSearchManager.SEARCHABLE_TYPES:
-                continue
-            
-            session_key = GlobalSearchManager.SEARCHABLE_TYPES[content_type]
-            items = st.session_state.get(session_key, [])
-            
-            if not items:
+        hits = index.search(query, types=content_types, limit=limit)
+        top_score = hits[0]['score'] if hits and hits[0]['score'] > 0 else 1.0
+        return [
+            {
+                'type': hit['type'],
+                'item': hit['item'],
+                'index': hashlib.md5(hit['key'].encode()).hexdigest()[:10],
+                'title': hit['title'][:50] if hit['title'] else f"Untitled {hit['type'].rstrip('s')}",
+                'preview': hit['preview'],
+                'date': hit['date'],
+                'relevance_score': max(1.0, 100.0 * hit['score'] / top_score),
+            }
+            for hit in hits
+        ]
+    
+    @staticmethod
+    def facets(query: str) -> Dict[str, int]:
+        """Match counts per content type for a query"""
+        index = GlobalSearchManager._index()
+        return index.facets(query) if index else {}
+    
+    @staticmethod
+    def _index():
+        try:
+            from app.services.search_index import get_search_index
+            from app.services.shortcuts_manager import SHORTCUTS_FILE
+            index = get_search_index()
+            index.backfill_async(shortcuts_file=SHORTCUTS_FILE)
+            return index
+        except Exception as e:
+            logger.warning(f"Search index unavailable: {e}")
+            return None
+    
+    @staticmethod
+    def index_item(content_type: str, item: Dict[str, Any]):
+        """Add or update one item in the search index (call when content is created)"""
+        index = GlobalSearchManager._index()
+        if index is None:
+            return
+        index.upsert(content_type, *GlobalSearchManager._item_doc(content_type, item))
+    
+    @staticmethod
+    def sync_session(index) -> int:
+        """Index session items appended since the last sync (only the new tail of each list)"""
+        try:
+            synced = st.session_state.setdefault('_search_synced_counts', {})
+        except Exception:
+            return 0
+        docs = []
+        for content_type, session_key in GlobalSearchManager.SEARCHABLE_TYPES.items():
+            items = st.session_state.get(session_key) or []
+            if not isinstance(items, list):
                 continue
-            
-            # Search through items
-            for idx, item in enumerate(items):
-                item_text = GlobalSearchManager._extract_searchable_text(item)
-                
-                if query_lower in item_text.lower():
-                    results.append({
-                        'type': content_type,
-                        'item': item,
-                        'index': idx,
-                        'title': GlobalSearchManager._get_item_title(item, content_type),
-                        'preview': GlobalSearchManager._get_preview(item, content_type),
-                        'date': GlobalSearchManager._get_date(item),
-                        'relevance_score': GlobalSearchManager._calculate_relevance(item_text, query)
-                    })
-        
-        # Sort by relevance and date
-        results.sort(key=lambda x: (-x['relevance_score'], x.get('date', '')), reverse=True)
-        
-        return results
+            start = synced.get(content_type, 0)
+            if len(items) < start:
+                start = 0  # List was replaced
+            for item in items[start:]:
+                docs.append((content_type, *GlobalSearchManager._item_doc(content_type, item)))
+            synced[content_type] = len(items)
+        if docs:
+            index.upsert_many(docs)
+        return len(docs)
+    
+    @staticmethod
+    def _item_doc(content_type: str, item: Any) -> tuple:
+        """(key, title, body, preview, date, item) for a session item"""
+        if not isinstance(item, dict):
+            item = {'text': str(item)}
+        text = GlobalSearchManager._extract_searchable_text(item)
+        key = next(
+            (str(item[k]) for k in ('id', 'campaign_dir', 'path', 'zip_path', 'file_path') if item.get(k)),
+            hashlib.md5(text.encode()).hexdigest()
+        )
+        title = GlobalSearchManager._get_item_title(item, content_type)
+        if content_type == 'campaigns' and item.get('concept'):
+            title = str(item['concept'])[:50]
+        return (
+            key,
+            title,
+            text,
+            GlobalSearchManager._get_preview(item, content_type),
+            GlobalSearchManager._get_date(item),
+            item,
+        )
     
     @staticmethod
     def _extract_searchable_text(item: Dict[str, Any]) -> str:
@@ -102,13 +161,13 @@ class GlobalSearchManager:
     def _get_preview(item: Dict[str, Any], content_type: str) -> str:
         """Get preview text for item"""
         if content_type == 'campaigns':
-            return item.get('description', '')[:100]
+            return str(item.get('description') or item.get('concept', ''))[:100]
         elif content_type == 'products':
-            return item.get('prompt', '')[:100]
+            return str(item.get('prompt', ''))[:100]
         elif content_type == 'content':
-            return item.get('content', '')[:100]
+            return str(item.get('content', ''))[:100]
         elif content_type == 'conversations':
-            return item.get('summary', '')[:100]
+            return str(item.get('summary', ''))[:100]
         else:
             return str(item)[:100]
     
@@ -119,26 +178,6 @@ class GlobalSearchManager:
             if date_key in item:
                 return str(item[date_key])
         return ""
-    
-    @staticmethod
-    def _calculate_relevance(text: str, query: str) -> float:
-        """Calculate relevance score for search result"""
-        text_lower = text.lower()
-        query_lower = query.lower()
-        
-        score = 0.0
-        
-        # Exact match = high relevance
-        if query_lower == text_lower:
-            score = 10.0
-        # Word boundary match = medium relevance
-        elif f" {query_lower} " in f" {text_lower} ":
-            score = 5.0
-        # Substring match = low relevance
-        else:
-            score = 1.0
-        
-        return score
 
 
 class SmartSuggestionEngine:
@@ -532,7 +571,92 @@ class BatchProcessingQueue:
 
 
 class ContentCalendarManager:
-    """Visual calendar for scheduled content"""
+    """
+    Visual calendar for scheduled content
+    
+    Calendar items are persisted in the scheduler service, so month and
+    upcoming views are indexed range queries and items come due on time
+    even when no page is open.
+    """
+    
+    KIND = 'calendar'
+    
+    @staticmethod
+    def _scheduler():
+        from app.services.scheduler_service import get_scheduler
+        scheduler = get_scheduler()
+        if not scheduler.has_handler(ContentCalendarManager.KIND):
+            # Coming due is the event; the calendar tab moves due items into its run queue
+            scheduler.register_handler(ContentCalendarManager.KIND, lambda entry: None)
+        return scheduler
+    
+    @staticmethod
+    def _item_datetime(item: Dict[str, Any]) -> Optional[datetime]:
+        """Resolve an item's run time from 'date' + 'time' or an ISO 'scheduled_date'"""
+        if item.get('scheduled_date'):
+            return datetime.fromisoformat(str(item['scheduled_date']))
+        if item.get('date'):
+            day = item['date']
+            if isinstance(day, str):
+                day = datetime.fromisoformat(day).date()
+            hour, minute = (int(p) for p in str(item.get('time') or '09:00').split(':')[:2])
+            return datetime(day.year, day.month, day.day, hour, minute)
+        return None
+    
+    @staticmethod
+    def schedule_item(item: Dict[str, Any]) -> Optional[int]:
+        """Persist (or move) a calendar item; stores its schedule ref on the item"""
+        run_at = ContentCalendarManager._item_datetime(item)
+        if run_at is None:
+            return None
+        import uuid
+        ref = item.setdefault('schedule_ref', f"calendar:{uuid.uuid4().hex[:12]}")
+        return ContentCalendarManager._scheduler().schedule(
+            ContentCalendarManager.KIND, run_at,
+            title=item.get('title', 'Scheduled Post'),
+            payload=item,
+            ref=ref,
+        )
+    
+    @staticmethod
+    def unschedule_item(item: Dict[str, Any]) -> bool:
+        ref = item.get('schedule_ref')
+        return ContentCalendarManager._scheduler().cancel(ref=ref) if ref else False
+    
+    @staticmethod
+    def _entry_to_item(entry: Dict[str, Any]) -> Dict[str, Any]:
+        item = dict(entry['payload'])
+        item['date'] = entry['run_at'].date()
+        item['time'] = entry['run_at'].strftime('%H:%M')
+        item['schedule_ref'] = entry['ref']
+        if entry['status'] in ('completed', 'delivered'):
+            item['status'] = 'due'
+        return item
+    
+    @staticmethod
+    def load_scheduled_items(days_back: int = 31, days_ahead: int = 366) -> List[Dict[str, Any]]:
+        """Rebuild the session's calendar items from the scheduler (e.g. after a restart)"""
+        now = datetime.now()
+        entries = ContentCalendarManager._scheduler().range(
+            now - timedelta(days=days_back), now + timedelta(days=days_ahead),
+            kinds=[ContentCalendarManager.KIND],
+            statuses=['pending', 'running', 'completed', 'delivered'],
+        )
+        return [ContentCalendarManager._entry_to_item(e) for e in entries]
+    
+    @staticmethod
+    def take_due_items(consumer: str = 'calendar') -> List[Dict[str, Any]]:
+        """
+        Calendar items that came due since the last call (each is returned once per consumer)
+        
+        Pass a stable consumer name (per workspace, not per session), otherwise
+        every new session is handed the last month's items again.
+        """
+        entries = ContentCalendarManager._scheduler().take_fired(
+            consumer, kinds=[ContentCalendarManager.KIND],
+            since=datetime.now() - timedelta(days=31),
+        )
+        return [ContentCalendarManager._entry_to_item(e) for e in entries]
     
     @staticmethod
     def get_calendar_data(year: int, month: int) -> Dict[int, List[Dict[str, Any]]]:
@@ -546,55 +670,35 @@ class ContentCalendarManager:
         Returns:
             Dict mapping day numbers to list of scheduled items
         """
-        scheduled_items = st.session_state.get('scheduled_items', [])
         calendar_data = {}
-        
-        for item in scheduled_items:
-            try:
-                item_date = datetime.fromisoformat(item.get('scheduled_date', ''))
-                
-                if item_date.year == year and item_date.month == month:
-                    day = item_date.day
-                    
-                    if day not in calendar_data:
-                        calendar_data[day] = []
-                    
-                    calendar_data[day].append({
-                        'title': item.get('title', 'Scheduled Post'),
-                        'type': item.get('type', 'post'),
-                        'platforms': item.get('platforms', []),
-                        'time': item_date.strftime('%H:%M')
-                    })
-            except:
-                continue
+        entries = ContentCalendarManager._scheduler().month(
+            year, month, kinds=[ContentCalendarManager.KIND],
+            statuses=['pending', 'running', 'completed', 'delivered'],
+        )
+        for entry in entries:
+            item = entry['payload']
+            calendar_data.setdefault(entry['run_at'].day, []).append({
+                'title': item.get('title', 'Scheduled Post'),
+                'type': item.get('type', 'post'),
+                'platforms': item.get('platforms', []),
+                'time': entry['run_at'].strftime('%H:%M')
+            })
         
         return calendar_data
     
     @staticmethod
     def get_upcoming_posts(days: int = 7) -> List[Dict[str, Any]]:
         """Get next N days of scheduled posts"""
-        scheduled_items = st.session_state.get('scheduled_items', [])
-        today = datetime.now()
-        upcoming = []
-        
-        for item in scheduled_items:
-            try:
-                item_date = datetime.fromisoformat(item.get('scheduled_date', ''))
-                
-                if today <= item_date <= today + timedelta(days=days):
-                    upcoming.append({
-                        'date': item_date,
-                        'title': item.get('title', 'Scheduled Post'),
-                        'platforms': item.get('platforms', []),
-                        'content': item.get('content', '')[:100]
-                    })
-            except:
-                continue
-        
-        # Sort by date
-        upcoming.sort(key=lambda x: x['date'])
-        
-        return upcoming
+        entries = ContentCalendarManager._scheduler().upcoming(days, kinds=[ContentCalendarManager.KIND])
+        return [
+            {
+                'date': entry['run_at'],
+                'title': entry['payload'].get('title', 'Scheduled Post'),
+                'platforms': entry['payload'].get('platforms', []),
+                'content': str(entry['payload'].get('content', ''))[:100]
+            }
+            for entry in entries
+        ]
 
 
 class QuickActionsBar:
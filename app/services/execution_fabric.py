@@ -0,0 +1,606 @@
+"""
+EXECUTION FABRIC
+================
+One process-wide place where background work runs.
+
+BackgroundTaskManager, GlobalJobQueue, CrossPageStateManager and the FastAPI
+JobWorkerPool all submit here instead of starting their own threads:
+1. Every job declares what it needs from a shared budget: CPU slots, memory
+   (MB) and API tokens (e.g. "replicate"); named profiles cover the usual kinds
+2. Jobs are admitted by priority while their needs fit what is left; smaller
+   jobs may backfill around a big one, but not once it has waited too long.
+   Adapters can add private pools (per-type concurrency caps); a job blocked
+   only by its own adapter's pool is skipped over, never waited on
+3. Every job's execution state (status, progress, resources, owning pid) is
+   recorded in one SQLite store with write-behind persistence, so running and
+   recent work from every adapter and process can be listed from one table
+4. Adapters keep their own APIs and their own domain records: task logs,
+   artifacts and retry kwargs (.background_tasks_state.json), FastAPI job
+   results (JobStore) and cross-page task logs and page state. The fabric
+   store indexes execution; it does not replace those, and merging them is
+   out of scope here
+
+Capacities come from the environment:
+    FABRIC_CPU_SLOTS        default: os.cpu_count()
+    FABRIC_MEMORY_MB        default: 70% of physical memory
+    FABRIC_API_LIMITS       default: "replicate=6" (comma-separated name=count)
+    FABRIC_MAX_THREADS      default: 32
+"""
+
+import os
+import json
+import time
+import uuid
+import atexit
+import bisect
+import asyncio
+import logging
+import sqlite3
+import threading
+import itertools
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+FABRIC_DB_FILE = Path.home() / ".pod_wizard" / "execution_fabric.db"
+
+# Resource needs per kind of work. "cpu" is in slots, "memory_mb" in MB and
+# any other key is an API token pool.
+RESOURCE_PROFILES: Dict[str, Dict[str, float]] = {
+    "default": {"cpu": 1, "memory_mb": 512},
+    "light": {"cpu": 0.25, "memory_mb": 128},
+    "campaign": {"cpu": 2, "memory_mb": 2000, "replicate": 2},
+    "image_generation": {"cpu": 0.5, "memory_mb": 1000, "replicate": 1},
+    "video_generation": {"cpu": 2, "memory_mb": 4000, "replicate": 1},
+    "text_generation": {"cpu": 0.25, "memory_mb": 256, "replicate": 1},
+    "product_creation": {"cpu": 1, "memory_mb": 1500, "replicate": 1},
+    "campaign_generation": {"cpu": 2, "memory_mb": 2000, "replicate": 2},
+    "blog_generation": {"cpu": 0.25, "memory_mb": 256, "replicate": 1},
+    "email_generation": {"cpu": 0.25, "memory_mb": 256, "replicate": 1},
+    "workflow_execution": {"cpu": 1, "memory_mb": 1000, "replicate": 1},
+    "batch_operation": {"cpu": 0.5, "memory_mb": 256},
+}
+
+FINISHED_STATUSES = ("completed", "failed", "cancelled", "interrupted")
+
+
+def _default_capacity() -> Dict[str, float]:
+    capacity: Dict[str, float] = {"cpu": float(os.getenv("FABRIC_CPU_SLOTS", os.cpu_count() or 4))}
+
+    memory_mb = os.getenv("FABRIC_MEMORY_MB")
+    if memory_mb is None:
+        try:
+            total = os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+            memory_mb = int(total * 0.7 / 1_000_000)
+        except (ValueError, OSError, AttributeError):
+            memory_mb = 8000
+    capacity["memory_mb"] = float(memory_mb)
+
+    for item in os.getenv("FABRIC_API_LIMITS", "replicate=6").split(","):
+        name, _, count = item.partition("=")
+        if name.strip() and count.strip():
+            try:
+                capacity[name.strip()] = float(count)
+            except ValueError:
+                logger.warning(f"Ignoring bad FABRIC_API_LIMITS entry: {item}")
+    return capacity
+
+
+@dataclass
+class FabricJob:
+    """A unit of work admitted and tracked by the fabric."""
+    job_id: str
+    name: str
+    source: str
+    fn: Callable = field(repr=False)
+    args: tuple = field(default_factory=tuple, repr=False)
+    kwargs: dict = field(default_factory=dict, repr=False)
+    resources: Dict[str, float] = field(default_factory=dict)
+    priority: int = 5  # 1-10, higher runs first
+    status: str = "queued"
+    progress: float = 0.0
+    message: str = ""
+    error: Optional[str] = None
+    metadata: Dict[str, Any] = field(default_factory=dict)
+    created_at: float = field(default_factory=time.time)
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    future: Future = field(default_factory=Future, repr=False)
+    cancel_event: threading.Event = field(default_factory=threading.Event, repr=False)
+    on_update: Optional[Callable[["FabricJob"], None]] = field(default=None, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in FINISHED_STATUSES
+
+    def to_record(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "name": self.name,
+            "source": self.source,
+            "status": self.status,
+            "priority": self.priority,
+            "progress": self.progress,
+            "message": self.message,
+            "error": self.error,
+            "resources": self.resources,
+            "metadata": self.metadata,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class FabricStore:
+    """
+    SQLite (WAL) record of every fabric job, written behind.
+
+    Status changes serialize the job and queue its row; a writer thread
+    upserts the latest row of each changed job in one transaction per flush
+    interval. Rows from a failed write are re-queued.
+    """
+
+    def __init__(self, db_path: Path = FABRIC_DB_FILE, flush_interval: float = 0.25):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()      # guards the pending rows
+        self._db_lock = threading.Lock()   # serializes use of the connection
+        self._dirty: Dict[str, tuple] = {}
+        self._wake = threading.Event()
+        self._stopping = False
+
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS fabric_jobs (
+                job_id TEXT PRIMARY KEY,
+                source TEXT NOT NULL,
+                name TEXT NOT NULL,
+                status TEXT NOT NULL,
+                pid INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                finished_at REAL,
+                data TEXT NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_fabric_status ON fabric_jobs(status, created_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_fabric_source ON fabric_jobs(source, created_at)")
+        self._conn.commit()
+
+        self._writer = threading.Thread(target=self._write_loop, name="fabric-store-writer", daemon=True)
+        self._writer.start()
+
+    def recover(self, keep_days: int = 7) -> int:
+        """Mark jobs left unfinished by dead processes as interrupted and prune old rows."""
+        with self._db_lock, self._conn:
+            pids = [row[0] for row in self._conn.execute(
+                "SELECT DISTINCT pid FROM fabric_jobs WHERE status IN ('queued', 'running')"
+            )]
+            # Rows carrying our own pid were left by an earlier process (pid reuse)
+            dead = [pid for pid in pids if pid == os.getpid() or not _pid_alive(pid)]
+            interrupted = 0
+            for pid in dead:
+                interrupted += self._conn.execute(
+                    "UPDATE fabric_jobs SET status = 'interrupted', finished_at = ? "
+                    "WHERE pid = ? AND status IN ('queued', 'running')",
+                    (time.time(), pid)
+                ).rowcount
+            self._conn.execute(
+                "DELETE FROM fabric_jobs WHERE finished_at IS NOT NULL AND finished_at < ?",
+                (time.time() - keep_days * 86400,)
+            )
+        if interrupted:
+            logger.info(f"🔁 Marked {interrupted} fabric jobs from stopped processes as interrupted")
+        return interrupted
+
+    def save(self, job: FabricJob):
+        """Queue a snapshot of the job for persistence (non-blocking)."""
+        # Serialized here, on the thread that changed the job, so the writer
+        # never reads a job while it is being updated
+        record = job.to_record()
+        row = (job.job_id, job.source, job.name, record["status"], os.getpid(),
+               record["created_at"], record["finished_at"], json.dumps(record, default=str))
+        with self._lock:
+            self._dirty[job.job_id] = row
+        self._wake.set()
+
+    def flush(self):
+        """Write pending rows now (called by the writer, history() and on shutdown)."""
+        with self._db_lock:
+            with self._lock:
+                dirty, self._dirty = self._dirty, {}
+            if not dirty:
+                return
+            try:
+                with self._conn:
+                    self._conn.executemany(
+                        "INSERT OR REPLACE INTO fabric_jobs "
+                        "(job_id, source, name, status, pid, created_at, finished_at, data) "
+                        "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        list(dirty.values())
+                    )
+            except Exception as e:
+                logger.error(f"Failed to save fabric jobs, will retry: {e}")
+                # Re-queue unless a newer save superseded the row meanwhile
+                with self._lock:
+                    for job_id, row in dirty.items():
+                        self._dirty.setdefault(job_id, row)
+                self._wake.set()
+
+    def history(self, limit: int = 100, source: Optional[str] = None,
+                status: Optional[str] = None) -> List[Dict[str, Any]]:
+        """Most recent job records from every process sharing the store."""
+        self.flush()
+        query, params = "SELECT data, status, pid FROM fabric_jobs", []
+        clauses = []
+        if source:
+            clauses.append("source = ?")
+            params.append(source)
+        if status:
+            clauses.append("status = ?")
+            params.append(status)
+        if clauses:
+            query += " WHERE " + " AND ".join(clauses)
+        query += " ORDER BY created_at DESC LIMIT ?"
+        params.append(limit)
+        with self._db_lock:
+            rows = self._conn.execute(query, params).fetchall()
+        records = []
+        for data, status, pid in rows:
+            record = json.loads(data)
+            record.update(status=status, pid=pid)
+            records.append(record)
+        return records
+
+    def _write_loop(self):
+        while not self._stopping:
+            self._wake.wait()
+            self._wake.clear()
+            time.sleep(self.flush_interval)  # Coalesce bursts of progress updates
+            self.flush()
+
+    def close(self):
+        self._stopping = True
+        self._wake.set()
+        self._writer.join(timeout=5)
+        self.flush()
+        self._conn.close()
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+
+
+class ExecutionFabric:
+    """
+    Budgeted executor shared by every background job system in the process.
+
+    Usage:
+        fabric = get_fabric()
+        job = fabric.submit(render_video, args=(path,), name="Render promo",
+                            source="my_tab", profile="video_generation")
+        job.future.result()
+
+        # Inside a running job:
+        fabric.update(fabric.current_job().job_id, progress=0.5, message="Encoding")
+    """
+
+    def __init__(
+        self,
+        capacity: Optional[Dict[str, float]] = None,
+        store: Optional[FabricStore] = None,
+        max_threads: Optional[int] = None,
+        starvation_seconds: float = 30.0,
+        keep_finished: int = 500
+    ):
+        self.capacity = capacity or _default_capacity()
+        self.starvation_seconds = starvation_seconds
+        self.keep_finished = keep_finished
+        self.store = store or FabricStore()
+        self.store.recover()
+        self._lock = threading.Lock()
+        self._in_use: Dict[str, float] = {}
+        self._private: set = set()
+        self._jobs: Dict[str, FabricJob] = {}
+        self._queue: List[tuple] = []  # (-priority, seq, job_id)
+        self._seq = itertools.count()
+        self._local = threading.local()
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_threads or int(os.getenv("FABRIC_MAX_THREADS", "32")),
+            thread_name_prefix="fabric"
+        )
+        logger.info(f"✅ Execution fabric ready: {self.capacity}")
+
+    # ----- budget -----
+
+    def set_capacity(self, resource: str, amount: float, shared: bool = False):
+        """
+        Add or resize a resource pool.
+
+        Args:
+            resource: Pool name
+            amount: Capacity
+            shared: False for an adapter's own pool (e.g. a per-type concurrency
+                cap); jobs waiting on a private pool don't hold back other jobs
+        """
+        with self._lock:
+            self.capacity[resource] = float(amount)
+            if shared:
+                self._private.discard(resource)
+            else:
+                self._private.add(resource)
+            self._dispatch()
+
+    def _needs(self, profile: Optional[str], resources: Optional[Dict[str, float]]) -> Dict[str, float]:
+        needs = dict(RESOURCE_PROFILES.get(profile or "default", RESOURCE_PROFILES["default"]))
+        needs.update(resources or {})
+        # A job bigger than a pool may still run, alone
+        return {name: min(float(amount), self.capacity.get(name, float(amount)))
+                for name, amount in needs.items() if amount}
+
+    def _blocked_on(self, needs: Dict[str, float]) -> List[str]:
+        return [
+            name for name, amount in needs.items()
+            if name in self.capacity and self._in_use.get(name, 0.0) + amount > self.capacity[name] + 1e-9
+        ]
+
+    def _fits(self, needs: Dict[str, float]) -> bool:
+        return not self._blocked_on(needs)
+
+    def _take(self, needs: Dict[str, float], sign: int):
+        for name, amount in needs.items():
+            if name in self.capacity:
+                self._in_use[name] = max(0.0, self._in_use.get(name, 0.0) + sign * amount)
+
+    # ----- submission -----
+
+    def submit(
+        self,
+        fn: Callable,
+        args: tuple = (),
+        kwargs: Optional[dict] = None,
+        *,
+        name: str,
+        source: str,
+        profile: Optional[str] = None,
+        resources: Optional[Dict[str, float]] = None,
+        priority: int = 5,
+        metadata: Optional[Dict[str, Any]] = None,
+        on_update: Optional[Callable[[FabricJob], None]] = None,
+        cancel_event: Optional[threading.Event] = None
+    ) -> FabricJob:
+        """
+        Queue work against the shared budget.
+
+        Args:
+            fn: Callable (or coroutine function) to run
+            args: Positional arguments
+            kwargs: Keyword arguments
+            name: Human-readable job name
+            source: Submitting system, e.g. "background_tasks"
+            profile: Key of RESOURCE_PROFILES
+            resources: Overrides/additions to the profile's needs
+            priority: 1-10, higher runs first
+            metadata: JSON-safe extra fields stored with the job
+            on_update: Called with the job on every status/progress change
+            cancel_event: Use this event as the job's cancel_event, e.g. a stop
+                flag the adapter already hands to fn, so cancel() and
+                shutdown() reach running work
+
+        Returns:
+            The FabricJob; its future resolves with fn's result
+        """
+        job = FabricJob(
+            job_id=uuid.uuid4().hex[:12],
+            name=name,
+            source=source,
+            fn=fn,
+            args=args,
+            kwargs=kwargs or {},
+            resources=self._needs(profile, resources),
+            priority=priority,
+            metadata=metadata or {},
+            on_update=on_update,
+            cancel_event=cancel_event or threading.Event()
+        )
+        with self._lock:
+            self._jobs[job.job_id] = job
+            bisect.insort(self._queue, (-priority, next(self._seq), job.job_id))
+            self.store.save(job)
+            self._dispatch()
+        logger.debug(f"📥 Fabric job {job.job_id} queued ({source}: {name})")
+        return job
+
+    def _dispatch(self):
+        """Start every queued job that fits (lock held)."""
+        now = time.time()
+        started = []
+        for entry in list(self._queue):
+            job = self._jobs.get(entry[2])
+            if job is None or job.status != "queued":
+                self._queue.remove(entry)
+                continue
+            blocked = self._blocked_on(job.resources)
+            if not blocked:
+                self._queue.remove(entry)
+                self._take(job.resources, +1)
+                job.status = "running"
+                job.started_at = now
+                started.append(job)
+            elif any(name in self._private for name in blocked):
+                # Waiting on its adapter's own cap; reserving shared budget
+                # for it would stall everything else for nothing
+                continue
+            elif now - job.created_at > self.starvation_seconds:
+                # Stop backfilling so the shared budget drains for this job
+                break
+        for job in started:
+            self.store.save(job)
+            self._pool.submit(self._run, job)
+
+    def _run(self, job: FabricJob):
+        self._local.job = job
+        self._notify(job)
+        result, exception = None, None
+        try:
+            if asyncio.iscoroutinefunction(job.fn):
+                result = asyncio.run(job.fn(*job.args, **job.kwargs))
+            else:
+                result = job.fn(*job.args, **job.kwargs)
+        except BaseException as e:
+            exception = e
+        finally:
+            self._local.job = None
+
+        with self._lock:
+            if job.cancel_event.is_set():
+                job.status = "cancelled"
+            else:
+                job.status = "failed" if exception is not None else "completed"
+            if exception is not None:
+                job.error = f"{type(exception).__name__}: {exception}"
+            if job.status == "completed":
+                job.progress = 1.0
+            job.finished_at = time.time()
+            self._take(job.resources, -1)
+            self.store.save(job)
+            self._dispatch()
+            self._prune()
+        # Resolve after the status is final so waiters never see a stale one
+        if exception is not None:
+            job.future.set_exception(exception)
+        else:
+            job.future.set_result(result)
+        self._notify(job)
+
+    def _prune(self):
+        """Keep only the most recent finished jobs in memory (lock held)."""
+        finished = [j for j in self._jobs.values() if j.done]
+        if len(finished) > self.keep_finished:
+            finished.sort(key=lambda j: j.finished_at or 0)
+            for job in finished[:len(finished) - self.keep_finished]:
+                del self._jobs[job.job_id]
+
+    def _notify(self, job: FabricJob):
+        if job.on_update:
+            try:
+                job.on_update(job)
+            except Exception as e:
+                logger.debug(f"Fabric job listener failed for {job.job_id}: {e}")
+
+    # ----- control -----
+
+    def current_job(self) -> Optional[FabricJob]:
+        """The fabric job running on this thread, if any."""
+        return getattr(self._local, "job", None)
+
+    def update(self, job_id: str, progress: Optional[float] = None, message: Optional[str] = None):
+        """Record progress (0-1) for a job; persisted write-behind."""
+        job = self._jobs.get(job_id)
+        if job is None:
+            return
+        if progress is not None:
+            job.progress = progress
+        if message is not None:
+            job.message = message
+        self.store.save(job)
+
+    def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a job. Queued jobs never start; running jobs get their
+        cancel_event set and are expected to stop cooperatively.
+
+        Returns:
+            True if the job was still queued and is now cancelled
+        """
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.done:
+                return False
+            job.cancel_event.set()
+            if job.status != "queued":
+                return False
+            job.status = "cancelled"
+            job.finished_at = time.time()
+            job.future.cancel()
+            self.store.save(job)
+            self._dispatch()
+        self._notify(job)
+        return True
+
+    # ----- inspection -----
+
+    def get(self, job_id: str) -> Optional[FabricJob]:
+        return self._jobs.get(job_id)
+
+    def jobs(self, source: Optional[str] = None, active_only: bool = False) -> List[FabricJob]:
+        with self._lock:
+            jobs = list(self._jobs.values())
+        if source:
+            jobs = [j for j in jobs if j.source == source]
+        if active_only:
+            jobs = [j for j in jobs if not j.done]
+        return sorted(jobs, key=lambda j: j.created_at, reverse=True)
+
+    def history(self, limit: int = 100, source: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self.store.history(limit=limit, source=source)
+
+    def forget(self, job_ids: List[str]):
+        """Drop finished jobs from memory (their records stay in the store)."""
+        with self._lock:
+            for job_id in job_ids:
+                job = self._jobs.get(job_id)
+                if job is not None and job.done:
+                    del self._jobs[job_id]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            jobs = list(self._jobs.values())
+            in_use = dict(self._in_use)
+            capacity = dict(self.capacity)
+        by_source: Dict[str, Dict[str, int]] = {}
+        for job in jobs:
+            if not job.done:
+                counts = by_source.setdefault(job.source, {"queued": 0, "running": 0})
+                counts[job.status] = counts.get(job.status, 0) + 1
+        return {
+            "capacity": capacity,
+            "in_use": {name: round(in_use.get(name, 0.0), 3) for name in capacity},
+            "queued": sum(1 for j in jobs if j.status == "queued"),
+            "running": sum(1 for j in jobs if j.status == "running"),
+            "by_source": by_source,
+        }
+
+    def shutdown(self, wait: bool = False):
+        with self._lock:
+            for job in self._jobs.values():
+                if not job.done:
+                    job.cancel_event.set()
+        self._pool.shutdown(wait=wait)
+        self.store.close()
+
+
+_fabric: Optional[ExecutionFabric] = None
+_fabric_lock = threading.Lock()
+
+
+def get_fabric() -> ExecutionFabric:
+    """Get the process-wide execution fabric."""
+    global _fabric
+    with _fabric_lock:
+        if _fabric is None:
+            _fabric = ExecutionFabric()
+            # The writer thread is a daemon; write the last changes on exit
+            atexit.register(_fabric.store.flush)
+        return _fabric
@@ -14,12 +14,109 @@ from typing import Optional, Dict, List, Any, Tuple
 from datetime import datetime
 import base64
 import json
+import time
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from io import BytesIO
-from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageEnhance
+from functools import lru_cache
+from PIL import Image, ImageDraw, ImageFont, ImageFilter, ImageEnhance, ImageChops
 
 logger = logging.getLogger(__name__)
 
 
+def _replicate_run(model: str, input_params: Dict[str, Any]) -> Any:
+    """Run a model under the shared adaptive Replicate throttle when available."""
+    try:
+        from app.services.platform_integrations import get_adaptive_rate_limiter
+    except ImportError:
+        return replicate.run(model, input=input_params)
+    return get_adaptive_rate_limiter().call(replicate.run, model, input=input_params)
+
+
+# ============ REPLICATE UPLOAD CACHE ============
+# Replicate file URLs expire after 24h; keep a margin so cached URLs are
+# never handed to a prediction right before they lapse.
+REPLICATE_FILE_TTL = 23 * 3600
+UPLOAD_CACHE_FILE = Path.home() / ".pod_wizard" / "replicate_uploads.json"
+
+
+class ReplicateUploadCache:
+    """
+    Content-addressed cache of Replicate file uploads.
+
+    The same image bytes are uploaded once per TTL no matter how many ads,
+    platforms or processes use them; concurrent requests for the same hash
+    wait on a single in-flight upload.
+    """
+
+    def __init__(self, path: Path = UPLOAD_CACHE_FILE, ttl: int = REPLICATE_FILE_TTL):
+        self.path = Path(path)
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._hash_locks: Dict[str, threading.Lock] = {}
+        self._entries: Dict[str, Dict[str, Any]] = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self.path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix('.tmp')
+            with open(tmp_path, 'w') as f:
+                json.dump(self._entries, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.debug(f"Could not persist upload cache: {e}")
+
+    @staticmethod
+    def file_hash(image_path: str) -> str:
+        digest = hashlib.sha256()
+        with open(image_path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()
+
+    def lock_for(self, content_hash: str) -> threading.Lock:
+        with self._lock:
+            return self._hash_locks.setdefault(content_hash, threading.Lock())
+
+    def get(self, content_hash: str) -> Optional[str]:
+        with self._lock:
+            entry = self._entries.get(content_hash)
+            if entry and time.time() - entry['uploaded_at'] < self.ttl:
+                return entry['url']
+            if entry:
+                del self._entries[content_hash]
+        return None
+
+    def put(self, content_hash: str, url: str):
+        with self._lock:
+            now = time.time()
+            self._entries = {h: e for h, e in self._entries.items() if now - e['uploaded_at'] < self.ttl}
+            self._entries[content_hash] = {'url': url, 'uploaded_at': now}
+            self._save()
+
+
+_upload_cache: Optional[ReplicateUploadCache] = None
+_upload_cache_lock = threading.Lock()
+
+
+def get_upload_cache() -> ReplicateUploadCache:
+    """Get the shared Replicate upload cache."""
+    global _upload_cache
+    with _upload_cache_lock:
+        if _upload_cache is None:
+            _upload_cache = ReplicateUploadCache()
+        return _upload_cache
+
+
 # ============ PIL TEXT OVERLAY SYSTEM ============
 # Professional text overlays with modern fonts and effects
 
@@ -48,114 +145,191 @@ HEADLINE_ENHANCERS = {
 }
 
 
+# Modern font preferences - prioritize sleek, professional fonts
+FONT_PATHS = {
+    'bold': [
+        # SF Pro - Apple's modern system font (best choice)
+        '/System/Library/Fonts/SFNS.ttf',
+        '/Library/Fonts/SF-Pro-Display-Bold.otf',
+        '/System/Library/Fonts/SFNSDisplay-Bold.otf',
+        '/System/Library/Fonts/SFCompactDisplay-Bold.otf',
+        # SF Pro Text (more legible at smaller sizes)
+        '/Library/Fonts/SF-Pro-Text-Bold.otf',
+        # Avenir - very clean and modern
+        '/System/Library/Fonts/Avenir.ttc',
+        '/Library/Fonts/Avenir-Black.ttf',
+        '/Library/Fonts/Avenir Next.ttc',
+        # Helvetica Neue - classic and clean
+        '/System/Library/Fonts/HelveticaNeue.ttc',
+        # Futura - modern geometric
+        '/Library/Fonts/Futura.ttc',
+        # Fallbacks
+        '/System/Library/Fonts/Helvetica.ttc',
+        '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
+    ],
+    'medium': [
+        '/Library/Fonts/SF-Pro-Display-Medium.otf',
+        '/Library/Fonts/SF-Pro-Text-Medium.otf',
+        '/System/Library/Fonts/SFNSDisplay-Medium.otf',
+        '/System/Library/Fonts/Avenir.ttc',
+        '/Library/Fonts/Avenir Next.ttc',
+        '/System/Library/Fonts/HelveticaNeue.ttc',
+        '/System/Library/Fonts/Helvetica.ttc',
+        '/System/Library/Fonts/SFNS.ttf',
+    ],
+    'light': [
+        '/Library/Fonts/SF-Pro-Display-Light.otf',
+        '/Library/Fonts/SF-Pro-Text-Light.otf',
+        '/System/Library/Fonts/SFNSDisplay-Light.otf',
+        '/System/Library/Fonts/Avenir.ttc',
+        '/Library/Fonts/Avenir Next.ttc',
+        '/System/Library/Fonts/HelveticaNeue.ttc',
+        '/System/Library/Fonts/SFNS.ttf',
+    ],
+    'thin': [
+        '/Library/Fonts/SF-Pro-Display-Thin.otf',
+        '/Library/Fonts/SF-Pro-Display-Ultralight.otf',
+        '/System/Library/Fonts/SFNSDisplay-Thin.otf',
+        '/System/Library/Fonts/Avenir.ttc',
+        '/System/Library/Fonts/HelveticaNeue.ttc',
+        '/System/Library/Fonts/SFNS.ttf',
+    ]
+}
+
+FONT_STYLE_ALIASES = {
+    'regular': 'medium',
+    'normal': 'medium',
+    'semibold': 'bold',
+    'heavy': 'bold',
+    'black': 'bold',
+}
+
+
+@lru_cache(maxsize=None)
+def _resolve_font_path(weight: str) -> Optional[str]:
+    """First installed, loadable font for a weight (probed once per process)."""
+    for font_path in FONT_PATHS.get(weight, FONT_PATHS['medium']) + ['/System/Library/Fonts/Helvetica.ttc']:
+        try:
+            if os.path.exists(font_path):
+                ImageFont.truetype(font_path, 12)
+                return font_path
+        except Exception:
+            continue
+    return None
+
+
+@lru_cache(maxsize=128)
+def _load_font(font_path: Optional[str], size: int):
+    """LRU of (path, size) -> font object."""
+    if font_path is None:
+        return ImageFont.load_default()
+    return ImageFont.truetype(font_path, size)
+
+
 def get_system_font(style: str = 'bold', size: int = 48):
     """
     Get a modern, sleek system font. Prioritizes SF Pro, Avenir, and other modern fonts.
     Style can be: 'bold', 'medium', 'regular', 'light', 'thin'
-    """
-    # Map style aliases
-    style_map = {
-        'regular': 'medium',
-        'normal': 'medium',
-        'semibold': 'bold',
-        'heavy': 'bold',
-        'black': 'bold',
-    }
-    weight = style_map.get(style, style)
-    
-    # Modern font preferences - prioritize sleek, professional fonts
-    font_paths = {
-        'bold': [
-            # SF Pro - Apple's modern system font (best choice)
-            '/System/Library/Fonts/SFNS.ttf',
-            '/Library/Fonts/SF-Pro-Display-Bold.otf',
-            '/System/Library/Fonts/SFNSDisplay-Bold.otf',
-            '/System/Library/Fonts/SFCompactDisplay-Bold.otf',
-            # SF Pro Text (more legible at smaller sizes)
-            '/Library/Fonts/SF-Pro-Text-Bold.otf',
-            # Avenir - very clean and modern
-            '/System/Library/Fonts/Avenir.ttc',
-            '/Library/Fonts/Avenir-Black.ttf',
-            '/Library/Fonts/Avenir Next.ttc',
-            # Helvetica Neue - classic and clean
-            '/System/Library/Fonts/HelveticaNeue.ttc',
-            # Futura - modern geometric
-            '/Library/Fonts/Futura.ttc',
-            # Fallbacks
-            '/System/Library/Fonts/Helvetica.ttc',
-            '/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf',
-        ],
-        'medium': [
-            '/Library/Fonts/SF-Pro-Display-Medium.otf',
-            '/Library/Fonts/SF-Pro-Text-Medium.otf',
-            '/System/Library/Fonts/SFNSDisplay-Medium.otf',
-            '/System/Library/Fonts/Avenir.ttc',
-            '/Library/Fonts/Avenir Next.ttc',
-            '/System/Library/Fonts/HelveticaNeue.ttc',
-            '/System/Library/Fonts/Helvetica.ttc',
-            '/System/Library/Fonts/SFNS.ttf',
-        ],
-        'light': [
-            '/Library/Fonts/SF-Pro-Display-Light.otf',
-            '/Library/Fonts/SF-Pro-Text-Light.otf',
-            '/System/Library/Fonts/SFNSDisplay-Light.otf',
-            '/System/Library/Fonts/Avenir.ttc',
-            '/Library/Fonts/Avenir Next.ttc',
-            '/System/Library/Fonts/HelveticaNeue.ttc',
-            '/System/Library/Fonts/SFNS.ttf',
-        ],
-        'thin': [
-            '/Library/Fonts/SF-Pro-Display-Thin.otf',
-            '/Library/Fonts/SF-Pro-Display-Ultralight.otf',
-            '/System/Library/Fonts/SFNSDisplay-Thin.otf',
-            '/System/Library/Fonts/Avenir.ttc',
-            '/System/Library/Fonts/HelveticaNeue.ttc',
-            '/System/Library/Fonts/SFNS.ttf',
-        ]
-    }
     
-    paths_to_try = font_paths.get(weight, font_paths['medium'])
-    
-    for font_path in paths_to_try:
-        try:
-            if os.path.exists(font_path):
-                return ImageFont.truetype(font_path, size)
-        except Exception:
-            continue
+    Font paths are resolved once per weight and loaded fonts are kept in an
+    LRU keyed by (path, size), so repeated overlays don't touch the disk.
+    """
+    weight = FONT_STYLE_ALIASES.get(style, style)
+    return _load_font(_resolve_font_path(weight), size)
+
+
+# ============ GLYPH / EFFECT LAYER CACHE ============
+# Effects draw the same string many times (glow = 33 passes). Rasterize each
+# (text, font) once and merge the shifted copies for an effect into a single
+# mask; repeated headlines across variations reuse both.
+
+@lru_cache(maxsize=1024)
+def _text_bbox(text: str, font) -> Tuple[int, int, int, int]:
+    """Cached text bounding box (same as draw.textbbox at the origin)."""
+    return font.getbbox(text)
+
+
+@lru_cache(maxsize=256)
+def _effect_mask(text: str, font, offsets: Tuple[Tuple[int, int], ...]):
+    """
+    Coverage mask of text drawn at every offset, merged as repeated pastes
+    of one colour would be (screen blend).
     
-    # Ultimate fallback
-    try:
-        return ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", size)
-    except:
-        return ImageFont.load_default()
+    Returns:
+        (mask, origin) where origin is where the text anchor (0, 0) falls
+        inside the mask
+    """
+    left, top, right, bottom = _text_bbox(text, font)
+    pad = max([max(abs(dx), abs(dy)) for dx, dy in offsets] + [0])
+    size = (max(1, right - left + 2 * pad), max(1, bottom - top + 2 * pad))
+    origin = (pad - left, pad - top)
+    
+    glyphs = Image.new('L', size, 0)
+    ImageDraw.Draw(glyphs).text(origin, text, font=font, fill=255)
+    if offsets == ((0, 0),):
+        return glyphs, origin
+    
+    mask = Image.new('L', size, 0)
+    for dx, dy in offsets:
+        shifted = ImageChops.offset(glyphs, dx, dy)
+        mask = ImageChops.screen(mask, shifted)
+    return mask, origin
+
+
+def _draw_effect_layer(draw, text: str, position: tuple, font, color: str, offsets: Tuple[Tuple[int, int], ...]):
+    mask, (ox, oy) = _effect_mask(text, font, offsets)
+    draw.bitmap((position[0] - ox, position[1] - oy), mask, fill=color)
+
+
+@lru_cache(maxsize=32)
+def _gradient_overlay(size: Tuple[int, int], top: bool, bottom: bool) -> Image.Image:
+    """Readability gradients for a canvas size (shared by every ad of that size)."""
+    width, height = size
+    overlay = Image.new('RGBA', size, (0, 0, 0, 0))
+    overlay_draw = ImageDraw.Draw(overlay)
+    
+    # Top gradient overlay for headline
+    if top:
+        gradient_height = int(height * 0.35)
+        for i in range(gradient_height):
+            alpha = int(180 * (1 - i / gradient_height))  # Fade from 180 to 0
+            overlay_draw.line([(0, i), (width, i)], fill=(0, 0, 0, alpha))
+    
+    # Bottom gradient overlay for CTA/price
+    if bottom:
+        gradient_height = int(height * 0.30)
+        for i in range(gradient_height):
+            y = height - gradient_height + i
+            alpha = int(180 * (i / gradient_height))  # Fade from 0 to 180
+            overlay_draw.line([(0, y), (width, y)], fill=(0, 0, 0, alpha))
+    
+    return overlay
+
+
+def _glow_offsets(glow_radius: int) -> Tuple[Tuple[int, int], ...]:
+    return tuple(
+        (dx, dy)
+        for offset in range(glow_radius, 0, -1)
+        for dx in (-offset, 0, offset)
+        for dy in (-offset, 0, offset)
+        if dx != 0 or dy != 0
+    )
+
+
+_OUTLINE_OFFSETS = tuple((dx, dy) for dx in range(-2, 3) for dy in range(-2, 3) if dx != 0 or dy != 0)
 
 
 def add_glow_effect(draw, text: str, position: tuple, font, color: str, glow_color: Optional[str] = None, glow_radius: int = 3):
     """
     Draw text with a subtle glow effect for that modern, premium look.
     """
-    x, y = position
-    
     if glow_color is None:
         # Use a lighter version of the text color for glow
         glow_color = color
     
-    # Draw glow layers (multiple passes with decreasing opacity)
-    for offset in range(glow_radius, 0, -1):
-        alpha = int(60 / offset)  # Decreasing opacity
-        glow_alpha = f"{glow_color}{alpha:02x}" if len(glow_color) == 7 else glow_color
-        
-        # Draw in all directions for glow effect
-        for dx in [-offset, 0, offset]:
-            for dy in [-offset, 0, offset]:
-                if dx != 0 or dy != 0:
-                    try:
-                        draw.text((x + dx, y + dy), text, font=font, fill=glow_color)
-                    except:
-                        pass
-    
-    # Draw main text on top
-    draw.text((x, y), text, font=font, fill=color)
+    # Glow layers (every offset in all directions), then main text on top
+    _draw_effect_layer(draw, text, position, font, glow_color, _glow_offsets(glow_radius))
+    _draw_effect_layer(draw, text, position, font, color, ((0, 0),))
 
 
 def add_text_with_effects(
@@ -176,31 +350,26 @@ def add_text_with_effects(
     
     if effect == 'shadow':
         # Soft shadow for depth
-        for i in range(shadow_offset, 0, -1):
-            alpha = int(80 / i)
-            draw.text((x + i, y + i), text, font=font, fill=shadow_color)
-        draw.text((x, y), text, font=font, fill=color)
+        shadow = tuple((i, i) for i in range(shadow_offset, 0, -1))
+        _draw_effect_layer(draw, text, position, font, shadow_color, shadow)
+        _draw_effect_layer(draw, text, position, font, color, ((0, 0),))
         
     elif effect == 'glow':
         add_glow_effect(draw, text, position, font, color, glow_color, glow_radius=4)
         
     elif effect == 'outline':
         # Outline effect
-        outline_color = shadow_color
-        for dx in [-2, -1, 0, 1, 2]:
-            for dy in [-2, -1, 0, 1, 2]:
-                if dx != 0 or dy != 0:
-                    draw.text((x + dx, y + dy), text, font=font, fill=outline_color)
-        draw.text((x, y), text, font=font, fill=color)
+        _draw_effect_layer(draw, text, position, font, shadow_color, _OUTLINE_OFFSETS)
+        _draw_effect_layer(draw, text, position, font, color, ((0, 0),))
         
     elif effect == 'double':
         # Double shadow for dramatic effect
-        draw.text((x + 4, y + 4), text, font=font, fill='#00000066')
-        draw.text((x + 2, y + 2), text, font=font, fill='#000000aa')
-        draw.text((x, y), text, font=font, fill=color)
+        _draw_effect_layer(draw, text, (x + 4, y + 4), font, '#00000066', ((0, 0),))
+        _draw_effect_layer(draw, text, (x + 2, y + 2), font, '#000000aa', ((0, 0),))
+        _draw_effect_layer(draw, text, position, font, color, ((0, 0),))
         
     else:  # clean - no effects
-        draw.text((x, y), text, font=font, fill=color)
+        _draw_effect_layer(draw, text, position, font, color, ((0, 0),))
 
 
 def enhance_headline_with_flair(headline: str, platform: str, style: str) -> str:
@@ -227,7 +396,7 @@ def enhance_headline_with_flair(headline: str, platform: str, style: str) -> str
 
 
 def add_text_overlay_to_image(
-    image_path: str,
+    image_path: Any,
     output_path: str,
     headline: str,
     tagline: str = "",
@@ -249,7 +418,7 @@ def add_text_overlay_to_image(
     - Brand color integration
     
     Args:
-        image_path: Path to the base image
+        image_path: Path to the base image (or an already loaded PIL image)
         output_path: Where to save the result
         headline: Main headline text
         tagline: Secondary tagline
@@ -265,7 +434,10 @@ def add_text_overlay_to_image(
     """
     try:
         # Load the image
-        img = Image.open(image_path).convert('RGBA')
+        if isinstance(image_path, Image.Image):
+            img = image_path.convert('RGBA')
+        else:
+            img = Image.open(image_path).convert('RGBA')
         width, height = img.size
         
         # Create a drawing context
@@ -354,23 +526,7 @@ def add_text_overlay_to_image(
         layout = layouts.get(platform, layouts['instagram_post'])
         
         # Add semi-transparent overlays for text readability
-        overlay = Image.new('RGBA', img.size, (0, 0, 0, 0))
-        overlay_draw = ImageDraw.Draw(overlay)
-        
-        # Top gradient overlay for headline
-        if headline:
-            gradient_height = int(height * 0.35)
-            for i in range(gradient_height):
-                alpha = int(180 * (1 - i / gradient_height))  # Fade from 180 to 0
-                overlay_draw.line([(0, i), (width, i)], fill=(0, 0, 0, alpha))
-        
-        # Bottom gradient overlay for CTA/price
-        if cta or price:
-            gradient_height = int(height * 0.30)
-            for i in range(gradient_height):
-                y = height - gradient_height + i
-                alpha = int(180 * (i / gradient_height))  # Fade from 0 to 180
-                overlay_draw.line([(0, y), (width, y)], fill=(0, 0, 0, alpha))
+        overlay = _gradient_overlay(img.size, bool(headline), bool(cta or price))
         
         # Composite the overlay
         img = Image.alpha_composite(img, overlay)
@@ -395,7 +551,7 @@ def add_text_overlay_to_image(
                 return
             
             # Get text bounding box
-            bbox = draw.textbbox((0, 0), text, font=font)
+            bbox = _text_bbox(text, font)
             text_width = bbox[2] - bbox[0]
             text_height = bbox[3] - bbox[1]
             
@@ -410,7 +566,7 @@ def add_text_overlay_to_image(
                 
                 for word in words:
                     test_line = ' '.join(current_line + [word])
-                    test_bbox = draw.textbbox((0, 0), test_line, font=font)
+                    test_bbox = _text_bbox(test_line, font)
                     test_width = test_bbox[2] - test_bbox[0]
                     
                     if test_width <= max_width:
@@ -431,7 +587,7 @@ def add_text_overlay_to_image(
                 start_y = int(height * y_ratio) - total_height // 2
                 
                 for i, line in enumerate(lines):
-                    line_bbox = draw.textbbox((0, 0), line, font=font)
+                    line_bbox = _text_bbox(line, font)
                     line_width = line_bbox[2] - line_bbox[0]
                     x = (width - line_width) // 2
                     y = start_y + i * int(text_height * 1.2)
@@ -469,7 +625,7 @@ def add_text_overlay_to_image(
             if not text:
                 return
             
-            bbox = draw.textbbox((0, 0), text, font=cta_font)
+            bbox = _text_bbox(text, cta_font)
             text_width = bbox[2] - bbox[0]
             text_height = bbox[3] - bbox[1]
             
@@ -547,13 +703,15 @@ def create_social_ad_with_text(
     price: Optional[float] = None,
     brand_name: Optional[str] = None,
     style: str = "bold",
-    brand_colors: Optional[Dict[str, str]] = None
+    brand_colors: Optional[Dict[str, str]] = None,
+    ad_copy: Optional[Dict[str, str]] = None
 ) -> Optional[str]:
     """
     Create a complete social media ad with text overlay.
     
     This crops/resizes the product image to the platform dimensions,
-    then adds professional text overlays.
+    then adds professional text overlays. Pass ``ad_copy`` to skip the
+    AI copy call (e.g. when copy was generated up front for a batch).
     """
     try:
         # Get platform config
@@ -584,22 +742,19 @@ def create_social_ad_with_text(
         # Resize to target dimensions
         img = img.resize((target_width, target_height), Image.Resampling.LANCZOS)
         
-        # Save the resized image temporarily
-        temp_path = output_path.replace('.png', '_temp.png')
-        img.convert('RGB').save(temp_path, 'PNG')
-        
         # Generate ad copy
-        ad_copy = generate_ad_copy_with_ai(
-            product_description=product_concept,
-            platform=platform,
-            style=style,
-            price=price,
-            brand_name=brand_name
-        )
+        if ad_copy is None:
+            ad_copy = generate_ad_copy_with_ai(
+                product_description=product_concept,
+                platform=platform,
+                style=style,
+                price=price,
+                brand_name=brand_name
+            )
         
-        # Add text overlay
+        # Add text overlay (resized image is handed over in memory)
         result = add_text_overlay_to_image(
-            image_path=temp_path,
+            image_path=img.convert('RGB'),
             output_path=output_path,
             headline=ad_copy.get('headline', 'Shop Now'),
             tagline=ad_copy.get('tagline', ''),
@@ -611,18 +766,101 @@ def create_social_ad_with_text(
             brand_colors=brand_colors
         )
         
-        # Clean up temp file
-        try:
-            os.remove(temp_path)
-        except:
-            pass
-        
         return result
         
     except Exception as e:
         logger.error(f"❌ Failed to create social ad: {e}")
         return None
 
+def _overlay_job(job: Dict[str, Any]) -> Optional[str]:
+    return add_text_overlay_to_image(**job)
+
+
+def _social_ad_job(job: Dict[str, Any]) -> Optional[str]:
+    return create_social_ad_with_text(**job)
+
+
+# Batches this small are composited in-process; spinning work out to
+# worker processes costs more than a couple of overlays
+COMPOSITING_INLINE_MAX = int(os.getenv("COMPOSITING_INLINE_MAX", "2"))
+
+_compositing_pool: Optional[ProcessPoolExecutor] = None
+_compositing_pool_lock = threading.Lock()
+
+
+def _get_compositing_pool() -> ProcessPoolExecutor:
+    """Shared compositing pool, started on first use and reused afterwards."""
+    global _compositing_pool
+    with _compositing_pool_lock:
+        if _compositing_pool is None:
+            _compositing_pool = ProcessPoolExecutor(max_workers=os.cpu_count() or 2)
+        return _compositing_pool
+
+
+def _discard_compositing_pool(pool: ProcessPoolExecutor):
+    global _compositing_pool
+    with _compositing_pool_lock:
+        if _compositing_pool is pool:
+            _compositing_pool = None
+    pool.shutdown(wait=False)
+
+
+def _run_compositing_batch(worker, jobs: List[Dict[str, Any]], max_workers: Optional[int]) -> List[Optional[str]]:
+    """
+    Run compositing jobs on the shared process pool (PIL work is CPU-bound and
+    holds the GIL). Worker processes live as long as the app, so their font
+    and glyph caches stay warm across batches. Small batches run in-process,
+    and a pool that can't start or breaks falls back to running inline.
+    """
+    if len(jobs) <= COMPOSITING_INLINE_MAX:
+        return [worker(job) for job in jobs]
+    
+    pool = None
+    try:
+        pool = _get_compositing_pool()
+        if not max_workers:
+            return list(pool.map(worker, jobs))
+        # Cap jobs in flight for callers that want to leave CPUs free
+        results: List[Optional[str]] = []
+        for start in range(0, len(jobs), max_workers):
+            results.extend(pool.map(worker, jobs[start:start + max_workers]))
+        return results
+    except Exception as e:
+        logger.warning(f"⚠️ Process pool unavailable ({e}), compositing in-process")
+        if isinstance(e, BrokenProcessPool):
+            _discard_compositing_pool(pool)
+        return [worker(job) for job in jobs]
+
+
+def add_text_overlays_batch(jobs: List[Dict[str, Any]], max_workers: Optional[int] = None) -> List[Optional[str]]:
+    """
+    Composite many text overlays in parallel.
+    
+    Args:
+        jobs: List of add_text_overlay_to_image keyword-argument dicts
+        max_workers: Max jobs in flight (default: the shared pool's CPU count)
+        
+    Returns:
+        Output paths in job order (None for failed jobs)
+    """
+    return _run_compositing_batch(_overlay_job, jobs, max_workers)
+
+
+def create_social_ads_batch(jobs: List[Dict[str, Any]], max_workers: Optional[int] = None) -> List[Optional[str]]:
+    """
+    Crop, resize and overlay many social ads in parallel.
+    
+    Args:
+        jobs: List of create_social_ad_with_text keyword-argument dicts
+              (include ``ad_copy`` so workers don't call the AI)
+        max_workers: Max jobs in flight (default: the shared pool's CPU count)
+        
+    Returns:
+        Output paths in job order (None for failed jobs)
+    """
+    return _run_compositing_batch(_social_ad_job, jobs, max_workers)
+
+
 # Platform-specific configurations for static ads
 PLATFORM_CONFIGS = {
     'instagram_post': {
@@ -764,8 +1002,6 @@ def generate_ad_copy_with_ai(
     
     # Try to use Replicate for smart copy generation
     try:
-        import replicate
-        
         copy_prompt = f"""Generate compelling advertising copy for this product:
 Product: {product_description}
 Platform: {platform}
@@ -780,9 +1016,9 @@ Return ONLY a JSON object (no other text):
     "cta": "3 words max, action word"
 }}"""
 
-        output = replicate.run(
+        output = _replicate_run(
             "meta/meta-llama-3-8b-instruct",
-            input={
+            {
                 "prompt": copy_prompt,
                 "max_tokens": 150,
                 "temperature": 0.8
@@ -952,33 +1188,48 @@ The text must be clearly legible, professionally styled, and integrated beautifu
         """
         Upload image to a temporary hosting service for Replicate.
         Uses Replicate's file upload endpoint.
+        
+        Uploads are cached by content hash for the lifetime of Replicate file
+        URLs, so the same mockup is only uploaded once across ads and runs.
         """
+        cache = get_upload_cache()
         try:
-            # Read the image
-            with open(image_path, 'rb') as f:
-                image_data = f.read()
-            
-            # Upload to Replicate's file hosting
-            response = requests.post(
-                "https://api.replicate.com/v1/files",
-                headers={
-                    "Authorization": f"Token {self.api_token}"
-                },
-                files={
-                    "file": (Path(image_path).name, image_data)
-                }
-            )
+            content_hash = cache.file_hash(image_path)
+        except OSError as e:
+            logger.warning(f"Upload failed, using data URI: {e}")
+            return self._encode_image_to_uri(image_path)
+        
+        with cache.lock_for(content_hash):
+            cached_url = cache.get(content_hash)
+            if cached_url:
+                logger.info(f"♻️ Reusing uploaded image for {Path(image_path).name}")
+                return cached_url
             
-            if response.status_code == 201:
-                result = response.json()
-                return result.get('urls', {}).get('get', '')
-            else:
+            try:
+                # Upload to Replicate's file hosting (streamed from disk)
+                with open(image_path, 'rb') as f:
+                    response = requests.post(
+                        "https://api.replicate.com/v1/files",
+                        headers={
+                            "Authorization": f"Token {self.api_token}"
+                        },
+                        files={
+                            "file": (Path(image_path).name, f)
+                        },
+                        timeout=120
+                    )
+                
+                if response.status_code == 201:
+                    url = response.json().get('urls', {}).get('get', '')
+                    if url:
+                        cache.put(content_hash, url)
+                        return url
                 logger.warning(f"File upload failed, using data URI fallback: {response.status_code}")
                 return self._encode_image_to_uri(image_path)
-                
-        except Exception as e:
-            logger.warning(f"Upload failed, using data URI: {e}")
-            return self._encode_image_to_uri(image_path)
+                    
+            except Exception as e:
+                logger.warning(f"Upload failed, using data URI: {e}")
+                return self._encode_image_to_uri(image_path)
     
     def generate_static_ad(
         self,
@@ -993,7 +1244,8 @@ The text must be clearly legible, professionally styled, and integrated beautifu
         prompt_strength: float = 0.75,
         ad_copy: Optional[Dict[str, str]] = None,
         price: Optional[float] = None,
-        brand_name: Optional[str] = None
+        brand_name: Optional[str] = None,
+        image_uri: Optional[str] = None
     ) -> Optional[str]:
         """
         Generate a professional static ad image WITH text overlays.
@@ -1011,6 +1263,7 @@ The text must be clearly legible, professionally styled, and integrated beautifu
             ad_copy: Optional dict with 'headline', 'tagline', 'cta' text to render
             price: Optional price to display on ad
             brand_name: Optional brand name
+            image_uri: Already-uploaded URI for product_image_path (skips the upload)
             
         Returns:
             Path to generated ad image, or None if failed
@@ -1073,7 +1326,8 @@ The advertisement should have bold, readable text overlaid on the image. The tex
                 return None
             
             # Upload image or convert to data URI
-            image_uri = self._upload_image_to_replicate(product_image_path)
+            if not image_uri:
+                image_uri = self._upload_image_to_replicate(product_image_path)
             
             # Build input parameters
             input_params = {
@@ -1096,10 +1350,7 @@ The advertisement should have bold, readable text overlaid on the image. The tex
             
             # Run the model
             logger.info(f"🚀 Running flux-static-ads model...")
-            output = replicate.run(
-                f"{self.model}:{self.model_version}",
-                input=input_params
-            )
+            output = _replicate_run(f"{self.model}:{self.model_version}", input_params)
             
             # Handle output (could be list or single URL)
             if isinstance(output, list):
@@ -1113,11 +1364,6 @@ The advertisement should have bold, readable text overlaid on the image. The tex
             
             # Download the generated image
             logger.info(f"📥 Downloading generated ad...")
-            response = requests.get(image_url)
-            
-            if response.status_code != 200:
-                logger.error(f"Failed to download image: {response.status_code}")
-                return None
             
             # Determine output path
             if not output_path:
@@ -1127,9 +1373,14 @@ The advertisement should have bold, readable text overlaid on the image. The tex
             # Ensure directory exists
             Path(output_path).parent.mkdir(parents=True, exist_ok=True)
             
-            # Save the image
-            with open(output_path, 'wb') as f:
-                f.write(response.content)
+            # Stream the image to disk
+            with requests.get(image_url, stream=True, timeout=120) as response:
+                if response.status_code != 200:
+                    logger.error(f"Failed to download image: {response.status_code}")
+                    return None
+                with open(output_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=256 * 1024):
+                        f.write(chunk)
             
             if Path(output_path).exists() and Path(output_path).stat().st_size > 0:
                 logger.info(f"✅ Static ad generated: {output_path}")
@@ -1150,11 +1401,15 @@ The advertisement should have bold, readable text overlaid on the image. The tex
         platforms: Optional[List[str]] = None,
         ad_style: str = 'lifestyle',
         brand_name: Optional[str] = None,
-        price: Optional[float] = None
+        price: Optional[float] = None,
+        max_workers: int = 6
     ) -> Dict[str, str]:
         """
         Generate static ads for multiple platforms with unique ad copy for each.
         
+        The source image is uploaded once and platforms are generated
+        concurrently, so a full set takes about one generation's latency.
+        
         Args:
             product_image_path: Path to product mockup
             product_description: Product concept/description
@@ -1163,6 +1418,7 @@ The advertisement should have bold, readable text overlaid on the image. The tex
             ad_style: Visual style for all ads
             brand_name: Optional brand name to include in prompts
             price: Optional product price to display on ads
+            max_workers: Platforms generated in parallel
             
         Returns:
             Dict mapping platform to generated ad path
@@ -1203,7 +1459,14 @@ The advertisement should have bold, readable text overlaid on the image. The tex
         generated_ads = {}
         total = len(platforms)
         
-        for idx, platform in enumerate(platforms, 1):
+        # Upload the shared source image once for every platform
+        if not Path(product_image_path).exists():
+            logger.error(f"Product image not found: {product_image_path}")
+            return generated_ads
+        image_uri = self._upload_image_to_replicate(product_image_path)
+        
+        def generate_for_platform(indexed):
+            idx, platform = indexed
             logger.info(f"\n📱 [{idx}/{total}] Generating {platform} ad with text overlay...")
             
             # Generate unique ad copy for this platform
@@ -1229,14 +1492,21 @@ The advertisement should have bold, readable text overlaid on the image. The tex
                 ad_copy=ad_copy,
                 price=price,
                 brand_name=brand_name,
-                seed=seed
+                seed=seed,
+                image_uri=image_uri
             )
             
             if result:
-                generated_ads[platform] = result
                 logger.info(f"   ✅ {platform} ad saved with text: {ad_copy.get('headline', '')}")
             else:
                 logger.warning(f"   ⚠️ {platform} ad generation failed")
+            return platform, result
+        
+        # Copy and image generation per platform are independent - fan out
+        with ThreadPoolExecutor(max_workers=max(1, min(total, max_workers))) as executor:
+            for platform, result in executor.map(generate_for_platform, enumerate(platforms, 1)):
+                if result:
+                    generated_ads[platform] = result
         
         logger.info(f"\n🎉 Generated {len(generated_ads)}/{total} platform ads with promotional text")
         return generated_ads
@@ -1270,26 +1540,30 @@ The advertisement should have bold, readable text overlaid on the image. The tex
         output_dir = Path(output_dir)
         output_dir.mkdir(parents=True, exist_ok=True)
         
-        variations = []
+        if not Path(product_image_path).exists():
+            logger.error(f"Product image not found: {product_image_path}")
+            return []
+        image_uri = self._upload_image_to_replicate(product_image_path)
         
-        for i in range(num_variations):
+        def generate_variation(i):
             style = styles[i % len(styles)]
             
             logger.info(f"\n🎨 Generating variation {i+1}/{num_variations} ({style} style)...")
             
             output_path = str(output_dir / f"ad_variation_{i+1}_{style}.png")
             
-            result = self.generate_static_ad(
+            return self.generate_static_ad(
                 product_image_path=product_image_path,
                 prompt=product_description,
                 platform=platform,
                 ad_style=style,
                 output_path=output_path,
-                seed=i * 1000 + 42  # Different seed for each variation
+                seed=i * 1000 + 42,  # Different seed for each variation
+                image_uri=image_uri
             )
-            
-            if result:
-                variations.append(result)
+        
+        with ThreadPoolExecutor(max_workers=max(1, min(num_variations, 6))) as executor:
+            variations = [r for r in executor.map(generate_variation, range(num_variations)) if r]
         
         logger.info(f"\n✅ Generated {len(variations)}/{num_variations} ad variations")
         return variations
@@ -1355,23 +1629,38 @@ def generate_social_ads_for_product(
     generated_ads = {}
     total = len(platforms)
     
-    for idx, platform in enumerate(platforms, 1):
-        logger.info(f"\n📱 [{idx}/{total}] Creating {platform} ad with text overlay...")
-        
-        output_path = str(social_dir / f"{Path(product_mockup_path).stem}_{platform}_ad.png")
-        
-        # Use PIL-based text overlay (reliable and clean)
-        result = create_social_ad_with_text(
-            product_image_path=product_mockup_path,
-            output_path=output_path,
+    # Ad copy is network-bound: fetch it for every platform concurrently
+    def _copy_for(platform: str) -> Dict[str, str]:
+        return generate_ad_copy_with_ai(
+            product_description=product_concept,
             platform=platform,
-            product_concept=product_concept,
-            price=price,
-            brand_name=brand_name,
             style=style,
-            brand_colors=brand_colors
+            price=price,
+            brand_name=brand_name
         )
-        
+    
+    with ThreadPoolExecutor(max_workers=max(1, min(total, 6))) as executor:
+        ad_copies = list(executor.map(_copy_for, platforms))
+    
+    # Compositing is CPU-bound: crop + overlay every platform in a process pool
+    logger.info(f"\n📱 Compositing {total} ads with text overlays...")
+    jobs = [
+        {
+            'product_image_path': product_mockup_path,
+            'output_path': str(social_dir / f"{Path(product_mockup_path).stem}_{platform}_ad.png"),
+            'platform': platform,
+            'product_concept': product_concept,
+            'price': price,
+            'brand_name': brand_name,
+            'style': style,
+            'brand_colors': brand_colors,
+            'ad_copy': ad_copy,
+        }
+        for platform, ad_copy in zip(platforms, ad_copies)
+    ]
+    results = create_social_ads_batch(jobs)
+    
+    for platform, result in zip(platforms, results):
         if result:
             generated_ads[platform] = result
             logger.info(f"   ✅ {platform} ad created with professional text overlay")
@@ -5,21 +5,25 @@ Enables multiple tabs to submit work simultaneously and process in parallel.
 Users can generate products, videos, content, etc. all at once without blocking.
 
 Architecture:
-- Central job queue backed by Ray
+- Central job queue admitted by the shared execution fabric
 - Each tab submits jobs to queue
-- Ray distributes work across workers
+- Jobs start when their resource profile fits the process-wide budget
+- Ray (when installed) still runs the work; the fabric decides when it starts
 - Results stored and retrieved per job
 - Real-time status updates
 """
 
 import logging
 import uuid
+from concurrent.futures import TimeoutError as FuturesTimeoutError
 from typing import Any, Callable, Dict, List, Optional
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 import asyncio
 
+from app.services.execution_fabric import FabricJob, get_fabric
+
 logger = logging.getLogger(__name__)
 
 # Try to import Ray
@@ -166,7 +170,9 @@ class GlobalJobQueue:
         self.max_concurrent_jobs = max_concurrent_jobs
         self.jobs: Dict[str, Job] = {}
         self.ray_available = HAS_RAY
-        self._running_futures = {}
+        self._fabric_jobs: Dict[str, FabricJob] = {}
+        self._ray_refs = {}
+        get_fabric().set_capacity("global_job_queue", max_concurrent_jobs)
         
         if self.ray_available:
             self._init_ray()
@@ -232,18 +238,43 @@ class GlobalJobQueue:
         
         self.jobs[job_id] = job
         
-        # Start execution if Ray available
-        if self.ray_available:
-            self._execute_job_async(job)
-        else:
-            # Execute locally in background
-            self._execute_job_local(job)
+        # The fabric admits the job once its profile fits the shared budget
+        resources = RESOURCE_PROFILES.get(job_type, {"num_cpus": 1, "memory": 1_000_000_000})
+        self._fabric_jobs[job_id] = get_fabric().submit(
+            self._run_job,
+            args=(job,),
+            name=description,
+            source="global_job_queue",
+            profile=job_type.value,
+            resources={
+                "cpu": resources["num_cpus"],
+                "memory_mb": resources["memory"] / 1_000_000,
+                "global_job_queue": 1
+            },
+            priority=priority,
+            metadata={"job_id": job_id, "tab_name": tab_name},
+            on_update=lambda fabric_job, j=job: self._sync_job(j, fabric_job)
+        )
         
         logger.info(f"📥 Job submitted: {job_id} ({tab_name}: {description})")
         return job_id
     
-    def _execute_job_async(self, job: Job):
-        """Execute job using Ray (non-blocking) with resource profiling."""
+    def _run_job(self, job: Job) -> Any:
+        """Run a job on a fabric worker, through Ray when available."""
+        if self.ray_available:
+            return self._execute_job_ray(job)
+        
+        if asyncio.iscoroutinefunction(job.function):
+            loop = asyncio.new_event_loop()
+            asyncio.set_event_loop(loop)
+            try:
+                return loop.run_until_complete(job.function(*job.args, **job.kwargs))
+            finally:
+                loop.close()
+        return job.function(*job.args, **job.kwargs)
+    
+    def _execute_job_ray(self, job: Job) -> Any:
+        """Execute job using Ray with resource profiling (blocks the fabric worker)."""
         # Get resource requirements for this job type
         resources = RESOURCE_PROFILES.get(job.job_type, {
             "num_cpus": 1,
@@ -256,96 +287,52 @@ class GlobalJobQueue:
         )
         def execute_job_remote(func, args, kwargs):
             """Remote execution wrapper with resource allocation."""
-            try:
-                if asyncio.iscoroutinefunction(func):
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    try:
-                        return loop.run_until_complete(func(*args, **kwargs))
-                    finally:
-                        loop.close()
-                else:
-                    return func(*args, **kwargs)
-            except Exception as e:
-                raise e
-        
-        # Submit to Ray
-        job.status = JobStatus.RUNNING
-        job.started_at = datetime.now()
+            if asyncio.iscoroutinefunction(func):
+                loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(loop)
+                try:
+                    return loop.run_until_complete(func(*args, **kwargs))
+                finally:
+                    loop.close()
+            return func(*args, **kwargs)
         
         # Log resource allocation
         logger.info(f"🎯 Job {job.id[:8]} allocated: {resources.get('num_cpus')} CPUs, "
                    f"{resources.get('memory') / 1_000_000:.0f}MB RAM")
         
-        future = execute_job_remote.remote(job.function, job.args, job.kwargs)
-        self._running_futures[job.id] = future
-        
-        # Check result asynchronously (non-blocking)
-        # The result will be available when user calls get_job_result()
+        ref = execute_job_remote.remote(job.function, job.args, job.kwargs)
+        self._ray_refs[job.id] = ref
+        try:
+            return ray.get(ref)
+        finally:
+            self._ray_refs.pop(job.id, None)
     
-    def _execute_job_local(self, job: Job):
-        """Execute job locally (fallback when Ray unavailable)."""
-        import threading
-        
-        def run_job():
-            try:
-                job.status = JobStatus.RUNNING
-                job.started_at = datetime.now()
-                
-                if asyncio.iscoroutinefunction(job.function):
-                    loop = asyncio.new_event_loop()
-                    asyncio.set_event_loop(loop)
-                    try:
-                        result = loop.run_until_complete(job.function(*job.args, **job.kwargs))
-                    finally:
-                        loop.close()
-                else:
-                    result = job.function(*job.args, **job.kwargs)
-                
-                job.result = result
-                job.status = JobStatus.COMPLETED
-                job.completed_at = datetime.now()
-                job.progress = 1.0
-                
-            except Exception as e:
-                job.status = JobStatus.FAILED
-                job.error = str(e)
-                job.completed_at = datetime.now()
-                logger.error(f"Job {job.id} failed: {e}")
-        
-        thread = threading.Thread(target=run_job, daemon=True)
-        thread.start()
+    def _sync_job(self, job: Job, fabric_job: FabricJob):
+        """Mirror fabric status changes onto the queue's Job record."""
+        if job.status == JobStatus.CANCELLED:
+            return
+        if fabric_job.status == "running":
+            job.status = JobStatus.RUNNING
+            job.started_at = datetime.now()
+        elif fabric_job.status == "completed":
+            job.result = fabric_job.future.result()
+            job.status = JobStatus.COMPLETED
+            job.completed_at = datetime.now()
+            job.progress = 1.0
+        elif fabric_job.status == "failed":
+            job.status = JobStatus.FAILED
+            job.error = str(fabric_job.future.exception())
+            job.completed_at = datetime.now()
+            logger.error(f"Job {job.id} failed: {job.error}")
+        elif fabric_job.status == "cancelled":
+            job.status = JobStatus.CANCELLED
+            job.completed_at = datetime.now()
     
     def get_job_status(self, job_id: str) -> Optional[JobStatus]:
         """Get current status of a job."""
         job = self.jobs.get(job_id)
         if not job:
             return None
-        
-        # Check if Ray job completed
-        if self.ray_available and job_id in self._running_futures:
-            try:
-                # Non-blocking check
-                future = self._running_futures[job_id]
-                ready, _ = ray.wait([future], timeout=0)
-                
-                if ready:
-                    # Job completed, get result
-                    try:
-                        result = ray.get(future)
-                        job.result = result
-                        job.status = JobStatus.COMPLETED
-                        job.completed_at = datetime.now()
-                        job.progress = 1.0
-                        del self._running_futures[job_id]
-                    except Exception as e:
-                        job.status = JobStatus.FAILED
-                        job.error = str(e)
-                        job.completed_at = datetime.now()
-                        del self._running_futures[job_id]
-            except Exception as e:
-                logger.error(f"Error checking job status: {e}")
-        
         return job.status
     
     def get_job_result(self, job_id: str, timeout: float = None) -> Any:
@@ -363,34 +350,25 @@ class GlobalJobQueue:
         if not job:
             return None
         
-        # If using Ray and job still running, optionally wait
-        if self.ray_available and job_id in self._running_futures:
-            future = self._running_futures[job_id]
-            
+        fabric_job = self._fabric_jobs.get(job_id)
+        if fabric_job is None:
+            return job.result
+        
+        if not fabric_job.future.done():
+            if not timeout:
+                return None
             try:
-                if timeout:
-                    result = ray.get(future, timeout=timeout)
-                else:
-                    # Check if ready without waiting
-                    ready, _ = ray.wait([future], timeout=0)
-                    if not ready:
-                        return None
-                    result = ray.get(future)
-                
-                job.result = result
-                job.status = JobStatus.COMPLETED
-                job.completed_at = datetime.now()
-                job.progress = 1.0
-                del self._running_futures[job_id]
-                
-            except Exception as e:
-                job.status = JobStatus.FAILED
-                job.error = str(e)
-                job.completed_at = datetime.now()
-                del self._running_futures[job_id]
-                raise e
-        
-        return job.result
+                fabric_job.future.result(timeout=timeout)
+            except FuturesTimeoutError:
+                return None
+            except Exception:
+                pass
+        
+        if fabric_job.future.cancelled():
+            return None
+        if fabric_job.future.exception() is not None:
+            raise fabric_job.future.exception()
+        return fabric_job.future.result()
     
     def get_job(self, job_id: str) -> Optional[Job]:
         """Get full job object."""
@@ -425,7 +403,13 @@ class GlobalJobQueue:
         return jobs
     
     def cancel_job(self, job_id: str) -> bool:
-        """Cancel a queued or running job."""
+        """
+        Cancel a queued or running job.
+        
+        A queued job never starts. A running thread job is only marked
+        cancelled; its function keeps running unless it checks
+        get_fabric().current_job().cancel_event. Ray jobs are cancelled.
+        """
         job = self.jobs.get(job_id)
         if not job:
             return False
@@ -433,12 +417,15 @@ class GlobalJobQueue:
         if job.status in [JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED]:
             return False
         
+        fabric_job = self._fabric_jobs.get(job_id)
+        if fabric_job:
+            get_fabric().cancel(fabric_job.job_id)
+        
         # Cancel Ray job if running
-        if self.ray_available and job_id in self._running_futures:
+        if self.ray_available and job_id in self._ray_refs:
             try:
-                ray.cancel(self._running_futures[job_id])
-                del self._running_futures[job_id]
-            except:
+                ray.cancel(self._ray_refs[job_id])
+            except Exception:
                 pass
         
         job.status = JobStatus.CANCELLED
@@ -458,6 +445,7 @@ class GlobalJobQueue:
         
         for job_id in to_remove:
             del self.jobs[job_id]
+            self._fabric_jobs.pop(job_id, None)
         
         logger.info(f"🧹 Cleared {len(to_remove)} completed jobs")
     
@@ -481,7 +469,8 @@ class GlobalJobQueue:
             'failed': failed,
             'ray_available': self.ray_available,
             'max_concurrent': self.max_concurrent_jobs,
-            'tab_counts': tab_counts
+            'tab_counts': tab_counts,
+            'fabric': get_fabric().stats()
         }
 
 
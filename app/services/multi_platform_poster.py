@@ -15,6 +15,10 @@ Handles posting to Instagram, TikTok, Pinterest, Facebook, Reddit using browser
 - Parallel platform posting with asyncio.gather()
 - Reduced wait times between actions
 - Browser instance reuse across posts
+- Warm browser pool shared across posting runs (one context per profile)
+- Priority post queue with per-platform concurrency caps
+- Cached cookie/localStorage sessions injected before the agent starts
+- Direct API fast paths that skip the browser agent entirely
 - Faster element detection with optimized selectors
 - Smart caching of browser context
 - flash_mode to skip LLM thinking overhead
@@ -45,13 +49,21 @@ import asyncio
 import os
 import sys
 from pathlib import Path
-from typing import Optional, List, Dict, Any, Tuple, Callable
+from typing import TYPE_CHECKING, Optional, List, Dict, Any, Tuple, Callable
 import logging
 import time
 import base64
+import json
+import heapq
+import itertools
+import threading
+from collections import deque
 from dataclasses import dataclass, field
 from datetime import datetime
 
+if TYPE_CHECKING:
+    from browser_use import Browser, BrowserConfig, BrowserProfile
+
 logger = logging.getLogger(__name__)
 
 # ============================================================================
@@ -78,8 +90,17 @@ class BrowserPerformanceConfig:
     
     # Parallel execution
     max_concurrent_posts: int = 3  # Post to multiple platforms simultaneously
+    per_platform_concurrency: int = 1  # Agents allowed per platform at once
     delay_between_platforms: float = 1.0  # Reduced from 3.0
     
+    # Warm browser pool
+    browser_idle_timeout: int = 900  # Close pooled browsers idle this long (seconds)
+    profile_per_platform: bool = False  # Separate persistent profile per platform
+    
+    # Session reuse / fast paths
+    session_probe_ttl: int = 1800  # Trust a session validity check this long (seconds)
+    prefer_direct_api: bool = True  # Skip the agent when an API/upload path works
+    
     # Cloud settings (browser-use v0.10.1)
     use_cloud: bool = False  # Use cloud stealth browser
     cloud_proxy_country: Optional[str] = None  # 'us', 'uk', 'fr', 'de', etc.
@@ -397,16 +418,80 @@ async def capture_debug_screenshot(agent, platform: str, config: BrowserPerforma
     
     return None
 
+class LatencyHistogram:
+    """Fixed-bucket latency histogram with a window of recent samples for percentiles"""
+    BUCKETS = (0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 30.0, 60.0, 120.0, 300.0)
+    
+    def __init__(self, window: int = 512):
+        self.counts = [0] * (len(self.BUCKETS) + 1)
+        self.samples: deque = deque(maxlen=window)
+        self.total = 0.0
+    
+    def observe(self, seconds: float):
+        for i, bound in enumerate(self.BUCKETS):
+            if seconds <= bound:
+                self.counts[i] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.samples.append(seconds)
+        self.total += seconds
+    
+    def summary(self) -> Dict[str, Any]:
+        ordered = sorted(self.samples)
+        count = sum(self.counts)
+        
+        def pct(q: float) -> float:
+            return ordered[min(len(ordered) - 1, int(q * len(ordered)))] if ordered else 0.0
+        
+        labels = [f"<={b:g}s" for b in self.BUCKETS] + [f">{self.BUCKETS[-1]:g}s"]
+        return {
+            'count': count,
+            'avg': round(self.total / count, 3) if count else 0.0,
+            'p50': round(pct(0.50), 3),
+            'p95': round(pct(0.95), 3),
+            'max': round(ordered[-1], 3) if ordered else 0.0,
+            'buckets': {label: n for label, n in zip(labels, self.counts) if n},
+        }
+
+
 class MetricsCollector:
     """Collect and report posting metrics"""
     def __init__(self):
         self.metrics: List[PostingMetrics] = []
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self._lock = threading.Lock()
     
     def start(self, platform: str) -> PostingMetrics:
         m = PostingMetrics(platform=platform)
-        self.metrics.append(m)
+        with self._lock:
+            self.metrics.append(m)
         return m
     
+    def observe(self, platform: str, stage: str, seconds: float):
+        """
+        Record a stage latency (queue_wait, browser_acquire, agent_step, agent_run).
+        Kept per platform and across all platforms.
+        """
+        with self._lock:
+            for key in (f"{platform}.{stage}", f"all.{stage}"):
+                if key not in self.histograms:
+                    self.histograms[key] = LatencyHistogram()
+                self.histograms[key].observe(seconds)
+    
+    def latency_report(self) -> Dict[str, Dict[str, Any]]:
+        with self._lock:
+            return {key: h.summary() for key, h in sorted(self.histograms.items())}
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Live view while posts are still running."""
+        with self._lock:
+            in_flight = [
+                {'platform': m.platform, 'elapsed': f"{m.duration:.1f}s"}
+                for m in self.metrics if m.end_time is None
+            ]
+        return {'in_flight': in_flight, 'latency': self.latency_report()}
+    
     def report(self) -> Dict[str, Any]:
         total = len(self.metrics)
         successful = sum(1 for m in self.metrics if m.success)
@@ -421,7 +506,542 @@ class MetricsCollector:
             'avg_duration': f"{avg_duration:.1f}s",
             'total_duration': f"{sum(m.duration for m in self.metrics):.1f}s",
             'debug_screenshots': failed_screenshots,
+            'latency': self.latency_report(),
+        }
+
+
+# ============================================================================
+# WARM BROWSER POOL + PRIORITY POST SCHEDULER
+# ============================================================================
+class PostScheduler:
+    """
+    Priority queue of post jobs with a global concurrency cap and
+    per-platform caps. Dispatch skips past jobs whose platform is saturated,
+    so one busy platform never holds up the rest of the queue.
+    
+    Runs on the BrowserPool loop.
+    """
+    
+    def __init__(self, max_concurrent: int, per_platform: int):
+        self.max_concurrent = max(1, max_concurrent)
+        self.per_platform = max(1, per_platform)
+        self._heap: List[tuple] = []
+        self._seq = itertools.count()
+        self._running = 0
+        self._running_by_platform: Dict[str, int] = {}
+    
+    def submit(self, platform: str, priority: int, job: Callable) -> 'asyncio.Future':
+        """
+        Queue a job. ``job(queue_wait_seconds)`` must return a coroutine.
+        Lower priority values run first; ties run in submission order.
+        """
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._heap, (priority, next(self._seq), time.time(), platform, job, future))
+        self._dispatch()
+        return future
+    
+    def queue_depth(self) -> int:
+        return len(self._heap)
+    
+    def resize(self, max_concurrent: int, per_platform: int):
+        """Change the caps; running jobs finish, queued ones start under the new caps."""
+        self.max_concurrent = max(1, max_concurrent)
+        self.per_platform = max(1, per_platform)
+        self._dispatch()
+    
+    def _dispatch(self):
+        while self._running < self.max_concurrent and self._heap:
+            for index, item in enumerate(sorted(self._heap)):
+                if self._running_by_platform.get(item[3], 0) < self.per_platform:
+                    break
+            else:
+                return  # Every queued platform is at its cap
+            self._heap.remove(item)
+            heapq.heapify(self._heap)
+            
+            platform = item[3]
+            self._running += 1
+            self._running_by_platform[platform] = self._running_by_platform.get(platform, 0) + 1
+            asyncio.ensure_future(self._run(item))
+    
+    async def _run(self, item: tuple):
+        _, _, queued_at, platform, job, future = item
+        try:
+            if not future.cancelled():
+                result = await job(time.time() - queued_at)
+                if not future.done():
+                    future.set_result(result)
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        finally:
+            self._running -= 1
+            self._running_by_platform[platform] -= 1
+            self._dispatch()
+
+
+@dataclass
+class _PooledBrowser:
+    browser: Any
+    in_use: int = 0
+    last_used: float = field(default_factory=time.time)
+
+
+class BrowserPool:
+    """
+    Process-wide pool of warm browsers, one persistent context per profile.
+    
+    Browser sessions are bound to the event loop that started them, and
+    callers typically wrap each post in ``asyncio.run``. The pool therefore
+    owns a long-lived loop on a daemon thread; posting coroutines are run on
+    it so browsers (and their logged-in profiles) survive across runs.
+    Idle browsers are closed after ``idle_timeout`` seconds.
+    """
+    
+    def __init__(self, idle_timeout: int = 900):
+        self.idle_timeout = idle_timeout
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self._browsers: Dict[str, _PooledBrowser] = {}
+        self._key_locks: Dict[str, asyncio.Lock] = {}
+        self._scheduler: Optional[PostScheduler] = None
+        self.stats = {'cold_starts': 0, 'warm_hits': 0, 'evictions': 0}
+    
+    # ----- loop management -----
+    
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._start_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name="browser-pool", daemon=True
+                )
+                self._thread.start()
+                asyncio.run_coroutine_threadsafe(self._reap_idle(), self._loop)
+            return self._loop
+    
+    async def run(self, coro):
+        """Await a coroutine on the pool loop from any loop."""
+        loop = self._ensure_loop()
+        try:
+            if asyncio.get_running_loop() is loop:
+                return await coro
+        except RuntimeError:
+            pass
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+    
+    def scheduler(self, config: BrowserPerformanceConfig) -> PostScheduler:
+        """Shared scheduler, resized to the caller's caps (call on the pool loop)."""
+        if self._scheduler is None:
+            self._scheduler = PostScheduler(config.max_concurrent_posts, config.per_platform_concurrency)
+        elif (self._scheduler.max_concurrent, self._scheduler.per_platform) != (
+                max(1, config.max_concurrent_posts), max(1, config.per_platform_concurrency)):
+            logger.info(
+                f"🔧 Post scheduler caps now {config.max_concurrent_posts} total, "
+                f"{config.per_platform_concurrency} per platform"
+            )
+            self._scheduler.resize(config.max_concurrent_posts, config.per_platform_concurrency)
+        return self._scheduler
+    
+    # ----- browsers (call on the pool loop) -----
+    
+    async def acquire(self, key: str, factory: Callable[[], Any]) -> Any:
+        """Get the warm browser for a profile key, starting it on first use."""
+        lock = self._key_locks.setdefault(key, asyncio.Lock())
+        async with lock:
+            entry = self._browsers.get(key)
+            if entry is None:
+                browser = factory()
+                start = getattr(browser, 'start', None)
+                if start is not None:
+                    try:
+                        await start()
+                    except Exception as e:
+                        logger.debug(f"Browser pre-start for {key} deferred to agent: {e}")
+                entry = self._browsers[key] = _PooledBrowser(browser=browser)
+                self.stats['cold_starts'] += 1
+                logger.info(f"🧊 Started browser for profile '{key}'")
+            else:
+                self.stats['warm_hits'] += 1
+            entry.in_use += 1
+            entry.last_used = time.time()
+            return entry.browser
+    
+    async def release(self, key: str, keep_warm: bool = True):
+        entry = self._browsers.get(key)
+        if entry is None:
+            return
+        entry.in_use = max(0, entry.in_use - 1)
+        entry.last_used = time.time()
+        if not keep_warm and entry.in_use == 0:
+            await self._close(key)
+    
+    async def discard(self, key: str):
+        """Drop a (possibly broken) browser unless other posts are still using it."""
+        entry = self._browsers.get(key)
+        if entry is not None and entry.in_use <= 1:
+            await self._close(key)
+    
+    async def close_idle(self, keys):
+        """Close these profiles' browsers unless a post is still using them."""
+        for key in keys:
+            entry = self._browsers.get(key)
+            if entry is not None and entry.in_use == 0:
+                await self._close(key)
+    
+    async def close_all(self):
+        for key in list(self._browsers):
+            await self._close(key)
+    
+    async def _close(self, key: str):
+        entry = self._browsers.pop(key, None)
+        if entry is None:
+            return
+        try:
+            await entry.browser.close()
+        except Exception:
+            pass  # Browser may already be closed
+    
+    async def _reap_idle(self):
+        while True:
+            await asyncio.sleep(60)
+            now = time.time()
+            for key, entry in list(self._browsers.items()):
+                if entry.in_use == 0 and now - entry.last_used > self.idle_timeout:
+                    logger.info(f"💤 Closing idle browser for profile '{key}'")
+                    self.stats['evictions'] += 1
+                    await self._close(key)
+    
+    def status(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'warm_browsers': len(self._browsers),
+            'in_use': sum(e.in_use for e in self._browsers.values()),
+            'queued_posts': self._scheduler.queue_depth() if self._scheduler else 0,
+        }
+
+
+_browser_pool: Optional[BrowserPool] = None
+_browser_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Get the process-wide warm browser pool."""
+    global _browser_pool
+    with _browser_pool_lock:
+        if _browser_pool is None:
+            _browser_pool = BrowserPool(idle_timeout=PERF_CONFIG.browser_idle_timeout)
+        return _browser_pool
+
+
+# ============================================================================
+# SESSION STATE CACHE (cookies + localStorage per platform)
+# ============================================================================
+SESSION_CACHE_DIR = Path.home() / ".pod_wizard" / "browser_sessions"
+
+# Auth cookies that mean "logged in", plus a cheap page that bounces to a
+# login screen when the session is dead
+SESSION_AUTH = {
+    'instagram': {
+        'domains': ['instagram.com'],
+        'auth_cookies': ['sessionid'],
+        'probe_url': 'https://www.instagram.com/accounts/edit/',
+        'logged_out_markers': ['/accounts/login'],
+    },
+    'facebook': {
+        'domains': ['facebook.com'],
+        'auth_cookies': ['c_user', 'xs'],
+        'probe_url': 'https://www.facebook.com/settings',
+        'logged_out_markers': ['/login'],
+    },
+    'tiktok': {
+        'domains': ['tiktok.com'],
+        'auth_cookies': ['sessionid'],
+        'probe_url': 'https://www.tiktok.com/upload',
+        'logged_out_markers': ['/login'],
+    },
+    'pinterest': {
+        'domains': ['pinterest.com'],
+        'auth_cookies': ['_pinterest_sess', '_auth'],
+        'probe_url': 'https://www.pinterest.com/settings/',
+        'logged_out_markers': ['/login'],
+    },
+    'reddit': {
+        'domains': ['reddit.com'],
+        'auth_cookies': ['reddit_session'],
+        'probe_url': 'https://www.reddit.com/settings/',
+        'logged_out_markers': ['/login'],
+    },
+    'linkedin': {
+        'domains': ['linkedin.com'],
+        'auth_cookies': ['li_at'],
+        'probe_url': 'https://www.linkedin.com/feed/',
+        'logged_out_markers': ['/login', '/authwall', '/uas/'],
+    },
+    'threads': {
+        'domains': ['threads.net', 'instagram.com'],
+        'auth_cookies': ['sessionid'],
+        'probe_url': 'https://www.threads.net/settings',
+        'logged_out_markers': ['/login'],
+    },
+    'youtube': {
+        'domains': ['youtube.com', 'google.com'],
+        'auth_cookies': ['SAPISID', 'SID'],
+        'probe_url': 'https://studio.youtube.com/',
+        'logged_out_markers': ['accounts.google.com', 'ServiceLogin'],
+    },
+}
+
+
+class SessionStateCache:
+    """
+    Per-platform browser session state (Playwright-style storage state:
+    cookies plus per-origin localStorage), captured after successful posts
+    and injected into new browsers so agents start already logged in.
+    
+    Validity is checked offline first (auth cookies present and unexpired),
+    then with one HTTP probe that follows redirects and looks for a login
+    page. Verdicts are trusted for ``probe_ttl`` seconds.
+    """
+    
+    def __init__(self, cache_dir: Path = SESSION_CACHE_DIR, probe_ttl: int = 1800):
+        self.cache_dir = Path(cache_dir)
+        self.probe_ttl = probe_ttl
+        self._lock = threading.Lock()
+    
+    def _path(self, platform: str) -> Path:
+        return self.cache_dir / f"{platform}.json"
+    
+    def load(self, platform: str) -> Optional[Dict[str, Any]]:
+        path = self._path(platform)
+        if not path.exists():
+            return None
+        try:
+            with open(path, 'r') as f:
+                return json.load(f)
+        except Exception as e:
+            logger.debug(f"Could not read session cache for {platform}: {e}")
+            return None
+    
+    def save(self, platform: str, state: Dict[str, Any]):
+        with self._lock:
+            try:
+                self.cache_dir.mkdir(parents=True, exist_ok=True)
+                path = self._path(platform)
+                tmp_path = path.with_suffix('.tmp')
+                with open(tmp_path, 'w') as f:
+                    json.dump(state, f)
+                os.chmod(tmp_path, 0o600)  # Session cookies are credentials
+                os.replace(tmp_path, path)
+            except Exception as e:
+                logger.warning(f"Failed to save session cache for {platform}: {e}")
+    
+    def invalidate(self, platform: str):
+        state = self.load(platform)
+        if state:
+            state['valid'] = False
+            state['probed_at'] = time.time()
+            self.save(platform, state)
+    
+    @staticmethod
+    def _for_platform(state: Dict[str, Any], platform: str) -> Dict[str, Any]:
+        """Keep only cookies/origins belonging to a platform's domains."""
+        domains = SESSION_AUTH.get(platform, {}).get('domains', [])
+        
+        def ours(host: str) -> bool:
+            host = (host or '').lstrip('.')
+            return any(host == d or host.endswith('.' + d) for d in domains)
+        
+        return {
+            'cookies': [c for c in state.get('cookies', []) if ours(c.get('domain', ''))],
+            'origins': [
+                o for o in state.get('origins', [])
+                if ours(o.get('origin', '').split('://')[-1].split('/')[0].split(':')[0])
+            ],
         }
+    
+    def has_auth_cookies(self, platform: str, state: Optional[Dict[str, Any]] = None) -> bool:
+        """Offline check: all auth cookies present and not expired."""
+        state = state if state is not None else self.load(platform)
+        auth = SESSION_AUTH.get(platform)
+        if not state or not auth:
+            return False
+        now = time.time()
+        live = {
+            c.get('name') for c in state.get('cookies', [])
+            if c.get('expires', -1) in (-1, None) or c.get('expires', -1) > now
+        }
+        return all(name in live for name in auth['auth_cookies'])
+    
+    def is_valid(self, platform: str, probe: bool = True) -> bool:
+        """Is the cached session for this platform usable right now?"""
+        state = self.load(platform)
+        if not self.has_auth_cookies(platform, state):
+            return False
+        if time.time() - state.get('probed_at', 0) < self.probe_ttl:
+            return bool(state.get('valid', False))
+        if not probe:
+            return True
+        
+        auth = SESSION_AUTH[platform]
+        try:
+            import requests
+            jar = requests.cookies.RequestsCookieJar()
+            for c in state.get('cookies', []):
+                jar.set(c['name'], c['value'], domain=c.get('domain'), path=c.get('path', '/'))
+            response = requests.get(
+                auth['probe_url'], cookies=jar, timeout=8, allow_redirects=True,
+                headers={'User-Agent': 'Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 '
+                                       '(KHTML, like Gecko) Chrome/124.0 Safari/537.36'}
+            )
+            valid = response.status_code < 400 and not any(
+                marker in response.url for marker in auth['logged_out_markers']
+            )
+        except Exception as e:
+            # Can't reach the platform: trust the cookies, don't cache a verdict
+            logger.debug(f"Session probe for {platform} failed: {e}")
+            return True
+        
+        state['valid'] = valid
+        state['probed_at'] = time.time()
+        self.save(platform, state)
+        logger.info(f"🍪 {platform} session {'valid' if valid else 'expired'} (probed)")
+        return valid
+    
+    def storage_state_for(self, platforms: List[str]) -> Optional[Dict[str, Any]]:
+        """Merged storage state of every platform with a usable cached session."""
+        merged = {'cookies': [], 'origins': []}
+        for platform in platforms:
+            state = self.load(platform)
+            if state and state.get('valid', True) and self.has_auth_cookies(platform, state):
+                merged['cookies'].extend(state.get('cookies', []))
+                merged['origins'].extend(state.get('origins', []))
+        return merged if merged['cookies'] else None
+    
+    async def capture(self, browser: Any, platform: str) -> bool:
+        """Snapshot the browser's session for a platform after a successful post."""
+        state = None
+        try:
+            export = getattr(browser, 'export_storage_state', None)
+            if export is not None:
+                state = await export()
+            if not state:
+                for name in ('_cdp_get_cookies', 'get_cookies', 'cookies'):
+                    getter = getattr(browser, name, None)
+                    if getter is not None:
+                        cookies = await getter()
+                        state = {'cookies': list(cookies or []), 'origins': []}
+                        break
+        except Exception as e:
+            logger.debug(f"Could not export session for {platform}: {e}")
+        if not state or not isinstance(state, dict):
+            return False
+        
+        state = self._for_platform(state, platform)
+        if not self.has_auth_cookies(platform, state):
+            return False
+        state.update({'saved_at': time.time(), 'probed_at': time.time(), 'valid': True})
+        self.save(platform, state)
+        return True
+    
+    async def inject(self, browser: Any, platform: str) -> bool:
+        """Push cached cookies into an already running browser."""
+        state = self.load(platform)
+        if not state or not state.get('cookies'):
+            return False
+        for name in ('_cdp_set_cookies', 'set_cookies', 'add_cookies'):
+            setter = getattr(browser, name, None)
+            if setter is not None:
+                try:
+                    await setter(state['cookies'])
+                    return True
+                except Exception as e:
+                    logger.debug(f"Cookie injection via {name} failed for {platform}: {e}")
+        return False
+    
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        """Offline view of cached sessions (for UI / diagnostics)."""
+        result = {}
+        for platform in SESSION_AUTH:
+            state = self.load(platform)
+            if state:
+                result[platform] = {
+                    'has_auth_cookies': self.has_auth_cookies(platform, state),
+                    'valid': state.get('valid'),
+                    'saved_at': state.get('saved_at'),
+                }
+        return result
+
+
+_session_cache: Optional[SessionStateCache] = None
+
+
+def get_session_cache() -> SessionStateCache:
+    """Get the global session state cache."""
+    global _session_cache
+    with _browser_pool_lock:
+        if _session_cache is None:
+            _session_cache = SessionStateCache(probe_ttl=PERF_CONFIG.session_probe_ttl)
+        return _session_cache
+
+
+# ============================================================================
+# DIRECT API FAST PATHS (skip the browser agent entirely)
+# ============================================================================
+def _pinterest_direct_post(image_path: str, caption: str, title: Optional[str] = None,
+                           link: Optional[str] = None, **kwargs) -> Optional[Dict[str, Any]]:
+    try:
+        from pinterest_api_service import PinterestAPI, post_to_pinterest as pinterest_api_post
+    except ImportError:
+        return None
+    if not PinterestAPI().is_authenticated():
+        return None
+    logger.info("📌 Using Pinterest API (fast path)")
+    return pinterest_api_post(image_path=image_path, title=title or caption[:100], description=caption, link=link)
+
+
+def _youtube_direct_post(image_path: str, caption: str, title: Optional[str] = None,
+                         description: Optional[str] = None, **kwargs) -> Optional[Dict[str, Any]]:
+    try:
+        import pickle
+        from app.utils import youtube_helper
+    except ImportError:
+        return None
+    # Only with a saved token that needs no interactive OAuth
+    token_file = Path(youtube_helper.__file__).parent / 'token.pickle'
+    if not token_file.exists():
+        return None
+    try:
+        with open(token_file, 'rb') as f:
+            credentials = pickle.load(f)
+        if not youtube_helper._check_scopes_match(credentials, youtube_helper.SCOPES):
+            return None
+        if not (credentials.valid or (credentials.expired and credentials.refresh_token)):
+            return None
+    except Exception:
+        return None
+    logger.info("📺 Using YouTube Data API (fast path)")
+    service = youtube_helper.get_youtube_service()
+    video = youtube_helper.upload_to_youtube(service, image_path, {
+        'title': title or caption[:100],
+        'description': description or caption,
+        'privacy': kwargs.get('privacy', 'unlisted'),
+    })
+    return {'success': True, **video}
+
+
+# platform -> handler(image_path, caption, **kwargs) returning a result dict,
+# or None when the direct path isn't available
+DIRECT_POST_HANDLERS: Dict[str, Callable[..., Optional[Dict[str, Any]]]] = {
+    'pinterest': _pinterest_direct_post,
+    'youtube': _youtube_direct_post,
+}
+
+
+def register_direct_poster(platform: str, handler: Callable[..., Optional[Dict[str, Any]]]):
+    """Register an API/upload fast path for a platform."""
+    DIRECT_POST_HANDLERS[platform.lower()] = handler
 
 
 # ============================================================================
@@ -591,9 +1211,10 @@ class MultiPlatformPoster:
         self.cloud_profile_id = cloud_profile_id or self.perf_config.cloud_profile_id
         self.cloud_proxy_country = cloud_proxy_country or self.perf_config.cloud_proxy_country
         
-        # Browser instance cache for reuse
-        self._browser = None
-        self._browser_lock = asyncio.Lock()
+        # Warm browsers live in the shared pool (reused across posting runs)
+        self._pool = get_browser_pool()
+        self._profile_keys: set = set()  # pool keys this poster acquired
+        self.sessions = get_session_cache()
         self._llm = None  # Cache LLM instance
         
     def get_browser_path(self) -> Optional[str]:
@@ -608,37 +1229,54 @@ class MultiPlatformPoster:
             return path
         return None
     
-    def _get_profile_directory(self) -> str:
+    def _profile_key(self, platform: Optional[str] = None) -> str:
+        """Pool key: one persistent browser context per profile"""
+        if platform and self.perf_config.profile_per_platform:
+            return f"social-media-{platform}"
+        return "social-media"
+    
+    def _get_profile_directory(self, platform: Optional[str] = None) -> str:
         """Get the browser profile directory path"""
         profile_path = os.path.expanduser(DEFAULT_PROFILE_DIR)
+        if platform and self.perf_config.profile_per_platform:
+            profile_path = f"{profile_path}-{platform}"
         os.makedirs(profile_path, exist_ok=True)
         return profile_path
     
-    async def _get_or_create_browser(self) -> 'Browser':
-        """Get cached browser or create new one (for reuse optimization)"""
-        if self.reuse_browser and self._browser:
-            return self._browser
+    def _create_browser(self, platform: Optional[str] = None) -> 'Browser':
+        """Create a new browser for a profile (started lazily by the pool)"""
+        from browser_use import Browser
         
-        async with self._browser_lock:
-            if self.reuse_browser and self._browser:
-                return self._browser
-            
-            from browser_use import Browser
-            
-            # Use new BrowserProfile API (v0.10.1)
-            try:
-                from browser_use import BrowserProfile
-                browser_profile = self._get_browser_profile()
-                self._browser = Browser(profile=browser_profile)
-            except ImportError:
-                # Fallback to old BrowserConfig for compatibility
-                from browser_use import BrowserConfig
-                browser_config = self._get_browser_config()
-                self._browser = Browser(config=browser_config)
-            
-            return self._browser
+        # Use new BrowserProfile API (v0.10.1)
+        try:
+            from browser_use import BrowserProfile
+            browser_profile = self._get_browser_profile(platform)
+            return Browser(profile=browser_profile)
+        except ImportError:
+            # Fallback to old BrowserConfig for compatibility
+            from browser_use import BrowserConfig
+            browser_config = self._get_browser_config(platform)
+            return Browser(config=browser_config)
+    
+    async def _get_or_create_browser(self, platform: Optional[str] = None) -> 'Browser':
+        """Get the warm pooled browser for this platform's profile (call on the pool loop)"""
+        key = self._profile_key(platform)
+        self._profile_keys.add(key)
+        return await self._pool.acquire(key, lambda: self._create_browser(platform))
+    
+    async def warm_up(self, platforms: List[str]):
+        """
+        Start browsers for these platforms' profiles ahead of a posting burst,
+        so the first post doesn't pay cold-start cost.
+        """
+        async def _warm():
+            for key, platform in {self._profile_key(p): p for p in platforms}.items():
+                await self._get_or_create_browser(platform)
+                await self._pool.release(key)
+        
+        await self._pool.run(_warm())
     
-    def _get_browser_profile(self) -> 'BrowserProfile':
+    def _get_browser_profile(self, platform: Optional[str] = None) -> 'BrowserProfile':
         """
         Create ENHANCED browser profile for maximum speed and stealth.
         Uses new BrowserProfile API from browser-use v0.10.1.
@@ -651,9 +1289,18 @@ class MultiPlatformPoster:
         from browser_use import BrowserProfile
         
         browser_path = self.get_browser_path()
-        profile_dir = self._get_profile_directory()
+        profile_dir = self._get_profile_directory(platform)
+        
+        # Restore cached sessions for every platform sharing this profile
+        if platform and self.perf_config.profile_per_platform:
+            session_platforms = [platform]
+        else:
+            session_platforms = list(SESSION_AUTH)
+        storage_state = self.sessions.storage_state_for(session_platforms)
+        extra = {'storage_state': storage_state} if storage_state else {}
         
         return BrowserProfile(
+            **extra,
             headless=self.headless,
             minimum_wait_page_load_time=self.perf_config.minimum_wait_page_load,
             wait_between_actions=self.perf_config.wait_between_actions,
@@ -666,15 +1313,13 @@ class MultiPlatformPoster:
         )
     
     async def _close_browser(self, force: bool = False):
-        """Close browser (only if not reusing or forced)"""
-        if (not self.reuse_browser or force) and self._browser:
-            async with self._browser_lock:
-                if self._browser:
-                    try:
-                        await self._browser.close()
-                    except Exception:
-                        pass  # Browser may already be closed
-                    self._browser = None
+        """
+        Close this poster's pooled browsers (only if not reusing or forced).
+        
+        Browsers other in-flight posts are still using stay open.
+        """
+        if not self.reuse_browser or force:
+            await self._pool.run(self._pool.close_idle(list(self._profile_keys)))
     
     async def _handle_twitter_manual_post(
         self,
@@ -799,13 +1444,70 @@ class MultiPlatformPoster:
         if platform == 'twitter':
             return await self._handle_twitter_manual_post(image_path, caption, **kwargs)
         
+        priority = kwargs.pop('priority', PLATFORM_CONFIG[platform].get('priority', 99))
+        
+        # Fast pre-check: a direct API/upload path needs zero agent steps
+        if self.perf_config.prefer_direct_api:
+            direct = await self._try_direct_post(platform, image_path, caption, **kwargs)
+            if direct is not None:
+                return direct
+        
+        async def _schedule():
+            scheduler = self._pool.scheduler(self.perf_config)
+            return await scheduler.submit(
+                platform, priority,
+                lambda queue_wait: self._post_with_agent(platform, image_path, caption, queue_wait, **kwargs)
+            )
+        
+        # Jobs run on the pool loop so warm browsers outlive the caller's loop
+        return await self._pool.run(_schedule())
+    
+    async def _try_direct_post(self, platform: str, image_path: str, caption: str, **kwargs) -> Optional[Dict[str, Any]]:
+        """Post through a registered API handler, or None to fall back to the browser."""
+        handler = DIRECT_POST_HANDLERS.get(platform)
+        if handler is None:
+            return None
+        start_time = time.time()
+        try:
+            result = await asyncio.to_thread(handler, image_path, caption, **kwargs)
+        except Exception as e:
+            logger.warning(f"{PLATFORM_CONFIG[platform]['icon']} Direct {platform} API unavailable: {e}")
+            return None
+        if not result or not result.get('success'):
+            return None
+        elapsed = time.time() - start_time
+        self.metrics.start(platform).complete(success=True, steps=0)
+        self.metrics.observe(platform, 'direct_api', elapsed)
+        logger.info(f"✅ [{PLATFORM_CONFIG[platform]['icon']}] {PLATFORM_CONFIG[platform]['name']} posted via API in {elapsed:.1f}s (0 agent steps)")
+        return {
+            **result,
+            'success': True,
+            'platform': platform,
+            'steps': 0,
+            'method': 'api',
+            'duration': f"{elapsed:.1f}s",
+        }
+    
+    async def _post_with_agent(
+        self,
+        platform: str,
+        image_path: str,
+        caption: str,
+        queue_wait: float = 0.0,
+        **kwargs
+    ) -> Dict[str, Any]:
+        """Run the browser-use agent for one post (on the pool loop, under the scheduler's caps)."""
         config = PLATFORM_CONFIG[platform]
         metrics = self.metrics.start(platform)
+        self.metrics.observe(platform, 'queue_wait', queue_wait)
+        profile_key = self._profile_key(platform)
         last_error = None
         screenshot_path = None
         agent = None
         
         for attempt in range(self.perf_config.max_retries):
+            browser = None
+            session_valid = False
             try:
                 # Import browser-use components
                 from browser_use import Agent, Browser
@@ -818,11 +1520,21 @@ class MultiPlatformPoster:
                 if self._llm is None:
                     self._llm = get_llm(self.llm_provider, self.llm_model)
                 
-                # Get or create browser (with reuse optimization)
-                browser = await self._get_or_create_browser()
+                # Get warm browser from the pool (cold start only on first use)
+                acquire_start = time.time()
+                browser = await self._get_or_create_browser(platform)
+                self.metrics.observe(platform, 'browser_acquire', time.time() - acquire_start)
+                
+                # Restore a known-good session so the agent skips the login flow
+                session_valid = await asyncio.to_thread(self.sessions.is_valid, platform)
+                if session_valid:
+                    await self.sessions.inject(browser, platform)
                 
                 # Build optimized task with smarter instructions
-                task = self._build_smart_task(platform, image_path, caption, username, password, **kwargs)
+                task = self._build_smart_task(
+                    platform, image_path, caption, username, password,
+                    session_valid=session_valid, **kwargs
+                )
                 
                 # Speed optimization context for the agent
                 speed_context = """
@@ -848,10 +1560,18 @@ Use multi-action sequences when possible. Skip unnecessary waits.
                 
                 elapsed = time.time() - start_time
                 steps = len(history.history) if hasattr(history, 'history') else 0
+                self.metrics.observe(platform, 'agent_run', elapsed)
+                for item in getattr(history, 'history', None) or []:
+                    step_seconds = getattr(getattr(item, 'metadata', None), 'duration_seconds', None)
+                    if step_seconds is not None:
+                        self.metrics.observe(platform, 'agent_step', step_seconds)
+                
+                # Remember the logged-in session for the next run
+                await self.sessions.capture(browser, platform)
                 
-                # Don't close browser if reusing
-                if not self.reuse_browser:
-                    await browser.close()
+                # Keep the browser warm unless reuse is disabled
+                await self._pool.release(profile_key, keep_warm=self.reuse_browser)
+                browser = None
                 
                 metrics.complete(success=True, steps=steps)
                 logger.info(f"✅ [{config['icon']}] {config['name']} completed in {elapsed:.1f}s ({steps} steps)")
@@ -865,6 +1585,8 @@ Use multi-action sequences when possible. Skip unnecessary waits.
                 }
                 
             except ImportError as e:
+                if browser is not None:
+                    await self._pool.release(profile_key, keep_warm=self.reuse_browser)
                 metrics.complete(success=False, error=str(e))
                 return {
                     'success': False,
@@ -886,14 +1608,20 @@ Use multi-action sequences when possible. Skip unnecessary waits.
                     except Exception as ss_err:
                         logger.debug(f"Screenshot capture failed: {ss_err}")
                 
+                if browser is not None:
+                    # A restored session may be the problem: re-probe next time
+                    if session_valid:
+                        self.sessions.invalidate(platform)
+                    
+                    # Reset browser for fresh state (kept if other posts share it)
+                    await self._pool.discard(profile_key)
+                    await self._pool.release(profile_key, keep_warm=self.reuse_browser)
+                
                 # Exponential backoff
                 if attempt < self.perf_config.max_retries - 1:
                     delay = self.perf_config.retry_base_delay * (2 ** attempt)
                     logger.info(f"⏳ Retrying in {delay:.1f}s...")
                     await asyncio.sleep(delay)
-                    
-                    # Reset browser on retry for fresh state
-                    await self._close_browser(force=True)
         
         metrics.complete(success=False, error=last_error, screenshot=screenshot_path)
         logger.error(f"❌ [{config['icon']}] {config['name']} failed after {self.perf_config.max_retries} attempts: {last_error}")
@@ -908,7 +1636,7 @@ Use multi-action sequences when possible. Skip unnecessary waits.
             result['debug_screenshot'] = screenshot_path
         return result
     
-    def _get_browser_config(self) -> 'BrowserConfig':
+    def _get_browser_config(self, platform: Optional[str] = None) -> 'BrowserConfig':
         """
         Create ENHANCED browser config for maximum speed and stealth.
         
@@ -920,7 +1648,7 @@ Use multi-action sequences when possible. Skip unnecessary waits.
         from browser_use import BrowserConfig
         
         browser_path = self.get_browser_path()
-        profile_dir = self._get_profile_directory()
+        profile_dir = self._get_profile_directory(platform)
         
         # Combine all optimized args
         extra_args = [
@@ -943,6 +1671,7 @@ Use multi-action sequences when possible. Skip unnecessary waits.
         caption: str,
         username: Optional[str],
         password: Optional[str],
+        session_valid: bool = False,
         **kwargs
     ) -> str:
         """
@@ -952,7 +1681,7 @@ Use multi-action sequences when possible. Skip unnecessary waits.
         - Clearer, more concise instructions
         - Better error recovery hints
         - Faster action sequences
-        - Session state detection
+        - Session state detection (restored sessions skip login entirely)
         """
         abs_image_path = str(Path(image_path).absolute())
         config = PLATFORM_CONFIG[platform]
@@ -970,7 +1699,9 @@ IMPORTANT RULES:
         
         # Login instructions (optimized)
         login_instructions = ""
-        if password == 'GOOGLE_OAUTH' and username:
+        if session_valid:
+            login_instructions = "Already logged in (session restored) - do NOT open login pages, go straight to posting."
+        elif password == 'GOOGLE_OAUTH' and username:
             login_instructions = f"""
 LOGIN (only if not already logged in):
 - Click "Continue with Google" or "Sign in with Google"
@@ -1027,6 +1758,9 @@ LOGIN (only if not already logged in):
         """
         Post to multiple platforms with optional PARALLEL execution.
         
+        Parallel posts go through the shared priority scheduler, which caps
+        total and per-platform concurrency; browsers stay warm afterwards.
+        
         Args:
             platforms: List of platform names
             image_path: Path to image
@@ -1052,23 +1786,20 @@ LOGIN (only if not already logged in):
             # 🚀 PARALLEL EXECUTION - Much faster!
             logger.info(f"🚀 Parallel posting to {len(sorted_platforms)} platforms...")
             
-            # Use semaphore to limit concurrent posts
-            semaphore = asyncio.Semaphore(self.perf_config.max_concurrent_posts)
-            
-            async def post_with_semaphore(platform: str) -> Tuple[str, Dict]:
-                async with semaphore:
-                    settings = platform_specific.get(platform, {})
-                    platform_caption = settings.get('caption', caption)
-                    result = await self.post_to_platform(
-                        platform=platform,
-                        image_path=image_path,
-                        caption=platform_caption,
-                        **settings
-                    )
-                    return platform, result
+            # Scheduler enforces priority order and concurrency caps
+            async def post_scheduled(platform: str) -> Tuple[str, Dict]:
+                settings = dict(platform_specific.get(platform, {}))
+                platform_caption = settings.pop('caption', caption)
+                result = await self.post_to_platform(
+                    platform=platform,
+                    image_path=image_path,
+                    caption=platform_caption,
+                    **settings
+                )
+                return platform, result
             
             # Execute all posts concurrently
-            tasks = [post_with_semaphore(p) for p in sorted_platforms]
+            tasks = [post_scheduled(p) for p in sorted_platforms]
             completed = await asyncio.gather(*tasks, return_exceptions=True)
             
             for item in completed:
@@ -1082,8 +1813,8 @@ LOGIN (only if not already logged in):
             for platform in sorted_platforms:
                 logger.info(f"📤 Posting to {platform}...")
                 
-                settings = platform_specific.get(platform, {})
-                platform_caption = settings.get('caption', caption)
+                settings = dict(platform_specific.get(platform, {}))
+                platform_caption = settings.pop('caption', caption)
                 
                 result = await self.post_to_platform(
                     platform=platform,
@@ -1098,8 +1829,8 @@ LOGIN (only if not already logged in):
                 if platform != sorted_platforms[-1]:
                     await asyncio.sleep(self.perf_config.delay_between_platforms)
         
-        # Cleanup browser if we were reusing
-        await self._close_browser(force=True)
+        # Browsers stay warm in the pool for the next run (closed if reuse is off)
+        await self._close_browser()
         
         # Report metrics
         total_time = time.time() - start_time
@@ -1170,29 +1901,7 @@ LOGIN (only if not already logged in):
         return result.get('success', False)
     
     async def post_to_pinterest(self, image_path: str, title: str, description: str, link: Optional[str] = None) -> bool:
-        """Post to Pinterest - tries API first, falls back to browser."""
-        # Try Pinterest API first (more reliable)
-        try:
-            from pinterest_api_service import PinterestAPI, post_to_pinterest as pinterest_api_post
-            
-            api = PinterestAPI()
-            if api.is_authenticated():
-                logger.info("📌 Using Pinterest API (fast path)")
-                result = pinterest_api_post(
-                    image_path=image_path,
-                    title=title,
-                    description=description,
-                    link=link
-                )
-                if result.get('success'):
-                    logger.info(f"✅ Pinterest API success: {result.get('board')}")
-                    return True
-        except ImportError:
-            pass
-        except Exception as e:
-            logger.warning(f"Pinterest API unavailable: {e}")
-        
-        # Fall back to browser automation
+        """Post to Pinterest - tries API first (fast path), falls back to browser."""
         result = await self.post_to_platform('pinterest', image_path, description, title=title, link=link)
         return result.get('success', False)
     
@@ -1212,8 +1921,11 @@ LOGIN (only if not already logged in):
         return result.get('success', False)
     
     def get_metrics_report(self) -> Dict[str, Any]:
-        """Get performance metrics report."""
-        return self.metrics.report()
+        """Get performance metrics report (includes latency histograms and pool status)."""
+        report = self.metrics.report()
+        report['browser_pool'] = self._pool.status()
+        report['sessions'] = self.sessions.status()
+        return report
 
 
 # ============================================================================
@@ -1387,6 +2099,7 @@ async def sync_local_cookies_to_cloud():
     return {
         'success': True,
         'message': 'Follow the instructions above to sync cookies',
+        'cached_sessions': get_session_cache().status(),
         'command': f'export BROWSER_USE_API_KEY={api_key[:10]}... && curl -fsSL https://browser-use.com/profile.sh | sh'
     }
 
@@ -887,8 +887,6 @@ class RequestCache:
     def clear(self):
         self._cache.clear()
 
-# Global cache instance
-_request_cache = RequestCache(ttl=OTTO_CONFIG.cache_ttl)
 
 
 # ============================================================================
@@ -2407,6 +2405,7 @@ Return a JSON workflow with this structure:
     "description": "Brief description",
     "steps": [
         {{"id": 1, "name": "Step Name", "type": "action_type", "config": {{}}, "depends_on": []}},
+        {{"id": 2, "name": "Next Step", "type": "action_type", "config": {{}}, "depends_on": [1]}},
     ],
     "triggers": ["manual"],
     "outputs": []
@@ -3760,6 +3759,8 @@ class TaskStep:
     started_at: datetime = None
     completed_at: datetime = None
     artifacts: List[Dict] = field(default_factory=list)  # Generated files, URLs, etc.
+    depends_on: Optional[List[int]] = None  # Step numbers (1-based); None/[] = previous step
+    parallel_group: Optional[int] = None
 
 
 @dataclass
@@ -3809,7 +3810,9 @@ class OttoEngine:
         self._metrics: Dict[str, List[float]] = {
             'analysis_time': [],
             'execution_time': [],
-            'api_calls': []
+            'api_calls': [],
+            'step_queue_time': [],  # Ready -> started (waiting on a worker/cap)
+            'step_run_time': []     # Started -> finished (including retries)
         }
         
         logger.info("🧠 Otto Engine ENHANCED initialized")
@@ -3834,18 +3837,35 @@ class OttoEngine:
         Use AI to deeply analyze the user's request with ENHANCED intelligence.
         
         Features:
-        - Request caching for repeated queries
+        - Plan cache keyed on the normalized intent template
+        - Rule-based fast path for common intents (LLM fills the cache in background)
         - Smarter prompt engineering
         - Better dependency detection
         - Cost/time estimation
         - Knowledge Base context injection
         - App state awareness
         """
-        # Check cache first
-        cached = _request_cache.get(user_request)
-        if cached:
-            return cached
+        from app.services.plan_cache import get_plan_cache
+        start_time = time.time()
+        result = get_plan_cache().resolve(
+            "otto", user_request,
+            llm_planner=lambda: self._llm_analyze_request(user_request),
+            fast_planner=lambda: self._fallback_analysis(user_request)
+        )
+        self._metrics['analysis_time'].append(time.time() - start_time)
+        if result:
+            return result
         
+        # Fallback analysis
+        return self._fallback_analysis(user_request)
+    
+    def get_planning_stats(self) -> Dict[str, Any]:
+        """Plan cache hit rate and planning latency saved."""
+        from app.services.plan_cache import get_plan_cache
+        return get_plan_cache().stats()
+    
+    def _llm_analyze_request(self, user_request: str) -> Optional[Dict[str, Any]]:
+        """Ask the LLM for an analysis of the request; returns None if it fails."""
         start_time = time.time()
         
         # Get knowledge base context
@@ -3878,7 +3898,8 @@ AVAILABLE CAPABILITIES (use the most efficient combination):
 9. AI ASSISTANTS - Brand builder, outreach, campaign, design, content
 
 OPTIMIZATION RULES:
-- Steps with NO dependencies can run in PARALLEL (mark "parallel_group" same number)
+- List in "depends_on" the step numbers whose output a step uses; every step after the first needs at least one
+- Steps that only depend on earlier steps (not on each other) can run in PARALLEL (mark "parallel_group" same number)
 - Use the fastest model that meets quality requirements
 - Batch similar operations together
 - Minimize API calls
@@ -3902,6 +3923,17 @@ RESPOND IN THIS EXACT JSON FORMAT:
             "parallel_group": 1,
             "estimated_time": "30 seconds",
             "estimated_cost": "$0.01"
+        }},
+        {{
+            "step_number": 2,
+            "name": "Step Name",
+            "description": "What this step does with step 1's output",
+            "task_type": "publish",
+            "service": "printify",
+            "depends_on": [1],
+            "parallel_group": 2,
+            "estimated_time": "30 seconds",
+            "estimated_cost": "$0.00"
         }}
     ],
     "expected_outputs": ["List of what will be produced"],
@@ -3922,12 +3954,7 @@ Be specific, actionable, and EFFICIENT."""
             if json_match:
                 result = json.loads(json_match.group())
                 
-                # Cache the result
-                _request_cache.set(user_request, result)
-                
-                # Track metrics
                 elapsed = time.time() - start_time
-                self._metrics['analysis_time'].append(elapsed)
                 logger.info(f"📊 Analysis completed in {elapsed:.2f}s")
                 
                 return result
@@ -3935,13 +3962,13 @@ Be specific, actionable, and EFFICIENT."""
         except Exception as e:
             logger.error(f"Request analysis failed: {e}")
         
-        # Fallback analysis
-        return self._fallback_analysis(user_request)
+        return None
     
     def _fallback_analysis(self, request: str) -> Dict[str, Any]:
         """Simple pattern-based analysis as fallback."""
         request_lower = request.lower()
         steps = []
+        design_step = video_step = None
         
         # Detect task types from keywords
         if any(w in request_lower for w in ['design', 'image', 'create', 'make', 'generate']):
@@ -3955,6 +3982,7 @@ Be specific, actionable, and EFFICIENT."""
                     "depends_on": [],
                     "estimated_time": "30 seconds"
                 })
+                design_step = 1
         
         if any(w in request_lower for w in ['video', 'commercial', 'promo', 'ad']):
             steps.append({
@@ -3963,9 +3991,10 @@ Be specific, actionable, and EFFICIENT."""
                 "description": "Create promotional video",
                 "task_type": "video",
                 "service": "replicate",
-                "depends_on": [1] if steps else [],
+                "depends_on": [design_step] if design_step else [],
                 "estimated_time": "2 minutes"
             })
+            video_step = len(steps)
         
         if any(w in request_lower for w in ['printify', 'print', 'mockup']):
             steps.append({
@@ -3974,7 +4003,7 @@ Be specific, actionable, and EFFICIENT."""
                 "description": "Create product on Printify",
                 "task_type": "publish",
                 "service": "printify",
-                "depends_on": [1] if steps else [],
+                "depends_on": [design_step] if design_step else ([len(steps)] if steps else []),
                 "estimated_time": "30 seconds"
             })
         
@@ -3985,7 +4014,7 @@ Be specific, actionable, and EFFICIENT."""
                 "description": "Publish video to YouTube",
                 "task_type": "publish",
                 "service": "youtube",
-                "depends_on": [],
+                "depends_on": [video_step] if video_step else ([len(steps)] if steps else []),
                 "estimated_time": "1 minute"
             })
         
@@ -3996,7 +4025,7 @@ Be specific, actionable, and EFFICIENT."""
                 "description": "Share on social platforms",
                 "task_type": "social",
                 "service": "browser",
-                "depends_on": [],
+                "depends_on": list(range(1, len(steps) + 1)),
                 "estimated_time": "1 minute"
             })
         
@@ -4027,11 +4056,14 @@ Be specific, actionable, and EFFICIENT."""
         
         steps = []
         for step_data in analysis.get("steps", []):
+            depends_on = step_data.get("depends_on")
             step = TaskStep(
                 id=str(uuid.uuid4())[:8],
                 name=step_data.get("name", "Step"),
                 description=step_data.get("description", ""),
-                task_type=TaskType(step_data.get("task_type", "general"))
+                task_type=TaskType(step_data.get("task_type", "general")),
+                depends_on=[int(d) for d in depends_on if str(d).isdigit()] if isinstance(depends_on, list) else None,
+                parallel_group=step_data.get("parallel_group")
             )
             steps.append(step)
         
@@ -4054,10 +4086,13 @@ Be specific, actionable, and EFFICIENT."""
         Execute a task plan with PARALLEL execution for independent steps.
         
         ENHANCED Features:
-        - Parallel execution of independent steps
+        - Dependency-driven scheduling: a step starts as soon as the steps it
+          depends on finish (no group barriers)
+        - Bounded workers (max_concurrent_tasks) that pull any ready step,
+          with at most parallel_batch_size concurrent steps per task type
         - Smart retry with exponential backoff
         - Real-time progress updates
-        - Performance metrics tracking
+        - Performance metrics tracking (per-step queue vs run time)
         
         Args:
             plan: The TaskPlan to execute
@@ -4068,108 +4103,115 @@ Be specific, actionable, and EFFICIENT."""
         plan.started_at = datetime.now()
         start_time = time.time()
         
-        total_steps = len(plan.steps)
+        steps = plan.steps
+        total_steps = len(steps)
+        dependencies = self._resolve_dependencies(steps)
+        dependents: Dict[int, List[int]] = {i: [] for i in range(total_steps)}
+        for i, deps in dependencies.items():
+            for d in deps:
+                dependents[d].append(i)
+        remaining = {i: len(deps) for i, deps in dependencies.items()}
+        
+        ready: List[int] = [i for i, n in remaining.items() if n == 0]
+        ready_at: Dict[int, float] = {i: time.time() for i in ready}
+        running_by_type: Dict[TaskType, int] = {}
+        state = {"running": 0, "completed": 0, "abort": False}
+        cond = asyncio.Condition()
         
-        # Group steps by parallel_group for concurrent execution
         if OTTO_CONFIG.enable_parallel_steps:
-            step_groups = self._group_parallel_steps(plan.steps)
+            worker_count = max(1, min(OTTO_CONFIG.max_concurrent_tasks, total_steps))
+            type_cap = max(1, OTTO_CONFIG.parallel_batch_size)
         else:
-            step_groups = [[step] for step in plan.steps]
-        
-        completed_count = 0
-        
-        for group_idx, step_group in enumerate(step_groups):
-            if len(step_group) > 1:
-                # Execute steps in parallel
-                logger.info(f"⚡ Executing {len(step_group)} steps in parallel")
-                tasks = []
-                for step in step_group:
-                    step.status = "running"
-                    step.started_at = datetime.now()
-                    tasks.append(self._execute_step_with_retry(step, plan.context))
-                
-                # Wait for all parallel steps
-                results = await asyncio.gather(*tasks, return_exceptions=True)
-                
-                for step, result in zip(step_group, results):
-                    completed_count += 1
-                    if isinstance(result, Exception):
-                        step.status = "failed"
-                        step.error = str(result)
-                        logger.error(f"Step {step.name} failed: {result}")
-                    else:
-                        step.result = result
-                        step.status = "completed"
-                        if result.get("artifacts"):
-                            step.artifacts = result["artifacts"]
-                            plan.context["latest_artifacts"] = result["artifacts"]
-                    
-                    step.completed_at = datetime.now()
-                    
-                    if progress_callback:
-                        progress_callback({
-                            "step": completed_count,
-                            "total": total_steps,
-                            "name": step.name,
-                            "status": step.status,
-                            "result": step.result if step.status == "completed" else None,
-                            "error": step.error if step.status == "failed" else None
-                        })
-            else:
-                # Execute single step
-                step = step_group[0]
+            worker_count, type_cap = 1, 1
+        
+        def _next_ready() -> Optional[int]:
+            for i in sorted(ready):
+                if running_by_type.get(steps[i].task_type, 0) < type_cap:
+                    ready.remove(i)
+                    return i
+            return None
+        
+        def _done() -> bool:
+            return state["completed"] == total_steps or (state["abort"] and state["running"] == 0)
+        
+        async def _worker():
+            while True:
+                async with cond:
+                    index = None
+                    while True:
+                        if _done() or state["abort"]:
+                            return
+                        index = _next_ready()
+                        if index is not None:
+                            break
+                        if state["running"] == 0 and not ready:
+                            # Dependency cycle or unknown reference: release the earliest blocked step
+                            blocked = sorted(i for i, n in remaining.items() if n > 0)
+                            if not blocked:
+                                return
+                            remaining[blocked[0]] = 0
+                            ready.append(blocked[0])
+                            ready_at[blocked[0]] = time.time()
+                            continue
+                        await cond.wait()
+                    step = steps[index]
+                    state["running"] += 1
+                    running_by_type[step.task_type] = running_by_type.get(step.task_type, 0) + 1
+                
+                queued = time.time() - ready_at.get(index, start_time)
+                self._metrics['step_queue_time'].append(queued)
                 step.status = "running"
                 step.started_at = datetime.now()
-                completed_count += 1
-                
                 if progress_callback:
                     progress_callback({
-                        "step": completed_count,
+                        "step": state["completed"] + 1,
                         "total": total_steps,
                         "name": step.name,
                         "status": "running"
                     })
                 
+                run_start = time.time()
                 try:
                     result = await self._execute_step_with_retry(step, plan.context)
-                    
                     step.result = result
                     step.status = "completed"
-                    step.completed_at = datetime.now()
-                    
-                    plan.context[f"step_{completed_count}_result"] = result
+                    plan.context[f"step_{index + 1}_result"] = result
                     if result.get("artifacts"):
                         step.artifacts = result["artifacts"]
                         plan.context["latest_artifacts"] = result["artifacts"]
-                    
-                    if progress_callback:
-                        progress_callback({
-                            "step": completed_count,
-                            "total": total_steps,
-                            "name": step.name,
-                            "status": "completed",
-                            "result": result
-                        })
-                    
                 except Exception as e:
                     logger.error(f"Step {step.name} failed: {e}")
                     step.status = "failed"
                     step.error = str(e)
-                    step.completed_at = datetime.now()
-                    
+                step.completed_at = datetime.now()
+                self._metrics['step_run_time'].append(time.time() - run_start)
+                
+                async with cond:
+                    state["running"] -= 1
+                    state["completed"] += 1
+                    running_by_type[step.task_type] -= 1
+                    # Continue with other steps unless critical
+                    if step.status == "failed" and step.task_type in [TaskType.DESIGN]:
+                        plan.status = "failed"
+                        state["abort"] = True
+                    for dependent in dependents[index]:
+                        remaining[dependent] -= 1
+                        if remaining[dependent] == 0:
+                            ready.append(dependent)
+                            ready_at[dependent] = time.time()
                     if progress_callback:
                         progress_callback({
-                            "step": completed_count,
+                            "step": state["completed"],
                             "total": total_steps,
                             "name": step.name,
-                            "status": "failed",
-                            "error": str(e)
+                            "status": step.status,
+                            "result": step.result if step.status == "completed" else None,
+                            "error": step.error if step.status == "failed" else None
                         })
-                    
-                    # Continue with other steps unless critical
-                    if step.task_type in [TaskType.DESIGN]:
-                        plan.status = "failed"
-                        break
+                    cond.notify_all()
+        
+        if total_steps:
+            await asyncio.gather(*(_worker() for _ in range(worker_count)))
         
         # Mark plan as completed
         if plan.status != "failed":
@@ -4186,28 +4228,27 @@ Be specific, actionable, and EFFICIENT."""
         
         return plan
     
-    def _group_parallel_steps(self, steps: List[TaskStep]) -> List[List[TaskStep]]:
-        """Group steps that can run in parallel based on dependencies."""
-        groups = []
-        current_group = []
-        last_group_num = None
-        
-        for step in steps:
-            # Check for parallel_group in the step context
-            group_num = getattr(step, 'parallel_group', None)
-            
-            if group_num is not None and group_num == last_group_num:
-                current_group.append(step)
-            else:
-                if current_group:
-                    groups.append(current_group)
-                current_group = [step]
-                last_group_num = group_num
-        
-        if current_group:
-            groups.append(current_group)
+    def _resolve_dependencies(self, steps: List[TaskStep]) -> Dict[int, List[int]]:
+        """
+        Map each step index to the indices it must wait for.
         
-        return groups if groups else [[step] for step in steps]
+        Explicit ``depends_on`` step numbers win. A missing or empty list
+        (planners emit ``[]`` by default) means the step waits for the previous
+        step, except that consecutive steps sharing a ``parallel_group`` wait
+        on the same predecessors as the group's first step.
+        """
+        deps: Dict[int, List[int]] = {}
+        for i, step in enumerate(steps):
+            explicit = {d - 1 for d in step.depends_on or [] if 0 < d <= len(steps) and d - 1 != i}
+            if explicit:
+                deps[i] = sorted(explicit)
+            elif i == 0:
+                deps[i] = []
+            elif step.parallel_group is not None and steps[i - 1].parallel_group == step.parallel_group:
+                deps[i] = list(deps[i - 1])
+            else:
+                deps[i] = [i - 1]
+        return deps
     
     async def _execute_step_with_retry(self, step: TaskStep, context: Dict) -> Dict[str, Any]:
         """Execute a step with exponential backoff retry."""
@@ -147,13 +147,119 @@ def run_in_background(func: Callable, *args, **kwargs):
 # ============================================
 
 class CheckpointManager:
-    """Manage checkpoints for long-running workflows"""
+    """
+    Manage checkpoints for long-running workflows.
+    
+    Besides the per-phase ``save``/``load`` files, stages and the items inside
+    them can be recorded in ``.checkpoints/manifest.json`` keyed by a hash of
+    their inputs. A stage or item counts as done only while its inputs hash
+    is unchanged and every artifact it recorded still exists on disk.
+    """
+    
+    MANIFEST_NAME = "manifest.json"
     
     def __init__(self, campaign_dir):
         from pathlib import Path
+        import threading
         self.campaign_dir = Path(campaign_dir)
         self.checkpoint_dir = self.campaign_dir / ".checkpoints"
         self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        self.manifest_path = self.checkpoint_dir / self.MANIFEST_NAME
+        self._lock = threading.Lock()
+        self._manifest = self._load_manifest()
+    
+    @staticmethod
+    def inputs_hash(inputs: Any) -> str:
+        """Stable hash of JSON-serializable stage inputs"""
+        import json
+        import hashlib
+        payload = json.dumps(inputs, sort_keys=True, default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()[:16]
+    
+    @staticmethod
+    def file_hash(path) -> str:
+        """Content hash of a file, for inputs that are files on disk"""
+        import hashlib
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(chunk)
+        return digest.hexdigest()[:16]
+    
+    def _load_manifest(self) -> dict:
+        import json
+        if self.manifest_path.exists():
+            try:
+                with open(self.manifest_path) as f:
+                    return json.load(f)
+            except (OSError, ValueError) as e:
+                logger.warning(f"Ignoring unreadable checkpoint manifest: {e}")
+        return {"stages": {}}
+    
+    def _write_manifest(self):
+        import os
+        import json
+        tmp_path = self.manifest_path.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(self._manifest, f, indent=2, default=str)
+        os.replace(tmp_path, self.manifest_path)
+    
+    @staticmethod
+    def _artifacts_present(entry: dict) -> bool:
+        from pathlib import Path
+        return all(Path(a).exists() for a in entry.get("artifacts", []))
+    
+    def _stage(self, stage: str) -> dict:
+        return self._manifest["stages"].setdefault(stage, {"items": {}})
+    
+    def is_stage_current(self, stage: str, inputs_hash: str) -> bool:
+        """True if stage completed with these inputs and its artifacts exist"""
+        with self._lock:
+            entry = self._manifest["stages"].get(stage)
+        return bool(
+            entry and entry.get("completed_at")
+            and entry.get("inputs_hash") == inputs_hash
+            and self._artifacts_present(entry)
+        )
+    
+    def get_stage(self, stage: str) -> dict:
+        """Data recorded for a completed stage"""
+        with self._lock:
+            return dict(self._manifest["stages"].get(stage, {}).get("data") or {})
+    
+    def complete_stage(self, stage: str, inputs_hash: str, data: dict = None, artifacts: List[str] = None):
+        """Record a finished stage with its inputs hash, data and artifacts"""
+        from datetime import datetime
+        with self._lock:
+            entry = self._stage(stage)
+            entry.update({
+                "inputs_hash": inputs_hash,
+                "data": data or {},
+                "artifacts": [str(a) for a in (artifacts or [])],
+                "completed_at": datetime.now().isoformat()
+            })
+            self._write_manifest()
+        logger.info(f"Checkpoint saved: {stage}")
+    
+    def get_item(self, stage: str, key: str, inputs_hash: str) -> dict:
+        """Data for a completed item, or None if missing or stale"""
+        with self._lock:
+            entry = self._manifest["stages"].get(stage, {}).get("items", {}).get(key)
+        if entry and entry.get("inputs_hash") == inputs_hash and self._artifacts_present(entry):
+            return entry.get("data") or {}
+        return None
+    
+    def record_item(self, stage: str, key: str, inputs_hash: str, data: dict = None, artifacts: List[str] = None):
+        """Record one finished item inside a stage (thread-safe)"""
+        from datetime import datetime
+        with self._lock:
+            self._stage(stage)["items"][key] = {
+                "inputs_hash": inputs_hash,
+                "data": data or {},
+                "artifacts": [str(a) for a in (artifacts or [])],
+                "completed_at": datetime.now().isoformat()
+            }
+            self._write_manifest()
     
     def save(self, phase: str, data: dict):
         """Save checkpoint for a phase"""
@@ -183,6 +289,8 @@ class CheckpointManager:
         if self.checkpoint_dir.exists():
             shutil.rmtree(self.checkpoint_dir)
         self.checkpoint_dir.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            self._manifest = {"stages": {}}
 
 
 # ============================================
@@ -0,0 +1,439 @@
+"""
+PLAN CACHE
+==========
+Planning fast path shared by EnhancedTaskQueue and OttoEngine.
+
+Requests are normalized into an intent template plus parameters:
+
+    "Make 5 mugs about Space Cats"  ->  "make {count} mugs about {topic}"
+                                        {"count": "5", "topic": "Space Cats"}
+
+Plans are stored per template with their parameter values swapped for
+placeholders, so "make 3 mugs about dogs" reuses the same plan. Whole values
+(a "topic" field, a "count" field) and whole-word mentions in free text
+("Design 3 mugs about dogs") are swapped. A template whose plan still can't
+be cached is remembered for the TTL so it doesn't trigger LLM fills. When
+there is no cached plan, a local classifier answers common intents with the
+caller's rule-based planner and an LLM plan is generated in the background to
+fill the cache. The LLM is only on the critical path for unfamiliar requests.
+"""
+
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+PLAN_CACHE_FILE = Path.home() / ".pod_wizard" / "plan_cache.json"
+# Bumped when the stored plan format changes; older caches are discarded
+PLAN_CACHE_VERSION = 2
+
+# Exemplar phrasings for intents the rule-based planners handle well.
+FAST_PATH_INTENTS: Dict[str, list] = {
+    "product_batch": [
+        "make mugs about",
+        "create t-shirts about",
+        "make hoodie designs",
+        "design posters products",
+        "create products printify",
+    ],
+    "social_post": [
+        "post to all socials",
+        "tweet about",
+        "share on social media",
+        "post on twitter",
+    ],
+    "promo_video": [
+        "make a promo video",
+        "create a commercial video",
+        "animate product video",
+    ],
+    "blog_post": [
+        "write a blog post about",
+        "publish blog to shopify",
+    ],
+}
+
+_STOPWORDS = {"a", "an", "the", "to", "on", "of", "my", "for", "some", "me", "please", "and", "all"}
+
+_TOPIC_RE = re.compile(
+    r"\b(about|featuring|themed|called|named)\s+(.+?)(?=\s+(?:and|then|with|to|on)\s|[,.;!?]|$)",
+    re.IGNORECASE
+)
+_QUOTED_RE = re.compile(r"[\"“]([^\"”]+)[\"”]")
+_NUMBER_RE = re.compile(r"\b\d+\b")
+
+
+def normalize_intent(request: str) -> Tuple[str, Dict[str, str]]:
+    """
+    Split a request into a normalized template and its parameters.
+
+    Args:
+        request: Raw user request
+
+    Returns:
+        (template, params) where template has {placeholders} for params
+    """
+    text = " ".join(request.split())
+    params: Dict[str, str] = {}
+
+    def _take(name: str, value: str) -> str:
+        key = name if name not in params else f"{name}_{len(params) + 1}"
+        params[key] = value
+        return "{" + key + "}"
+
+    text = _QUOTED_RE.sub(lambda m: _take("text", m.group(1)), text)
+    text = _TOPIC_RE.sub(lambda m: f"{m.group(1)} " + _take("topic", m.group(2).strip()), text)
+    text = _NUMBER_RE.sub(lambda m: _take("count", m.group(0)), text)
+
+    template = re.sub(r"[^\w{}\s-]", " ", text.lower())
+    template = " ".join(template.split())
+    return template, params
+
+
+def _tokens(template: str) -> set:
+    words = re.sub(r"\{[^}]*\}", " ", template).replace("-", " ").split()
+    return {w.rstrip("s") if len(w) > 3 else w for w in words if w not in _STOPWORDS}
+
+
+def classify_intent(template: str) -> Tuple[Optional[str], float]:
+    """
+    Match a template against the fast-path intents by token overlap.
+
+    Returns:
+        (intent, score) with intent None when nothing matches
+    """
+    tokens = _tokens(template)
+    if not tokens:
+        return None, 0.0
+    best, best_score = None, 0.0
+    for intent, exemplars in FAST_PATH_INTENTS.items():
+        for exemplar in exemplars:
+            ex_tokens = _tokens(exemplar)
+            overlap = len(tokens & ex_tokens)
+            if not overlap:
+                continue
+            score = overlap / ((len(tokens) * len(ex_tokens)) ** 0.5)
+            if score > best_score:
+                best, best_score = intent, score
+    return best, best_score
+
+
+# Plan keys whose integer values come from a {count} parameter
+_COUNT_KEYS = {"count", "quantity", "num_products", "num_designs", "num_items", "num_videos", "number"}
+
+
+def _is_count(name: str) -> bool:
+    return name == "count" or name.startswith("count_")
+
+
+def _mention_pattern(name: str, value: str) -> str:
+    # Counts only match standalone between spaces, so model IDs like
+    # "flux-1.1-pro" or ratios like "1:1" are left alone
+    if _is_count(name):
+        return rf"(?<!\S){re.escape(value)}(?!\S)"
+    return rf"(?<!\w){re.escape(value)}(?!\w)"
+
+
+def _parameterize(obj: Any, params: Dict[str, str], key: Optional[str] = None) -> Any:
+    """
+    Replace parameter values inside a plan with {{name}} markers.
+
+    A string equal to a topic/text value, or an integer equal to a count under
+    one of the _COUNT_KEYS, becomes a whole-value marker. Whole-word mentions
+    inside free text become inline markers; topic/text values go first so a
+    count inside a topic stays part of the topic.
+    """
+    if isinstance(obj, str):
+        for name, value in params.items():
+            if _is_count(name):
+                if key in _COUNT_KEYS and obj.strip() == value:
+                    return "{{" + name + "}}"
+            elif obj.strip().lower() == value.lower():
+                return "{{" + name + "}}"
+        ordered = sorted(params.items(), key=lambda item: _is_count(item[0]))
+        for name, value in ordered:
+            if value:
+                obj = re.sub(_mention_pattern(name, value), "{{" + name + "}}", obj, flags=re.IGNORECASE)
+        return obj
+    if isinstance(obj, int) and not isinstance(obj, bool):
+        if key in _COUNT_KEYS:
+            for name, value in params.items():
+                if _is_count(name) and str(obj) == value:
+                    return "{{int:" + name + "}}"
+        return obj
+    if isinstance(obj, dict):
+        return {k: _parameterize(v, params, k) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_parameterize(v, params, key) for v in obj]
+    return obj
+
+
+def _mentions_params(obj: Any, params: Dict[str, str]) -> bool:
+    """
+    True if the parameterized plan still contains one of the parameter values.
+
+    Such a plan is specific to this request and would be wrong for other
+    values, so it isn't cached.
+    """
+    if isinstance(obj, str):
+        return any(
+            value and re.search(_mention_pattern(name, value), obj, flags=re.IGNORECASE)
+            for name, value in params.items()
+        )
+    if isinstance(obj, dict):
+        return any(_mentions_params(v, params) for v in obj.values())
+    if isinstance(obj, list):
+        return any(_mentions_params(v, params) for v in obj)
+    return False
+
+
+_MARKER_RE = re.compile(r"\{\{(\w+)\}\}")
+
+
+def _instantiate(obj: Any, params: Dict[str, str]) -> Any:
+    """Fill {{name}} markers in a cached plan with this request's values."""
+    if isinstance(obj, str):
+        if obj.startswith("{{int:") and obj.endswith("}}"):
+            value = params.get(obj[6:-2])
+            return int(value) if value is not None and value.isdigit() else obj
+        return _MARKER_RE.sub(lambda m: params.get(m.group(1), m.group(0)), obj)
+    if isinstance(obj, dict):
+        return {k: _instantiate(v, params) for k, v in obj.items()}
+    if isinstance(obj, list):
+        return [_instantiate(v, params) for v in obj]
+    return obj
+
+
+class PlanCache:
+    """
+    Persistent cache of parameterized plans keyed by namespace + intent template.
+
+    Usage:
+        cache = get_plan_cache()
+        plan = cache.resolve("task_queue", description,
+                             llm_planner=lambda: ask_llm(description),
+                             fast_planner=lambda: rule_plan(description))
+    """
+
+    def __init__(
+        self,
+        path: Path = PLAN_CACHE_FILE,
+        ttl: int = 7 * 24 * 3600,
+        fast_path_threshold: float = 0.6,
+        fast_path_max_tokens: int = 12
+    ):
+        self.path = Path(path)
+        self.ttl = ttl
+        self.fast_path_threshold = fast_path_threshold
+        self.fast_path_max_tokens = fast_path_max_tokens
+        self._lock = threading.Lock()
+        self._filling: set = set()
+        self._uncacheable: Dict[str, float] = {}  # key -> when its plan was refused
+        self._filler = ThreadPoolExecutor(max_workers=1, thread_name_prefix="plan-cache-fill")
+        self._data = self._load()
+        self._stats = {
+            "requests": 0, "hits": 0, "fast_path": 0, "llm_plans": 0,
+            "background_fills": 0, "served_seconds": 0.0
+        }
+
+    # ----- persistence -----
+
+    def _load(self) -> Dict:
+        if self.path.exists():
+            try:
+                with open(self.path, "r") as f:
+                    data = json.load(f)
+                if data.get("version") != PLAN_CACHE_VERSION:
+                    data["plans"] = {}
+                data["version"] = PLAN_CACHE_VERSION
+                data.setdefault("plans", {})
+                data.setdefault("llm_latency_avg", 0.0)
+                data.setdefault("llm_samples", 0)
+                return data
+            except Exception as e:
+                logger.warning(f"Failed to load plan cache: {e}")
+        return {"version": PLAN_CACHE_VERSION, "plans": {}, "llm_latency_avg": 0.0, "llm_samples": 0}
+
+    def _save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(self._data, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            logger.warning(f"Failed to save plan cache: {e}")
+
+    @staticmethod
+    def _key(namespace: str, template: str) -> str:
+        return hashlib.sha256(f"{namespace}\n{template}".encode()).hexdigest()[:24]
+
+    # ----- cache operations -----
+
+    def get(self, namespace: str, template: str, params: Dict[str, str]) -> Optional[Dict]:
+        with self._lock:
+            entry = self._data["plans"].get(self._key(namespace, template))
+            if not entry:
+                return None
+            if time.time() - entry["created"] > self.ttl:
+                del self._data["plans"][self._key(namespace, template)]
+                return None
+            entry["hits"] = entry.get("hits", 0) + 1
+            plan = entry["plan"]
+        return _instantiate(plan, params)
+
+    def put(self, namespace: str, template: str, params: Dict[str, str], plan: Dict) -> bool:
+        """Cache a plan under its template; False if it is specific to this request."""
+        parameterized = _parameterize(plan, params)
+        if _mentions_params(parameterized, params):
+            logger.debug(f"Plan still mentions request values, not caching: {template}")
+            with self._lock:
+                self._uncacheable[self._key(namespace, template)] = time.time()
+            return False
+        with self._lock:
+            self._data["plans"][self._key(namespace, template)] = {
+                "template": template,
+                "plan": parameterized,
+                "created": time.time(),
+                "hits": 0
+            }
+            self._save()
+        return True
+
+    def _record_llm_latency(self, elapsed: float):
+        with self._lock:
+            n = self._data["llm_samples"] + 1
+            avg = self._data["llm_latency_avg"]
+            self._data["llm_latency_avg"] = avg + (elapsed - avg) / n
+            self._data["llm_samples"] = n
+
+    def _fill_async(self, namespace: str, template: str, params: Dict[str, str],
+                    llm_planner: Callable[[], Optional[Dict]]):
+        key = self._key(namespace, template)
+        with self._lock:
+            if key in self._filling:
+                return
+            refused = self._uncacheable.get(key)
+            if refused is not None:
+                if time.time() - refused < self.ttl:
+                    return
+                del self._uncacheable[key]
+            self._filling.add(key)
+
+        def _fill():
+            try:
+                start = time.time()
+                plan = llm_planner()
+                if plan:
+                    self._record_llm_latency(time.time() - start)
+                    if self.put(namespace, template, params, plan):
+                        with self._lock:
+                            self._stats["background_fills"] += 1
+            except Exception as e:
+                logger.debug(f"Background plan fill failed: {e}")
+            finally:
+                with self._lock:
+                    self._filling.discard(key)
+
+        self._filler.submit(_fill)
+
+    def resolve(
+        self,
+        namespace: str,
+        request: str,
+        llm_planner: Callable[[], Optional[Dict]],
+        fast_planner: Optional[Callable[[], Dict]] = None,
+        background_fill: bool = True
+    ) -> Optional[Dict]:
+        """
+        Get a plan from the cache, the fast path, or the LLM (in that order).
+
+        Args:
+            namespace: Planner namespace (plans differ in shape per engine)
+            request: Raw user request
+            llm_planner: Returns an LLM plan for this request, or None on failure
+            fast_planner: Returns a rule-based plan for this request
+            background_fill: Warm the cache with an LLM plan after a fast-path answer
+
+        Returns:
+            Plan dict with a "planner_source" key, or None if the LLM failed
+        """
+        start = time.time()
+        template, params = normalize_intent(request)
+        with self._lock:
+            self._stats["requests"] += 1
+
+        plan = self.get(namespace, template, params)
+        if plan is not None:
+            self._mark_served("hits", start)
+            logger.info(f"🎯 Plan cache hit: {template}")
+            plan["planner_source"] = "cache"
+            return plan
+
+        intent, score = classify_intent(template)
+        if (fast_planner and intent and score >= self.fast_path_threshold
+                and len(template.split()) <= self.fast_path_max_tokens):
+            plan = fast_planner()
+            self._mark_served("fast_path", start)
+            logger.info(f"⚡ Fast-path plan ({intent}, score {score:.2f}): {template}")
+            if background_fill:
+                self._fill_async(namespace, template, params, llm_planner)
+            plan["planner_source"] = "fast_path"
+            return plan
+
+        plan = llm_planner()
+        elapsed = time.time() - start
+        if plan:
+            self._record_llm_latency(elapsed)
+            self.put(namespace, template, params, plan)
+            with self._lock:
+                self._stats["llm_plans"] += 1
+            plan["planner_source"] = "llm"
+        return plan
+
+    def _mark_served(self, counter: str, start: float):
+        with self._lock:
+            self._stats[counter] += 1
+            self._stats["served_seconds"] += time.time() - start
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit rate and estimated planning latency saved versus always calling the LLM."""
+        with self._lock:
+            s = dict(self._stats)
+            avg_llm = self._data["llm_latency_avg"]
+            cached_plans = len(self._data["plans"])
+            uncacheable = len(self._uncacheable)
+        answered = s["hits"] + s["fast_path"]
+        s["hit_rate"] = (s["hits"] / s["requests"]) if s["requests"] else 0.0
+        s["fast_path_rate"] = (answered / s["requests"]) if s["requests"] else 0.0
+        s["avg_llm_latency"] = avg_llm
+        s["latency_saved_seconds"] = max(0.0, answered * avg_llm - s.pop("served_seconds"))
+        s["cached_plans"] = cached_plans
+        s["uncacheable_templates"] = uncacheable
+        return s
+
+    def clear(self):
+        with self._lock:
+            self._data["plans"] = {}
+            self._save()
+
+
+_plan_cache: Optional[PlanCache] = None
+_plan_cache_lock = threading.Lock()
+
+
+def get_plan_cache() -> PlanCache:
+    """Get the global plan cache instance."""
+    global _plan_cache
+    with _plan_cache_lock:
+        if _plan_cache is None:
+            _plan_cache = PlanCache()
+        return _plan_cache
@@ -39,10 +39,15 @@ Usage in autonomous_business_platform.py:
 import streamlit as st
 import os
 from app.services.secure_config import get_api_key
+import re
 import time
+import logging
+import threading
 from typing import Any, Dict, Optional, Callable
 from functools import wraps
 
+logger = logging.getLogger(__name__)
+
 # Import our new modules
 try:
     from api_usage_tracker import (
@@ -212,6 +217,119 @@ def get_rate_limiter() -> ReplicateRateLimiter:
     return _rate_limiter
 
 
+class AdaptiveRateLimiter:
+    """
+    Thread-safe, process-wide throttle that learns the real Replicate quota.
+
+    Calls are spaced by the current rate and capped at max_in_flight. On a
+    429 the rate is set from the quota in the error ("6 requests per minute")
+    or halved, and all callers pause for the Retry-After / "available in N
+    seconds" hint. Sustained success raises the rate again, so accounts with
+    a healthy balance are not held to the low-credit limit.
+    """
+
+    _QUOTA_RE = re.compile(r"(\d+)\s*requests?\s*per\s*minute", re.I)
+    _RETRY_RE = re.compile(r"available in\s*~?(\d+(?:\.\d+)?)\s*s", re.I)
+
+    def __init__(self, requests_per_minute: float = None, max_in_flight: int = 6,
+                 min_rpm: float = 1.0, max_rpm: float = 600.0):
+        if requests_per_minute is None:
+            requests_per_minute = float(os.getenv("REPLICATE_RPM", "60"))
+        self.rpm = requests_per_minute
+        self.min_rpm = min_rpm
+        self.max_rpm = max_rpm
+        self.max_in_flight = max_in_flight
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._next_slot = 0.0
+        self._paused_until = 0.0
+        self._successes = 0
+        self.stats = {"calls": 0, "throttled": 0, "waited_seconds": 0.0}
+
+    def acquire(self):
+        """Block until this caller may start a request (rate only, no slot)."""
+        with self._lock:
+            now = time.time()
+            start = max(now, self._next_slot, self._paused_until)
+            self._next_slot = start + 60.0 / self.rpm
+            wait_time = start - now
+            self.stats["calls"] += 1
+            self.stats["waited_seconds"] += wait_time
+        if wait_time > 0:
+            if wait_time > 2:
+                logger.info(f"⏳ Rate limit: waiting {wait_time:.1f}s before next API call...")
+            time.sleep(wait_time)
+
+    def on_success(self):
+        """Additive increase after a run of successful calls."""
+        with self._lock:
+            self._successes += 1
+            if self._successes >= 5 and self.rpm < self.max_rpm:
+                self.rpm = min(self.max_rpm, self.rpm + max(1.0, self.rpm * 0.1))
+                self._successes = 0
+
+    def on_rate_limited(self, error: Exception = None):
+        """Adopt the quota reported by a 429 and pause everyone for Retry-After."""
+        text = str(error or "")
+        retry_after = self._retry_after(error)
+        with self._lock:
+            self._successes = 0
+            self.stats["throttled"] += 1
+            quota = self._QUOTA_RE.search(text)
+            if quota:
+                self.rpm = max(self.min_rpm, float(quota.group(1)))
+            else:
+                self.rpm = max(self.min_rpm, self.rpm / 2)
+            pause = retry_after if retry_after is not None else 60.0 / self.rpm
+            self._paused_until = max(self._paused_until, time.time() + pause)
+        logger.warning(f"⚠️ Rate limited - throttling to {self.rpm:.0f} req/min, pausing {pause:.1f}s")
+
+    def _retry_after(self, error: Exception) -> Optional[float]:
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None) or {}
+        value = headers.get("Retry-After") if hasattr(headers, "get") else None
+        if value:
+            try:
+                return float(value)
+            except ValueError:
+                pass
+        match = self._RETRY_RE.search(str(error or ""))
+        return float(match.group(1)) if match else None
+
+    @staticmethod
+    def is_rate_limit_error(error: Exception) -> bool:
+        status = getattr(error, "status", None) or getattr(getattr(error, "response", None), "status_code", None)
+        text = str(error).lower()
+        return status == 429 or "429" in text or "throttled" in text or "rate limit" in text
+
+    def call(self, fn: Callable, *args, max_retries: int = 4, **kwargs) -> Any:
+        """Run fn under the throttle, retrying 429s after the advised pause."""
+        for attempt in range(max_retries + 1):
+            with self._slots:
+                self.acquire()
+                try:
+                    result = fn(*args, **kwargs)
+                except Exception as e:
+                    if not self.is_rate_limit_error(e) or attempt == max_retries:
+                        raise
+                    self.on_rate_limited(e)
+                    continue
+            self.on_success()
+            return result
+
+
+_adaptive_rate_limiter: Optional[AdaptiveRateLimiter] = None
+_adaptive_rate_limiter_lock = threading.Lock()
+
+def get_adaptive_rate_limiter() -> AdaptiveRateLimiter:
+    """Get the shared adaptive rate limiter used by batch generators"""
+    global _adaptive_rate_limiter
+    with _adaptive_rate_limiter_lock:
+        if _adaptive_rate_limiter is None:
+            _adaptive_rate_limiter = AdaptiveRateLimiter()
+        return _adaptive_rate_limiter
+
+
 # =============================================================================
 # TRACKED API CALLS
 # =============================================================================
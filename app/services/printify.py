@@ -190,6 +190,7 @@ from concurrent.futures import ThreadPoolExecutor
 from app.services.api_service import PrintifyAPI, ReplicateAPI
 from app.services.local_models_manager import LocalModelsManager
 from .database_manager import DatabaseManager
+from .scheduler_service import get_scheduler
 from .image_manager import ImageManager
 try:
     from dialogs import TemplateDialog, PriceRuleDialog, ScheduleDialog
@@ -296,6 +297,9 @@ except ImportError:
 class ProductWizardApp(QMainWindow):
     """Main application window with full features"""
     
+    # Emitted from the scheduler thread; Qt delivers it on the UI thread
+    scheduled_job_due = pyqtSignal(int)
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("AI Print-on-Demand Product Wizard - Advanced Edition")
@@ -310,10 +314,13 @@ class ProductWizardApp(QMainWindow):
         self.active_workers = 0
         self.completed_products = []
         
-        # Setup scheduler timer
-        self.scheduler_timer = QTimer()
-        self.scheduler_timer.timeout.connect(self._check_scheduled_jobs)
-        self.scheduler_timer.start(60000)  # Check every minute
+        # Scheduled jobs fire from the scheduler service at their due time (no polling)
+        self.scheduled_job_due.connect(self._run_scheduled_job)
+        self.scheduler = get_scheduler()
+        self.db.sync_scheduled_jobs()
+        self.scheduler.register_handler(
+            "product_job", lambda entry: self.scheduled_job_due.emit(entry["payload"]["job_id"])
+        )
         
         self._setup_ui()
         self._load_active_shop()
@@ -1226,33 +1233,34 @@ class ProductWizardApp(QMainWindow):
             self.schedule_table.setItem(i, 2, QTableWidgetItem(str(len(prompts))))
             self.schedule_table.setItem(i, 3, QTableWidgetItem(row[6]))
     
-    def _check_scheduled_jobs(self):
-        """Check and execute pending jobs"""
-        jobs = self.db.get_pending_jobs()
-        for job in jobs:
-            self.db.update_job_status(job.id, 'running')
+    def _run_scheduled_job(self, job_id: int):
+        """Execute a scheduled job when the scheduler says it is due"""
+        job = self.db.get_scheduled_job(job_id)
+        if not job or job.status != 'pending':
+            return
+        self.db.update_job_status(job.id, 'running')
+        
+        # Execute scheduled job
+        try:
+            prompts = job.prompts
+            self.log_info(f"🚀 Executing scheduled job {job.id}: {len(prompts)} products")
             
-            # Execute scheduled job
-            try:
-                prompts = json.loads(job.prompts)
-                self.log_info(f"🚀 Executing scheduled job {job.id}: {len(prompts)} products")
-                
-                # Update UI to show job is running
-                self.status_label.setText(f"Running scheduled job: {job.name}")
-                
-                # Launch batch workflow
-                self._run_batch_workflow(prompts)
-                
-                # Update job status
-                self.db.update_job_status(job.id, 'completed')
-                self.log_success(f"✅ Scheduled job {job.id} completed successfully")
-                
-            except Exception as e:
-                self.log_error(f"❌ Scheduled job {job.id} failed: {str(e)}")
-                self.db.update_job_status(job.id, 'failed')
+            # Update UI to show job is running
+            self.status_label.setText(f"Running scheduled job {job.id}: {len(prompts)} {job.product_type} products")
             
-            # Refresh schedule table
-            self._refresh_schedule_table()
+            # Launch batch workflow
+            self._run_batch_workflow(prompts)
+            
+            # Update job status
+            self.db.update_job_status(job.id, 'completed')
+            self.log_success(f"✅ Scheduled job {job.id} completed successfully")
+            
+        except Exception as e:
+            self.log_error(f"❌ Scheduled job {job.id} failed: {str(e)}")
+            self.db.update_job_status(job.id, 'failed')
+        
+        # Refresh schedule table
+        self._refresh_schedule_table()
     
     # ========================================================================
     # History Management
@@ -10,20 +10,172 @@ Features:
 - Cache mockups for reuse
 - Support multiple mockup variants
 - Batch download for campaigns
+- Concurrent batch downloads over a pooled HTTP session
+- Global content-addressed mockup store shared across campaigns
 
 Author: Autonomous Business Platform
-Version: 1.0
+Version: 1.1
 """
 
 import os
+import shutil
+import hashlib
+import tempfile
+import threading
 import requests
+from requests.adapters import HTTPAdapter
 import json
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 from datetime import datetime
 import time
 
 
+MOCKUP_STORE_DIR = Path.home() / ".pod_wizard" / "mockup_store"
+
+
+class MockupStore:
+    """
+    Content-addressed on-disk store for mockup images, shared by all campaigns.
+    
+    Images are stored once under ``blobs/<sha256><ext>`` and indexed by their
+    Printify image URL (with ETag). Product → mockup URL listings are indexed
+    too, so re-running a campaign for known products needs no network at all.
+    Index changes are kept in memory and written with a single ``flush()``.
+    """
+    
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root) if root else MOCKUP_STORE_DIR
+        self.blobs_dir = self.root / "blobs"
+        self.blobs_dir.mkdir(parents=True, exist_ok=True)
+        self.index_file = self.root / "index.json"
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._index = self._load_index()
+    
+    def _load_index(self) -> Dict:
+        if self.index_file.exists():
+            try:
+                with open(self.index_file, 'r') as f:
+                    data = json.load(f)
+                data.setdefault('urls', {})
+                data.setdefault('products', {})
+                return data
+            except (OSError, json.JSONDecodeError) as e:
+                print(f"⚠️ Mockup store index unreadable, starting fresh: {e}")
+        return {'urls': {}, 'products': {}}
+    
+    def lookup_url(self, url: str) -> Optional[Dict]:
+        """Return the index entry for url if its blob is present on disk."""
+        with self._lock:
+            entry = self._index['urls'].get(url)
+        if entry and Path(entry['path']).exists():
+            return entry
+        return None
+    
+    def put_stream(self, url: str, response: requests.Response, ext: str = ".png") -> Dict:
+        """
+        Stream a response body into the store, hashing as it is written.
+        
+        Returns:
+            The index entry for the stored blob
+        """
+        digest = hashlib.sha256()
+        size = 0
+        fd, tmp_path = tempfile.mkstemp(dir=self.root, suffix=".part")
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=64 * 1024):
+                    if chunk:
+                        digest.update(chunk)
+                        f.write(chunk)
+                        size += len(chunk)
+            if size == 0:
+                raise ValueError("empty response body")
+            blob_path = self.blobs_dir / f"{digest.hexdigest()}{ext}"
+            if blob_path.exists():
+                os.remove(tmp_path)
+            else:
+                os.replace(tmp_path, blob_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        
+        entry = {
+            'sha256': digest.hexdigest(),
+            'path': str(blob_path),
+            'etag': response.headers.get('ETag'),
+            'size': size,
+            'fetched_at': datetime.now().isoformat()
+        }
+        with self._lock:
+            self._index['urls'][url] = entry
+            self._dirty = True
+        return entry
+    
+    def touch_url(self, url: str) -> None:
+        """Mark a cached URL as revalidated (HTTP 304)."""
+        with self._lock:
+            entry = self._index['urls'].get(url)
+            if entry:
+                entry['validated_at'] = datetime.now().isoformat()
+                self._dirty = True
+    
+    def get_product_mockups(self, product_id: str) -> Optional[List[Dict]]:
+        with self._lock:
+            entry = self._index['products'].get(str(product_id))
+        return entry['mockups'] if entry else None
+    
+    def set_product_mockups(self, product_id: str, mockups: List[Dict]) -> None:
+        with self._lock:
+            self._index['products'][str(product_id)] = {
+                'mockups': mockups,
+                'fetched_at': datetime.now().isoformat()
+            }
+            self._dirty = True
+    
+    def materialize(self, blob_path: str, dest: Path) -> str:
+        """Expose a stored blob at dest (hard link when possible, else copy)."""
+        dest = Path(dest)
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        if dest.exists():
+            if os.path.samefile(blob_path, dest):
+                return str(dest)
+            dest.unlink()
+        try:
+            os.link(blob_path, dest)
+        except OSError:
+            shutil.copy2(blob_path, dest)
+        return str(dest)
+    
+    def flush(self) -> None:
+        """Write the index once if anything changed since the last flush."""
+        with self._lock:
+            if not self._dirty:
+                return
+            snapshot = json.dumps(self._index, indent=2)
+            self._dirty = False
+        tmp_path = self.index_file.with_suffix('.tmp')
+        with open(tmp_path, 'w') as f:
+            f.write(snapshot)
+        os.replace(tmp_path, self.index_file)
+
+
+_shared_store: Optional[MockupStore] = None
+_shared_store_lock = threading.Lock()
+
+
+def get_mockup_store() -> MockupStore:
+    """Get the process-wide mockup store."""
+    global _shared_store
+    with _shared_store_lock:
+        if _shared_store is None:
+            _shared_store = MockupStore()
+        return _shared_store
+
+
 class PrintifyMockupService:
     """
     Service for downloading and managing Printify product mockups.
@@ -32,13 +184,21 @@ class PrintifyMockupService:
     This service fetches those mockups and caches them locally.
     """
     
-    def __init__(self, api_token: str, shop_id: str):
+    def __init__(
+        self,
+        api_token: str,
+        shop_id: str,
+        store: Optional[MockupStore] = None,
+        max_workers: int = 6
+    ):
         """
         Initialize Printify mockup service.
         
         Args:
             api_token: Printify API token from .env
             shop_id: Printify shop ID
+            store: Mockup store (defaults to the shared global store)
+            max_workers: Concurrent downloads in batch operations
         """
         self.api_token = api_token
         self.shop_id = shop_id
@@ -50,6 +210,15 @@ class PrintifyMockupService:
         
         # Cache for mockup metadata
         self.mockup_cache: Dict[str, Dict] = {}
+        
+        self.store = store or get_mockup_store()
+        self.max_workers = max_workers
+        
+        # Pooled session sized for the batch worker count
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
     
     def get_product_details(self, product_id: str) -> Optional[Dict]:
         """
@@ -63,7 +232,7 @@ class PrintifyMockupService:
         """
         try:
             url = f"{self.base_url}/shops/{self.shop_id}/products/{product_id}.json"
-            response = requests.get(url, headers=self.headers, timeout=30)
+            response = self.session.get(url, headers=self.headers, timeout=30)
             
             if response.status_code == 200:
                 return response.json()
@@ -75,18 +244,25 @@ class PrintifyMockupService:
             print(f"❌ Error fetching product details: {e}")
             return None
     
-    def get_mockup_urls(self, product_id: str) -> List[Dict[str, str]]:
+    def get_mockup_urls(self, product_id: str, refresh: bool = False) -> List[Dict[str, str]]:
         """
         Extract mockup URLs from product data.
         
         Printify products include mockup images in the 'images' array.
+        Listings are served from the mockup store unless refresh is True.
         
         Args:
             product_id: Printify product ID
+            refresh: Re-fetch the product from the API even if indexed
             
         Returns:
             List of mockup dicts with 'url', 'variant', 'is_default' keys
         """
+        if not refresh:
+            cached = self.store.get_product_mockups(product_id)
+            if cached:
+                return cached
+        
         product_data = self.get_product_details(product_id)
         
         if not product_data:
@@ -109,6 +285,9 @@ class PrintifyMockupService:
         # Sort by default first, then by position
         mockups.sort(key=lambda x: (not x['is_default'], x['position']))
         
+        if mockups:
+            self.store.set_product_mockups(product_id, mockups)
+        
         return mockups
     
     def download_mockup(
@@ -116,16 +295,22 @@ class PrintifyMockupService:
         mockup_url: str, 
         save_dir: Path, 
         filename: str,
-        retry_count: int = 3
+        retry_count: int = 3,
+        revalidate: bool = False
     ) -> Optional[str]:
         """
         Download a single mockup image with retry logic.
         
+        Images already in the mockup store are linked into save_dir without
+        touching the network. With revalidate=True a conditional request is
+        sent using the stored ETag and the blob is reused on HTTP 304.
+        
         Args:
             mockup_url: Direct URL to mockup image
             save_dir: Directory to save image
             filename: Filename for saved image
             retry_count: Number of retry attempts
+            revalidate: Check the stored copy against the server's ETag
             
         Returns:
             Path to saved image or None if failed
@@ -135,22 +320,31 @@ class PrintifyMockupService:
         
         save_path = save_dir / filename
         
+        cached = self.store.lookup_url(mockup_url)
+        if cached and not revalidate:
+            return self.store.materialize(cached['path'], save_path)
+        
+        request_headers = {}
+        if cached and cached.get('etag'):
+            request_headers['If-None-Match'] = cached['etag']
+        
         for attempt in range(retry_count):
             try:
-                response = requests.get(mockup_url, timeout=60)
-                
-                if response.status_code == 200:
-                    with open(save_path, 'wb') as f:
-                        f.write(response.content)
+                with self.session.get(mockup_url, headers=request_headers, timeout=60, stream=True) as response:
+                    if response.status_code == 304 and cached:
+                        self.store.touch_url(mockup_url)
+                        return self.store.materialize(cached['path'], save_path)
                     
-                    # Verify file was saved
-                    if save_path.exists() and save_path.stat().st_size > 0:
-                        return str(save_path)
+                    if response.status_code == 200:
+                        ext = Path(filename).suffix or ".png"
+                        try:
+                            entry = self.store.put_stream(mockup_url, response, ext=ext)
+                        except ValueError:
+                            print(f"⚠️ Downloaded file is empty, retrying...")
+                            continue
+                        return self.store.materialize(entry['path'], save_path)
                     else:
-                        print(f"⚠️ Downloaded file is empty, retrying...")
-                        continue
-                else:
-                    print(f"⚠️ Download failed with status {response.status_code}")
+                        print(f"⚠️ Download failed with status {response.status_code}")
                     
             except Exception as e:
                 print(f"⚠️ Download attempt {attempt+1} failed: {e}")
@@ -166,7 +360,8 @@ class PrintifyMockupService:
         self, 
         product_id: str, 
         campaign_dir: Path,
-        download_all: bool = False
+        download_all: bool = False,
+        refresh: bool = False
     ) -> Dict[str, str]:
         """
         Download all mockups for a product.
@@ -175,12 +370,13 @@ class PrintifyMockupService:
             product_id: Printify product ID
             campaign_dir: Campaign directory to save mockups
             download_all: If True, download all variants; if False, only default
+            refresh: Re-fetch the product listing and revalidate stored images
             
         Returns:
             Dict mapping mockup type to file path
             Example: {'default': '/path/to/mockup.png', 'back': '/path/to/back.png'}
         """
-        mockup_urls = self.get_mockup_urls(product_id)
+        mockup_urls = self.get_mockup_urls(product_id, refresh=refresh)
         
         if not mockup_urls:
             print(f"⚠️ No mockups found for product {product_id}")
@@ -213,7 +409,8 @@ class PrintifyMockupService:
             saved_path = self.download_mockup(
                 mockup_url, 
                 mockup_dir, 
-                filename
+                filename,
+                revalidate=refresh
             )
             
             if saved_path:
@@ -227,44 +424,72 @@ class PrintifyMockupService:
     def batch_download_mockups(
         self, 
         product_ids: List[str], 
-        campaign_dir: Path
+        campaign_dir: Path,
+        refresh: bool = False
     ) -> Dict[str, Dict[str, str]]:
         """
-        Download mockups for multiple products.
+        Download mockups for multiple products concurrently.
+        
+        Products are fetched over a bounded thread pool sharing one pooled
+        HTTP session. Images already in the mockup store are linked in
+        without network access. Campaign metadata and the store index are
+        each written once for the whole batch.
         
         Args:
             product_ids: List of Printify product IDs
             campaign_dir: Campaign directory
+            refresh: Re-fetch product listings and revalidate stored images
             
         Returns:
             Dict mapping product_id to mockup paths dict
         """
         all_mockups = {}
         
-        for product_id in product_ids:
-            print(f"\n🎨 Processing product {product_id}...")
-            mockups = self.download_product_mockups(product_id, campaign_dir)
-            
-            if mockups:
-                all_mockups[product_id] = mockups
-                print(f"✅ Downloaded {len(mockups)} mockup(s) for product {product_id}")
-            else:
-                print(f"⚠️ No mockups downloaded for product {product_id}")
+        if not product_ids:
+            return all_mockups
+        
+        workers = max(1, min(self.max_workers, len(product_ids)))
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            futures = {
+                executor.submit(self.download_product_mockups, product_id, campaign_dir, False, refresh): product_id
+                for product_id in product_ids
+            }
+            for future in as_completed(futures):
+                product_id = futures[future]
+                try:
+                    mockups = future.result()
+                except Exception as e:
+                    print(f"❌ Mockup download failed for product {product_id}: {e}")
+                    mockups = {}
+                
+                if mockups:
+                    all_mockups[product_id] = mockups
+                    print(f"✅ Downloaded {len(mockups)} mockup(s) for product {product_id}")
+                else:
+                    print(f"⚠️ No mockups downloaded for product {product_id}")
+        
+        # Preserve the caller's product order
+        all_mockups = {pid: all_mockups[pid] for pid in product_ids if pid in all_mockups}
+        
+        if all_mockups:
+            self.cache_mockup_metadata_batch(all_mockups, campaign_dir)
+        try:
+            self.store.flush()
+        except OSError as e:
+            print(f"⚠️ Failed to write mockup store index: {e}")
         
         return all_mockups
     
-    def cache_mockup_metadata(
-        self, 
-        product_id: str, 
-        mockup_paths: Dict[str, str],
+    def cache_mockup_metadata_batch(
+        self,
+        mockups_by_product: Dict[str, Dict[str, str]],
         campaign_dir: Path
     ) -> None:
         """
-        Save mockup metadata to campaign directory for future reference.
+        Save mockup metadata for several products with a single write.
         
         Args:
-            product_id: Printify product ID
-            mockup_paths: Dict of mockup type to file path
+            mockups_by_product: Dict mapping product_id to mockup paths dict
             campaign_dir: Campaign directory
         """
         try:
@@ -279,21 +504,39 @@ class PrintifyMockupService:
                 cache_data = {}
             
             # Add new mockup data
-            cache_data[product_id] = {
-                'mockup_paths': mockup_paths,
-                'downloaded_at': datetime.now().isoformat(),
-                'product_id': product_id
-            }
+            now = datetime.now().isoformat()
+            for product_id, mockup_paths in mockups_by_product.items():
+                cache_data[product_id] = {
+                    'mockup_paths': mockup_paths,
+                    'downloaded_at': now,
+                    'product_id': product_id
+                }
             
             # Save cache
             with open(cache_file, 'w') as f:
                 json.dump(cache_data, f, indent=2)
             
-            print(f"💾 Cached mockup metadata for product {product_id}")
+            print(f"💾 Cached mockup metadata for {len(mockups_by_product)} product(s)")
             
         except Exception as e:
             print(f"⚠️ Failed to cache mockup metadata: {e}")
     
+    def cache_mockup_metadata(
+        self, 
+        product_id: str, 
+        mockup_paths: Dict[str, str],
+        campaign_dir: Path
+    ) -> None:
+        """
+        Save mockup metadata to campaign directory for future reference.
+        
+        Args:
+            product_id: Printify product ID
+            mockup_paths: Dict of mockup type to file path
+            campaign_dir: Campaign directory
+        """
+        self.cache_mockup_metadata_batch({product_id: mockup_paths}, campaign_dir)
+    
     def get_cached_mockups(
         self, 
         product_id: str, 
@@ -367,6 +610,10 @@ class PrintifyMockupService:
         # Cache for future use
         if mockup_paths:
             self.cache_mockup_metadata(product_id, mockup_paths, campaign_dir)
+        try:
+            self.store.flush()
+        except OSError as e:
+            print(f"⚠️ Failed to write mockup store index: {e}")
         
         return mockup_paths
     
@@ -0,0 +1,453 @@
+"""
+SCHEDULER SERVICE
+=================
+Durable time-based scheduler for calendar posts and product jobs.
+
+Entries live in an SQLite table indexed by (status, run_at); the pending
+ones are mirrored in an in-memory heap. A single dispatcher thread sleeps
+until the earliest run_at (or until an entry is added or changed) instead
+of polling, then hands the entry to the handler registered for its kind.
+
+- Month/range views are indexed range queries, not scans of every item
+- Entries due while the process was down are run on start if they are
+  within their misfire grace window, otherwise marked "missed"
+- Entries left "running" by a crash are marked failed, never re-run
+- Every entry records the pid of the process that scheduled or ran it, so a
+  second process on the same database (the Qt app next to Streamlit) only
+  settles entries whose process is gone, and claims an entry before running it
+- Entries of a kind with no registered handler wait until one registers
+- Re-scheduling a finished or missed entry under the same ref only re-arms it
+  when its run_at changes, so idempotent syncs on start can't revive it
+- Fired entries are handed to each consumer once (take_fired), tracked per
+  consumer so one reader doesn't hide an entry from the others; delivery
+  records older than DELIVERY_RETENTION_DAYS are pruned on start
+"""
+
+import heapq
+import json
+import os
+import sqlite3
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SCHEDULER_DB_FILE = Path.home() / ".pod_wizard" / "scheduler.db"
+DELIVERY_RETENTION_DAYS = 31
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS schedule_entries (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    kind TEXT NOT NULL,
+    ref TEXT UNIQUE,
+    title TEXT,
+    run_at REAL NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',
+    payload TEXT,
+    misfire_grace REAL,
+    created_at REAL NOT NULL,
+    fired_at REAL,
+    error TEXT,
+    pid INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_schedule_status_run_at ON schedule_entries(status, run_at);
+CREATE INDEX IF NOT EXISTS idx_schedule_run_at ON schedule_entries(run_at);
+CREATE TABLE IF NOT EXISTS schedule_deliveries (
+    entry_id INTEGER NOT NULL,
+    consumer TEXT NOT NULL,
+    delivered_at REAL NOT NULL,
+    PRIMARY KEY (entry_id, consumer)
+);
+"""
+
+_COLUMNS = "id, kind, ref, title, run_at, status, payload, misfire_grace, created_at, fired_at, error"
+
+
+def _row_to_entry(row: tuple) -> Dict[str, Any]:
+    entry = dict(zip(_COLUMNS.split(", "), row))
+    entry["run_at"] = datetime.fromtimestamp(entry["run_at"])
+    entry["payload"] = json.loads(entry["payload"]) if entry["payload"] else {}
+    if entry["fired_at"]:
+        entry["fired_at"] = datetime.fromtimestamp(entry["fired_at"])
+    return entry
+
+
+class PersistentScheduler:
+    """
+    Time-ordered, persistent scheduler with next-due wakeups.
+
+    Usage:
+        scheduler = get_scheduler()
+        scheduler.register_handler("calendar", lambda entry: publish(entry["payload"]))
+        entry_id = scheduler.schedule("calendar", datetime(2025, 6, 1, 9, 0),
+                                      title="Launch post", payload={...})
+        scheduler.month(2025, 6)         # indexed range query
+    """
+
+    def __init__(self, path: Path = SCHEDULER_DB_FILE, misfire_grace: float = 6 * 3600,
+                 max_workers: int = 2, autostart: bool = True):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.misfire_grace = misfire_grace
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(_SCHEMA)
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(schedule_entries)")}
+        if "pid" not in columns:
+            self._conn.execute("ALTER TABLE schedule_entries ADD COLUMN pid INTEGER")
+            self._conn.commit()
+        self._db_lock = threading.Lock()
+
+        self._cond = threading.Condition()
+        self._heap: List[tuple] = []               # (run_at, entry_id)
+        self._pending: Dict[int, float] = {}       # entry_id -> run_at of its live heap tuple
+        self._kinds: Dict[int, str] = {}
+        self._handlers: Dict[str, Callable[[Dict[str, Any]], Any]] = {}
+        self._parked: Dict[str, List[int]] = {}    # due entries waiting for a handler
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="scheduler-run")
+        self._stats = {"fired": 0, "failed": 0, "missed": 0, "caught_up": 0}
+        self._thread: Optional[threading.Thread] = None
+        self._stopping = False
+
+        self._recover()
+        if autostart:
+            self.start()
+
+    # ----- persistence -----
+
+    def _execute(self, sql: str, params: Iterable = ()) -> sqlite3.Cursor:
+        with self._db_lock:
+            cursor = self._conn.execute(sql, tuple(params))
+            self._conn.commit()
+            return cursor
+
+    def _query(self, sql: str, params: Iterable = ()) -> List[tuple]:
+        with self._db_lock:
+            return self._conn.execute(sql, tuple(params)).fetchall()
+
+    def _set_status(self, entry_id: int, status: str, error: Optional[str] = None, fired: bool = False):
+        if fired:
+            self._execute(
+                "UPDATE schedule_entries SET status=?, error=?, fired_at=? WHERE id=?",
+                (status, error, datetime.now().timestamp(), entry_id)
+            )
+        else:
+            self._execute("UPDATE schedule_entries SET status=?, error=? WHERE id=?", (status, error, entry_id))
+
+    def _recover(self):
+        """
+        Load pending entries into the heap and settle ones stopped processes left behind.
+
+        Entries belonging to another live process (pid) are loaded but never
+        settled here; whichever process claims one first runs it.
+        """
+        now = datetime.now().timestamp()
+        me = os.getpid()
+        with self._db_lock:
+            pids = [row[0] for row in self._conn.execute(
+                "SELECT DISTINCT pid FROM schedule_entries WHERE status IN ('pending', 'running')"
+            )]
+        # Rows carrying our own pid were left by an earlier process (pid reuse)
+        live = {pid for pid in pids if pid is not None and pid != me and _pid_alive(pid)}
+        marks = ",".join("?" * len(live))
+        others = f" AND (pid IS NULL OR pid NOT IN ({marks}))" if live else ""
+        self._execute(
+            "UPDATE schedule_entries SET status='failed', error='Interrupted by restart' "
+            f"WHERE status='running'{others}", tuple(live)
+        )
+        self._execute(
+            "DELETE FROM schedule_deliveries WHERE delivered_at < ? "
+            "OR entry_id NOT IN (SELECT id FROM schedule_entries)",
+            (now - DELIVERY_RETENTION_DAYS * 86400,)
+        )
+        rows = self._query(
+            "SELECT id, kind, run_at, misfire_grace, pid FROM schedule_entries WHERE status='pending' ORDER BY run_at"
+        )
+        missed = []
+        for entry_id, kind, run_at, grace, pid in rows:
+            grace = self.misfire_grace if grace is None else grace
+            if pid not in live:
+                if run_at < now - grace:
+                    missed.append(entry_id)
+                    continue
+                if run_at < now:
+                    self._stats["caught_up"] += 1
+            self._push(entry_id, kind, run_at)
+        for entry_id in missed:
+            self._set_status(entry_id, "missed", error="Past misfire grace window")
+        self._stats["missed"] += len(missed)
+        if rows:
+            logger.info(
+                f"📅 Scheduler loaded {len(rows) - len(missed)} pending entries "
+                f"({self._stats['caught_up']} to catch up, {len(missed)} missed)"
+            )
+
+    # ----- heap -----
+
+    def _push(self, entry_id: int, kind: str, run_at: float):
+        with self._cond:
+            self._pending[entry_id] = run_at
+            self._kinds[entry_id] = kind
+            heapq.heappush(self._heap, (run_at, entry_id))
+            self._cond.notify()
+
+    def _forget(self, entry_id: int):
+        with self._cond:
+            self._pending.pop(entry_id, None)
+            self._kinds.pop(entry_id, None)
+            for parked in self._parked.values():
+                if entry_id in parked:
+                    parked.remove(entry_id)
+            self._cond.notify()
+
+    # ----- public API -----
+
+    def register_handler(self, kind: str, handler: Callable[[Dict[str, Any]], Any]):
+        """
+        Run ``handler(entry)`` when entries of this kind come due.
+
+        Handlers run on a worker thread; hand off to your UI thread if needed.
+        Entries that came due before the handler existed run now.
+        """
+        with self._cond:
+            self._handlers[kind] = handler
+            for entry_id in self._parked.pop(kind, []):
+                if entry_id in self._pending:
+                    heapq.heappush(self._heap, (self._pending[entry_id], entry_id))
+            self._cond.notify()
+
+    def has_handler(self, kind: str) -> bool:
+        with self._cond:
+            return kind in self._handlers
+
+    def mark(self, entry_id: int, status: str):
+        """Record a caller-defined status on a finished entry (e.g. "delivered")."""
+        self._set_status(entry_id, status)
+
+    def schedule(self, kind: str, run_at: datetime, title: str = "", payload: Optional[Dict] = None,
+                 ref: Optional[str] = None, misfire_grace: Optional[float] = None) -> int:
+        """
+        Add an entry, or move/update the existing entry with the same ref.
+        
+        An existing entry that already ran, failed, was cancelled or missed
+        keeps its status unless run_at changes; its title and payload are
+        still updated.
+
+        Args:
+            kind: Handler kind, e.g. "calendar" or "product_job"
+            run_at: Local time to fire
+            title: Display title
+            payload: JSON-serializable data for the handler
+            ref: Optional unique reference for idempotent upserts
+            misfire_grace: Seconds an overdue entry may still run after a restart
+
+        Returns:
+            Entry id
+        """
+        ts = run_at.timestamp()
+        payload_json = json.dumps(payload or {}, default=str)
+        existing = self._query("SELECT id, run_at, status FROM schedule_entries WHERE ref=?", (ref,)) if ref else []
+        if existing:
+            entry_id, old_ts, status = existing[0]
+            if status == "running" or (status != "pending" and abs(old_ts - ts) < 1e-3):
+                self._execute(
+                    "UPDATE schedule_entries SET kind=?, title=?, payload=?, misfire_grace=? WHERE id=?",
+                    (kind, title, payload_json, misfire_grace, entry_id)
+                )
+                return entry_id
+            self._execute(
+                "UPDATE schedule_entries SET kind=?, title=?, run_at=?, payload=?, misfire_grace=?, "
+                "status='pending', error=NULL, fired_at=NULL, pid=? WHERE id=?",
+                (kind, title, ts, payload_json, misfire_grace, os.getpid(), entry_id)
+            )
+        else:
+            entry_id = self._execute(
+                "INSERT INTO schedule_entries (kind, ref, title, run_at, payload, misfire_grace, created_at, pid) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (kind, ref, title, ts, payload_json, misfire_grace, datetime.now().timestamp(), os.getpid())
+            ).lastrowid
+        self._push(entry_id, kind, ts)
+        return entry_id
+
+    def cancel(self, entry_id: Optional[int] = None, ref: Optional[str] = None) -> bool:
+        """Cancel a pending entry by id or ref."""
+        if entry_id is None and ref is not None:
+            rows = self._query("SELECT id FROM schedule_entries WHERE ref=?", (ref,))
+            entry_id = rows[0][0] if rows else None
+        if entry_id is None:
+            return False
+        cursor = self._execute(
+            "UPDATE schedule_entries SET status='cancelled' WHERE id=? AND status='pending'", (entry_id,)
+        )
+        self._forget(entry_id)
+        return cursor.rowcount > 0
+
+    def take_fired(self, consumer: str, kinds: Optional[List[str]] = None,
+                   since: Optional[datetime] = None) -> List[Dict[str, Any]]:
+        """
+        Entries that ran successfully and haven't been handed to this consumer yet.
+
+        Args:
+            consumer: Name of the reader; each consumer gets every entry once
+            kinds: Only these kinds
+            since: Ignore entries that fired before this time (at most
+                DELIVERY_RETENTION_DAYS back, the span deliveries are remembered)
+
+        Returns:
+            Entries ordered by run_at, recorded as delivered to the consumer
+        """
+        sql = (f"SELECT {_COLUMNS} FROM schedule_entries WHERE status IN ('completed', 'delivered') "
+               "AND fired_at >= ? AND id NOT IN (SELECT entry_id FROM schedule_deliveries WHERE consumer=?)")
+        oldest = datetime.now().timestamp() - DELIVERY_RETENTION_DAYS * 86400
+        params: List[Any] = [max(since.timestamp() if since else 0, oldest), consumer]
+        if kinds:
+            sql += f" AND kind IN ({','.join('?' * len(kinds))})"
+            params.extend(kinds)
+        sql += " ORDER BY run_at"
+        now = datetime.now().timestamp()
+        with self._db_lock:
+            rows = self._conn.execute(sql, params).fetchall()
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO schedule_deliveries (entry_id, consumer, delivered_at) VALUES (?, ?, ?)",
+                [(row[0], consumer, now) for row in rows]
+            )
+            self._conn.commit()
+        return [_row_to_entry(row) for row in rows]
+
+    def get(self, entry_id: int) -> Optional[Dict[str, Any]]:
+        rows = self._query(f"SELECT {_COLUMNS} FROM schedule_entries WHERE id=?", (entry_id,))
+        return _row_to_entry(rows[0]) if rows else None
+
+    def range(self, start: datetime, end: datetime, kinds: Optional[List[str]] = None,
+              statuses: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        """Entries with start <= run_at < end, ordered by time (uses the run_at index)."""
+        sql = f"SELECT {_COLUMNS} FROM schedule_entries WHERE run_at >= ? AND run_at < ?"
+        params: List[Any] = [start.timestamp(), end.timestamp()]
+        if kinds:
+            sql += f" AND kind IN ({','.join('?' * len(kinds))})"
+            params.extend(kinds)
+        if statuses:
+            sql += f" AND status IN ({','.join('?' * len(statuses))})"
+            params.extend(statuses)
+        sql += " ORDER BY run_at"
+        return [_row_to_entry(row) for row in self._query(sql, params)]
+
+    def month(self, year: int, month: int, kinds: Optional[List[str]] = None,
+              statuses: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        start = datetime(year, month, 1)
+        end = datetime(year + (month == 12), month % 12 + 1, 1)
+        return self.range(start, end, kinds=kinds, statuses=statuses)
+
+    def upcoming(self, days: int = 7, kinds: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        now = datetime.now()
+        return self.range(now, now + timedelta(days=days), kinds=kinds, statuses=["pending"])
+
+    def next_due(self) -> Optional[datetime]:
+        with self._cond:
+            live = [run_at for run_at, entry_id in self._heap if self._pending.get(entry_id) == run_at]
+        return datetime.fromtimestamp(min(live)) if live else None
+
+    def stats(self) -> Dict[str, Any]:
+        with self._cond:
+            stats = dict(self._stats, pending=len(self._pending),
+                         parked=sum(len(p) for p in self._parked.values()))
+        next_due = self.next_due()
+        stats["next_due"] = next_due.isoformat() if next_due else None
+        return stats
+
+    # ----- dispatch -----
+
+    def start(self):
+        if self._thread is None or not self._thread.is_alive():
+            self._stopping = False
+            self._thread = threading.Thread(target=self._dispatch_loop, name="scheduler", daemon=True)
+            self._thread.start()
+
+    def shutdown(self):
+        with self._cond:
+            self._stopping = True
+            self._cond.notify()
+        if self._thread:
+            self._thread.join(timeout=5)
+        self._pool.shutdown(wait=False)
+
+    def _dispatch_loop(self):
+        while True:
+            with self._cond:
+                while not self._stopping:
+                    # Drop tuples for cancelled or rescheduled entries
+                    while self._heap and self._pending.get(self._heap[0][1]) != self._heap[0][0]:
+                        heapq.heappop(self._heap)
+                    if not self._heap:
+                        self._cond.wait()
+                        continue
+                    delay = self._heap[0][0] - datetime.now().timestamp()
+                    if delay > 0:
+                        self._cond.wait(timeout=delay)
+                        continue
+                    run_at, entry_id = heapq.heappop(self._heap)
+                    kind = self._kinds.get(entry_id)
+                    if kind not in self._handlers:
+                        self._parked.setdefault(kind, []).append(entry_id)
+                        continue
+                    self._pending.pop(entry_id, None)
+                    self._kinds.pop(entry_id, None)
+                    handler = self._handlers[kind]
+                    break
+                else:
+                    return
+            if self._claim(entry_id):
+                self._pool.submit(self._run, entry_id, handler)
+
+    def _claim(self, entry_id: int) -> bool:
+        """Mark a pending entry running under our pid; False if another process got there first."""
+        cursor = self._execute(
+            "UPDATE schedule_entries SET status='running', error=NULL, fired_at=?, pid=? "
+            "WHERE id=? AND status='pending'",
+            (datetime.now().timestamp(), os.getpid(), entry_id)
+        )
+        return cursor.rowcount > 0
+
+    def _run(self, entry_id: int, handler: Callable[[Dict[str, Any]], Any]):
+        entry = self.get(entry_id)
+        if entry is None:
+            return
+        try:
+            handler(entry)
+            self._set_status(entry_id, "completed")
+            with self._cond:
+                self._stats["fired"] += 1
+            lateness = (datetime.now() - entry["run_at"]).total_seconds()
+            logger.info(f"⏰ Ran scheduled {entry['kind']} '{entry['title']}' ({lateness:.1f}s after due)")
+        except Exception as e:
+            self._set_status(entry_id, "failed", error=str(e))
+            with self._cond:
+                self._stats["failed"] += 1
+            logger.error(f"❌ Scheduled {entry['kind']} '{entry['title']}' failed: {e}")
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+        return True
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+
+
+_scheduler: Optional[PersistentScheduler] = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler() -> PersistentScheduler:
+    """Get the global scheduler instance."""
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = PersistentScheduler()
+        return _scheduler
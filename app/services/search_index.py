@@ -0,0 +1,374 @@
+"""
+SEARCH INDEX
+============
+Persistent full-text index behind GlobalSearchManager.
+
+Documents from every content type live in one SQLite FTS5 table:
+- BM25 ranking with titles weighted above body text
+- Prefix matching on every query term, so partial words work for typeahead
+- Type facets (match counts per content type) from the same query
+- Upserts keyed by (type, key), so re-saving an item replaces it
+
+Feeds: campaign creation, UnifiedStorageManager.save_generated_content,
+ChatHistoryManager.save_conversation and shortcut saves. backfill() picks
+up library files, conversations, campaigns and shortcuts saved before the
+index existed (or by other processes), skipping files that haven't changed.
+"""
+
+import re
+import json
+import sqlite3
+import logging
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+SEARCH_INDEX_FILE = Path.home() / ".pod_wizard" / "search_index.db"
+
+MAX_BODY_CHARS = 20000
+MAX_PAYLOAD_BYTES = 64 * 1024
+
+_TERM_RE = re.compile(r"\w+", re.UNICODE)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id INTEGER PRIMARY KEY,
+    type TEXT NOT NULL,
+    key TEXT NOT NULL,
+    title TEXT,
+    preview TEXT,
+    date TEXT,
+    payload TEXT,
+    UNIQUE(type, key)
+);
+CREATE VIRTUAL TABLE IF NOT EXISTS docs_fts USING fts5(
+    title, body, tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+CREATE TABLE IF NOT EXISTS indexed_files (
+    path TEXT PRIMARY KEY,
+    mtime REAL NOT NULL
+);
+"""
+
+
+def build_match_query(query: str) -> Optional[str]:
+    """Turn free text into an FTS5 query where every term is a prefix match."""
+    terms = _TERM_RE.findall(query.lower())
+    if not terms:
+        return None
+    return " ".join(f'"{term}"*' for term in terms)
+
+
+def _payload(item: Any) -> str:
+    """Serialize an item for display, dropping bulky nested values if it is too large."""
+    text = json.dumps(item, default=str)
+    if len(text) > MAX_PAYLOAD_BYTES and isinstance(item, dict):
+        slim = {k: v for k, v in item.items() if isinstance(v, (str, int, float, bool)) or v is None}
+        text = json.dumps(slim, default=str)
+    return text if len(text) <= MAX_PAYLOAD_BYTES else json.dumps({"truncated": True})
+
+
+class SearchIndex:
+    """
+    SQLite FTS5 index of searchable platform content.
+
+    Usage:
+        index = get_search_index()
+        index.upsert("campaigns", key=campaign_dir, title=concept, body=text, item=summary)
+        hits = index.search("space cat", types=["campaigns", "content"])
+        facets = index.facets("space cat")   # {"campaigns": 3, "content": 12}
+    """
+
+    def __init__(self, path: Path = SEARCH_INDEX_FILE):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+        self._backfill_started = False
+        with self._write_lock:
+            self._conn().executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = sqlite3.connect(str(self.path), timeout=10)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    # ----- writes -----
+
+    def upsert(self, doc_type: str, key: str, title: str, body: str = "",
+               preview: str = "", date: str = "", item: Any = None):
+        """Add or replace one document."""
+        self.upsert_many([(doc_type, key, title, body, preview, date, item)])
+
+    def upsert_many(self, docs: Iterable[tuple]):
+        """Add or replace documents given as (type, key, title, body, preview, date, item)."""
+        with self._write_lock:
+            conn = self._conn()
+            with conn:
+                for doc_type, key, title, body, preview, date, item in docs:
+                    row = conn.execute("SELECT id FROM docs WHERE type=? AND key=?", (doc_type, key)).fetchone()
+                    payload = _payload(item) if item is not None else None
+                    if row:
+                        doc_id = row[0]
+                        conn.execute(
+                            "UPDATE docs SET title=?, preview=?, date=?, payload=? WHERE id=?",
+                            (title, preview, date, payload, doc_id)
+                        )
+                        conn.execute("DELETE FROM docs_fts WHERE rowid=?", (doc_id,))
+                    else:
+                        doc_id = conn.execute(
+                            "INSERT INTO docs (type, key, title, preview, date, payload) VALUES (?, ?, ?, ?, ?, ?)",
+                            (doc_type, key, title, preview, date, payload)
+                        ).lastrowid
+                    conn.execute(
+                        "INSERT INTO docs_fts (rowid, title, body) VALUES (?, ?, ?)",
+                        (doc_id, title or "", (body or "")[:MAX_BODY_CHARS])
+                    )
+
+    def delete(self, doc_type: str, key: str):
+        with self._write_lock:
+            conn = self._conn()
+            with conn:
+                row = conn.execute("SELECT id FROM docs WHERE type=? AND key=?", (doc_type, key)).fetchone()
+                if row:
+                    conn.execute("DELETE FROM docs_fts WHERE rowid=?", (row[0],))
+                    conn.execute("DELETE FROM docs WHERE id=?", (row[0],))
+
+    def replace_type(self, doc_type: str, docs: Iterable[tuple]):
+        """Make the index hold exactly these (key, title, body, preview, date, item) docs for a type."""
+        docs = list(docs)
+        keep = {d[0] for d in docs}
+        with self._write_lock:
+            conn = self._conn()
+            stale = [doc_id for doc_id, key in conn.execute("SELECT id, key FROM docs WHERE type=?", (doc_type,))
+                     if key not in keep]
+            with conn:
+                conn.executemany("DELETE FROM docs_fts WHERE rowid=?", [(i,) for i in stale])
+                conn.executemany("DELETE FROM docs WHERE id=?", [(i,) for i in stale])
+        self.upsert_many((doc_type, *doc) for doc in docs)
+
+    # ----- reads -----
+
+    def search(self, query: str, types: Optional[List[str]] = None, limit: int = 50) -> List[Dict[str, Any]]:
+        """
+        Ranked full-text search.
+
+        Args:
+            query: Free text; each term matches as a prefix
+            types: Optional content type filter
+            limit: Max results
+
+        Returns:
+            Dicts with type, key, title, preview, date, item and score (higher is better)
+        """
+        match = build_match_query(query)
+        if not match:
+            return []
+        sql = (
+            "SELECT d.type, d.key, d.title, d.preview, d.date, d.payload, bm25(docs_fts, 5.0, 1.0) AS rank "
+            "FROM docs_fts JOIN docs d ON d.id = docs_fts.rowid WHERE docs_fts MATCH ?"
+        )
+        params: List[Any] = [match]
+        if types:
+            sql += f" AND d.type IN ({','.join('?' * len(types))})"
+            params.extend(types)
+        sql += " ORDER BY rank LIMIT ?"
+        params.append(limit)
+        try:
+            rows = self._conn().execute(sql, params).fetchall()
+        except sqlite3.OperationalError as e:
+            logger.debug(f"Search query failed ({match}): {e}")
+            return []
+        return [
+            {
+                "type": doc_type,
+                "key": key,
+                "title": title,
+                "preview": preview,
+                "date": date,
+                "item": json.loads(payload) if payload else {},
+                "score": -rank,
+            }
+            for doc_type, key, title, preview, date, payload, rank in rows
+        ]
+
+    def facets(self, query: str) -> Dict[str, int]:
+        """Match counts per content type."""
+        match = build_match_query(query)
+        if not match:
+            return {}
+        try:
+            rows = self._conn().execute(
+                "SELECT d.type, COUNT(*) FROM docs_fts JOIN docs d ON d.id = docs_fts.rowid "
+                "WHERE docs_fts MATCH ? GROUP BY d.type",
+                (match,)
+            ).fetchall()
+        except sqlite3.OperationalError:
+            return {}
+        return dict(rows)
+
+    def count(self) -> int:
+        return self._conn().execute("SELECT COUNT(*) FROM docs").fetchone()[0]
+
+    # ----- backfill from disk -----
+
+    def _changed(self, path: Path) -> bool:
+        row = self._conn().execute("SELECT mtime FROM indexed_files WHERE path=?", (str(path),)).fetchone()
+        try:
+            return row is None or row[0] != path.stat().st_mtime
+        except OSError:
+            return False
+
+    def _mark(self, paths: List[Path]):
+        rows = []
+        for path in paths:
+            try:
+                rows.append((str(path), path.stat().st_mtime))
+            except OSError:
+                pass
+        with self._write_lock:
+            conn = self._conn()
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO indexed_files (path, mtime) VALUES (?, ?)", rows)
+
+    def backfill(self, workspace_root: Optional[Path] = None, shortcuts_file: Optional[Path] = None) -> int:
+        """
+        Index content saved on disk. Unchanged files are skipped, so this is
+        cheap to run on every start.
+
+        Returns:
+            Number of documents (re)indexed
+        """
+        root = Path(workspace_root or Path.cwd())
+        indexed = 0
+
+        # Library files written by UnifiedStorageManager (one .json sidecar each)
+        sidecars = [p for p in (root / "library").glob("*/*.*.json") if self._changed(p)]
+        docs = []
+        for sidecar in sidecars:
+            try:
+                meta = json.loads(sidecar.read_text())
+            except Exception:
+                continue
+            docs.append(("content", *library_doc(meta, sidecar.with_suffix(""))))
+        self.upsert_many(docs)
+        self._mark(sidecars)
+        indexed += len(docs)
+
+        # Saved chat conversations
+        conversations = [p for p in (root / "file_library" / "conversations").glob("*.json") if self._changed(p)]
+        docs = []
+        for path in conversations:
+            try:
+                conversation = json.loads(path.read_text())
+            except Exception:
+                continue
+            docs.append(("conversations", *conversation_doc(conversation)))
+        self.upsert_many(docs)
+        self._mark(conversations)
+        indexed += len(docs)
+
+        # Campaign output folders
+        campaign_dirs = [p for p in (root / "campaigns").glob("*") if p.is_dir() and self._changed(p)]
+        docs = []
+        for campaign_dir in campaign_dirs:
+            text = []
+            for text_file in sorted(campaign_dir.glob("*.md")) + sorted(campaign_dir.glob("*.txt")):
+                try:
+                    text.append(text_file.read_text(errors="ignore")[:4000])
+                except OSError:
+                    pass
+            title = campaign_dir.name.replace("_", " ")
+            body = "\n".join(text)
+            docs.append(("campaigns", str(campaign_dir), title, body, body[:100],
+                         "", {"concept": title, "path": str(campaign_dir)}))
+        self.upsert_many(docs)
+        self._mark(campaign_dirs)
+        indexed += len(docs)
+
+        # Shortcuts
+        if shortcuts_file and Path(shortcuts_file).exists() and self._changed(Path(shortcuts_file)):
+            try:
+                shortcuts = json.loads(Path(shortcuts_file).read_text()).get("shortcuts", [])
+                self.replace_type("shortcuts", [shortcut_doc(s) for s in shortcuts])
+                self._mark([Path(shortcuts_file)])
+                indexed += len(shortcuts)
+            except Exception as e:
+                logger.debug(f"Shortcut backfill failed: {e}")
+
+        if indexed:
+            logger.info(f"🔎 Search index backfilled {indexed} documents")
+        return indexed
+
+    def backfill_async(self, workspace_root: Optional[Path] = None, shortcuts_file: Optional[Path] = None):
+        """Run backfill() once per process on a background thread."""
+        if self._backfill_started:
+            return
+        self._backfill_started = True
+
+        def _run():
+            try:
+                self.backfill(workspace_root, shortcuts_file)
+            except Exception as e:
+                logger.warning(f"Search index backfill failed: {e}")
+
+        threading.Thread(target=_run, name="search-backfill", daemon=True).start()
+
+
+# ----- document builders (shared by live feeds and backfill) -----
+
+def library_doc(meta: Dict[str, Any], file_path: Path) -> tuple:
+    """(key, title, body, preview, date, item) for a library file and its metadata."""
+    text_values = [str(v) for v in meta.values() if isinstance(v, (str, int, float))]
+    title = str(meta.get("name") or meta.get("prompt") or meta.get("filename") or file_path.name)[:80]
+    preview = str(meta.get("prompt") or meta.get("description") or "")[:100]
+    item = dict(meta, local_path=str(file_path))
+    return (str(file_path), title, " ".join(text_values), preview, str(meta.get("created_at", "")), item)
+
+
+def conversation_doc(conversation: Dict[str, Any]) -> tuple:
+    """(key, title, body, preview, date, item) for a saved chat conversation."""
+    messages = conversation.get("messages", [])
+    body = "\n".join(str(m.get("content", "")) for m in messages if isinstance(m, dict))
+    item = {k: v for k, v in conversation.items() if k != "messages"}
+    return (
+        str(conversation.get("id")),
+        str(conversation.get("title", "Conversation")),
+        body,
+        str(conversation.get("summary", ""))[:100],
+        str(conversation.get("updated_at") or conversation.get("created_at", "")),
+        item,
+    )
+
+
+def shortcut_doc(shortcut: Dict[str, Any]) -> tuple:
+    """(key, title, body, preview, date, item) for a magic shortcut."""
+    text = " ".join(str(v) for v in shortcut.values() if isinstance(v, (str, int)))
+    title = str(shortcut.get("name") or shortcut.get("title") or "Shortcut")
+    return (
+        str(shortcut.get("id") or title),
+        title,
+        text,
+        str(shortcut.get("description") or shortcut.get("prompt") or "")[:100],
+        str(shortcut.get("created_at", "")),
+        shortcut,
+    )
+
+
+_search_index: Optional[SearchIndex] = None
+_search_index_lock = threading.Lock()
+
+
+def get_search_index() -> SearchIndex:
+    """Get the global search index instance."""
+    global _search_index
+    with _search_index_lock:
+        if _search_index is None:
+            _search_index = SearchIndex()
+        return _search_index
@@ -100,6 +100,15 @@ def load_shortcuts() -> List[Dict[str, Any]]:
     return []
 
 
+def _index_shortcuts(shortcuts: List[Dict[str, Any]]):
+    """Keep global search in step with the saved shortcut list"""
+    try:
+        from app.services.search_index import get_search_index, shortcut_doc
+        get_search_index().replace_type('shortcuts', [shortcut_doc(s) for s in shortcuts])
+    except Exception as e:
+        print(f"Error indexing shortcuts: {e}")
+
+
 def save_shortcuts(shortcuts: List[Dict[str, Any]]) -> bool:
     """Save shortcuts to disk"""
     try:
@@ -110,6 +119,7 @@ def save_shortcuts(shortcuts: List[Dict[str, Any]]) -> bool:
         }
         with open(SHORTCUTS_FILE, 'w') as f:
             json.dump(data, f, indent=2)
+        _index_shortcuts(shortcuts)
         return True
     except Exception as e:
         print(f"Error saving shortcuts: {e}")
@@ -495,6 +505,7 @@ class ShortcutsManager:
             }
             with open(self.storage_path, 'w') as f:
                 json.dump(data, f, indent=2)
+            _index_shortcuts(shortcuts)
             return True
         except Exception as e:
             print(f"Error saving shortcuts: {e}")
@@ -36,6 +36,13 @@ from modules.ai_generation import (
 )
 from modules.audio_processing import prepare_background_music
 from modules.file_utils import create_temp_directory
+from modules.ffmpeg_assembly import (
+    CommercialScene,
+    FFmpegAssemblyError,
+    assemble_commercial,
+    is_ffmpeg_available,
+    probe_duration
+)
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -156,16 +163,20 @@ class StaticCommercialProducer:
         template: str = '3_scene_basic',
         brand_template: Optional[dict] = None,
         allow_substitute_visuals: bool = False,
-        max_retries: int = 2
+        max_retries: int = 2,
+        engine: str = "auto"
     ) -> str:
         """
         Create a professional commercial video from static images.
         Applies Ken Burns effect (zoom/pan) to each image.
+
+        Args:
+            engine: "ffmpeg" assembles everything in one filter graph and a
+                single multithreaded encode; "moviepy" uses the per-frame
+                MoviePy pipeline; "auto" tries ffmpeg and falls back to MoviePy.
         """
         logger.info("🎬 Creating commercial video...")
         
-        video_clips = []
-        
         # Map images/audio to template scenes (pad/trim as necessary)
         scenes = self.TEMPLATES.get(template, self.TEMPLATES['3_scene_basic'])
         pairs = []
@@ -174,24 +185,98 @@ class StaticCommercialProducer:
             aud = audio_paths[i] if i < len(audio_paths) else audio_paths[0]
             pairs.append((img, aud, scene))
 
+        if engine in ("auto", "ffmpeg") and is_ffmpeg_available():
+            try:
+                return self._create_commercial_ffmpeg(
+                    pairs, music_path, output_path, clip_duration,
+                    brand_template, allow_substitute_visuals
+                )
+            except Exception as e:
+                if engine == "ffmpeg":
+                    raise
+                logger.warning(f"⚠️ ffmpeg assembly failed, falling back to MoviePy: {e}")
+        elif engine == "ffmpeg":
+            raise FFmpegAssemblyError("ffmpeg engine requested but ffmpeg was not found")
+
+        return self._create_commercial_moviepy(
+            pairs, music_path, output_path, brand_template,
+            allow_substitute_visuals, max_retries
+        )
+
+    def _resolve_scene_image(self, img_path: str, idx: int, allow_substitute_visuals: bool) -> str:
+        """Validate a scene image, substituting the brand placeholder if allowed."""
+        if os.path.exists(img_path):
+            return img_path
+        msg = f"Image not found for clip {idx}: {img_path}"
+        logger.error(msg)
+        if not allow_substitute_visuals:
+            raise Exception(msg)
+        # If substitution allowed, use a placeholder image from brand assets
+        from brand_brain import BrandBrain
+        bb = BrandBrain()
+        placeholder = bb.get_placeholder_image() if hasattr(bb, 'get_placeholder_image') else None
+        if placeholder and os.path.exists(placeholder):
+            return placeholder
+        logger.warning("No placeholder available, continuing with audio-only clip")
+        return img_path
+
+    def _create_commercial_ffmpeg(
+        self,
+        pairs: List[tuple],
+        music_path: Optional[str],
+        output_path: str,
+        clip_duration: float,
+        brand_template: Optional[dict],
+        allow_substitute_visuals: bool
+    ) -> str:
+        """
+        Assemble the commercial with one ffmpeg filter graph (zoompan, fades,
+        CTA card, brand overlay, ducked music) and a single encode.
+        """
+        scenes = []
+        for idx, (img_path, audio_path, _scene) in enumerate(pairs, 1):
+            img_path = self._resolve_scene_image(img_path, idx, allow_substitute_visuals)
+            if not os.path.exists(img_path):
+                logger.warning(f"  ⚠️ Skipping clip {idx}: no usable image")
+                continue
+            duration = probe_duration(audio_path) if audio_path else None
+            scenes.append(CommercialScene(img_path, audio_path, duration or clip_duration))
+            logger.info(f"  ✅ Clip {idx} queued ({scenes[-1].duration:.1f}s)")
+
+        if not scenes:
+            raise Exception("No video clips were created")
+
+        assemble_commercial(
+            scenes,
+            output_path,
+            music_path=music_path,
+            work_dir=str(self.output_dir),
+            cta_text="Shop Now!",
+            cta_duration=3.5,
+            brand_template=brand_template,
+            music_volume=0.3
+        )
+
+        logger.info("✅ Commercial complete!")
+        return output_path
+
+    def _create_commercial_moviepy(
+        self,
+        pairs: List[tuple],
+        music_path: Optional[str],
+        output_path: str,
+        brand_template: Optional[dict],
+        allow_substitute_visuals: bool,
+        max_retries: int
+    ) -> str:
+        """Assemble the commercial with MoviePy (per-frame zoom, separate CTA encode)."""
+        video_clips = []
+
         for idx, (img_path, audio_path, scene) in enumerate(pairs, 1):
             try:
                 logger.info(f"  Processing clip {idx}...")
                 # Validate image exists
-                if not os.path.exists(img_path):
-                    msg = f"Image not found for clip {idx}: {img_path}"
-                    logger.error(msg)
-                    if not allow_substitute_visuals:
-                        raise Exception(msg)
-                    else:
-                        # If substitution allowed, use a placeholder image from brand assets
-                        from brand_brain import BrandBrain
-                        bb = BrandBrain()
-                        placeholder = bb.get_placeholder_image() if hasattr(bb, 'get_placeholder_image') else None
-                        if placeholder and os.path.exists(placeholder):
-                            img_path = placeholder
-                        else:
-                            logger.warning("No placeholder available, continuing with audio-only clip")
+                img_path = self._resolve_scene_image(img_path, idx, allow_substitute_visuals)
 
                 # Retry logic for clip generation
                 attempt = 0
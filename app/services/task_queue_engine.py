@@ -188,6 +188,21 @@ class EnhancedTaskQueue:
     Now with optional Ray distributed execution support.
     """
     
+    # Max steps of each agent type running at once within execute_task
+    AGENT_CONCURRENCY = {
+        "designer": 2,
+        "writer": 3,
+        "video": 1,
+        "publisher": 2,
+        "browser": 1,
+        "marketer": 2,
+    }
+    DEFAULT_AGENT_CONCURRENCY = 2
+    
+    # Agents whose results feed context, and agents that read that context
+    CONTEXT_PRODUCER_AGENTS = {"designer", "writer", "video"}
+    CONTEXT_CONSUMER_AGENTS = {"publisher", "browser", "marketer"}
+    
     def __init__(
         self,
         replicate_api=None,
@@ -214,9 +229,11 @@ class EnhancedTaskQueue:
         # Artifact storage
         self.artifact_dir = Path("task_artifacts")
         self.artifact_dir.mkdir(exist_ok=True)
+        self._artifact_writer = None
         
-        # Executor for parallel operations
+        # Executor for parallel operations (also caps concurrent steps overall)
         self.executor = ThreadPoolExecutor(max_workers=4)
+        self.agent_concurrency = dict(self.AGENT_CONCURRENCY)
     
     @property
     def otto_engine(self):
@@ -349,10 +366,29 @@ class EnhancedTaskQueue:
         """
         Use AI to analyze a task and create a detailed execution plan.
         Now includes model detection for specific AI model routing.
+        
+        Recurring requests are served from the plan cache and common intents
+        take the rule-based fast path, so the LLM is only awaited for
+        unfamiliar requests.
         """
         if not self.replicate:
             return self._fallback_plan(description)
         
+        from app.services.plan_cache import get_plan_cache
+        plan = get_plan_cache().resolve(
+            "task_queue", description,
+            llm_planner=lambda: self._llm_analyze_task(description),
+            fast_planner=lambda: self._fallback_plan(description)
+        )
+        return plan or self._fallback_plan(description)
+    
+    def get_planning_stats(self) -> Dict[str, Any]:
+        """Plan cache hit rate and planning latency saved."""
+        from app.services.plan_cache import get_plan_cache
+        return get_plan_cache().stats()
+    
+    def _llm_analyze_task(self, description: str) -> Optional[Dict[str, Any]]:
+        """Ask the LLM for an execution plan; returns None if it fails."""
         # Detect model preferences first
         model_prefs = self.detect_model_preferences(description)
         
@@ -432,7 +468,7 @@ Respond in this JSON format:
         except Exception as e:
             logger.error(f"Task analysis failed: {e}")
         
-        return self._fallback_plan(description)
+        return None
     
     def _fallback_plan(self, description: str) -> Dict:
         """Create a simple fallback plan when AI analysis fails."""
@@ -583,98 +619,197 @@ Respond in this JSON format:
         task.status = TaskStatus.READY
         return task
     
+    def _resolve_step_dependencies(self, task: Task) -> Dict[str, List[str]]:
+        """
+        Build the dependency edges for each step.
+        
+        Declared ``depends_on`` ids are used as-is (unknown ids are ignored).
+        Steps that declare nothing but read earlier steps' context get implicit
+        edges so they don't race their producers: video steps wait for earlier
+        designer steps, and publisher/browser/marketer steps wait for every
+        earlier designer/writer/video step.
+        """
+        known = {s.id for s in task.steps}
+        deps: Dict[str, List[str]] = {}
+        for i, step in enumerate(task.steps):
+            declared = [d for d in step.depends_on if d in known and d != step.id]
+            if declared or step.depends_on:
+                deps[step.id] = declared
+                continue
+            
+            earlier = task.steps[:i]
+            if step.agent == "video":
+                producers = {"designer"}
+            elif step.agent in self.CONTEXT_CONSUMER_AGENTS:
+                producers = self.CONTEXT_PRODUCER_AGENTS
+            else:
+                producers = set()
+            deps[step.id] = [s.id for s in earlier if s.agent in producers]
+        return deps
+    
+    async def _run_step_isolated(self, step: TaskStep, context: Dict) -> Dict[str, Any]:
+        """
+        Run a step without blocking the event loop.
+        
+        Step implementations make blocking API calls inside ``async def``, so
+        each one runs on its own loop in the executor. Browser steps stay on the
+        caller's loop because the browser service is bound to it.
+        """
+        if step.agent == "browser":
+            return await self._execute_step(step, context)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self.executor, lambda: asyncio.run(self._execute_step(step, context))
+        )
+    
     async def execute_task(self, task: Task, progress_callback: Optional[Callable] = None) -> Task:
-        """Execute a task with real-time progress updates."""
+        """
+        Execute a task's steps as a dependency graph with real-time progress updates.
+        
+        Every step whose dependencies have completed is launched immediately,
+        bounded by ``agent_concurrency`` per agent and by the executor size
+        overall, so wall time follows the critical path. A failed step marks
+        its transitive dependents as skipped (CANCELLED). A step sees the
+        ``context_updates`` of its (transitive) dependencies only, merged in
+        plan order, so its context does not depend on which steps finished first.
+        """
         logger.info(f"🚀 Starting task execution: {task.id} - {task.description[:50]}...")
         task.status = TaskStatus.RUNNING
         task.started_at = datetime.now()
         
-        try:
-            for i, step in enumerate(task.steps):
-                logger.info(f"📍 Step {i+1}/{len(task.steps)}: {step.name}")
-                task.current_step = i
-                
-                # Check dependencies
-                for dep_id in step.depends_on:
-                    dep_step = next((s for s in task.steps if s.id == dep_id), None)
-                    if dep_step and dep_step.status != TaskStatus.COMPLETED:
-                        step.error = f"Dependency {dep_id} not completed"
-                        step.status = TaskStatus.FAILED
-                        continue
-                
-                # Execute step
+        total = len(task.steps)
+        position = {s.id: i for i, s in enumerate(task.steps)}
+        base_context = dict(task.context)
+        updates_by_position: Dict[int, Dict] = {}
+        semaphores: Dict[str, asyncio.Semaphore] = {}
+        
+        def merged_context(positions=None) -> Dict:
+            context = dict(base_context)
+            for i in sorted(updates_by_position if positions is None else positions):
+                context.update(updates_by_position.get(i, {}))
+            return context
+        
+        def step_context(step: TaskStep) -> Dict:
+            # Only the step's transitive dependencies are guaranteed to have
+            # finished when it starts, so only their updates are visible
+            ancestors: set = set()
+            stack = list(deps[step.id])
+            while stack:
+                dep_id = stack.pop()
+                if dep_id not in ancestors:
+                    ancestors.add(dep_id)
+                    stack.extend(deps[dep_id])
+            return merged_context({position[d] for d in ancestors})
+        
+        def emit(step: TaskStep, status: str, **extra):
+            if progress_callback:
+                update = {
+                    "task_id": task.id,
+                    "step": position[step.id] + 1,
+                    "total": total,
+                    "name": step.name,
+                    "status": status,
+                    "agent": step.agent,
+                    "completed": sum(1 for s in task.steps if s.status == TaskStatus.COMPLETED),
+                }
+                update.update(extra)
+                progress_callback(update)
+        
+        async def run_step(step: TaskStep) -> Dict[str, Any]:
+            limit = self.agent_concurrency.get(step.agent, self.DEFAULT_AGENT_CONCURRENCY)
+            semaphore = semaphores.setdefault(step.agent, asyncio.Semaphore(limit))
+            async with semaphore:
+                logger.info(f"📍 Step {position[step.id] + 1}/{total}: {step.name}")
+                task.current_step = position[step.id]
                 step.status = TaskStatus.RUNNING
                 step.started_at = datetime.now()
+                emit(step, "running")
+                return await self._run_step_isolated(step, step_context(step))
+        
+        try:
+            deps = self._resolve_step_dependencies(task)
+            pending = [s for s in task.steps]
+            running: Dict[asyncio.Future, TaskStep] = {}
+            
+            while pending or running:
+                # Launch ready steps and skip those with a failed dependency,
+                # repeating until a pass makes no change so skips cascade
+                changed = True
+                while changed:
+                    changed = False
+                    for step in list(pending):
+                        dep_steps = [task.steps[position[d]] for d in deps[step.id]]
+                        blocked = next((d for d in dep_steps if d.status in (TaskStatus.FAILED, TaskStatus.CANCELLED)), None)
+                        if blocked:
+                            pending.remove(step)
+                            step.status = TaskStatus.CANCELLED
+                            step.error = f"Skipped: dependency {blocked.id} did not complete"
+                            step.completed_at = datetime.now()
+                            emit(step, "skipped", error=step.error)
+                            changed = True
+                        elif all(d.status == TaskStatus.COMPLETED for d in dep_steps):
+                            pending.remove(step)
+                            running[asyncio.ensure_future(run_step(step))] = step
+                            changed = True
                 
-                if progress_callback:
-                    progress_callback({
-                        "task_id": task.id,
-                        "step": i + 1,
-                        "total": len(task.steps),
-                        "name": step.name,
-                        "status": "running",
-                        "agent": step.agent
-                    })
+                if not running:
+                    # Anything still pending is waiting on a cycle
+                    for step in pending:
+                        step.status = TaskStatus.FAILED
+                        step.error = "Dependency cycle detected"
+                        step.completed_at = datetime.now()
+                        emit(step, "failed", error=step.error)
+                    pending = []
+                    break
                 
-                try:
-                    result = await self._execute_step(step, task.context)
-                    step.result = result
-                    step.status = TaskStatus.COMPLETED
-                    step.completed_at = datetime.now()
-                    
-                    # Collect artifacts
-                    if result.get("artifacts"):
-                        for art_data in result["artifacts"]:
-                            artifact = Artifact(
-                                id=str(uuid.uuid4())[:8],
-                                type=ArtifactType(art_data.get("type", "text")),
-                                name=art_data.get("name", step.name),
-                                url=art_data.get("url"),
-                                content=art_data.get("content"),
-                                metadata=art_data.get("metadata", {})
-                            )
-                            step.artifacts.append(artifact)
-                            task.artifacts.append(artifact)
-                            
-                            # Save artifact to disk
-                            self._save_artifact(artifact, task.id)
-                    
-                    # Update context for next steps
-                    if result.get("context_updates"):
-                        task.context.update(result["context_updates"])
-                    
-                    if progress_callback:
-                        progress_callback({
-                            "task_id": task.id,
-                            "step": i + 1,
-                            "total": len(task.steps),
-                            "name": step.name,
-                            "status": "completed",
-                            "result": result,
-                            "artifacts": [a.to_dict() for a in step.artifacts]
-                        })
-                    
-                except Exception as e:
-                    step.error = str(e)
-                    step.status = TaskStatus.FAILED
-                    step.completed_at = datetime.now()
-                    logger.error(f"Step {step.name} failed: {e}")
-                    
-                    if progress_callback:
-                        progress_callback({
-                            "task_id": task.id,
-                            "step": i + 1,
-                            "total": len(task.steps),
-                            "name": step.name,
-                            "status": "failed",
-                            "error": str(e)
-                        })
+                done, _ = await asyncio.wait(list(running), return_when=asyncio.FIRST_COMPLETED)
+                for future in done:
+                    step = running.pop(future)
+                    try:
+                        result = future.result()
+                        step.result = result
+                        step.status = TaskStatus.COMPLETED
+                        step.completed_at = datetime.now()
+                        
+                        # Collect artifacts
+                        if result.get("artifacts"):
+                            for art_data in result["artifacts"]:
+                                artifact = Artifact(
+                                    id=str(uuid.uuid4())[:8],
+                                    type=ArtifactType(art_data.get("type", "text")),
+                                    name=art_data.get("name", step.name),
+                                    url=art_data.get("url"),
+                                    content=art_data.get("content"),
+                                    metadata=art_data.get("metadata", {})
+                                )
+                                step.artifacts.append(artifact)
+                                task.artifacts.append(artifact)
+                                
+                                # Persist in the background; file_path is set when written
+                                self._save_artifact(artifact, task.id)
+                        
+                        # Record context for dependent steps (merged in plan order)
+                        if result.get("context_updates"):
+                            updates_by_position[position[step.id]] = result["context_updates"]
+                            task.context = merged_context()
+                        
+                        emit(step, "completed", result=result,
+                             artifacts=[a.to_dict() for a in step.artifacts])
+                        
+                    except Exception as e:
+                        step.error = str(e)
+                        step.status = TaskStatus.FAILED
+                        step.completed_at = datetime.now()
+                        logger.error(f"Step {step.name} failed: {e}")
+                        emit(step, "failed", error=str(e))
+            
+            task.context = merged_context()
             
             # Generate final summary
             task.final_summary = self._generate_task_summary(task)
             
             # Determine final status
-            failed_steps = [s for s in task.steps if s.status == TaskStatus.FAILED]
+            failed_steps = [s for s in task.steps if s.status in (TaskStatus.FAILED, TaskStatus.CANCELLED)]
             if failed_steps:
                 if len(failed_steps) == len(task.steps):
                     task.status = TaskStatus.FAILED
@@ -1369,36 +1504,33 @@ Make it engaging and shareable."""
             "context_updates": {}
         }
     
+    @property
+    def artifact_writer(self):
+        """Background writer that persists artifacts off the event loop (lazy)."""
+        if self._artifact_writer is None:
+            from app.services.artifact_writer import get_artifact_writer
+            self._artifact_writer = get_artifact_writer(self.artifact_dir)
+        return self._artifact_writer
+    
     def _save_artifact(self, artifact: Artifact, task_id: str):
-        """Save artifact to filesystem for persistence."""
-        task_dir = self.artifact_dir / task_id
-        task_dir.mkdir(exist_ok=True)
+        """
+        Queue an artifact for persistence without blocking the step.
         
-        try:
-            if artifact.url and artifact.type in [ArtifactType.IMAGE, ArtifactType.VIDEO]:
-                # Download and save media
-                response = requests.get(artifact.url, timeout=60)
-                if response.status_code == 200:
-                    ext = "mp4" if artifact.type == ArtifactType.VIDEO else "png"
-                    file_path = task_dir / f"{artifact.id}.{ext}"
-                    with open(file_path, "wb") as f:
-                        f.write(response.content)
-                    artifact.file_path = str(file_path)
-            
-            elif artifact.content and artifact.type == ArtifactType.TEXT:
-                # Save text content
-                file_path = task_dir / f"{artifact.id}.txt"
-                with open(file_path, "w") as f:
-                    f.write(artifact.content)
-                artifact.file_path = str(file_path)
-            
-            # Save artifact metadata
-            meta_path = task_dir / f"{artifact.id}.json"
-            with open(meta_path, "w") as f:
-                json.dump(artifact.to_dict(), f, indent=2)
-                
-        except Exception as e:
-            logger.warning(f"Failed to save artifact {artifact.id}: {e}")
+        Media is streamed to disk by the artifact writer's worker threads and
+        metadata is appended in batches to ``<task_id>/artifacts.jsonl``.
+        
+        Returns:
+            Future resolving to the saved file path (or None)
+        """
+        return self.artifact_writer.submit(artifact, task_id)
+    
+    async def wait_for_artifacts(self, task_id: str, timeout: Optional[float] = None) -> List[Optional[str]]:
+        """Await persistence of every artifact queued for a task."""
+        futures = [asyncio.wrap_future(f) for f in self.artifact_writer.futures_for_task(task_id)]
+        if not futures:
+            return []
+        done, _ = await asyncio.wait(futures, timeout=timeout)
+        return [f.result() if f in done and not f.exception() else None for f in futures]
     
     def _generate_task_summary(self, task: Task) -> str:
         """Generate a human-readable summary of task execution."""
@@ -1833,7 +1965,7 @@ def render_enhanced_task_queue(replicate_api=None, printify_api=None, shopify_ap
                 def progress_callback(update):
                     with progress_container:
                         status = update.get("status", "running")
-                        icon = {"running": "⏳", "completed": "✅", "failed": "❌"}.get(status, "⚪")
+                        icon = {"running": "⏳", "completed": "✅", "failed": "❌", "skipped": "⏭️"}.get(status, "⚪")
                         st.markdown(f"{icon} Step {update['step']}/{update['total']}: {update['name']}")
                     
                     # Display artifacts immediately
@@ -0,0 +1,190 @@
+"""
+YOUTUBE UPLOAD MANAGER
+======================
+Concurrent queue for YouTube uploads.
+
+1. Uploads run on a small worker pool, each with its own HTTP transport
+2. Videos are sent in fixed-size resumable chunks (see youtube_helper), so a
+   network blip only resends one chunk and a restart resumes the session
+3. Every upload has a record (state, bytes sent, speed, ETA, result) that is
+   published as a progress event to listeners and the per-upload callback
+"""
+
+import time
+import uuid
+import logging
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Optional
+
+from app.utils.youtube_helper import new_authorized_http, upload_to_youtube
+
+logger = logging.getLogger(__name__)
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+
+class YouTubeUploadManager:
+    """
+    Queue of YouTube uploads with per-upload progress events.
+
+    Usage:
+        manager = get_upload_manager()
+        upload_id = manager.submit(service, "ad.mp4", metadata,
+                                   on_progress=lambda e: print(e["progress"]))
+        result = manager.wait(upload_id)   # {'id', 'url', 'title', 'privacy'}
+    """
+
+    def __init__(self, max_workers: int = 2):
+        self._pool = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="youtube-upload")
+        self._lock = threading.Lock()
+        self._uploads: Dict[str, Dict[str, Any]] = {}
+        self._futures: Dict[str, Future] = {}
+        self._callbacks: Dict[str, ProgressCallback] = {}
+        self._listeners: List[ProgressCallback] = []
+
+    # ----- events -----
+
+    def add_listener(self, callback: ProgressCallback):
+        """Receive progress events for every upload."""
+        with self._lock:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback: ProgressCallback):
+        with self._lock:
+            if callback in self._listeners:
+                self._listeners.remove(callback)
+
+    def _emit(self, upload_id: str, **changes):
+        with self._lock:
+            record = self._uploads[upload_id]
+            record.update(changes, updated_at=time.time())
+            event = dict(record)
+            callbacks = list(self._listeners)
+            if upload_id in self._callbacks:
+                callbacks.append(self._callbacks[upload_id])
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception as e:
+                logger.debug(f"Upload progress listener failed: {e}")
+
+    # ----- queue -----
+
+    def submit(
+        self,
+        youtube_service,
+        video_path: str,
+        metadata: Dict[str, Any],
+        thumbnail_path: Optional[str] = None,
+        on_progress: Optional[ProgressCallback] = None
+    ) -> str:
+        """
+        Queue a video for upload.
+
+        Args:
+            youtube_service: Authenticated YouTube API service object
+            video_path: Path to video file
+            metadata: Dict with title, description, tags, category, privacy
+            thumbnail_path: Optional thumbnail image path
+            on_progress: Optional callback receiving this upload's events
+
+        Returns:
+            Upload ID for status(), wait() and events
+        """
+        upload_id = uuid.uuid4().hex[:12]
+        total = Path(video_path).stat().st_size
+        with self._lock:
+            self._uploads[upload_id] = {
+                "upload_id": upload_id,
+                "video": Path(video_path).name,
+                "title": metadata.get("title", ""),
+                "state": "queued",
+                "bytes_sent": 0,
+                "total_bytes": total,
+                "progress": 0.0,
+                "speed": 0.0,
+                "eta": None,
+                "result": None,
+                "error": None,
+                "queued_at": time.time(),
+                "updated_at": time.time()
+            }
+            if on_progress:
+                self._callbacks[upload_id] = on_progress
+            self._futures[upload_id] = self._pool.submit(
+                self._run, upload_id, youtube_service, video_path, metadata, thumbnail_path
+            )
+        logger.info(f"📥 Queued YouTube upload {upload_id}: {Path(video_path).name}")
+        return upload_id
+
+    def _run(self, upload_id: str, youtube_service, video_path: str,
+             metadata: Dict[str, Any], thumbnail_path: Optional[str]) -> Dict[str, Any]:
+        started = time.time()
+        self._emit(upload_id, state="uploading", started_at=started)
+        first_offset: List[Optional[int]] = [None]
+
+        def _on_chunk(sent: int, total: int):
+            # Speed is measured from the first acknowledged offset so a
+            # resumed upload doesn't report the resumed bytes as this run's
+            if first_offset[0] is None:
+                first_offset[0] = sent
+                speed = 0.0
+            else:
+                speed = (sent - first_offset[0]) / max(time.time() - started, 1e-6)
+            eta = (total - sent) / speed if speed > 0 else None
+            self._emit(upload_id, bytes_sent=sent, total_bytes=total,
+                       progress=sent / max(total, 1), speed=speed, eta=eta)
+
+        try:
+            result = upload_to_youtube(
+                youtube_service=youtube_service,
+                video_path=video_path,
+                metadata=metadata,
+                thumbnail_path=thumbnail_path,
+                on_progress=_on_chunk,
+                http=new_authorized_http(youtube_service)
+            )
+        except Exception as e:
+            self._emit(upload_id, state="failed", error=str(e), finished_at=time.time())
+            logger.error(f"❌ YouTube upload {upload_id} failed: {e}")
+            raise
+        self._emit(upload_id, state="completed", progress=1.0, eta=0,
+                   result=result, finished_at=time.time())
+        logger.info(f"✅ YouTube upload {upload_id} finished in {time.time() - started:.1f}s")
+        return result
+
+    def wait(self, upload_id: str, timeout: Optional[float] = None) -> Dict[str, Any]:
+        """Block until an upload finishes; re-raises its error."""
+        with self._lock:
+            future = self._futures[upload_id]
+        return future.result(timeout=timeout)
+
+    def status(self, upload_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            record = self._uploads.get(upload_id)
+            return dict(record) if record else None
+
+    def list(self, active_only: bool = False) -> List[Dict[str, Any]]:
+        with self._lock:
+            records = [dict(r) for r in self._uploads.values()]
+        if active_only:
+            records = [r for r in records if r["state"] in ("queued", "uploading")]
+        return sorted(records, key=lambda r: r["queued_at"], reverse=True)
+
+    def shutdown(self, wait: bool = False):
+        self._pool.shutdown(wait=wait)
+
+
+_upload_manager: Optional[YouTubeUploadManager] = None
+_upload_manager_lock = threading.Lock()
+
+
+def get_upload_manager() -> YouTubeUploadManager:
+    """Get the global YouTube upload manager instance."""
+    global _upload_manager
+    with _upload_manager_lock:
+        if _upload_manager is None:
+            _upload_manager = YouTubeUploadManager()
+        return _upload_manager
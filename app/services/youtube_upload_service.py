@@ -8,15 +8,15 @@ import os
 from app.services.secure_config import get_api_key
 import re
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 import logging
 import random
 
 from app.utils.youtube_helper import (
     get_youtube_service,
-    upload_to_youtube,
     YOUTUBE_CATEGORIES
 )
+from app.services.youtube_upload_manager import get_upload_manager
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -361,26 +361,28 @@ DESCRIPTION: [your description here]"""
             'notify_subscribers': False
         }
     
-    def upload_commercial(
+    def queue_commercial(
         self,
         video_path: str,
         product_name: str,
         metadata: Optional[Dict] = None,
         thumbnail_path: Optional[str] = None,
+        on_progress: Optional[Callable[[Dict], None]] = None,
         **kwargs
-    ) -> Optional[Dict]:
+    ) -> Optional[str]:
         """
-        Upload commercial video to YouTube
+        Queue a commercial video for upload without waiting for it
         
         Args:
             video_path: Path to video file
             product_name: Product name for metadata
             metadata: Optional pre-generated metadata dict
             thumbnail_path: Optional thumbnail image path
+            on_progress: Optional callback receiving progress event dicts
             **kwargs: Additional args for generate_metadata_from_campaign
         
         Returns:
-            Dict with upload result (id, url, title) or None if failed
+            Upload ID (see get_upload_manager()) or None if it couldn't be queued
         """
         if not self.is_authenticated:
             if not self.authenticate():
@@ -399,13 +401,56 @@ DESCRIPTION: [your description here]"""
         logger.info(f"   Privacy: {metadata.get('privacy', 'unlisted')}")
         
         try:
-            result = upload_to_youtube(
-                youtube_service=self.youtube_service,
-                video_path=video_path,
-                metadata=metadata,
-                thumbnail_path=thumbnail_path
+            return get_upload_manager().submit(
+                self.youtube_service,
+                video_path,
+                metadata,
+                thumbnail_path=thumbnail_path,
+                on_progress=on_progress
             )
-            
+        except Exception as e:
+            logger.error(f"❌ Could not queue upload: {e}")
+            return None
+    
+    def upload_commercial(
+        self,
+        video_path: str,
+        product_name: str,
+        metadata: Optional[Dict] = None,
+        thumbnail_path: Optional[str] = None,
+        on_progress: Optional[Callable[[Dict], None]] = None,
+        **kwargs
+    ) -> Optional[Dict]:
+        """
+        Upload commercial video to YouTube
+        
+        The video goes through the shared upload queue in resumable chunks;
+        this call blocks until it finishes.
+        
+        Args:
+            video_path: Path to video file
+            product_name: Product name for metadata
+            metadata: Optional pre-generated metadata dict
+            thumbnail_path: Optional thumbnail image path
+            on_progress: Optional callback receiving progress event dicts
+            **kwargs: Additional args for generate_metadata_from_campaign
+        
+        Returns:
+            Dict with upload result (id, url, title) or None if failed
+        """
+        upload_id = self.queue_commercial(
+            video_path,
+            product_name,
+            metadata=metadata,
+            thumbnail_path=thumbnail_path,
+            on_progress=on_progress,
+            **kwargs
+        )
+        if not upload_id:
+            return None
+        
+        try:
+            result = get_upload_manager().wait(upload_id)
             logger.info(f"✅ Upload successful: {result['url']}")
             return result
             
@@ -417,31 +462,45 @@ DESCRIPTION: [your description here]"""
         self,
         video_path: str,
         output_path: Optional[str] = None,
-        timestamp: float = 1.0
+        timestamp: Optional[float] = None
     ) -> Optional[str]:
         """
         Extract a frame from video to use as thumbnail
         
+        With ffmpeg available, a handful of candidate frames are scored and
+        the best one is rendered at 1280x720; MoviePy is the fallback.
+        
         Args:
             video_path: Path to video file
             output_path: Where to save thumbnail (default: same dir as video)
-            timestamp: Timestamp in seconds to extract frame
+            timestamp: Timestamp in seconds to extract frame (default: pick the best frame)
         
         Returns:
             Path to generated thumbnail or None if failed
         """
+        if not output_path:
+            video_dir = Path(video_path).parent
+            video_name = Path(video_path).stem
+            output_path = video_dir / f"{video_name}_thumbnail.jpg"
+        
+        try:
+            from modules.video_thumbnails import create_video_thumbnail, ThumbnailError
+            try:
+                thumbnail = create_video_thumbnail(video_path, str(output_path), timestamp=timestamp)
+                logger.info(f"✅ Thumbnail created: {thumbnail}")
+                return thumbnail
+            except ThumbnailError as e:
+                logger.warning(f"⚠️ ffmpeg thumbnail failed, falling back to MoviePy: {e}")
+        except ImportError:
+            pass
+        
         try:
             from moviepy.editor import VideoFileClip
             from PIL import Image
             
-            if not output_path:
-                video_dir = Path(video_path).parent
-                video_name = Path(video_path).stem
-                output_path = video_dir / f"{video_name}_thumbnail.jpg"
-            
             # Extract frame
             clip = VideoFileClip(video_path)
-            frame = clip.get_frame(timestamp)
+            frame = clip.get_frame(1.0 if timestamp is None else timestamp)
             clip.close()
             
             # Convert to PIL Image and resize to YouTube recommended size
@@ -458,6 +517,37 @@ DESCRIPTION: [your description here]"""
             logger.error(f"❌ Thumbnail creation failed: {e}")
             return None
     
+    def create_thumbnails_for_videos(
+        self,
+        video_paths: List[str],
+        output_dir: Optional[str] = None
+    ) -> Dict[str, Optional[str]]:
+        """
+        Create thumbnails for several videos at once (e.g. a whole campaign)
+        
+        Args:
+            video_paths: Videos to process
+            output_dir: Directory for thumbnails (default: next to each video)
+        
+        Returns:
+            Dict mapping video path to thumbnail path (None where it failed)
+        """
+        try:
+            from modules.video_thumbnails import create_thumbnails_batch
+            from modules.ffmpeg_assembly import is_ffmpeg_available
+            if is_ffmpeg_available():
+                return create_thumbnails_batch(video_paths, output_dir=output_dir)
+        except ImportError:
+            pass
+        
+        results = {}
+        for video_path in video_paths:
+            output_path = None
+            if output_dir:
+                output_path = str(Path(output_dir) / f"{Path(video_path).stem}_thumbnail.jpg")
+            results[video_path] = self.create_thumbnail_from_video(video_path, output_path)
+        return results
+    
     def get_upload_history(self, limit: int = 10) -> List[Dict]:
         """
         Get recent video uploads from authenticated channel
@@ -1,6 +1,6 @@
 import streamlit as st
 import os
-from datetime import datetime
+from datetime import datetime, timedelta
 import logging
 
 # Configure logger
@@ -95,235 +95,75 @@ def render_analytics_tab():
             st.write(f"- client_secret.json: {'✅ Exists' if os.path.exists('client_secret.json') else '❌ Not found'}")
             st.write(f"- token.pickle: {'✅ Exists' if os.path.exists('token.pickle') else '❌ Not found'}")
         
-        # Fetch data from all platforms
-        shopify_data = None
-        printify_data = None
-        youtube_data = None
+        # Serve the last snapshot instantly; stale sources refresh in the background
+        from app.services.analytics_cache import get_analytics_cache
+        cache = get_analytics_cache()
+        sources = []
         
-        # Check if analytics jobs are running
-        if 'analytics_fetch_jobs' not in st.session_state:
-            st.session_state.analytics_fetch_jobs = []
-        
-        if st.session_state.analytics_fetch_jobs:
-            # Jobs already submitted, check progress
-            from app.services.tab_job_helpers import check_jobs_progress, are_all_jobs_done, collect_job_results
+        if shopify_connected and st.session_state.get('shopify_api'):
+            shopify_api = st.session_state.shopify_api
             
-            job_ids = st.session_state.analytics_fetch_jobs
-            progress = check_jobs_progress(job_ids)
+            def fetch_shopify():
+                return shopify_api.get_comprehensive_analytics()
             
-            with st.spinner(f"⚡ Fetching analytics in parallel: {progress['completed']}/{len(job_ids)} complete..."):
-                if are_all_jobs_done(job_ids):
-                    results = collect_job_results(job_ids)
-                    shopify_data = results[0] if len(results) > 0 else None
-                    printify_data = results[1] if len(results) > 1 else None
-                    youtube_data = results[2] if len(results) > 2 else None
-                    st.session_state.analytics_fetch_jobs = []
-                else:
-                    if st.button("🔄 Refresh Analytics", key="refresh_analytics"):
-                        st.rerun()
-                    st.stop()
-        else:
-            # Submit parallel fetch jobs
-            from app.services.global_job_queue import get_global_job_queue, JobType
-            queue = get_global_job_queue()
-            job_ids = []
-            
-            # Job 1: Get Shopify data
-            if shopify_connected and st.session_state.get('shopify_api'):
-                def fetch_shopify():
-                    try:
-                        return st.session_state.shopify_api.get_comprehensive_analytics()
-                    except Exception as e:
-                        logger.error(f"Shopify error: {e}")
-                        return {'error': str(e)}
-                
-                job_ids.append(queue.submit_job(
-                    job_type=JobType.BATCH_OPERATION,
-                    tab_name="Analytics",
-                    description="Fetch Shopify Analytics",
-                    function=fetch_shopify,
-                    priority=7
-                ))
-            else:
-                job_ids.append(None)  # Placeholder
+            cache.register('shopify', fetch_shopify, account=os.getenv('SHOPIFY_SHOP_URL'))
+            sources.append('shopify')
+        
+        if printify_connected and st.session_state.get('printify_api'):
+            printify_api = st.session_state.printify_api
             
-            # Job 2: Get Printify data
-            if printify_connected and st.session_state.get('printify_api'):
-                def fetch_printify():
-                    try:
-                        api = st.session_state.printify_api
-                        shops = api.get_shops()
-                        if shops:
-                            shop_id = str(shops[0].get('id'))
-                            products = api.get_shop_products(shop_id=shop_id, limit=50)
-                            return {
-                                'shop_count': len(shops),
-                                'product_count': len(products),
-                                'products': products
-                            }
-                        return None
-                    except Exception as e:
-                        logger.error(f"Printify error: {e}")
-                        return {'error': str(e)}
-                
-                job_ids.append(queue.submit_job(
-                    job_type=JobType.BATCH_OPERATION,
-                    tab_name="Analytics",
-                    description="Fetch Printify Data",
-                    function=fetch_printify,
-                    priority=7
-                ))
-            else:
-                job_ids.append(None)
+            def fetch_printify():
+                shops = printify_api.get_shops()
+                if shops:
+                    shop_id = str(shops[0].get('id'))
+                    products = printify_api.get_shop_products(shop_id=shop_id, limit=50)
+                    return {
+                        'shop_count': len(shops),
+                        'product_count': len(products),
+                        'products': products
+                    }
+                return None
             
-            # Job 3: Get YouTube data
-            if youtube_connected and st.session_state.get('youtube_service'):
-                def fetch_youtube():
-                    try:
-                        yt = st.session_state.youtube_service
-                        upload_history = yt.get_upload_history(limit=50)
-                        if upload_history:
-                            total_views = sum(v.get('view_count', 0) for v in upload_history)
-                            total_likes = sum(v.get('like_count', 0) for v in upload_history)
-                            return {
-                                'video_count': len(upload_history),
-                                'total_views': total_views,
-                                'total_likes': total_likes,
-                                'videos': upload_history
-                            }
-                        return None
-                    except Exception as e:
-                        logger.error(f"YouTube error: {e}")
-                        return {'error': str(e)}
-                
-                job_ids.append(queue.submit_job(
-                    job_type=JobType.BATCH_OPERATION,
-                    tab_name="Analytics",
-                    description="Fetch YouTube Stats",
-                    function=fetch_youtube,
-                    priority=7
-                ))
-            else:
-                job_ids.append(None)
+            cache.register('printify', fetch_printify, account=os.getenv('PRINTIFY_SHOP_ID'))
+            sources.append('printify')
+        
+        if youtube_connected and st.session_state.get('youtube_service'):
+            youtube_service = st.session_state.youtube_service
             
-            # Filter out None placeholders
-            st.session_state.analytics_fetch_jobs = [j for j in job_ids if j]
+            def fetch_youtube():
+                upload_history = youtube_service.get_upload_history(limit=50)
+                if upload_history:
+                    return {
+                        'video_count': len(upload_history),
+                        'total_views': sum(v.get('view_count', 0) for v in upload_history),
+                        'total_likes': sum(v.get('like_count', 0) for v in upload_history),
+                        'videos': upload_history
+                    }
+                return None
             
-            if st.session_state.analytics_fetch_jobs:
-                st.info(f"⚡ Fetching analytics from {len(st.session_state.analytics_fetch_jobs)} sources in parallel...")
-                import time
-                time.sleep(0.5)
-                st.rerun()
-            else:
-                # No services connected
-                pass
+            cache.register('youtube', fetch_youtube)
+            sources.append('youtube')
         
-        # Display unified metrics
-        st.markdown("#### 📈 Key Metrics")
+        force_refresh = st.button("🔄 Refresh Analytics", key="refresh_analytics")
+        for source in sources:
+            cache.refresh(source, force=force_refresh)
         
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            if shopify_data and not shopify_data.get('error'):
-                revenue = shopify_data.get('revenue', {}).get('recent_orders_total', 0)
-                st.metric("💰 Shopify Revenue", f"${revenue:,.2f}")
-            else:
-                st.metric("💰 Shopify Revenue", "Not Connected", delta=None)
-        
-        with col2:
-            if shopify_data and not shopify_data.get('error'):
-                orders = shopify_data.get('orders', {}).get('total_count', 0)
-                st.metric("📦 Total Orders", f"{orders:,}")
-            else:
-                st.metric("📦 Total Orders", "Not Connected", delta=None)
-        
-        with col3:
-            if printify_data:
-                products = printify_data.get('product_count', 0)
-                st.metric("🎨 Printify Products", f"{products:,}")
-            else:
-                st.metric("🎨 Printify Products", "Not Connected", delta=None)
+        # Re-render just the overview while fetches are in flight so each
+        # source shows up as soon as it lands
+        from app.utils.performance_boost import experimental_fragment
         
-        with col4:
-            if youtube_data:
-                views = youtube_data.get('total_views', 0)
-                st.metric("📺 YouTube Views", f"{views:,}")
-            else:
-                st.metric("📺 YouTube Views", "Not Connected", delta=None)
-        
-        st.markdown("---")
-        
-        # Second row of metrics
-        col1, col2, col3, col4 = st.columns(4)
-        
-        with col1:
-            if shopify_data and not shopify_data.get('error'):
-                products = shopify_data.get('products', {}).get('total_count', 0)
-                st.metric("🛍️ Shopify Products", f"{products:,}")
-            else:
-                st.metric("🛍️ Shopify Products", "-")
-        
-        with col2:
-            if shopify_data and not shopify_data.get('error'):
-                customers = shopify_data.get('customers', {}).get('total_count', 0)
-                st.metric("👥 Customers", f"{customers:,}")
-            else:
-                st.metric("👥 Customers", "-")
-        
-        with col3:
-            if printify_data:
-                shops = printify_data.get('shop_count', 0)
-                st.metric("🏪 Printify Shops", f"{shops:,}")
-            else:
-                st.metric("🏪 Printify Shops", "-")
-        
-        with col4:
-            if youtube_data:
-                videos = youtube_data.get('video_count', 0)
-                st.metric("🎬 YouTube Videos", f"{videos:,}")
-            else:
-                st.metric("🎬 YouTube Videos", "-")
-        
-        st.markdown("---")
-        
-        # Platform status
-        st.markdown("#### 🔌 Platform Connections")
-        
-        col1, col2, col3 = st.columns(3)
-        
-        with col1:
-            if shopify_connected and shopify_data and not shopify_data.get('error'):
-                shop_name = shopify_data.get('shop', {}).get('name', 'Unknown')
-                st.success(f"✅ Shopify: {shop_name}")
-                st.caption("Publishing blogs successfully")
-            elif shopify_connected:
-                st.success("✅ Shopify: Connected")
-                st.caption("Credentials configured, ready to publish")
-            else:
-                st.error("❌ Shopify: Not Connected")
-                st.caption("Add to .env: SHOPIFY_SHOP_URL, SHOPIFY_ACCESS_TOKEN")
-        
-        with col2:
-            if printify_connected and printify_data:
-                st.success(f"✅ Printify: {printify_data.get('product_count', 0)} products")
-                st.caption("Ready to create products")
-            elif printify_connected:
-                st.success("✅ Printify: Connected")
-                st.caption("API token configured")
-            else:
-                st.error("❌ Printify: Not Connected")
-                st.caption("Add to .env: PRINTIFY_API_TOKEN, PRINTIFY_SHOP_ID")
+        @experimental_fragment(run_every=timedelta(seconds=2) if cache.is_refreshing() else None)
+        def render_overview():
+            shopify_data = cache.data('shopify') if 'shopify' in sources else None
+            printify_data = cache.data('printify') if 'printify' in sources else None
+            youtube_data = cache.data('youtube') if 'youtube' in sources else None
+            _render_freshness(cache, sources)
+            _render_overview_metrics(
+                shopify_data, printify_data, youtube_data,
+                shopify_connected, printify_connected, youtube_connected
+            )
         
-        with col3:
-            if youtube_connected and youtube_data:
-                st.success(f"✅ YouTube: {youtube_data.get('video_count', 0)} videos")
-                st.caption("Uploading videos successfully")
-            elif youtube_connected:
-                st.success("✅ YouTube: Authenticated")
-                st.caption("OAuth token valid, ready to upload")
-            else:
-                st.error("❌ YouTube: Not Connected")
-                st.caption("Add client_secret.json and authenticate")
+        render_overview()
     
     # ========================================
     # SHOPIFY TAB
@@ -695,3 +535,145 @@ TWITTER_PASSWORD=your_password
                 st.markdown("2. Check that credentials are correct in .env")
                 st.markdown("3. Try logging in manually at twitter.com first")
                 st.markdown("4. Watch terminal logs when posting to see exact error")
+
+
+def _format_age(seconds):
+    if seconds is None:
+        return "never"
+    if seconds < 60:
+        return f"{int(seconds)}s ago"
+    if seconds < 3600:
+        return f"{int(seconds // 60)}m ago"
+    return f"{int(seconds // 3600)}h ago"
+
+
+def _render_freshness(cache, sources):
+    """One caption line with per-source age, fetch time and refresh state."""
+    parts = []
+    for source in sources:
+        entry = cache.get(source)
+        if entry is None:
+            parts.append(f"{source.title()}: loading…")
+            continue
+        part = f"{source.title()}: {_format_age(entry['age'])}"
+        if entry.get('duration') is not None:
+            part += f" ({entry['duration']:.1f}s)"
+        if entry['refreshing']:
+            part += " ⟳"
+        elif entry.get('error'):
+            part += " ⚠️"
+        parts.append(part)
+    if parts:
+        st.caption("🕒 " + " · ".join(parts))
+
+
+def _render_overview_metrics(shopify_data, printify_data, youtube_data,
+                             shopify_connected, printify_connected, youtube_connected):
+    """Key metrics and connection cards for the Overview tab."""
+    # Display unified metrics
+    st.markdown("#### 📈 Key Metrics")
+    
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        if shopify_data and not shopify_data.get('error'):
+            revenue = shopify_data.get('revenue', {}).get('recent_orders_total', 0)
+            st.metric("💰 Shopify Revenue", f"${revenue:,.2f}")
+        else:
+            st.metric("💰 Shopify Revenue", "Not Connected", delta=None)
+    
+    with col2:
+        if shopify_data and not shopify_data.get('error'):
+            orders = shopify_data.get('orders', {}).get('total_count', 0)
+            st.metric("📦 Total Orders", f"{orders:,}")
+        else:
+            st.metric("📦 Total Orders", "Not Connected", delta=None)
+    
+    with col3:
+        if printify_data:
+            products = printify_data.get('product_count', 0)
+            st.metric("🎨 Printify Products", f"{products:,}")
+        else:
+            st.metric("🎨 Printify Products", "Not Connected", delta=None)
+    
+    with col4:
+        if youtube_data:
+            views = youtube_data.get('total_views', 0)
+            st.metric("📺 YouTube Views", f"{views:,}")
+        else:
+            st.metric("📺 YouTube Views", "Not Connected", delta=None)
+    
+    st.markdown("---")
+    
+    # Second row of metrics
+    col1, col2, col3, col4 = st.columns(4)
+    
+    with col1:
+        if shopify_data and not shopify_data.get('error'):
+            products = shopify_data.get('products', {}).get('total_count', 0)
+            st.metric("🛍️ Shopify Products", f"{products:,}")
+        else:
+            st.metric("🛍️ Shopify Products", "-")
+    
+    with col2:
+        if shopify_data and not shopify_data.get('error'):
+            customers = shopify_data.get('customers', {}).get('total_count', 0)
+            st.metric("👥 Customers", f"{customers:,}")
+        else:
+            st.metric("👥 Customers", "-")
+    
+    with col3:
+        if printify_data:
+            shops = printify_data.get('shop_count', 0)
+            st.metric("🏪 Printify Shops", f"{shops:,}")
+        else:
+            st.metric("🏪 Printify Shops", "-")
+    
+    with col4:
+        if youtube_data:
+            videos = youtube_data.get('video_count', 0)
+            st.metric("🎬 YouTube Videos", f"{videos:,}")
+        else:
+            st.metric("🎬 YouTube Videos", "-")
+    
+    st.markdown("---")
+    
+    # Platform status
+    st.markdown("#### 🔌 Platform Connections")
+    
+    col1, col2, col3 = st.columns(3)
+    
+    with col1:
+        if shopify_connected and shopify_data and not shopify_data.get('error'):
+            shop_name = shopify_data.get('shop', {}).get('name', 'Unknown')
+            st.success(f"✅ Shopify: {shop_name}")
+            st.caption("Publishing blogs successfully")
+        elif shopify_connected:
+            st.success("✅ Shopify: Connected")
+            st.caption("Credentials configured, ready to publish")
+        else:
+            st.error("❌ Shopify: Not Connected")
+            st.caption("Add to .env: SHOPIFY_SHOP_URL, SHOPIFY_ACCESS_TOKEN")
+    
+    with col2:
+        if printify_connected and printify_data:
+            st.success(f"✅ Printify: {printify_data.get('product_count', 0)} products")
+            st.caption("Ready to create products")
+        elif printify_connected:
+            st.success("✅ Printify: Connected")
+            st.caption("API token configured")
+        else:
+            st.error("❌ Printify: Not Connected")
+            st.caption("Add to .env: PRINTIFY_API_TOKEN, PRINTIFY_SHOP_ID")
+    
+    with col3:
+        if youtube_connected and youtube_data:
+            st.success(f"✅ YouTube: {youtube_data.get('video_count', 0)} videos")
+            st.caption("Uploading videos successfully")
+        elif youtube_connected:
+            st.success("✅ YouTube: Authenticated")
+            st.caption("OAuth token valid, ready to upload")
+        else:
+            st.error("❌ YouTube: Not Connected")
+            st.caption("Add client_secret.json and authenticate")
+
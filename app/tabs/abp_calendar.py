@@ -68,6 +68,30 @@ def render_calendar_tab():
             'completed': [],
             'failed': []
         }
+    
+    # Calendar items are persisted by the scheduler service; restore them once per session
+    try:
+        from app.services.enhanced_features import ContentCalendarManager
+        if not st.session_state.get('_calendar_restored'):
+            st.session_state._calendar_restored = True
+            known = {item.get('schedule_ref') for item in st.session_state.scheduled_items}
+            st.session_state.scheduled_items.extend(
+                item for item in ContentCalendarManager.load_scheduled_items()
+                if item['schedule_ref'] not in known
+            )
+        
+        # Items that came due while we weren't looking go straight to the queue
+        # (one delivery per workspace, so a refresh or restart doesn't queue them again)
+        for due_item in ContentCalendarManager.take_due_items():
+            due_item['added_at'] = dt.now().strftime("%Y-%m-%d %H:%M:%S")
+            st.session_state.queue_items['pending'].append(due_item)
+            for item in st.session_state.scheduled_items:
+                if item.get('schedule_ref') == due_item['schedule_ref']:
+                    item['status'] = 'due'
+            st.toast(f"⏰ Due now: {due_item.get('title', 'Scheduled item')}")
+    except Exception as e:
+        ContentCalendarManager = None
+        logger.warning(f"Scheduler unavailable, calendar is session-only: {e}")
     if 'calendar_date' not in st.session_state:
         st.session_state.calendar_date = datetime_module.date.today()
     if 'recurring_tasks' not in st.session_state:
@@ -153,6 +177,11 @@ def render_calendar_tab():
         today = datetime_module.date.today()
         selected_date = st.session_state.calendar_date
         
+        # Group once instead of scanning every item for every cell
+        items_by_date = {}
+        for item in st.session_state.scheduled_items:
+            items_by_date.setdefault(item.get('date'), []).append(item)
+        
         for week in cal:
             cols = st.columns(7)
             for idx, day in enumerate(week):
@@ -168,10 +197,7 @@ def render_calendar_tab():
                         )
                         
                         # Count items scheduled for this date
-                        items_on_date = [
-                            item for item in st.session_state.scheduled_items
-                            if item.get('date') == cell_date
-                        ]
+                        items_on_date = items_by_date.get(cell_date, [])
                         
                         # Style based on date
                         is_today = cell_date == today
@@ -244,6 +270,8 @@ def render_calendar_tab():
                             
                             if st.button("🗑️", key=f"del_item_{idx}", use_container_width=True):
                                 st.session_state.scheduled_items.remove(item)
+                                if ContentCalendarManager:
+                                    ContentCalendarManager.unschedule_item(item)
                                 st.rerun()
                         
                         # Edit form (shown when editing)
@@ -262,6 +290,8 @@ def render_calendar_tab():
                                     item['time'] = new_time.strftime('%H:%M')
                                     item['type'] = new_type
                                     item['description'] = new_desc
+                                    if ContentCalendarManager:
+                                        ContentCalendarManager.schedule_item(item)
                                     del st.session_state[f'editing_item_{idx}']
                                     st.success("✅ Saved!")
                                     st.rerun()
@@ -891,6 +921,8 @@ For each post, provide:
                                         'ai_generated': True
                                     }
                                     st.session_state.scheduled_items.append(new_item)
+                                    if ContentCalendarManager:
+                                        ContentCalendarManager.schedule_item(new_item)
                                 st.success(f"✅ Added {min(batch_count, 7)} posts to calendar!")
                                 st.rerun()
                                 
@@ -1053,6 +1085,8 @@ Be specific and actionable."""
                     'created_at': datetime_module.datetime.now().isoformat()
                 }
                 st.session_state.scheduled_items.append(new_item)
+                if ContentCalendarManager:
+                    ContentCalendarManager.schedule_item(new_item)
                 st.session_state['show_schedule_modal'] = False
                 st.success(f"✅ Scheduled '{item_title}' for {item_date}")
                 st.rerun()
@@ -268,3 +268,8 @@ def render_campaign_complete_summary(
 
     st.session_state.current_campaign = summary_entry
     st.session_state.campaign_history.append(summary_entry)
+    try:
+        from app.services.enhanced_features import GlobalSearchManager
+        GlobalSearchManager.index_item('campaigns', summary_entry)
+    except Exception as e:
+        logger.debug(f"Search indexing skipped: {e}")
@@ -339,6 +339,11 @@ Format: Just the 5 headlines, numbered."""
                     "status": "Completed"
                 }
                 st.session_state.campaign_history.append(campaign_summary)
+                try:
+                    from app.services.enhanced_features import GlobalSearchManager
+                    GlobalSearchManager.index_item('campaigns', campaign_summary)
+                except Exception as e:
+                    logger.debug(f"Search indexing skipped: {e}")
 
                 # Provide download link for the ZIP file
                 st.download_button(
@@ -9,13 +9,17 @@ This solves the problem where:
 3. Page state resets when returning to a page
 
 Architecture:
-- Background thread pool for long-running tasks
-- Persistent state storage with auto-save
+- Long-running tasks run on the shared execution fabric
+- Write-behind persistence: progress and log lines are buffered in memory,
+  appended to a per-task log and coalesced into snapshots by a flusher thread
+- Page state is diffed against the last saved copy and only written on change
 - Real-time progress tracking across pages
 - Automatic state restoration on page load
 """
 
 import streamlit as st
+import atexit
+import copy
 import threading
 import queue
 import time
@@ -26,10 +30,11 @@ import traceback
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any, Callable, Optional, List
-from dataclasses import dataclass, field, asdict
+from dataclasses import dataclass, field, asdict, replace
 from enum import Enum
 import logging
-from concurrent.futures import ThreadPoolExecutor, Future
+
+from app.services.execution_fabric import FabricJob, get_fabric
 
 logger = logging.getLogger(__name__)
 
@@ -39,6 +44,9 @@ TASKS_DIR = Path("sessions/background_tasks")
 STATE_DIR.mkdir(parents=True, exist_ok=True)
 TASKS_DIR.mkdir(parents=True, exist_ok=True)
 
+# Snapshots and page states are written at most once per interval
+FLUSH_INTERVAL_MS = int(os.getenv("STATE_FLUSH_INTERVAL_MS", "250"))
+
 
 class TaskStatus(Enum):
     PENDING = "pending"
@@ -64,9 +72,13 @@ class BackgroundTask:
     page_origin: str = ""
     logs: List[str] = field(default_factory=list)
     
-    def to_dict(self) -> dict:
-        """Convert to JSON-serializable dict."""
-        data = asdict(self)
+    def to_dict(self, include_logs: bool = True) -> dict:
+        """Convert to JSON-serializable dict.
+
+        Args:
+            include_logs: If False, leave out the logs (they live in the task's .log file)
+        """
+        data = asdict(self if include_logs else replace(self, logs=[]))
         data['status'] = self.status.value
         # Don't serialize the result if it's not JSON-safe
         try:
@@ -79,6 +91,7 @@ class BackgroundTask:
     def from_dict(cls, data: dict) -> 'BackgroundTask':
         """Restore from dict."""
         data['status'] = TaskStatus(data.get('status', 'pending'))
+        data.pop('log_seq', None)
         return cls(**data)
 
 
@@ -128,15 +141,29 @@ class CrossPageStateManager:
             return
         
         self._initialized = True
-        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="bg_task_")
         self._tasks: Dict[str, BackgroundTask] = {}
-        self._task_futures: Dict[str, Future] = {}
+        self._task_jobs: Dict[str, FabricJob] = {}
         self._page_states: Dict[str, Dict[str, Any]] = {}
         self._progress_queues: Dict[str, queue.Queue] = {}
         
+        # Write-behind state: producers queue snapshots under _persist_lock
+        # (taken on their own thread), the flusher does the disk IO under _flush_lock
+        self._persist_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._dirty_tasks: Dict[str, dict] = {}
+        self._pending_logs: Dict[str, List[dict]] = {}
+        self._log_seq: Dict[str, int] = {}
+        self._saved_page_states: Dict[str, Dict[str, Any]] = {}
+        self._dirty_pages: Dict[str, Dict[str, Any]] = {}
+        self._flush_wakeup = threading.Event()
+        
         # Load any persisted tasks and states
         self._load_persisted_state()
         
+        self._flusher = threading.Thread(target=self._flush_loop, name="state-flusher", daemon=True)
+        self._flusher.start()
+        atexit.register(self.flush)
+        
         logger.info("CrossPageStateManager initialized")
     
     def _load_persisted_state(self):
@@ -148,6 +175,8 @@ class CrossPageStateManager:
                     with open(state_file, 'r') as f:
                         page_name = state_file.stem
                         self._page_states[page_name] = json.load(f)
+                        # Deep copy: the diff must not share nested values with the live state
+                        self._saved_page_states[page_name] = copy.deepcopy(self._page_states[page_name])
                 except Exception as e:
                     logger.warning(f"Could not load state for {state_file}: {e}")
             
@@ -156,18 +185,46 @@ class CrossPageStateManager:
                 try:
                     with open(task_file, 'r') as f:
                         task_data = json.load(f)
-                        task = BackgroundTask.from_dict(task_data)
-                        # Mark incomplete tasks as failed (they were interrupted)
-                        if task.status in [TaskStatus.PENDING, TaskStatus.RUNNING]:
-                            task.status = TaskStatus.FAILED
-                            task.error = "Task was interrupted by app restart"
-                        self._tasks[task.task_id] = task
+                    log_seq = task_data.get('log_seq', 0)
+                    task = BackgroundTask.from_dict(task_data)
+                    self._replay_task_log(task, log_seq)
+                    # Mark incomplete tasks as failed (they were interrupted)
+                    if task.status in [TaskStatus.PENDING, TaskStatus.RUNNING]:
+                        task.status = TaskStatus.FAILED
+                        task.error = "Task was interrupted by app restart"
+                    self._tasks[task.task_id] = task
                 except Exception as e:
                     logger.warning(f"Could not load task {task_file}: {e}")
                     
         except Exception as e:
             logger.error(f"Error loading persisted state: {e}")
     
+    def _replay_task_log(self, task: BackgroundTask, snapshot_seq: int):
+        """
+        Rebuild a task's logs from its .log file.
+        
+        Entries newer than the snapshot (written just before a crash) also
+        bring the progress fields forward.
+        """
+        log_file = TASKS_DIR / f"{task.task_id}.log"
+        if not log_file.exists():
+            return
+        logs = []
+        seq = 0
+        with open(log_file, 'r') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except ValueError:
+                    continue  # torn final line
+                seq = entry.get('seq', seq)
+                logs.append(entry.get('line', ''))
+                if seq > snapshot_seq:
+                    task.progress = entry.get('progress', task.progress)
+                    task.progress_message = entry.get('message', task.progress_message)
+        task.logs = logs
+        self._log_seq[task.task_id] = seq
+    
     def save_page_state(self, page_name: str, state: Dict[str, Any], merge: bool = True):
         """
         Save the current state of a page.
@@ -178,23 +235,31 @@ class CrossPageStateManager:
             merge: If True, merge with existing state. If False, replace.
         """
         try:
-            if merge and page_name in self._page_states:
+            merge = merge and page_name in self._page_states
+            if merge:
                 self._page_states[page_name].update(state)
             else:
                 self._page_states[page_name] = state.copy()
             
-            # Add metadata
-            self._page_states[page_name]['_last_saved'] = datetime.now().isoformat()
-            self._page_states[page_name]['_page_name'] = page_name
-            
-            # Persist to disk
-            state_file = STATE_DIR / f"{page_name}.json"
-            
-            # Make state JSON-safe
-            safe_state = self._make_json_safe(self._page_states[page_name])
-            
-            with open(state_file, 'w') as f:
-                json.dump(safe_state, f, indent=2)
+            # Only the incoming keys are made JSON-safe and compared against
+            # the last saved copy; unchanged saves don't touch the disk
+            incoming = {str(k): self._make_json_safe(v) for k, v in state.items()}
+            incoming.pop('_last_saved', None)
+            with self._persist_lock:
+                saved = self._saved_page_states.get(page_name, {})
+                new_saved = {**saved, **incoming} if merge else incoming
+                new_saved.pop('_last_saved', None)
+                new_saved['_page_name'] = page_name
+                if {k: v for k, v in saved.items() if k != '_last_saved'} == new_saved:
+                    return
+                
+                # Add metadata
+                new_saved['_last_saved'] = datetime.now().isoformat()
+                self._page_states[page_name]['_last_saved'] = new_saved['_last_saved']
+                self._page_states[page_name]['_page_name'] = page_name
+                self._saved_page_states[page_name] = new_saved
+                self._dirty_pages[page_name] = new_saved
+            self._flush_wakeup.set()
                 
         except Exception as e:
             logger.error(f"Error saving page state for {page_name}: {e}")
@@ -241,6 +306,7 @@ class CrossPageStateManager:
                 with open(state_file, 'r') as f:
                     state = json.load(f)
                     self._page_states[page_name] = state
+                    self._saved_page_states[page_name] = copy.deepcopy(state)
                     return state.copy()
             except Exception as e:
                 logger.error(f"Error loading page state for {page_name}: {e}")
@@ -255,14 +321,17 @@ class CrossPageStateManager:
             page_name: Unique identifier for the page
         """
         try:
-            # Remove from memory
-            if page_name in self._page_states:
-                del self._page_states[page_name]
-            
-            # Remove from disk
-            state_file = STATE_DIR / f"{page_name}.json"
-            if state_file.exists():
-                state_file.unlink()
+            # Remove from memory (holding the flush lock so a pending write
+            # can't recreate the file after it's gone)
+            with self._flush_lock, self._persist_lock:
+                self._page_states.pop(page_name, None)
+                self._saved_page_states.pop(page_name, None)
+                self._dirty_pages.pop(page_name, None)
+                
+                # Remove from disk
+                state_file = STATE_DIR / f"{page_name}.json"
+                if state_file.exists():
+                    state_file.unlink()
                 
             logger.info(f"Cleared page state for {page_name}")
         except Exception as e:
@@ -280,7 +349,8 @@ class CrossPageStateManager:
         args: tuple = (),
         kwargs: Optional[dict] = None,
         page: str = "unknown",
-        on_progress: Optional[Callable[[str, float, str], None]] = None
+        on_progress: Optional[Callable[[str, float, str], None]] = None,
+        profile: str = "default"
     ) -> str:
         """
         Run a function in the background that survives page navigation.
@@ -292,6 +362,7 @@ class CrossPageStateManager:
             kwargs: Keyword arguments for the function
             page: Page that initiated the task
             on_progress: Optional callback(task_id, progress, message)
+            profile: Execution fabric resource profile (e.g. "video_generation")
             
         Returns:
             task_id: Unique identifier to check task status
@@ -316,7 +387,7 @@ class CrossPageStateManager:
         def task_wrapper():
             task.status = TaskStatus.RUNNING
             task.started_at = datetime.now().isoformat()
-            self._persist_task(task)
+            self._persist_task(task, immediate=True)
             
             try:
                 # Inject progress callback if function accepts it
@@ -325,9 +396,11 @@ class CrossPageStateManager:
                         task.progress_message = message
                         if progress is not None:
                             task.progress = progress
-                        task.logs.append(f"[{datetime.now().strftime('%H:%M:%S')}] {message}")
+                        self._append_task_log(task, f"[{datetime.now().strftime('%H:%M:%S')}] {message}")
                         progress_queue.put((progress or task.progress, message))
-                        self._persist_task(task)
+                        job = self._task_jobs.get(task_id)
+                        if job:
+                            get_fabric().update(job.job_id, task.progress / 100, message)
                         if on_progress:
                             on_progress(task_id, task.progress, message)
                     
@@ -346,28 +419,104 @@ class CrossPageStateManager:
                 task.status = TaskStatus.FAILED
                 task.error = f"{type(e).__name__}: {str(e)}"
                 task.completed_at = datetime.now().isoformat()
-                task.logs.append(f"[ERROR] {traceback.format_exc()}")
+                self._append_task_log(task, f"[ERROR] {traceback.format_exc()}")
                 logger.error(f"Background task {task_id} failed: {e}")
             
             finally:
-                self._persist_task(task)
+                self._persist_task(task, immediate=True)
                 progress_queue.put(None)  # Signal completion
         
-        # Submit to executor
-        future = self._executor.submit(task_wrapper)
-        self._task_futures[task_id] = future
+        # Queue on the execution fabric (starts once the budget allows)
+        self._task_jobs[task_id] = get_fabric().submit(
+            task_wrapper,
+            name=name,
+            source="cross_page_state",
+            profile=profile,
+            metadata={"task_id": task_id, "page": page}
+        )
         
         logger.info(f"Started background task: {name} (ID: {task_id})")
         return task_id
     
-    def _persist_task(self, task: BackgroundTask):
-        """Save task state to disk."""
-        try:
-            task_file = TASKS_DIR / f"{task.task_id}.json"
-            with open(task_file, 'w') as f:
-                json.dump(task.to_dict(), f, indent=2)
-        except Exception as e:
-            logger.warning(f"Could not persist task {task.task_id}: {e}")
+    def _append_task_log(self, task: BackgroundTask, line: str):
+        """Add a log line to a task; it reaches the task's .log file on the next flush."""
+        with self._persist_lock:
+            task.logs.append(line)
+            seq = self._log_seq.get(task.task_id, 0) + 1
+            self._log_seq[task.task_id] = seq
+            self._pending_logs.setdefault(task.task_id, []).append({
+                'seq': seq,
+                'line': line,
+                'progress': task.progress,
+                'message': task.progress_message
+            })
+            self._dirty_tasks[task.task_id] = self._snapshot(task)
+        self._flush_wakeup.set()
+    
+    def _snapshot(self, task: BackgroundTask) -> dict:
+        """Task snapshot without logs, taken by the thread that changed it (lock held)."""
+        data = task.to_dict(include_logs=False)
+        data['log_seq'] = self._log_seq.get(task.task_id, 0)
+        return data
+    
+    def _persist_task(self, task: BackgroundTask, immediate: bool = False):
+        """
+        Mark a task's snapshot for saving.
+        
+        Args:
+            task: Task to save
+            immediate: Flush now instead of waiting for the flusher (status changes)
+        """
+        with self._persist_lock:
+            self._dirty_tasks[task.task_id] = self._snapshot(task)
+        if immediate:
+            self.flush()
+        else:
+            self._flush_wakeup.set()
+    
+    def _flush_loop(self):
+        """Background flusher: coalesces everything dirtied within one interval."""
+        while True:
+            self._flush_wakeup.wait()
+            time.sleep(FLUSH_INTERVAL_MS / 1000)
+            self._flush_wakeup.clear()
+            self.flush()
+    
+    def flush(self):
+        """Write pending task logs, task snapshots and page states to disk."""
+        with self._flush_lock:
+            with self._persist_lock:
+                tasks, self._dirty_tasks = self._dirty_tasks, {}
+                logs, self._pending_logs = self._pending_logs, {}
+                pages, self._dirty_pages = self._dirty_pages, {}
+            
+            # Log lines go first so a snapshot never claims entries the log lacks
+            for task_id, entries in logs.items():
+                try:
+                    with open(TASKS_DIR / f"{task_id}.log", 'a') as f:
+                        f.write(''.join(json.dumps(e) + '\n' for e in entries))
+                except Exception as e:
+                    logger.warning(f"Could not append log for task {task_id}: {e}")
+            
+            for task_id, data in tasks.items():
+                try:
+                    self._write_json(TASKS_DIR / f"{task_id}.json", data)
+                except Exception as e:
+                    logger.warning(f"Could not persist task {task_id}: {e}")
+            
+            for page_name, state in pages.items():
+                try:
+                    self._write_json(STATE_DIR / f"{page_name}.json", state)
+                except Exception as e:
+                    logger.error(f"Error saving page state for {page_name}: {e}")
+    
+    @staticmethod
+    def _write_json(path: Path, data: Any):
+        """Atomically replace a JSON file."""
+        tmp_path = path.with_suffix('.json.tmp')
+        with open(tmp_path, 'w') as f:
+            json.dump(data, f, separators=(',', ':'))
+        os.replace(tmp_path, path)
     
     def get_task_status(self, task_id: str) -> Optional[BackgroundTask]:
         """Get the current status of a background task."""
@@ -422,13 +571,18 @@ class CrossPageStateManager:
         return tasks[:limit]
     
     def cancel_task(self, task_id: str) -> bool:
-        """Attempt to cancel a running task."""
-        if task_id in self._task_futures:
-            future = self._task_futures[task_id]
-            cancelled = future.cancel()
+        """
+        Cancel a task that hasn't started yet.
+        
+        A running task can't be interrupted: its fabric job's cancel_event is
+        set, which only stops functions that check
+        get_fabric().current_job().cancel_event. Returns False for those.
+        """
+        if task_id in self._task_jobs:
+            cancelled = get_fabric().cancel(self._task_jobs[task_id].job_id)
             if cancelled and task_id in self._tasks:
                 self._tasks[task_id].status = TaskStatus.CANCELLED
-                self._persist_task(self._tasks[task_id])
+                self._persist_task(self._tasks[task_id], immediate=True)
             return cancelled
         return False
     
@@ -445,11 +599,17 @@ class CrossPageStateManager:
             except:
                 pass
         
-        for task_id in to_remove:
-            del self._tasks[task_id]
-            task_file = TASKS_DIR / f"{task_id}.json"
-            if task_file.exists():
-                task_file.unlink()
+        with self._flush_lock, self._persist_lock:
+            for task_id in to_remove:
+                del self._tasks[task_id]
+                self._task_jobs.pop(task_id, None)
+                self._log_seq.pop(task_id, None)
+                self._dirty_tasks.pop(task_id, None)
+                self._pending_logs.pop(task_id, None)
+                for suffix in (".json", ".log"):
+                    task_file = TASKS_DIR / f"{task_id}{suffix}"
+                    if task_file.exists():
+                        task_file.unlink()
 
 
 # Singleton accessor
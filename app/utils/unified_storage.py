@@ -144,6 +144,7 @@ class UnifiedStorageManager:
                 **metadata
             }
             metadata_path.write_text(json.dumps(full_metadata, indent=2))
+            self._index_for_search(full_metadata, target_path)
             
             # Update Otto's memory
             self._update_otto_memory(content_type, target_path, metadata, source)
@@ -160,6 +161,14 @@ class UnifiedStorageManager:
                 st.warning(f"⚠️ Could not save to library: {e}")
             return None
     
+    def _index_for_search(self, metadata: Dict[str, Any], file_path: Path):
+        """Make saved content findable from global search"""
+        try:
+            from app.services.search_index import get_search_index, library_doc
+            get_search_index().upsert("content", *library_doc(metadata, file_path))
+        except Exception as e:
+            logger.debug(f"Search indexing skipped: {e}")
+    
     def _update_otto_memory(
         self,
         content_type: str,
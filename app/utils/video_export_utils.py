@@ -4,9 +4,13 @@ Handles batch export, platform presets, error handling with retry logic
 """
 
 import os
+import json
 import time
+import hashlib
 import logging
+import subprocess
 import zipfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import tempfile
@@ -222,11 +226,139 @@ def convert_video_for_platform(
     )
 
 
+EXPORT_MANIFEST_NAME = ".export_manifest.json"
+
+
+def _file_sha256(path: str, chunk_size: int = 1024 * 1024) -> str:
+    """Stream a file through SHA-256 and return the hex digest."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _preset_fingerprint(platform: str) -> str:
+    """Hash the encode settings that determine a platform's output."""
+    preset = PLATFORM_PRESETS[platform]
+    settings = {
+        "dimensions": list(preset["dimensions"]),
+        "fps": preset["fps"],
+        "bitrate": preset["bitrate"],
+        "format": preset["format"],
+    }
+    return hashlib.sha256(json.dumps(settings, sort_keys=True).encode()).hexdigest()[:16]
+
+
+def _load_export_manifest(output_dir_path: Path) -> Dict:
+    manifest_path = output_dir_path / EXPORT_MANIFEST_NAME
+    if manifest_path.exists():
+        try:
+            with open(manifest_path, 'r') as f:
+                return json.load(f)
+        except (OSError, json.JSONDecodeError):
+            logger.warning(f"⚠️ Ignoring unreadable export manifest: {manifest_path}")
+    return {}
+
+
+def _save_export_manifest(output_dir_path: Path, manifest: Dict) -> None:
+    manifest_path = output_dir_path / EXPORT_MANIFEST_NAME
+    tmp_path = manifest_path.with_suffix('.tmp')
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+
+
+def _is_export_current(manifest: Dict, output_path: str, source_hash: str, platform: str) -> bool:
+    """
+    True if output_path is a previous export of this exact source with the
+    current preset, and the file on disk is unchanged since it was written.
+    """
+    entry = manifest.get(output_path)
+    if not entry or not os.path.exists(output_path):
+        return False
+    if entry.get("source_hash") != source_hash or entry.get("preset") != _preset_fingerprint(platform):
+        return False
+    return entry.get("output_hash") == _file_sha256(output_path)
+
+
+def _get_ffmpeg() -> Optional[str]:
+    try:
+        from modules.ffmpeg_assembly import get_ffmpeg_binary
+        return get_ffmpeg_binary()
+    except ImportError:
+        return None
+
+
+def export_platforms_single_pass(
+    source_video_path: str,
+    outputs: Dict[str, str],
+    threads: int = 0,
+    timeout: int = 1800
+) -> Dict[str, str]:
+    """
+    Decode the source once and encode every platform output in one ffmpeg run.
+
+    The decoded stream is fanned out with a ``split`` filter; each branch is
+    scaled to its preset dimensions and encoded concurrently by ffmpeg.
+
+    Args:
+        source_video_path: Path to source video
+        outputs: Dict mapping platform name to output path
+        threads: Encoder threads per output (0 = ffmpeg decides)
+        timeout: Seconds before the export is abandoned
+        
+    Returns:
+        Dict mapping platform name to output path
+    """
+    ffmpeg = _get_ffmpeg()
+    if not ffmpeg:
+        raise RuntimeError("ffmpeg not found")
+    
+    platforms = list(outputs.keys())
+    n = len(platforms)
+    
+    chains = [f"[0:v]split={n}" + "".join(f"[src{i}]" for i in range(n))]
+    for i, platform in enumerate(platforms):
+        preset = PLATFORM_PRESETS[platform]
+        width, height = preset["dimensions"]
+        chains.append(
+            f"[src{i}]scale={width}:{height},setsar=1,fps={preset['fps']},"
+            f"format=yuv420p[out{i}]"
+        )
+    
+    cmd = [ffmpeg, '-y', '-hide_banner', '-loglevel', 'error',
+           '-i', source_video_path,
+           '-filter_complex', ';'.join(chains)]
+    for i, platform in enumerate(platforms):
+        preset = PLATFORM_PRESETS[platform]
+        cmd += [
+            '-map', f'[out{i}]',
+            '-map', '0:a?',
+            '-c:v', 'libx264',
+            '-b:v', preset["bitrate"],
+            '-threads', str(threads),
+            '-c:a', 'aac',
+            '-movflags', '+faststart',
+            outputs[platform]
+        ]
+    
+    logger.info(f"🎬 Single-pass export: 1 decode → {n} encodes ({', '.join(platforms)})")
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    if result.returncode != 0:
+        raise RuntimeError(f"ffmpeg export failed: {result.stderr.strip()[-2000:]}")
+    
+    return dict(outputs)
+
+
 def batch_export_all_platforms(
     source_video_path: str,
     output_dir: str,
     base_filename: str,
-    platforms: Optional[List[str]] = None
+    platforms: Optional[List[str]] = None,
+    mode: str = "auto",
+    max_workers: Optional[int] = None,
+    skip_unchanged: bool = True
 ) -> Dict[str, str]:
     """
     Export video for multiple platforms at once.
@@ -236,6 +368,13 @@ def batch_export_all_platforms(
         output_dir: Directory for output videos
         base_filename: Base name for output files
         platforms: List of platforms (None = all platforms)
+        mode: "single_pass" decodes once and encodes all outputs in one ffmpeg
+            run; "parallel" converts each platform in a bounded pool;
+            "sequential" converts one platform at a time; "auto" uses
+            single_pass when ffmpeg is available, otherwise parallel
+        max_workers: Pool size for parallel mode (default: one per platform, max 4)
+        skip_unchanged: Skip platforms whose existing output was produced from
+            the same source content with the current preset
         
     Returns:
         Dict mapping platform name to output path
@@ -247,32 +386,77 @@ def batch_export_all_platforms(
     output_dir_path.mkdir(parents=True, exist_ok=True)
     
     results = {}
+    pending: Dict[str, str] = {}
+    
+    source_hash = _file_sha256(source_video_path) if skip_unchanged else None
+    manifest = _load_export_manifest(output_dir_path) if skip_unchanged else {}
     
     for platform in platforms:
         if platform not in PLATFORM_PRESETS:
             logger.warning(f"⚠️ Skipping unknown platform: {platform}")
             continue
         
-        preset = PLATFORM_PRESETS[platform]
         output_filename = f"{base_filename}_{platform}.mp4"
         output_path = str(output_dir_path / output_filename)
         
-        logger.info(f"📤 Exporting for {preset['name']}...")
+        if skip_unchanged and _is_export_current(manifest, output_path, source_hash, platform):
+            logger.info(f"⏭️ {PLATFORM_PRESETS[platform]['name']}: up to date, skipping")
+            results[platform] = output_path
+            continue
         
-        try:
-            converted_path = convert_video_for_platform(
-                source_video_path,
-                output_path,
-                platform
-            )
-            results[platform] = converted_path
-            logger.info(f"✅ {preset['name']}: {output_filename}")
+        pending[platform] = output_path
+    
+    exported = set(pending)
+    if pending:
+        if mode == "auto":
+            mode = "single_pass" if _get_ffmpeg() else "parallel"
+        
+        if mode == "single_pass":
+            try:
+                results.update(export_platforms_single_pass(source_video_path, pending))
+                for platform in pending:
+                    logger.info(f"✅ {PLATFORM_PRESETS[platform]['name']}: {os.path.basename(pending[platform])}")
+                pending = {}
+            except Exception as e:
+                logger.warning(f"⚠️ Single-pass export failed, converting per platform: {e}")
+                mode = "parallel"
+        
+        if pending:
+            workers = 1 if mode == "sequential" else (max_workers or min(4, len(pending)))
             
-        except Exception as e:
-            logger.error(f"❌ Failed to export for {preset['name']}: {e}")
-            results[platform] = None
+            def export_one(platform: str) -> str:
+                logger.info(f"📤 Exporting for {PLATFORM_PRESETS[platform]['name']}...")
+                return convert_video_for_platform(source_video_path, pending[platform], platform)
+            
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                futures = {executor.submit(export_one, platform): platform for platform in pending}
+                for future in as_completed(futures):
+                    platform = futures[future]
+                    name = PLATFORM_PRESETS[platform]['name']
+                    try:
+                        results[platform] = future.result()
+                        logger.info(f"✅ {name}: {os.path.basename(pending[platform])}")
+                    except Exception as e:
+                        logger.error(f"❌ Failed to export for {name}: {e}")
+                        results[platform] = None
+    
+    if skip_unchanged:
+        for platform, output_path in results.items():
+            if platform in exported and output_path and os.path.exists(output_path):
+                manifest[output_path] = {
+                    "platform": platform,
+                    "source_hash": source_hash,
+                    "preset": _preset_fingerprint(platform),
+                    "output_hash": _file_sha256(output_path),
+                    "exported_at": time.time(),
+                }
+        try:
+            _save_export_manifest(output_dir_path, manifest)
+        except OSError as e:
+            logger.warning(f"⚠️ Could not write export manifest: {e}")
     
-    return results
+    # Preserve the caller's platform order
+    return {p: results[p] for p in platforms if p in results}
 
 
 def create_batch_export_zip(
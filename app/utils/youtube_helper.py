@@ -5,9 +5,15 @@ Extracted from youtube-automate scripts for integration with autonomous_business
 """
 
 import os
+import json
 import pickle
+import random
+import socket
+import hashlib
 import datetime
+import threading
 import time
+import http.client
 import httplib2
 from pathlib import Path
 
@@ -28,6 +34,14 @@ SCOPES = [
 API_SERVICE_NAME = 'youtube'
 API_VERSION = 'v3'
 
+# Resumable upload settings (chunk size must be a multiple of 256 KiB)
+UPLOAD_CHUNK_SIZE = 8 * 1024 * 1024
+UPLOAD_MAX_CHUNK_RETRIES = 8
+UPLOAD_SESSIONS_FILE = Path.home() / ".pod_wizard" / "youtube_upload_sessions.json"
+UPLOAD_SESSION_MAX_AGE = 6 * 24 * 3600  # YouTube expires upload sessions after about a week
+RETRYABLE_STATUS_CODES = (429, 500, 502, 503, 504)
+RETRYABLE_EXCEPTIONS = (httplib2.HttpLib2Error, http.client.HTTPException, ConnectionError, socket.timeout)
+
 
 def _check_scopes_match(credentials, required_scopes):
     """Check if credentials have all required scopes."""
@@ -337,7 +351,232 @@ YOUTUBE_CATEGORIES = {
 }
 
 
-def upload_to_youtube(youtube_service, video_path, metadata, thumbnail_path=None):
+class UploadSessionStore:
+    """
+    Persists resumable upload session URIs so an interrupted upload can
+    continue from the last acknowledged byte, even after a restart.
+
+    Sessions are keyed by file path, size, mtime and title, so an edited
+    video never resumes into a stale session.
+    """
+
+    def __init__(self, path: Path = UPLOAD_SESSIONS_FILE):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._sessions = self._load()
+
+    def _load(self):
+        if self.path.exists():
+            try:
+                with open(self.path, "r") as f:
+                    sessions = json.load(f)
+                cutoff = time.time() - UPLOAD_SESSION_MAX_AGE
+                return {k: v for k, v in sessions.items() if v.get("created", 0) > cutoff}
+            except Exception as e:
+                print(f"⚠️ Could not load upload sessions: {e}")
+        return {}
+
+    def _save(self):
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(".tmp")
+            with open(tmp_path, "w") as f:
+                json.dump(self._sessions, f)
+            os.replace(tmp_path, self.path)
+        except Exception as e:
+            print(f"⚠️ Could not save upload sessions: {e}")
+
+    @staticmethod
+    def key_for(video_path, title):
+        stat = os.stat(video_path)
+        raw = f"{os.path.abspath(video_path)}|{stat.st_size}|{stat.st_mtime_ns}|{title}"
+        return hashlib.sha256(raw.encode()).hexdigest()[:24]
+
+    def get(self, key):
+        with self._lock:
+            session = self._sessions.get(key)
+            return dict(session) if session else None
+
+    def put(self, key, uri, progress, video_path):
+        with self._lock:
+            session = self._sessions.get(key)
+            if session and session["uri"] == uri and session["progress"] == progress:
+                return
+            created = session["created"] if session and session["uri"] == uri else time.time()
+            self._sessions[key] = {
+                "uri": uri,
+                "progress": progress,
+                "video_path": str(video_path),
+                "created": created
+            }
+            self._save()
+
+    def drop(self, key):
+        with self._lock:
+            if self._sessions.pop(key, None) is not None:
+                self._save()
+
+
+_session_store = None
+_session_store_lock = threading.Lock()
+
+
+def get_upload_session_store():
+    """Get the global upload session store."""
+    global _session_store
+    with _session_store_lock:
+        if _session_store is None:
+            _session_store = UploadSessionStore()
+        return _session_store
+
+
+def new_authorized_http(youtube_service):
+    """
+    Fresh authorized transport sharing the service's credentials.
+
+    httplib2.Http objects are not thread-safe, so each concurrent upload
+    needs its own. Returns None if the credentials can't be found, in which
+    case the service's own transport is used.
+    """
+    credentials = getattr(getattr(youtube_service, '_http', None), 'credentials', None)
+    if credentials is None:
+        return None
+    try:
+        import google_auth_httplib2
+        return google_auth_httplib2.AuthorizedHttp(credentials, http=httplib2.Http())
+    except ImportError:
+        return None
+
+
+def _resume_session(insert_request, session, total_bytes, http=None):
+    """
+    Point insert_request at a saved session and ask YouTube how much it has.
+
+    Returns:
+        ("resume", None) with insert_request positioned at the next byte,
+        ("done", video_resource) if the session had already completed, or
+        ("expired", None) if the session is gone and the upload must restart
+    """
+    http = http or insert_request.http
+    try:
+        resp, content = http.request(
+            session["uri"],
+            method="PUT",
+            headers={"Content-Length": "0", "Content-Range": f"bytes */{total_bytes}"}
+        )
+    except RETRYABLE_EXCEPTIONS as e:
+        print(f"⚠️ Could not query upload session, starting over: {e}")
+        return "expired", None
+
+    if resp.status in (200, 201):
+        return "done", json.loads(content)
+    if resp.status == 308:
+        received = resp.get("range")
+        insert_request.resumable_uri = session["uri"]
+        insert_request.resumable_progress = int(received.rsplit("-", 1)[1]) + 1 if received else 0
+        return "resume", None
+    return "expired", None
+
+
+def resumable_upload(
+    youtube_service,
+    video_path,
+    body,
+    notify_subscribers=False,
+    on_progress=None,
+    chunk_size=UPLOAD_CHUNK_SIZE,
+    max_chunk_retries=UPLOAD_MAX_CHUNK_RETRIES,
+    http=None
+):
+    """
+    Upload a video in fixed-size chunks, resuming saved sessions.
+
+    Each chunk is retried with exponential backoff on transient HTTP and
+    network errors; only that chunk is resent. The session URI and offset
+    are saved after every chunk, so a crash or restart picks up where the
+    upload stopped instead of starting from byte zero.
+
+    Args:
+        youtube_service: Authenticated YouTube API service object
+        video_path: Path to video file
+        body: videos.insert body (snippet + status)
+        notify_subscribers: Passed to videos.insert
+        on_progress: Optional callback(bytes_sent, total_bytes)
+        chunk_size: Bytes per request, a multiple of 256 KiB
+        max_chunk_retries: Attempts per chunk before giving up
+        http: Optional transport (one per thread for concurrent uploads)
+
+    Returns:
+        The inserted video resource
+    """
+    store = get_upload_session_store()
+    key = store.key_for(video_path, body['snippet']['title'])
+
+    def _new_request():
+        media_body = MediaFileUpload(video_path, chunksize=chunk_size, resumable=True)
+        request = youtube_service.videos().insert(
+            part=','.join(body.keys()),
+            body=body,
+            media_body=media_body,
+            notifySubscribers=notify_subscribers
+        )
+        return request, media_body.size()
+
+    insert_request, total_bytes = _new_request()
+    response = None
+
+    session = store.get(key)
+    if session:
+        outcome, response = _resume_session(insert_request, session, total_bytes, http)
+        if outcome == "resume":
+            print(f"🔁 Resuming upload at {insert_request.resumable_progress / max(total_bytes, 1):.0%}")
+        elif outcome == "expired":
+            store.drop(key)
+
+    retries = 0
+    while response is None:
+        try:
+            status, response = insert_request.next_chunk(http=http)
+            retries = 0
+        except HttpError as e:
+            if e.resp.status in (404, 410) and insert_request.resumable_uri:
+                print("⚠️ Upload session expired, starting over")
+                store.drop(key)
+                insert_request, total_bytes = _new_request()
+                continue
+            if e.resp.status not in RETRYABLE_STATUS_CODES:
+                raise
+            retries = _backoff(retries, max_chunk_retries, e)
+            continue
+        except RETRYABLE_EXCEPTIONS as e:
+            retries = _backoff(retries, max_chunk_retries, e)
+            continue
+
+        if response is None and insert_request.resumable_uri:
+            store.put(key, insert_request.resumable_uri, insert_request.resumable_progress, video_path)
+        if on_progress:
+            sent = total_bytes if response is not None else insert_request.resumable_progress
+            try:
+                on_progress(sent, total_bytes)
+            except Exception as e:
+                print(f"⚠️ Progress callback failed: {e}")
+
+    store.drop(key)
+    return response
+
+
+def _backoff(retries, max_retries, error):
+    """Sleep before re-sending a chunk; raises once retries are exhausted."""
+    if retries >= max_retries:
+        print(f"❌ Chunk failed after {max_retries} retries: {error}")
+        raise error
+    delay = min(60, 2 ** retries) + random.random()
+    print(f"⚠️ Chunk upload error ({error}), retrying in {delay:.1f}s...")
+    time.sleep(delay)
+    return retries + 1
+
+
+def upload_to_youtube(youtube_service, video_path, metadata, thumbnail_path=None, on_progress=None, http=None):
     """
     Simplified upload function for Streamlit page integration.
     
@@ -346,6 +585,8 @@ def upload_to_youtube(youtube_service, video_path, metadata, thumbnail_path=None
         video_path: Path to video file
         metadata: Dict with keys: title, description, tags, category, privacy, notify_subscribers
         thumbnail_path: Optional path to thumbnail image
+        on_progress: Optional callback(bytes_sent, total_bytes) called after each chunk
+        http: Optional transport (one per thread for concurrent uploads)
     
     Returns:
         Dict with video details including 'id' and 'url'
@@ -365,23 +606,21 @@ def upload_to_youtube(youtube_service, video_path, metadata, thumbnail_path=None
             }
         }
         
-        # Upload video
-        media_body = MediaFileUpload(video_path, chunksize=-1, resumable=True)
-        
-        insert_request = youtube_service.videos().insert(
-            part=','.join(body.keys()),
-            body=body,
-            media_body=media_body,
-            notifySubscribers=metadata.get('notify_subscribers', False)
+        # Upload video in resumable chunks
+        def _report(sent, total):
+            print(f"Upload progress: {int(sent * 100 / max(total, 1))}%")
+            if on_progress:
+                on_progress(sent, total)
+
+        response = resumable_upload(
+            youtube_service,
+            video_path,
+            body,
+            notify_subscribers=metadata.get('notify_subscribers', False),
+            on_progress=_report,
+            http=http
         )
         
-        # Execute upload
-        response = None
-        while response is None:
-            status, response = insert_request.next_chunk()
-            if status:
-                print(f"Upload progress: {int(status.progress() * 100)}%")
-        
         video_id = response['id']
         
         # Upload thumbnail if provided
@@ -390,7 +629,7 @@ def upload_to_youtube(youtube_service, video_path, metadata, thumbnail_path=None
                 youtube_service.thumbnails().set(
                     videoId=video_id,
                     media_body=MediaFileUpload(thumbnail_path)
-                ).execute()
+                ).execute(http=http)
                 print("✅ Thumbnail uploaded")
             except Exception as e:
                 print(f"⚠️ Thumbnail upload failed: {e}")
@@ -15,8 +15,13 @@ import os
 import sys
 import json
 import uuid
+import time
 import asyncio
 import logging
+import sqlite3
+import threading
+import concurrent.futures
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from pathlib import Path
 from typing import Dict, List, Optional, Any, Callable
@@ -116,7 +121,7 @@ class QueueStats(BaseModel):
 
 
 # ========================================
-# JOB STORAGE (In-Memory + Disk Persistence)
+# JOB STORAGE (In-Memory + SQLite WAL Persistence)
 # ========================================
 
 @dataclass
@@ -154,13 +159,192 @@ class Job:
         )
 
 
+def _job_to_record(job: Job) -> Dict[str, Any]:
+    return {
+        "job_id": job.job_id,
+        "job_type": job.job_type,
+        "tab_name": job.tab_name,
+        "description": job.description,
+        "status": job.status.value,
+        "params": job.params,
+        "priority": job.priority,
+        "metadata": job.metadata,
+        "created_at": job.created_at.isoformat(),
+        "started_at": job.started_at.isoformat() if job.started_at else None,
+        "completed_at": job.completed_at.isoformat() if job.completed_at else None,
+        "progress": job.progress,
+        "result": job.result,
+        "error": job.error,
+    }
+
+
+def _job_from_record(job_data: Dict[str, Any]) -> Job:
+    return Job(
+        job_id=job_data["job_id"],
+        job_type=job_data["job_type"],
+        tab_name=job_data["tab_name"],
+        description=job_data["description"],
+        status=JobStatus(job_data["status"]),
+        params=job_data.get("params", {}),
+        priority=job_data.get("priority", 5),
+        metadata=job_data.get("metadata", {}),
+        created_at=datetime.fromisoformat(job_data["created_at"]),
+        started_at=datetime.fromisoformat(job_data["started_at"]) if job_data.get("started_at") else None,
+        completed_at=datetime.fromisoformat(job_data["completed_at"]) if job_data.get("completed_at") else None,
+        progress=job_data.get("progress", 0),
+        result=job_data.get("result"),
+        error=job_data.get("error"),
+    )
+
+
+class JobStore:
+    """
+    SQLite (WAL) job store with write-behind persistence.
+    
+    Request handlers serialize the changed job and queue its row; a writer
+    thread coalesces every change to a job since the last flush into one
+    upsert of that job's row. Cost per update is constant regardless of how
+    many jobs are stored. Rows from a failed write are re-queued.
+    """
+    
+    def __init__(self, db_path: Path = Path("data/fastapi_jobs.db"), flush_interval: float = 0.1):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.flush_interval = flush_interval
+        self._lock = threading.Lock()      # guards the pending rows
+        self._db_lock = threading.Lock()   # serializes use of the connection
+        self._dirty: Dict[str, tuple] = {}
+        self._deleted: set = set()
+        self._wake = threading.Event()
+        self._stopping = False
+        
+        self._conn = sqlite3.connect(str(self.db_path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute("""
+            CREATE TABLE IF NOT EXISTS jobs (
+                job_id TEXT PRIMARY KEY,
+                job_type TEXT NOT NULL,
+                tab_name TEXT NOT NULL,
+                status TEXT NOT NULL,
+                priority INTEGER NOT NULL,
+                created_at TEXT NOT NULL,
+                data TEXT NOT NULL
+            )
+        """)
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_status ON jobs(status, priority, created_at)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_jobs_tab ON jobs(tab_name, created_at)")
+        self._conn.commit()
+        
+        self._writer = threading.Thread(target=self._write_loop, name="job-store-writer", daemon=True)
+        self._writer.start()
+    
+    def load_all(self) -> List[Job]:
+        with self._db_lock:
+            rows = self._conn.execute("SELECT data FROM jobs ORDER BY created_at").fetchall()
+        jobs = []
+        for (data,) in rows:
+            try:
+                jobs.append(_job_from_record(json.loads(data)))
+            except Exception as e:
+                logger.warning(f"Skipping unreadable job row: {e}")
+        return jobs
+    
+    def import_legacy_json(self, jobs_file: Path) -> int:
+        """One-time migration from the old data/fastapi_jobs.json snapshot."""
+        if not jobs_file.exists():
+            return 0
+        try:
+            with open(jobs_file) as f:
+                data = json.load(f)
+            for job_data in data:
+                self.save(_job_from_record(job_data))
+            self.flush()
+            jobs_file.rename(jobs_file.with_suffix(".json.migrated"))
+            logger.info(f"📦 Migrated {len(data)} jobs from {jobs_file} to {self.db_path}")
+            return len(data)
+        except Exception as e:
+            logger.error(f"Failed to migrate jobs from {jobs_file}: {e}")
+            return 0
+    
+    def save(self, job: Job):
+        """Queue a snapshot of the job for persistence (non-blocking)."""
+        # Serialized here, on the thread that changed the job, so the writer
+        # never reads a Job the event loop is still modifying
+        record = _job_to_record(job)
+        row = (
+            job.job_id, job.job_type, job.tab_name, record["status"],
+            job.priority, record["created_at"], json.dumps(record, default=str)
+        )
+        with self._lock:
+            self._dirty[job.job_id] = row
+            self._deleted.discard(job.job_id)
+        self._wake.set()
+    
+    def delete(self, job_ids: List[str]):
+        with self._lock:
+            for job_id in job_ids:
+                self._dirty.pop(job_id, None)
+                self._deleted.add(job_id)
+        self._wake.set()
+    
+    def flush(self):
+        """Write pending changes now (called by the writer and on shutdown)."""
+        with self._db_lock:
+            with self._lock:
+                dirty, self._dirty = self._dirty, {}
+                deleted, self._deleted = self._deleted, set()
+            if not dirty and not deleted:
+                return
+            try:
+                with self._conn:
+                    if dirty:
+                        self._conn.executemany(
+                            "INSERT OR REPLACE INTO jobs (job_id, job_type, tab_name, status, priority, created_at, data) "
+                            "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                            list(dirty.values())
+                        )
+                    if deleted:
+                        self._conn.executemany("DELETE FROM jobs WHERE job_id = ?", [(j,) for j in deleted])
+            except Exception as e:
+                logger.error(f"Failed to save jobs, will retry: {e}")
+                # Re-queue unless a newer save/delete superseded the entry meanwhile
+                with self._lock:
+                    for job_id, row in dirty.items():
+                        if job_id not in self._dirty and job_id not in self._deleted:
+                            self._dirty[job_id] = row
+                    for job_id in deleted:
+                        if job_id not in self._dirty:
+                            self._deleted.add(job_id)
+                self._wake.set()
+    
+    def _write_loop(self):
+        while not self._stopping:
+            self._wake.wait()
+            self._wake.clear()
+            time.sleep(self.flush_interval)  # Coalesce bursts of updates
+            self.flush()
+    
+    def close(self):
+        self._stopping = True
+        self._wake.set()
+        self._writer.join(timeout=5)
+        self.flush()
+        self._conn.close()
+
+
 class JobManager:
     """Manages all jobs with Ray backend"""
     
-    def __init__(self):
+    def __init__(self, store: Optional[JobStore] = None):
         self.jobs: Dict[str, Job] = {}
         self.ray_available = False
         self.ray_info = {}
+        self.store = store or JobStore()
+        # Counters kept up to date on every change so stats never scan all jobs
+        self._status_counts: Dict[JobStatus, int] = {status: 0 for status in JobStatus}
+        self._tab_counts: Dict[str, int] = {}
+        self._listeners: List[Callable[[Job], None]] = []
         self._init_ray()
         self._load_jobs_from_disk()
         
@@ -187,60 +371,43 @@ class JobManager:
             
     def _load_jobs_from_disk(self):
         """Load persisted jobs on startup"""
-        jobs_file = Path("data/fastapi_jobs.json")
-        if jobs_file.exists():
+        self.store.import_legacy_json(Path("data/fastapi_jobs.json"))
+        for job in self.store.load_all():
+            if job.status == JobStatus.RUNNING:
+                # The process that was running it is gone
+                job.status = JobStatus.FAILED
+                job.error = "Interrupted by backend restart"
+                job.completed_at = datetime.now()
+                self.store.save(job)
+            self.jobs[job.job_id] = job
+            self._count(job, 1)
+        logger.info(f"📂 Loaded {len(self.jobs)} jobs from disk")
+                
+    def _save_job(self, job: Job):
+        """Persist one job (write-behind, never blocks the event loop)"""
+        self.store.save(job)
+    
+    def _count(self, job: Job, delta: int):
+        self._status_counts[job.status] += delta
+        self._tab_counts[job.tab_name] = self._tab_counts.get(job.tab_name, 0) + delta
+        if not self._tab_counts[job.tab_name]:
+            del self._tab_counts[job.tab_name]
+    
+    def _set_status(self, job: Job, status: JobStatus):
+        self._status_counts[job.status] -= 1
+        self._status_counts[status] += 1
+        job.status = status
+    
+    def add_listener(self, callback: Callable[[Job], None]):
+        """Call ``callback(job)`` after every job change"""
+        self._listeners.append(callback)
+    
+    def _notify(self, job: Job):
+        for callback in self._listeners:
             try:
-                with open(jobs_file) as f:
-                    data = json.load(f)
-                for job_data in data:
-                    job = Job(
-                        job_id=job_data["job_id"],
-                        job_type=job_data["job_type"],
-                        tab_name=job_data["tab_name"],
-                        description=job_data["description"],
-                        status=JobStatus(job_data["status"]),
-                        params=job_data.get("params", {}),
-                        priority=job_data.get("priority", 5),
-                        metadata=job_data.get("metadata", {}),
-                        created_at=datetime.fromisoformat(job_data["created_at"]),
-                        started_at=datetime.fromisoformat(job_data["started_at"]) if job_data.get("started_at") else None,
-                        completed_at=datetime.fromisoformat(job_data["completed_at"]) if job_data.get("completed_at") else None,
-                        progress=job_data.get("progress", 0),
-                        result=job_data.get("result"),
-                        error=job_data.get("error"),
-                    )
-                    self.jobs[job.job_id] = job
-                logger.info(f"📂 Loaded {len(self.jobs)} jobs from disk")
+                callback(job)
             except Exception as e:
-                logger.error(f"Failed to load jobs: {e}")
-                
-    def _save_jobs_to_disk(self):
-        """Persist jobs to disk"""
-        jobs_file = Path("data/fastapi_jobs.json")
-        jobs_file.parent.mkdir(parents=True, exist_ok=True)
-        try:
-            data = []
-            for job in self.jobs.values():
-                data.append({
-                    "job_id": job.job_id,
-                    "job_type": job.job_type,
-                    "tab_name": job.tab_name,
-                    "description": job.description,
-                    "status": job.status.value,
-                    "params": job.params,
-                    "priority": job.priority,
-                    "metadata": job.metadata,
-                    "created_at": job.created_at.isoformat(),
-                    "started_at": job.started_at.isoformat() if job.started_at else None,
-                    "completed_at": job.completed_at.isoformat() if job.completed_at else None,
-                    "progress": job.progress,
-                    "result": job.result,
-                    "error": job.error,
-                })
-            with open(jobs_file, "w") as f:
-                json.dump(data, f, indent=2, default=str)
-        except Exception as e:
-            logger.error(f"Failed to save jobs: {e}")
+                logger.debug(f"Job listener failed: {e}")
     
     def submit_job(self, request: JobSubmitRequest) -> Job:
         """Submit a new job"""
@@ -257,7 +424,9 @@ class JobManager:
             created_at=datetime.now(),
         )
         self.jobs[job_id] = job
-        self._save_jobs_to_disk()
+        self._count(job, 1)
+        self._save_job(job)
+        self._notify(job)
         logger.info(f"📋 Job submitted: {job_id} - {request.description}")
         return job
     
@@ -279,7 +448,7 @@ class JobManager:
         """Update job status"""
         job = self.jobs.get(job_id)
         if job:
-            job.status = status
+            self._set_status(job, status)
             if progress is not None:
                 job.progress = progress
             if result is not None:
@@ -290,41 +459,39 @@ class JobManager:
                 job.started_at = datetime.now()
             if status in [JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED]:
                 job.completed_at = datetime.now()
-            self._save_jobs_to_disk()
+            self._save_job(job)
+            self._notify(job)
             
     def cancel_job(self, job_id: str) -> bool:
         """Cancel a job"""
         job = self.jobs.get(job_id)
         if job and job.status in [JobStatus.QUEUED, JobStatus.RUNNING]:
-            job.status = JobStatus.CANCELLED
+            self._set_status(job, JobStatus.CANCELLED)
             job.completed_at = datetime.now()
-            self._save_jobs_to_disk()
+            self._save_job(job)
+            self._notify(job)
             return True
         return False
     
     def delete_job(self, job_id: str) -> bool:
         """Delete a job"""
         if job_id in self.jobs:
-            del self.jobs[job_id]
-            self._save_jobs_to_disk()
+            self._count(self.jobs.pop(job_id), -1)
+            self.store.delete([job_id])
             return True
         return False
     
     def get_stats(self) -> QueueStats:
         """Get queue statistics"""
-        jobs = list(self.jobs.values())
-        by_tab = {}
-        for job in jobs:
-            by_tab[job.tab_name] = by_tab.get(job.tab_name, 0) + 1
-            
+        counts = self._status_counts
         return QueueStats(
-            total=len(jobs),
-            queued=len([j for j in jobs if j.status == JobStatus.QUEUED]),
-            running=len([j for j in jobs if j.status == JobStatus.RUNNING]),
-            completed=len([j for j in jobs if j.status == JobStatus.COMPLETED]),
-            failed=len([j for j in jobs if j.status == JobStatus.FAILED]),
-            cancelled=len([j for j in jobs if j.status == JobStatus.CANCELLED]),
-            by_tab=by_tab,
+            total=len(self.jobs),
+            queued=counts[JobStatus.QUEUED],
+            running=counts[JobStatus.RUNNING],
+            completed=counts[JobStatus.COMPLETED],
+            failed=counts[JobStatus.FAILED],
+            cancelled=counts[JobStatus.CANCELLED],
+            by_tab=dict(self._tab_counts),
             ray_enabled=self.ray_available,
             ray_cpus=self.ray_info.get("cpus", 0),
             ray_memory_gb=self.ray_info.get("memory_gb", 0),
@@ -337,8 +504,8 @@ class JobManager:
             if job.status in [JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED]
         ]
         for job_id in to_delete:
-            del self.jobs[job_id]
-        self._save_jobs_to_disk()
+            self._count(self.jobs.pop(job_id), -1)
+        self.store.delete(to_delete)
         return len(to_delete)
 
 
@@ -349,10 +516,52 @@ class JobManager:
 class JobExecutor:
     """Executes jobs using Ray or threading"""
     
-    def __init__(self, job_manager: JobManager):
+    def __init__(self, job_manager: JobManager, max_workers: int = None):
         self.job_manager = job_manager
         self.replicate_api = None
+        self.max_workers = max_workers or int(os.getenv("JOB_MAX_WORKERS", "8"))
+        # Blocking SDK calls get their own pool so concurrency isn't capped by the default executor
+        self.blocking_pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="job-exec")
+        self._http = None
         self._init_replicate()
+    
+    def _http_client(self):
+        """Shared pooled HTTP client for result downloads"""
+        if self._http is None:
+            import httpx
+            self._http = httpx.AsyncClient(
+                timeout=httpx.Timeout(300.0, connect=15.0),
+                follow_redirects=True,
+                limits=httpx.Limits(max_connections=self.max_workers * 2,
+                                    max_keepalive_connections=self.max_workers),
+            )
+        return self._http
+    
+    async def _run_blocking(self, fn: Callable, *args, **kwargs):
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.blocking_pool, lambda: fn(*args, **kwargs))
+    
+    async def _download_to(self, url: str, dest: Path, chunk_size: int = 256 * 1024) -> Path:
+        """Stream a result to disk (temp file + atomic rename)"""
+        dest.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = dest.with_name(dest.name + ".part")
+        try:
+            async with self._http_client().stream("GET", str(url)) as response:
+                response.raise_for_status()
+                with open(tmp_path, "wb") as f:
+                    async for chunk in response.aiter_bytes(chunk_size):
+                        f.write(chunk)
+            os.replace(tmp_path, dest)
+        finally:
+            if tmp_path.exists():
+                tmp_path.unlink()
+        return dest
+    
+    async def close(self):
+        if self._http is not None:
+            await self._http.aclose()
+            self._http = None
+        self.blocking_pool.shutdown(wait=False)
         
     def _init_replicate(self):
         """Initialize Replicate API"""
@@ -383,7 +592,7 @@ class JobExecutor:
     async def execute_job(self, job_id: str):
         """Execute a single job with retry logic"""
         job = self.job_manager.get_job(job_id)
-        if not job:
+        if not job or job.status == JobStatus.CANCELLED:
             return
             
         self.job_manager.update_job_status(job_id, JobStatus.RUNNING, progress=0)
@@ -440,31 +649,19 @@ class JobExecutor:
         self.job_manager.update_job_status(job.job_id, JobStatus.RUNNING, progress=10)
         
         # Run in thread pool to not block
-        loop = asyncio.get_event_loop()
-        image_url = await loop.run_in_executor(
-            None, 
-            lambda: self.replicate_api.generate_image(prompt, model=model, width=width, height=height)
+        image_url = await self._run_blocking(
+            self.replicate_api.generate_image, prompt, model=model, width=width, height=height
         )
         
         self.job_manager.update_job_status(job.job_id, JobStatus.RUNNING, progress=80)
         
         # Download and save image
         if image_url:
-            import requests
-            from pathlib import Path
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+            filename = f"image_{timestamp}_{job.job_id}.png"
+            filepath = await self._download_to(image_url, Path("library/images") / filename)
             
-            response = requests.get(image_url)
-            if response.status_code == 200:
-                images_dir = Path("library/images")
-                images_dir.mkdir(parents=True, exist_ok=True)
-                
-                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                filename = f"image_{timestamp}_{job.job_id}.png"
-                filepath = images_dir / filename
-                
-                with open(filepath, "wb") as f:
-                    f.write(response.content)
-                    
+            if filepath.exists():
                 return {
                     "image_url": image_url,
                     "local_path": str(filepath),
@@ -484,11 +681,7 @@ class JobExecutor:
         
         self.job_manager.update_job_status(job.job_id, JobStatus.RUNNING, progress=10)
         
-        loop = asyncio.get_event_loop()
-        text = await loop.run_in_executor(
-            None,
-            lambda: self.replicate_api.generate_text(prompt, max_tokens=max_tokens)
-        )
+        text = await self._run_blocking(self.replicate_api.generate_text, prompt, max_tokens=max_tokens)
         
         return {"text": text, "prompt": prompt}
     
@@ -506,45 +699,28 @@ class JobExecutor:
         try:
             import replicate
             
-            loop = asyncio.get_event_loop()
-            
             if "kling" in model.lower():
-                video_url = await loop.run_in_executor(
-                    None,
-                    lambda: replicate.run(
-                        "kwaivgi/kling-v2.5-turbo-pro",
-                        input={"prompt": prompt, "aspect_ratio": "16:9"}
-                    )
+                video_url = await self._run_blocking(
+                    replicate.run,
+                    "kwaivgi/kling-v2.5-turbo-pro",
+                    input={"prompt": prompt, "aspect_ratio": "16:9"}
                 )
             else:
-                video_url = await loop.run_in_executor(
-                    None,
-                    lambda: replicate.run(
-                        "luma/ray",
-                        input={"prompt": prompt}
-                    )
+                video_url = await self._run_blocking(
+                    replicate.run,
+                    "luma/ray",
+                    input={"prompt": prompt}
                 )
                 
             self.job_manager.update_job_status(job.job_id, JobStatus.RUNNING, progress=80)
             
             # Download video
             if video_url:
-                import requests
-                from pathlib import Path
+                timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+                filename = f"video_{timestamp}_{job.job_id}.mp4"
+                filepath = await self._download_to(video_url, Path("library/videos") / filename)
                 
-                response = requests.get(video_url, stream=True)
-                if response.status_code == 200:
-                    videos_dir = Path("library/videos")
-                    videos_dir.mkdir(parents=True, exist_ok=True)
-                    
-                    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                    filename = f"video_{timestamp}_{job.job_id}.mp4"
-                    filepath = videos_dir / filename
-                    
-                    with open(filepath, "wb") as f:
-                        for chunk in response.iter_content(chunk_size=8192):
-                            f.write(chunk)
-                            
+                if filepath.exists():
                     return {
                         "video_url": video_url,
                         "local_path": str(filepath),
@@ -624,43 +800,416 @@ class JobExecutor:
         }
 
 
+# ========================================
+# JOB WORKER POOL
+# ========================================
+
+# Jobs of one type allowed to run at once (video is slow and rate limited upstream)
+JOB_TYPE_CONCURRENCY = {
+    JobType.IMAGE_GENERATION.value: 6,
+    JobType.VIDEO_GENERATION.value: 2,
+    JobType.TEXT_GENERATION.value: 8,
+    JobType.PRODUCT_CREATION.value: 4,
+    JobType.CAMPAIGN_GENERATION.value: 2,
+    JobType.WORKFLOW_EXECUTION.value: 2,
+}
+DEFAULT_JOB_CONCURRENCY = 4
+
+
+class JobWorkerPool:
+    """
+    Runs queued jobs through the process-wide execution fabric by priority
+    (10 = most urgent, FIFO within a priority). Besides the shared CPU,
+    memory and API budget, the global cap and per-JobType caps are fabric
+    token pools. A job whose type is saturated is skipped over, not waited
+    on, so one busy type never blocks the rest.
+    """
+    
+    def __init__(self, executor: JobExecutor, max_workers: int = None,
+                 type_limits: Optional[Dict[str, int]] = None):
+        from app.services.execution_fabric import get_fabric
+        self.executor = executor
+        self.max_workers = max_workers or int(os.getenv("JOB_MAX_WORKERS", "8"))
+        self.type_limits = {**JOB_TYPE_CONCURRENCY, **(type_limits or {})}
+        self.fabric = get_fabric()
+        self.fabric.set_capacity("fastapi", self.max_workers)
+        for job_type in JobType:
+            self.fabric.set_capacity(f"fastapi:{job_type.value}", self._limit(job_type.value))
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._fabric_jobs: Dict[str, Any] = {}  # job_id -> FabricJob
+        self._running: Dict[str, concurrent.futures.Future] = {}
+        self._closing = False
+    
+    def enqueue(self, job: Job):
+        """Queue a job (call from the event loop)."""
+        if self._closing:
+            return
+        self._loop = asyncio.get_running_loop()
+        type_pool = f"fastapi:{job.job_type}"
+        if type_pool not in self.fabric.capacity:
+            self.fabric.set_capacity(type_pool, self._limit(job.job_type))
+        self._fabric_jobs[job.job_id] = self.fabric.submit(
+            self._run,
+            args=(job.job_id,),
+            name=job.description or job.job_type,
+            source="fastapi",
+            profile=job.job_type,
+            resources={"fastapi": 1, type_pool: 1},
+            priority=job.priority,
+            metadata={"job_id": job.job_id, "job_type": job.job_type, "tab_name": job.tab_name},
+            on_update=lambda fabric_job, j=job.job_id: self._on_update(j, fabric_job)
+        )
+    
+    def _run(self, job_id: str):
+        """Fabric worker: run the job on the server's event loop and wait for it."""
+        if self._closing or not self._is_queued(job_id):
+            return  # Cancelled or deleted while waiting
+        future = asyncio.run_coroutine_threadsafe(self.executor.execute_job(job_id), self._loop)
+        self._running[job_id] = future
+        try:
+            future.result()
+        except concurrent.futures.CancelledError:
+            pass
+        finally:
+            self._running.pop(job_id, None)
+    
+    def _on_update(self, job_id: str, fabric_job):
+        if fabric_job.done:
+            self._fabric_jobs.pop(job_id, None)
+    
+    def cancel(self, job_id: str) -> bool:
+        """Stop a running job; queued jobs are dropped before they start."""
+        fabric_job = self._fabric_jobs.get(job_id)
+        if fabric_job is not None:
+            self.fabric.cancel(fabric_job.job_id)
+        future = self._running.get(job_id)
+        if future is not None and not future.done():
+            future.cancel()
+            return True
+        return False
+    
+    def _limit(self, job_type: str) -> int:
+        return self.type_limits.get(job_type, DEFAULT_JOB_CONCURRENCY)
+    
+    def _is_queued(self, job_id: str) -> bool:
+        job = self.executor.job_manager.get_job(job_id)
+        return job is not None and job.status == JobStatus.QUEUED
+    
+    def stats(self) -> Dict[str, Any]:
+        active = self.fabric.jobs(source="fastapi", active_only=True)
+        running_by_type: Dict[str, int] = {}
+        for fabric_job in active:
+            if fabric_job.status == "running":
+                job_type = fabric_job.metadata.get("job_type")
+                running_by_type[job_type] = running_by_type.get(job_type, 0) + 1
+        fabric_stats = self.fabric.stats()
+        return {
+            "max_workers": self.max_workers,
+            "queued": sum(1 for j in active if j.status == "queued"),
+            "running": sum(1 for j in active if j.status == "running"),
+            "running_by_type": running_by_type,
+            "budget": {"capacity": fabric_stats["capacity"], "in_use": fabric_stats["in_use"]},
+        }
+    
+    async def shutdown(self):
+        self._closing = True
+        for fabric_job in list(self._fabric_jobs.values()):
+            self.fabric.cancel(fabric_job.job_id)
+        running = list(self._running.values())
+        for future in running:
+            future.cancel()
+        if running:
+            await asyncio.gather(*(asyncio.wrap_future(f) for f in running), return_exceptions=True)
+
+
+class BatchManager:
+    """
+    Groups jobs submitted through /jobs/batch so they can be tracked and
+    cancelled as a unit. Items run on the shared JobWorkerPool; the batch
+    id is stored in each job's metadata so batches survive a restart.
+    """
+    
+    def __init__(self, job_manager: JobManager, pool: JobWorkerPool):
+        self.job_manager = job_manager
+        self.pool = pool
+        self.batches: Dict[str, Dict[str, Any]] = {}
+        self._rebuild()
+    
+    def _rebuild(self):
+        for job in sorted(self.job_manager.jobs.values(), key=lambda j: j.created_at):
+            batch_id = (job.metadata or {}).get("batch_id")
+            if not batch_id:
+                continue
+            batch = self.batches.setdefault(batch_id, {
+                "batch_id": batch_id,
+                "job_type": job.job_type,
+                "tab_name": job.tab_name,
+                "created_at": job.created_at,
+                "job_ids": [],
+            })
+            batch["job_ids"].append(job.job_id)
+    
+    def submit(self, request: BatchJobRequest) -> Dict[str, Any]:
+        """Create one job per item and queue them all on the worker pool"""
+        batch_id = f"batch-{uuid.uuid4().hex[:8]}"
+        job_ids = []
+        for index, item in enumerate(request.items):
+            job = self.job_manager.submit_job(JobSubmitRequest(
+                job_type=request.job_type,
+                tab_name=request.tab_name,
+                description=request.description_template.format(index=index+1, **item),
+                params=item,
+                priority=request.priority,
+                metadata={"batch_id": batch_id, "batch_index": index},
+            ))
+            job_ids.append(job.job_id)
+            self.pool.enqueue(job)
+        
+        self.batches[batch_id] = {
+            "batch_id": batch_id,
+            "job_type": request.job_type,
+            "tab_name": request.tab_name,
+            "created_at": datetime.now(),
+            "job_ids": job_ids,
+        }
+        logger.info(f"📦 Batch {batch_id} queued: {len(job_ids)} items")
+        return {"batch_id": batch_id, "job_ids": job_ids, "count": len(job_ids)}
+    
+    def progress(self, batch_id: str) -> Optional[Dict[str, Any]]:
+        """Aggregate status counts and overall progress for a batch"""
+        batch = self.batches.get(batch_id)
+        if not batch:
+            return None
+        jobs = [j for j in (self.job_manager.get_job(jid) for jid in batch["job_ids"]) if j]
+        counts = {status.value: 0 for status in JobStatus}
+        for job in jobs:
+            counts[job.status.value] += 1
+        finished = counts["completed"] + counts["failed"] + counts["cancelled"]
+        started = [j.started_at for j in jobs if j.started_at]
+        ended = [j.completed_at for j in jobs if j.completed_at]
+        elapsed = (max(ended) - min(started)).total_seconds() if started and ended else 0.0
+        return {
+            "batch_id": batch_id,
+            "job_type": batch["job_type"],
+            "tab_name": batch["tab_name"],
+            "created_at": batch["created_at"].isoformat(),
+            "total": len(jobs),
+            "counts": counts,
+            "progress": sum(100.0 if j.status == JobStatus.COMPLETED else j.progress for j in jobs) / len(jobs) if jobs else 0.0,
+            "done": finished == len(jobs),
+            "items_per_minute": round(counts["completed"] / elapsed * 60, 2) if elapsed else None,
+            "job_ids": batch["job_ids"],
+        }
+    
+    def cancel(self, batch_id: str) -> Optional[List[str]]:
+        """Cancel every unfinished job in a batch; returns the cancelled ids"""
+        batch = self.batches.get(batch_id)
+        if not batch:
+            return None
+        cancelled = []
+        for job_id in batch["job_ids"]:
+            if self.job_manager.cancel_job(job_id):
+                self.pool.cancel(job_id)
+                cancelled.append(job_id)
+        logger.info(f"🛑 Batch {batch_id} cancelled: {len(cancelled)} jobs")
+        return cancelled
+    
+    def list(self) -> List[Dict[str, Any]]:
+        batches = sorted(self.batches.values(), key=lambda b: b["created_at"], reverse=True)
+        return [self.progress(b["batch_id"]) for b in batches]
+
+
 # ========================================
 # WEBSOCKET CONNECTION MANAGER
 # ========================================
 
+@dataclass
+class Subscriber:
+    """One WebSocket connection with its filters and bounded send queue"""
+    websocket: WebSocket
+    queue: asyncio.Queue
+    tabs: Optional[set] = None       # None = every tab
+    job_ids: Optional[set] = None    # None = every job
+    sender: Optional[asyncio.Task] = None
+    dropped: int = 0
+    needs_resync: bool = False
+    
+    def wants(self, job_id: str, tab_name: str) -> bool:
+        if self.job_ids is not None and job_id in self.job_ids:
+            return True
+        if self.tabs is not None:
+            return tab_name in self.tabs
+        return self.job_ids is None
+
+
 class ConnectionManager:
-    """Manages WebSocket connections for real-time updates"""
+    """
+    Pub/sub hub for real-time job updates.
+    
+    Job changes are recorded as pending deltas (latest wins per job) and
+    fanned out by a flusher at ``WS_UPDATE_HZ`` per second. Each connection
+    has its own bounded queue and sender task, so a slow client only drops
+    its own backlog (and gets a fresh snapshot) instead of stalling others.
+    """
+    
+    def __init__(self, update_hz: float = None, queue_size: int = None):
+        self.update_hz = update_hz or float(os.getenv("WS_UPDATE_HZ", "4"))
+        self.queue_size = queue_size or int(os.getenv("WS_QUEUE_SIZE", "64"))
+        self.subscribers: Dict[WebSocket, Subscriber] = {}
+        self.job_manager: Optional[JobManager] = None
+        self._pending: Dict[str, Job] = {}
+        self._last_sent: Dict[str, Dict[str, Any]] = {}
+        self._flusher: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+    
+    @property
+    def active_connections(self) -> List[WebSocket]:
+        return list(self.subscribers)
+    
+    def attach(self, job_manager: JobManager):
+        """Start publishing changes from a JobManager (call from the event loop)"""
+        self.job_manager = job_manager
+        self._loop = asyncio.get_running_loop()
+        job_manager.add_listener(self.publish_job)
+        self._flusher = asyncio.ensure_future(self._flush_loop())
+    
+    async def close(self):
+        if self._flusher:
+            self._flusher.cancel()
+        for sub in list(self.subscribers.values()):
+            if sub.sender:
+                sub.sender.cancel()
+        self.subscribers.clear()
+    
+    # ----- connections -----
     
-    def __init__(self):
-        self.active_connections: List[WebSocket] = []
-        
     async def connect(self, websocket: WebSocket):
         await websocket.accept()
-        self.active_connections.append(websocket)
-        logger.info(f"WebSocket connected. Total: {len(self.active_connections)}")
+        sub = Subscriber(websocket=websocket, queue=asyncio.Queue(maxsize=self.queue_size))
+        sub.sender = asyncio.ensure_future(self._sender(sub))
+        self.subscribers[websocket] = sub
+        logger.info(f"WebSocket connected. Total: {len(self.subscribers)}")
         
     def disconnect(self, websocket: WebSocket):
-        if websocket in self.active_connections:
-            self.active_connections.remove(websocket)
-        logger.info(f"WebSocket disconnected. Total: {len(self.active_connections)}")
-        
+        sub = self.subscribers.pop(websocket, None)
+        if sub and sub.sender and sub.sender is not asyncio.current_task():
+            sub.sender.cancel()
+        logger.info(f"WebSocket disconnected. Total: {len(self.subscribers)}")
+    
+    def subscribe(self, websocket: WebSocket, tabs: Optional[List[str]] = None,
+                  job_ids: Optional[List[str]] = None):
+        """Limit a connection to some tabs and/or jobs (None clears that filter)"""
+        sub = self.subscribers.get(websocket)
+        if sub:
+            sub.tabs = set(tabs) if tabs is not None else None
+            sub.job_ids = set(job_ids) if job_ids is not None else None
+            self.send(sub, self.snapshot(sub))
+    
+    def snapshot(self, sub: Subscriber, limit: int = 200) -> Dict[str, Any]:
+        """Current state of the jobs a subscriber follows, plus stats"""
+        jobs = []
+        if self.job_manager:
+            for job in self.job_manager.get_all_jobs():
+                if sub.wants(job.job_id, job.tab_name):
+                    jobs.append(job.to_response().dict())
+                    if len(jobs) >= limit:
+                        break
+        return {"type": "snapshot", "jobs": jobs, "stats": self._stats()}
+    
+    # ----- publishing -----
+    
+    def publish_job(self, job: Job):
+        """Record a job change; the flusher sends the latest state at most update_hz times/s"""
+        self._pending[job.job_id] = job
+    
+    async def send_job_update(self, job: Job):
+        self.publish_job(job)
+    
     async def broadcast(self, message: dict):
-        """Send message to all connected clients"""
-        disconnected = []
-        for connection in self.active_connections:
+        """Queue a message for every connected client"""
+        if message.get("type") == "job_deleted":
+            self._last_sent.pop(message.get("job_id"), None)
+        elif message.get("type") == "jobs_cleared" and self.job_manager:
+            self._last_sent = {k: v for k, v in self._last_sent.items() if k in self.job_manager.jobs}
+        for sub in list(self.subscribers.values()):
+            self.send(sub, message)
+    
+    def _delta(self, job: Job) -> Optional[Dict[str, Any]]:
+        state = {"status": job.status.value, "progress": round(job.progress, 1)}
+        if job.status in (JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED):
+            state["error"] = job.error
+            state["result"] = job.result
+        last = self._last_sent.get(job.job_id)
+        if last is None:
+            # First event for a job carries enough to render it
+            changes = {**state, "job_type": job.job_type, "description": job.description,
+                       "priority": job.priority}
+        else:
+            changes = {k: v for k, v in state.items() if last.get(k) != v}
+            if not changes:
+                return None
+        self._last_sent[job.job_id] = state
+        return {"job_id": job.job_id, "tab_name": job.tab_name, **changes}
+    
+    def _stats(self) -> Dict[str, Any]:
+        return self.job_manager.get_stats().dict() if self.job_manager else {}
+    
+    async def _flush_loop(self):
+        interval = 1.0 / self.update_hz
+        while True:
+            await asyncio.sleep(interval)
             try:
-                await connection.send_json(message)
-            except Exception:
-                disconnected.append(connection)
-        for conn in disconnected:
-            self.disconnect(conn)
-            
-    async def send_job_update(self, job: Job):
-        """Send job update to all clients"""
-        await self.broadcast({
-            "type": "job_update",
-            "job": job.to_response().dict()
-        })
+                self._flush()
+            except Exception as e:
+                logger.warning(f"WebSocket flush failed: {e}")
+    
+    def _flush(self):
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, {}
+        deltas = [d for d in (self._delta(job) for job in pending.values()) if d]
+        if not deltas or not self.subscribers:
+            return
+        stats = self._stats()
+        for sub in list(self.subscribers.values()):
+            events = [d for d in deltas if sub.wants(d["job_id"], d["tab_name"])]
+            if events:
+                self.send(sub, {"type": "job_deltas", "events": events, "stats": stats})
+    
+    def send(self, sub: Subscriber, message: dict):
+        """Queue a message for one client without waiting on its socket"""
+        if sub.needs_resync:
+            return  # A snapshot is already on its way
+        try:
+            sub.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Client can't keep up: drop its backlog and resend full state once
+            sub.dropped += sub.queue.qsize()
+            while not sub.queue.empty():
+                sub.queue.get_nowait()
+            sub.needs_resync = True
+            sub.queue.put_nowait({"type": "resync"})
+    
+    async def _sender(self, sub: Subscriber):
+        try:
+            while True:
+                message = await sub.queue.get()
+                if message.get("type") == "resync":
+                    sub.needs_resync = False
+                    message = self.snapshot(sub)
+                await sub.websocket.send_json(message)
+        except asyncio.CancelledError:
+            pass
+        except Exception:
+            self.disconnect(sub.websocket)
+    
+    def status(self) -> Dict[str, Any]:
+        return {
+            "connections": len(self.subscribers),
+            "update_hz": self.update_hz,
+            "pending": len(self._pending),
+            "dropped": sum(s.dropped for s in self.subscribers.values()),
+        }
 
 
 # ========================================
@@ -670,24 +1219,38 @@ class ConnectionManager:
 # Global instances
 job_manager: Optional[JobManager] = None
 job_executor: Optional[JobExecutor] = None
+job_pool: Optional[JobWorkerPool] = None
+batch_manager: Optional[BatchManager] = None
 ws_manager = ConnectionManager()
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler"""
-    global job_manager, job_executor
+    global job_manager, job_executor, job_pool, batch_manager
     
     # Startup
     logger.info("🚀 Starting FastAPI Backend...")
     job_manager = JobManager()
     job_executor = JobExecutor(job_manager)
+    job_pool = JobWorkerPool(job_executor, max_workers=job_executor.max_workers)
+    batch_manager = BatchManager(job_manager, job_pool)
+    ws_manager.attach(job_manager)
+    
+    # Resume jobs that were still queued when the backend stopped
+    for job in sorted(job_manager.jobs.values(), key=lambda j: j.created_at):
+        if job.status == JobStatus.QUEUED:
+            job_pool.enqueue(job)
     logger.info("✅ FastAPI Backend ready")
     
     yield
     
     # Shutdown
     logger.info("👋 Shutting down FastAPI Backend...")
+    await job_pool.shutdown()
+    await ws_manager.close()
+    await job_executor.close()
+    job_manager.store.close()
 
 
 app = FastAPI(
@@ -729,7 +1292,9 @@ async def health():
         "ray_enabled": job_manager.ray_available if job_manager else False,
         "ray_info": job_manager.ray_info if job_manager else {},
         "jobs_count": len(job_manager.jobs) if job_manager else 0,
+        "workers": job_pool.stats() if job_pool else {},
         "websocket_connections": len(ws_manager.active_connections),
+        "websocket": ws_manager.status(),
     }
 
 
@@ -745,11 +1310,9 @@ async def submit_job(request: JobSubmitRequest, background_tasks: BackgroundTask
         
     job = job_manager.submit_job(request)
     
-    # Execute job in background
-    background_tasks.add_task(job_executor.execute_job, job.job_id)
-    
-    # Notify WebSocket clients
-    await ws_manager.send_job_update(job)
+    # Hand off to the worker pool (runs by priority within per-type limits)
+    # WebSocket clients hear about it through the job manager listener
+    job_pool.enqueue(job)
     
     return job.to_response()
 
@@ -760,22 +1323,43 @@ async def submit_batch_jobs(request: BatchJobRequest, background_tasks: Backgrou
     if not job_manager:
         raise HTTPException(status_code=503, detail="Service not ready")
         
-    job_ids = []
-    for index, item in enumerate(request.items):
-        job_request = JobSubmitRequest(
-            job_type=request.job_type,
-            tab_name=request.tab_name,
-            description=request.description_template.format(index=index+1, **item),
-            params=item,
-            priority=request.priority,
-        )
-        job = job_manager.submit_job(job_request)
-        job_ids.append(job.job_id)
+    # Items share the worker pool, so throughput follows JOB_MAX_WORKERS
+    return batch_manager.submit(request)
+
+
+@app.get("/jobs/batches")
+async def list_batches():
+    """List batches with their progress"""
+    if not job_manager:
+        raise HTTPException(status_code=503, detail="Service not ready")
+        
+    return batch_manager.list()
+
+
+@app.get("/jobs/batch/{batch_id}")
+async def get_batch(batch_id: str):
+    """Get progress for a batch"""
+    if not job_manager:
+        raise HTTPException(status_code=503, detail="Service not ready")
         
-        # Execute each job in background
-        background_tasks.add_task(job_executor.execute_job, job.job_id)
+    progress = batch_manager.progress(batch_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
         
-    return {"job_ids": job_ids, "count": len(job_ids)}
+    return progress
+
+
+@app.post("/jobs/batch/{batch_id}/cancel")
+async def cancel_batch(batch_id: str):
+    """Cancel every unfinished job in a batch"""
+    if not job_manager:
+        raise HTTPException(status_code=503, detail="Service not ready")
+        
+    cancelled = batch_manager.cancel(batch_id)
+    if cancelled is None:
+        raise HTTPException(status_code=404, detail="Batch not found")
+        
+    return {"status": "cancelled", "batch_id": batch_id, "cancelled": len(cancelled)}
 
 
 @app.get("/jobs", response_model=List[JobResponse])
@@ -819,9 +1403,7 @@ async def cancel_job(job_id: str):
     success = job_manager.cancel_job(job_id)
     if not success:
         raise HTTPException(status_code=400, detail="Cannot cancel job")
-        
-    job = job_manager.get_job(job_id)
-    await ws_manager.send_job_update(job)
+    job_pool.cancel(job_id)
     
     return {"status": "cancelled", "job_id": job_id}
 
@@ -951,8 +1533,18 @@ async def generate_product(
 
 @app.websocket("/ws")
 async def websocket_endpoint(websocket: WebSocket):
-    """WebSocket for real-time job updates"""
+    """
+    WebSocket for real-time job updates.
+    
+    Client messages:
+        {"type": "subscribe", "tabs": [...], "job_ids": [...]}  (omit a key for "all")
+        {"type": "snapshot"} / {"type": "get_stats"} / {"type": "ping"}
+    Server messages: "snapshot", "job_deltas" (coalesced changes + stats),
+    "job_deleted", "jobs_cleared", "stats", "pong".
+    """
     await ws_manager.connect(websocket)
+    sub = ws_manager.subscribers[websocket]
+    ws_manager.send(sub, ws_manager.snapshot(sub))
     try:
         while True:
             # Keep connection alive and listen for client messages
@@ -962,12 +1554,15 @@ async def websocket_endpoint(websocket: WebSocket):
             try:
                 message = json.loads(data)
                 if message.get("type") == "ping":
-                    await websocket.send_json({"type": "pong"})
+                    ws_manager.send(sub, {"type": "pong"})
+                elif message.get("type") == "subscribe":
+                    ws_manager.subscribe(websocket, tabs=message.get("tabs"), job_ids=message.get("job_ids"))
+                elif message.get("type") == "snapshot":
+                    ws_manager.send(sub, ws_manager.snapshot(sub))
                 elif message.get("type") == "get_stats":
-                    stats = job_manager.get_stats()
-                    await websocket.send_json({
+                    ws_manager.send(sub, {
                         "type": "stats",
-                        "data": stats.dict()
+                        "data": job_manager.get_stats().dict()
                     })
             except json.JSONDecodeError:
                 pass
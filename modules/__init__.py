@@ -36,6 +36,24 @@ from .video_generation import (
     VideoGenerationError
 )
 
+# FFmpeg Assembly (single-pass commercial rendering)
+from .ffmpeg_assembly import (
+    assemble_commercial,
+    build_commercial_filter_graph,
+    is_ffmpeg_available,
+    probe_duration,
+    CommercialScene,
+    FFmpegAssemblyError
+)
+
+# Video Thumbnails (ffmpeg frame selection)
+from .video_thumbnails import (
+    create_video_thumbnail,
+    create_thumbnails_batch,
+    select_thumbnail_time,
+    ThumbnailError
+)
+
 # Model Selection
 from .model_selection_ui import (
     render_model_selection_ui,
@@ -134,6 +152,20 @@ __all__ = [
     'orchestrate_video_generation',
     'VideoGenerationError',
     
+    # FFmpeg Assembly
+    'assemble_commercial',
+    'build_commercial_filter_graph',
+    'is_ffmpeg_available',
+    'probe_duration',
+    'CommercialScene',
+    'FFmpegAssemblyError',
+    
+    # Video Thumbnails
+    'create_video_thumbnail',
+    'create_thumbnails_batch',
+    'select_thumbnail_time',
+    'ThumbnailError',
+    
     # Model Selection
     'render_model_selection_ui',
     'render_model_info_card',
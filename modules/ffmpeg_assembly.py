@@ -0,0 +1,459 @@
+"""
+FFmpeg Assembly Module
+Single-pass commercial assembly built on one ffmpeg filter graph.
+
+The MoviePy path zooms every frame through a Python callback, concatenates with
+``method="compose"``, encodes on one thread and then re-encodes the whole video
+to append the CTA card. Here zoompan, fades, audio concat, the CTA card, brand
+overlay and music ducking all live in one ``-filter_complex`` and the output is
+encoded exactly once with ffmpeg's own threading.
+"""
+
+import os
+import re
+import shutil
+import logging
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class FFmpegAssemblyError(Exception):
+    """Raised when the ffmpeg assembly engine cannot produce a video."""
+    pass
+
+
+@dataclass
+class CommercialScene:
+    """One still image shown for the length of its voiceover segment."""
+    image_path: str
+    audio_path: Optional[str]
+    duration: float
+
+
+def get_ffmpeg_binary() -> Optional[str]:
+    """
+    Locate an ffmpeg executable.
+
+    Checks PATH first, then the binary configured by ``modules/__init__.py``
+    through imageio-ffmpeg.
+
+    Returns:
+        Path to ffmpeg, or None if unavailable
+    """
+    found = shutil.which("ffmpeg")
+    if found:
+        return found
+
+    configured = os.environ.get("IMAGEIO_FFMPEG_EXE")
+    if configured and os.path.exists(configured):
+        return configured
+
+    try:
+        import imageio_ffmpeg
+        return imageio_ffmpeg.get_ffmpeg_exe()
+    except (ImportError, RuntimeError):
+        return None
+
+
+def is_ffmpeg_available() -> bool:
+    """Return True if an ffmpeg binary can be located."""
+    return get_ffmpeg_binary() is not None
+
+
+_DURATION_RE = re.compile(r"Duration:\s*(\d+):(\d+):(\d+(?:\.\d+)?)")
+
+
+def probe_duration(media_path: str) -> Optional[float]:
+    """
+    Read a media file's duration without decoding it.
+
+    Uses ffprobe when present and falls back to parsing ``ffmpeg -i`` output,
+    which is all imageio-ffmpeg ships.
+
+    Args:
+        media_path: Path to audio or video file
+
+    Returns:
+        Duration in seconds, or None if it could not be determined
+    """
+    ffprobe = shutil.which("ffprobe")
+    if ffprobe:
+        try:
+            result = subprocess.run(
+                [ffprobe, "-v", "error", "-show_entries", "format=duration",
+                 "-of", "default=noprint_wrappers=1:nokey=1", media_path],
+                capture_output=True, text=True, timeout=30
+            )
+            if result.returncode == 0 and result.stdout.strip():
+                return float(result.stdout.strip())
+        except (subprocess.SubprocessError, ValueError):
+            pass
+
+    ffmpeg = get_ffmpeg_binary()
+    if not ffmpeg:
+        return None
+    try:
+        result = subprocess.run(
+            [ffmpeg, "-hide_banner", "-i", media_path],
+            capture_output=True, text=True, timeout=30
+        )
+        match = _DURATION_RE.search(result.stderr)
+        if match:
+            hours, minutes, seconds = match.groups()
+            return int(hours) * 3600 + int(minutes) * 60 + float(seconds)
+    except subprocess.SubprocessError:
+        pass
+    return None
+
+
+def render_cta_card_image(
+    output_path: str,
+    width: int = 1920,
+    height: int = 1080,
+    cta_text: str = "Shop Now!",
+    bg_color: Tuple[int, int, int] = (0, 0, 0),
+    text_color: Tuple[int, int, int] = (255, 255, 255)
+) -> str:
+    """
+    Render the CTA end card as a still image for use as a filter graph input.
+
+    Matches the look of ``add_cta_card`` (white text centered on black) without
+    requiring ImageMagick or ffmpeg's drawtext filter.
+
+    Args:
+        output_path: Where to save the PNG
+        width: Card width
+        height: Card height
+        cta_text: Call-to-action text
+        bg_color: Background RGB color
+        text_color: Text RGB color
+
+    Returns:
+        Path to the rendered image
+    """
+    from PIL import Image, ImageDraw, ImageFont
+
+    img = Image.new("RGB", (width, height), color=bg_color)
+    draw = ImageDraw.Draw(img)
+
+    font_size = min(width, height) // 10
+    font = None
+    for font_path in (
+        "/System/Library/Fonts/Supplemental/Arial Bold.ttf",
+        "/System/Library/Fonts/Supplemental/Arial.ttf",
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+        "/usr/share/fonts/truetype/dejavu/DejaVuSans.ttf",
+        "C:\\Windows\\Fonts\\arialbd.ttf",
+    ):
+        if os.path.exists(font_path):
+            try:
+                font = ImageFont.truetype(font_path, font_size)
+                break
+            except OSError:
+                continue
+    if font is None:
+        font = ImageFont.load_default()
+
+    bbox = draw.textbbox((0, 0), cta_text, font=font)
+    text_width = bbox[2] - bbox[0]
+    text_height = bbox[3] - bbox[1]
+    draw.text(
+        ((width - text_width) // 2 - bbox[0], (height - text_height) // 2 - bbox[1]),
+        cta_text,
+        fill=text_color,
+        font=font
+    )
+
+    img.save(output_path)
+    return output_path
+
+
+def _hex_to_ffmpeg_color(hex_color: str) -> str:
+    """Convert '#RRGGBB' to ffmpeg's '0xRRGGBB' form, defaulting to black."""
+    value = (hex_color or "").lstrip("#")
+    if len(value) != 6 or not all(c in "0123456789abcdefABCDEF" for c in value):
+        return "0x000000"
+    return f"0x{value}"
+
+
+def build_commercial_filter_graph(
+    scenes: List[CommercialScene],
+    width: int = 1920,
+    height: int = 1080,
+    fps: int = 30,
+    zoom_amount: float = 0.15,
+    fade_duration: float = 0.5,
+    cta_duration: float = 0.0,
+    has_music: bool = False,
+    music_volume: float = 0.3,
+    music_fade_in: float = 0.5,
+    music_fade_out: float = 1.0,
+    duck_music: bool = True,
+    logo_input: Optional[int] = None,
+    bar_color: Optional[str] = None
+) -> Tuple[str, str, str]:
+    """
+    Build the ``-filter_complex`` graph for a commercial.
+
+    Input order expected by the graph: one image per scene, one audio per
+    scene, then (optionally) the CTA card image, the music track and the
+    brand logo, in that order.
+
+    Args:
+        scenes: Scenes in playback order
+        width: Output width
+        height: Output height
+        fps: Output frame rate
+        zoom_amount: Center zoom reached at the end of each scene (0.15 = 115%)
+        fade_duration: Fade in/out length per scene
+        cta_duration: Length of the CTA card (0 disables it)
+        has_music: Whether a music input follows the CTA input
+        music_volume: Music gain before ducking
+        music_fade_in: Music fade in length
+        music_fade_out: Music fade out length
+        duck_music: Sidechain-compress music under the voiceover
+        logo_input: Input index of the brand logo, if any
+        bar_color: Brand color for the bottom accent bar, if any
+
+    Returns:
+        Tuple of (filter_graph, video_label, audio_label)
+    """
+    n = len(scenes)
+    if n == 0:
+        raise FFmpegAssemblyError("At least one scene is required")
+
+    chains: List[str] = []
+    video_labels: List[str] = []
+    audio_labels: List[str] = []
+
+    # Zoom on a supersampled frame so zoompan's integer crop doesn't jitter
+    sw, sh = width * 2, height * 2
+    for i, scene in enumerate(scenes):
+        frames = max(1, int(round(scene.duration * fps)))
+        fade = min(fade_duration, scene.duration / 2)
+        fade_out_start = max(0.0, scene.duration - fade)
+        chains.append(
+            f"[{i}:v]scale={sw}:{sh},setsar=1,"
+            f"zoompan=z='1+{zoom_amount}*on/{frames}'"
+            f":x='iw/2-(iw/zoom/2)':y='ih/2-(ih/zoom/2)'"
+            f":d={frames}:s={width}x{height}:fps={fps},"
+            f"trim=duration={scene.duration:.3f},"
+            f"fade=t=in:st=0:d={fade:.3f},"
+            f"fade=t=out:st={fade_out_start:.3f}:d={fade:.3f},"
+            f"format=yuv420p[v{i}]"
+        )
+        video_labels.append(f"[v{i}]")
+
+        # Scenes without a voiceover get an anullsrc input at the same index
+        chains.append(
+            f"[{n + i}:a]aformat=sample_rates=44100:channel_layouts=stereo,"
+            f"apad,atrim=0:{scene.duration:.3f},asetpts=PTS-STARTPTS[a{i}]"
+        )
+        audio_labels.append(f"[a{i}]")
+
+    next_input = 2 * n
+    total_duration = sum(s.duration for s in scenes)
+
+    if cta_duration > 0:
+        cta_input = next_input
+        next_input += 1
+        chains.append(
+            f"[{cta_input}:v]scale={width}:{height},setsar=1,fps={fps},"
+            f"trim=duration={cta_duration:.3f},format=yuv420p[vcta]"
+        )
+        video_labels.append("[vcta]")
+        total_duration += cta_duration
+
+    chains.append(
+        f"{''.join(video_labels)}concat=n={len(video_labels)}:v=1:a=0[vcat]"
+    )
+    video_out = "[vcat]"
+
+    if bar_color:
+        bar_height = int(height * 0.06)
+        chains.append(
+            f"{video_out}drawbox=x=0:y={height - bar_height}:w={width}:h={bar_height}"
+            f":color={_hex_to_ffmpeg_color(bar_color)}@1:t=fill[vbar]"
+        )
+        video_out = "[vbar]"
+
+    # Voiceover runs under the scenes; the CTA card gets silence
+    chains.append(
+        f"{''.join(audio_labels)}concat=n={n}:v=0:a=1,"
+        f"apad=whole_dur={total_duration:.3f}[voice]"
+    )
+    audio_out = "[voice]"
+
+    if has_music:
+        music_input = next_input
+        next_input += 1
+        fade_out_start = max(0.0, total_duration - music_fade_out)
+        chains.append(
+            f"[{music_input}:a]aformat=sample_rates=44100:channel_layouts=stereo,"
+            f"atrim=0:{total_duration:.3f},asetpts=PTS-STARTPTS,"
+            f"volume={music_volume},"
+            f"afade=t=in:st=0:d={music_fade_in},"
+            f"afade=t=out:st={fade_out_start:.3f}:d={music_fade_out}[music]"
+        )
+        if duck_music:
+            chains.append("[voice]asplit=2[voicemix][voicekey]")
+            chains.append(
+                "[music][voicekey]sidechaincompress="
+                "threshold=0.05:ratio=8:attack=20:release=400[ducked]"
+            )
+            music_label, voice_label = "[ducked]", "[voicemix]"
+        else:
+            music_label, voice_label = "[music]", "[voice]"
+        # amix divides by the input count; restore unity gain to match CompositeAudioClip
+        chains.append(
+            f"{voice_label}{music_label}amix=inputs=2:duration=first:"
+            f"dropout_transition=0,volume=2[mix]"
+        )
+        audio_out = "[mix]"
+
+    if logo_input is not None:
+        logo_width = int(width * 0.08)
+        chains.append(f"[{logo_input}:v]scale={logo_width}:-1[logo]")
+        chains.append(f"{video_out}[logo]overlay=W-w-20:20[vlogo]")
+        video_out = "[vlogo]"
+
+    return ";".join(chains), video_out, audio_out
+
+
+def assemble_commercial(
+    scenes: List[CommercialScene],
+    output_path: str,
+    music_path: Optional[str] = None,
+    work_dir: Optional[str] = None,
+    width: int = 1920,
+    height: int = 1080,
+    fps: int = 30,
+    cta_text: Optional[str] = "Shop Now!",
+    cta_duration: float = 3.5,
+    cta_image_path: Optional[str] = None,
+    brand_template: Optional[Dict] = None,
+    music_volume: float = 0.3,
+    duck_music: bool = True,
+    preset: str = "medium",
+    crf: int = 20,
+    threads: int = 0,
+    timeout: int = 900
+) -> str:
+    """
+    Assemble a full commercial in a single ffmpeg invocation.
+
+    Args:
+        scenes: Scenes in playback order
+        output_path: Final MP4 path
+        music_path: Optional background music (looped to length and ducked)
+        work_dir: Directory for intermediate assets (CTA card image)
+        width: Output width
+        height: Output height
+        fps: Output frame rate
+        cta_text: CTA card text (None disables the card)
+        cta_duration: CTA card duration in seconds
+        cta_image_path: Pre-rendered CTA card image to use instead of cta_text
+        brand_template: Brand template with optional 'logo' and 'colors.primary'
+        music_volume: Background music gain
+        duck_music: Lower music under the voiceover
+        preset: libx264 preset
+        crf: libx264 constant rate factor
+        threads: Encoder threads (0 = ffmpeg picks per core count)
+        timeout: Seconds before the encode is abandoned
+
+    Returns:
+        Path to the assembled video
+
+    Raises:
+        FFmpegAssemblyError: If ffmpeg is missing or the encode fails
+
+    Example:
+        >>> scenes = [CommercialScene("hero.png", "vo1.mp3", 4.2)]
+        >>> assemble_commercial(scenes, "out.mp4", music_path="music.mp3")
+    """
+    ffmpeg = get_ffmpeg_binary()
+    if not ffmpeg:
+        raise FFmpegAssemblyError("ffmpeg not found")
+
+    work = Path(work_dir) if work_dir else Path(output_path).parent
+    work.mkdir(parents=True, exist_ok=True)
+
+    cmd: List[str] = [ffmpeg, "-y", "-hide_banner", "-loglevel", "error"]
+    for scene in scenes:
+        if not os.path.exists(scene.image_path):
+            raise FFmpegAssemblyError(f"Image not found: {scene.image_path}")
+        cmd += ["-i", scene.image_path]
+    for scene in scenes:
+        if scene.audio_path:
+            cmd += ["-i", scene.audio_path]
+        else:
+            # Silent input keeps indices aligned; the graph trims it to length
+            cmd += ["-f", "lavfi", "-i", "anullsrc=r=44100:cl=stereo"]
+
+    use_cta = bool(cta_duration > 0 and (cta_image_path or cta_text))
+    if use_cta:
+        if not cta_image_path or not os.path.exists(cta_image_path):
+            cta_image_path = render_cta_card_image(
+                str(work / "cta_card.png"), width, height, cta_text or ""
+            )
+        cmd += ["-loop", "1", "-framerate", str(fps), "-t", f"{cta_duration:.3f}",
+                "-i", cta_image_path]
+
+    has_music = bool(music_path and os.path.exists(music_path))
+    if has_music:
+        cmd += ["-stream_loop", "-1", "-i", music_path]
+
+    logo_input = None
+    bar_color = None
+    if brand_template:
+        bar_color = brand_template.get("colors", {}).get("primary", "#000000")
+        logo_path = brand_template.get("logo")
+        if logo_path and os.path.exists(logo_path):
+            logo_input = 2 * len(scenes) + int(use_cta) + int(has_music)
+            cmd += ["-i", logo_path]
+
+    graph, video_label, audio_label = build_commercial_filter_graph(
+        scenes,
+        width=width,
+        height=height,
+        fps=fps,
+        cta_duration=cta_duration if use_cta else 0.0,
+        has_music=has_music,
+        music_volume=music_volume,
+        duck_music=duck_music,
+        logo_input=logo_input,
+        bar_color=bar_color
+    )
+
+    cmd += [
+        "-filter_complex", graph,
+        "-filter_complex_threads", str(threads or os.cpu_count() or 1),
+        "-map", video_label,
+        "-map", audio_label,
+        "-c:v", "libx264",
+        "-preset", preset,
+        "-crf", str(crf),
+        "-pix_fmt", "yuv420p",
+        "-r", str(fps),
+        "-threads", str(threads),
+        "-c:a", "aac",
+        "-b:a", "192k",
+        "-movflags", "+faststart",
+        output_path
+    ]
+
+    logger.info(f"🎞️ Assembling {len(scenes)} scenes with ffmpeg (single encode)...")
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        raise FFmpegAssemblyError(f"ffmpeg assembly timed out after {timeout}s")
+
+    if result.returncode != 0 or not os.path.exists(output_path):
+        raise FFmpegAssemblyError(f"ffmpeg assembly failed: {result.stderr.strip()[-2000:]}")
+
+    logger.info(f"✅ Assembled commercial: {output_path}")
+    return output_path
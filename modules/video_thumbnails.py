@@ -0,0 +1,354 @@
+"""
+Video Thumbnails Module
+Smart thumbnail extraction with ffmpeg.
+
+Instead of opening the whole video in MoviePy to grab one frame, each
+candidate timestamp is read with ffmpeg's input seek (jump to the nearest
+keyframe, decode only up to the requested frame) and scaled to a small
+analysis size inside ffmpeg. The candidates are scored together with numpy
+for sharpness, contrast, exposure, colorfulness and composition. The winner
+is then rendered once at 1280x720 by ffmpeg's own lanczos scaler.
+"""
+
+import os
+import logging
+import subprocess
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .ffmpeg_assembly import get_ffmpeg_binary, probe_duration
+
+logger = logging.getLogger(__name__)
+
+THUMBNAIL_SIZE = (1280, 720)
+ANALYSIS_SIZE = (320, 180)
+
+# Relative weights of the (normalized) frame metrics
+SCORE_WEIGHTS = {
+    "sharpness": 0.35,
+    "contrast": 0.2,
+    "exposure": 0.15,
+    "colorfulness": 0.15,
+    "composition": 0.15,
+}
+
+
+class ThumbnailError(Exception):
+    """Raised when a thumbnail cannot be extracted."""
+    pass
+
+
+def _scale_filter(width: int, height: int, flags: str = "bilinear") -> str:
+    # Fill the frame and center-crop, matching YouTube's 16:9 thumbnail
+    return (f"scale={width}:{height}:force_original_aspect_ratio=increase:flags={flags},"
+            f"crop={width}:{height}")
+
+
+def candidate_timestamps(
+    duration: float,
+    count: int = 8,
+    skip_start: float = 0.5,
+    skip_end: float = 3.5
+) -> List[float]:
+    """
+    Spread candidate timestamps across a video.
+
+    The first moments (fade-ins) and the tail (commercials end on a
+    3.5s CTA card) are skipped when the video is long enough.
+
+    Args:
+        duration: Video duration in seconds
+        count: Number of candidates
+        skip_start: Seconds to skip at the start
+        skip_end: Seconds to skip at the end
+
+    Returns:
+        Sorted list of timestamps in seconds
+    """
+    start, end = skip_start, duration - skip_end
+    if end - start < 1.0:
+        start, end = duration * 0.1, duration * 0.9
+    if count <= 1 or end <= start:
+        return [max(0.0, (start + end) / 2)]
+    step = (end - start) / (count - 1)
+    return [round(start + i * step, 3) for i in range(count)]
+
+
+def extract_frame(
+    video_path: str,
+    timestamp: float,
+    size: Tuple[int, int] = ANALYSIS_SIZE,
+    ffmpeg: Optional[str] = None,
+    timeout: int = 30
+) -> Optional[np.ndarray]:
+    """
+    Decode a single frame as an RGB array, scaled inside ffmpeg.
+
+    Args:
+        video_path: Path to video file
+        timestamp: Seconds into the video
+        size: (width, height) of the returned frame
+        ffmpeg: ffmpeg binary (located if omitted)
+        timeout: Seconds before the decode is abandoned
+
+    Returns:
+        uint8 array of shape (height, width, 3), or None past the end of the video
+    """
+    ffmpeg = ffmpeg or get_ffmpeg_binary()
+    if not ffmpeg:
+        raise ThumbnailError("ffmpeg not found")
+
+    width, height = size
+    cmd = [ffmpeg, "-hide_banner", "-loglevel", "error",
+           "-ss", f"{timestamp:.3f}", "-i", video_path,
+           "-frames:v", "1", "-an", "-sn",
+           "-vf", _scale_filter(width, height),
+           "-f", "rawvideo", "-pix_fmt", "rgb24", "pipe:1"]
+    try:
+        result = subprocess.run(cmd, capture_output=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        raise ThumbnailError(f"Frame decode timed out at {timestamp:.1f}s")
+    if result.returncode != 0:
+        raise ThumbnailError(result.stderr.decode(errors="ignore").strip() or "ffmpeg failed")
+
+    expected = width * height * 3
+    if len(result.stdout) < expected:
+        return None
+    return np.frombuffer(result.stdout[:expected], dtype=np.uint8).reshape(height, width, 3)
+
+
+def _composition_weights(height: int, width: int) -> np.ndarray:
+    """Weight map peaking at the rule-of-thirds points and the center."""
+    ys = np.linspace(0, 1, height)[:, None]
+    xs = np.linspace(0, 1, width)[None, :]
+    points = [(1 / 3, 1 / 3), (1 / 3, 2 / 3), (2 / 3, 1 / 3), (2 / 3, 2 / 3), (0.5, 0.5)]
+    weights = np.zeros((height, width), dtype=np.float32)
+    for py, px in points:
+        weights = np.maximum(weights, np.exp(-(((ys - py) ** 2) + ((xs - px) ** 2)) / (2 * 0.12 ** 2)))
+    return weights
+
+
+def frame_metrics(frames: np.ndarray) -> Dict[str, np.ndarray]:
+    """
+    Raw quality metrics for a stack of frames, computed in one pass.
+
+    Args:
+        frames: uint8 array of shape (n, height, width, 3)
+
+    Returns:
+        Dict of metric name -> array of shape (n,)
+    """
+    rgb = frames.astype(np.float32) / 255.0
+    r, g, b = rgb[..., 0], rgb[..., 1], rgb[..., 2]
+    luma = 0.299 * r + 0.587 * g + 0.114 * b
+
+    # Variance of the Laplacian: high for crisp frames, low for motion blur
+    laplacian = (4 * luma[:, 1:-1, 1:-1] - luma[:, :-2, 1:-1] - luma[:, 2:, 1:-1]
+                 - luma[:, 1:-1, :-2] - luma[:, 1:-1, 2:])
+    sharpness = laplacian.var(axis=(1, 2))
+
+    contrast = luma.std(axis=(1, 2))
+    brightness = luma.mean(axis=(1, 2))
+    exposure = 1.0 - np.abs(brightness - 0.5) * 2
+
+    # Hasler & Suesstrunk colorfulness
+    rg = r - g
+    yb = 0.5 * (r + g) - b
+    colorfulness = (np.sqrt(rg.std(axis=(1, 2)) ** 2 + yb.std(axis=(1, 2)) ** 2)
+                    + 0.3 * np.sqrt(rg.mean(axis=(1, 2)) ** 2 + yb.mean(axis=(1, 2)) ** 2))
+
+    # Share of edge energy near the thirds points rather than the borders;
+    # a detector-free stand-in for "the subject is framed well"
+    grad = np.abs(np.diff(luma, axis=1))[:, :, :-1] + np.abs(np.diff(luma, axis=2))[:, :-1, :]
+    weights = _composition_weights(*grad.shape[1:])
+    composition = (grad * weights).sum(axis=(1, 2)) / (grad.sum(axis=(1, 2)) + 1e-6)
+
+    return {
+        "sharpness": sharpness,
+        "contrast": contrast,
+        "exposure": exposure,
+        "colorfulness": colorfulness,
+        "composition": composition,
+        "brightness": brightness,
+    }
+
+
+def score_frames(frames: np.ndarray) -> np.ndarray:
+    """
+    Score candidate frames; higher is a better thumbnail.
+
+    Each metric is min-max normalized across the candidates so the weights
+    compare like with like. Near-black and flat frames (fades, blank cards)
+    are pushed to the bottom regardless of the other metrics.
+
+    Args:
+        frames: uint8 array of shape (n, height, width, 3)
+
+    Returns:
+        float array of shape (n,)
+    """
+    metrics = frame_metrics(frames)
+    scores = np.zeros(len(frames), dtype=np.float32)
+    for name, weight in SCORE_WEIGHTS.items():
+        values = metrics[name]
+        spread = values.max() - values.min()
+        normalized = (values - values.min()) / spread if spread > 1e-9 else np.zeros_like(values)
+        scores += weight * normalized
+
+    unusable = (metrics["brightness"] < 0.06) | (metrics["brightness"] > 0.96) | (metrics["contrast"] < 0.03)
+    scores[unusable] -= 1.0
+    return scores
+
+
+def select_thumbnail_time(
+    video_path: str,
+    candidates: int = 8,
+    max_workers: int = 4
+) -> Tuple[float, Dict[float, float]]:
+    """
+    Pick the best thumbnail timestamp from evenly spread candidates.
+
+    Args:
+        video_path: Path to video file
+        candidates: Number of frames to decode and score
+        max_workers: Concurrent ffmpeg decodes
+
+    Returns:
+        (best timestamp, {timestamp: score})
+
+    Raises:
+        ThumbnailError: If ffmpeg is missing or no frame could be decoded
+    """
+    ffmpeg = get_ffmpeg_binary()
+    if not ffmpeg:
+        raise ThumbnailError("ffmpeg not found")
+
+    duration = probe_duration(video_path)
+    if not duration:
+        raise ThumbnailError(f"Could not read duration of {video_path}")
+    timestamps = candidate_timestamps(duration, candidates)
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="thumb-decode") as pool:
+        decoded = list(pool.map(lambda t: extract_frame(video_path, t, ffmpeg=ffmpeg), timestamps))
+
+    found = [(t, frame) for t, frame in zip(timestamps, decoded) if frame is not None]
+    if not found:
+        raise ThumbnailError(f"No frames decoded from {video_path}")
+
+    scores = score_frames(np.stack([frame for _, frame in found]))
+    ranked = {t: float(s) for (t, _), s in zip(found, scores)}
+    best = found[int(np.argmax(scores))][0]
+    return best, ranked
+
+
+def render_thumbnail(
+    video_path: str,
+    timestamp: float,
+    output_path: str,
+    size: Tuple[int, int] = THUMBNAIL_SIZE,
+    quality: int = 2,
+    timeout: int = 60
+) -> str:
+    """
+    Render one full-resolution thumbnail frame straight to JPEG.
+
+    Args:
+        video_path: Path to video file
+        timestamp: Seconds into the video
+        output_path: JPEG output path
+        size: (width, height) of the thumbnail
+        quality: ffmpeg mjpeg qscale (2 = best, 31 = worst)
+        timeout: Seconds before the render is abandoned
+
+    Returns:
+        output_path
+    """
+    ffmpeg = get_ffmpeg_binary()
+    if not ffmpeg:
+        raise ThumbnailError("ffmpeg not found")
+
+    width, height = size
+    Path(output_path).parent.mkdir(parents=True, exist_ok=True)
+    cmd = [ffmpeg, "-y", "-hide_banner", "-loglevel", "error",
+           "-ss", f"{timestamp:.3f}", "-i", video_path,
+           "-frames:v", "1", "-an", "-sn",
+           "-vf", _scale_filter(width, height, flags="lanczos"),
+           "-q:v", str(quality), output_path]
+    try:
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    except subprocess.TimeoutExpired:
+        raise ThumbnailError(f"Thumbnail render timed out for {video_path}")
+    if result.returncode != 0 or not os.path.exists(output_path):
+        raise ThumbnailError(result.stderr.strip() or "ffmpeg failed")
+    return output_path
+
+
+def create_video_thumbnail(
+    video_path: str,
+    output_path: Optional[str] = None,
+    timestamp: Optional[float] = None,
+    candidates: int = 8
+) -> str:
+    """
+    Create a 1280x720 YouTube thumbnail for a video.
+
+    Args:
+        video_path: Path to video file
+        output_path: JPEG output path (default: <video>_thumbnail.jpg)
+        timestamp: Use this exact time instead of picking the best frame
+        candidates: Frames to score when picking automatically
+
+    Returns:
+        Path to the thumbnail
+
+    Raises:
+        ThumbnailError: If ffmpeg is missing or extraction fails
+
+    Example:
+        >>> create_video_thumbnail("commercial.mp4")
+        'commercial_thumbnail.jpg'
+    """
+    if not os.path.exists(video_path):
+        raise ThumbnailError(f"Video not found: {video_path}")
+    if not output_path:
+        output_path = str(Path(video_path).with_name(f"{Path(video_path).stem}_thumbnail.jpg"))
+
+    if timestamp is None:
+        timestamp, scores = select_thumbnail_time(video_path, candidates)
+        logger.info(f"🖼️ Picked thumbnail frame at {timestamp:.1f}s from {len(scores)} candidates")
+    return render_thumbnail(video_path, timestamp, str(output_path))
+
+
+def create_thumbnails_batch(
+    video_paths: Sequence[str],
+    output_dir: Optional[str] = None,
+    candidates: int = 8,
+    max_workers: int = 2
+) -> Dict[str, Optional[str]]:
+    """
+    Create thumbnails for several videos, e.g. all of a campaign's commercials.
+
+    Args:
+        video_paths: Videos to process
+        output_dir: Directory for thumbnails (default: next to each video)
+        candidates: Frames to score per video
+        max_workers: Videos processed concurrently (each runs its own decodes)
+
+    Returns:
+        Dict mapping video path to thumbnail path (None where it failed)
+    """
+    def _one(video_path: str) -> Optional[str]:
+        output_path = None
+        if output_dir:
+            output_path = str(Path(output_dir) / f"{Path(video_path).stem}_thumbnail.jpg")
+        try:
+            return create_video_thumbnail(video_path, output_path, candidates=candidates)
+        except ThumbnailError as e:
+            logger.warning(f"⚠️ Thumbnail failed for {Path(video_path).name}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="thumb-batch") as pool:
+        return dict(zip(video_paths, pool.map(_one, video_paths)))